@@ -0,0 +1,124 @@
+"""Single-flight coalescing of identical concurrent requests to expensive routes.
+
+``@coalesce()`` under a route decorator makes concurrent identical requests
+share one run of the handler: the first request (the leader) starts it, and
+requests arriving while it runs wait for the same result instead of running
+their own. Requests are identical when they have the same method, path,
+query parameters and ``Authorization`` header, so callers with different
+credentials never share a result. After a cache expiry or a deploy, a herd
+of N identical requests thus costs one handler run.
+
+The handler runs in a task shielded from any single caller: a client that
+disconnects or times out does not cancel the run for the others. The run
+uses the leader's dependencies (such as a ``yield`` database session), which
+FastAPI tears down when the leader's call ends, so a cancelled leader keeps
+its call open until the run has finished. The run is bounded by
+``timeout``; when it expires every waiter gets a 504. Exceptions,
+including ``HTTPException``, are raised to every waiter. Only the flight is
+shared, not a cache: the next request after the run completes runs the
+handler again.
+
+Use it on read-only GET routes. The handler runs with the leader's
+dependencies and its return value goes to every waiter, so it must not
+return a ``Response`` object or depend on the request body.
+"""
+
+import anyio
+import asyncio
+import functools
+import hashlib
+import inspect
+from collections.abc import Awaitable, Callable, Hashable
+from fastapi import HTTPException, Request, status
+from typing import Any
+
+_REQUEST_PARAM = "_coalesce_request"
+
+
+def coalesce(
+    timeout: float = 30.0,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Make concurrent identical requests to a route share one handler run.
+
+    Example::
+
+        @router.get("/report")
+        @coalesce(timeout=10)
+        async def report(session: DBSessionDep) -> Report: ...
+
+    Args:
+        timeout: Seconds the shared run may take before all waiters get a 504.
+
+    Returns:
+        Callable: Decorator for async route handlers.
+    """
+
+    def decorator(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        if not inspect.iscoroutinefunction(endpoint):
+            raise TypeError(f"@coalesce requires an async handler, got {endpoint.__qualname__}")
+        signature = inspect.signature(endpoint)
+        request_param = next(
+            (name for name, param in signature.parameters.items() if param.annotation is Request), None
+        )
+        flights: dict[Hashable, asyncio.Task[Any]] = {}
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs: Any) -> Any:
+            request = kwargs[request_param] if request_param else kwargs.pop(_REQUEST_PARAM)
+            key = _request_key(request)
+            task = flights.get(key)
+            leader = task is None
+            if task is None:
+                task = asyncio.ensure_future(asyncio.wait_for(endpoint(**kwargs), timeout))
+                flights[key] = task
+                task.add_done_callback(functools.partial(_finish, flights, key))
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if leader:
+                    await _outlive(task)
+                raise
+            except TimeoutError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Request timed out after {timeout:g}s"
+                ) from e
+
+        if request_param is None:
+            # FastAPI passes the request only to parameters it can see in the signature.
+            extra = inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+                parameters=[*signature.parameters.values(), extra]
+            )
+        return wrapper
+
+    return decorator
+
+
+def _request_key(request: Request) -> Hashable:
+    """Identify a request by method, path, sorted query parameters and credentials."""
+    authorization = request.headers.get("authorization")
+    scope = hashlib.sha256(authorization.encode()).digest() if authorization else None
+    return request.method, request.url.path, tuple(sorted(request.query_params.multi_items())), scope
+
+
+async def _outlive(task: asyncio.Task[Any]) -> None:
+    """Wait for a run to finish although the caller is being cancelled.
+
+    Starlette cancels through anyio cancel scopes, which cancel every
+    ``await`` until the scope exits; a shielded scope suspends that.
+    """
+    with anyio.CancelScope(shield=True):
+        while not task.done():
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                continue
+
+
+def _finish(flights: dict[Hashable, asyncio.Task[Any]], key: Hashable, task: asyncio.Task[Any]) -> None:
+    """Forget a finished run so the next request starts a new one."""
+    if flights.get(key) is task:
+        del flights[key]
+    if not task.cancelled():
+        # Mark the exception as retrieved in case every waiter is gone.
+        task.exception()
@@ -0,0 +1,50 @@
+"""ASGI middleware for API instrumentation."""
+
+import time
+from app.core.services.latency import LatencyRecorder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LatencyMiddleware:
+    """Records the latency of every HTTP request by route template.
+
+    A plain ASGI middleware, so it adds no per-request task or body
+    buffering. The time runs until the response is complete. Requests that
+    match no route are recorded as ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: LatencyRecorder) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+            recorder: Recorder that receives the latencies.
+        """
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call, timing HTTP requests."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.recorder.record(f"{scope['method']} {_route_template(scope)}", time.perf_counter() - start)
+
+
+def _route_template(scope: Scope) -> str:
+    """Get the path template of the route that handled a request.
+
+    The router stores the matched route in the (shared) scope. FastAPI
+    versions that keep included routes unprefixed put the full template in
+    the ``fastapi`` scope entry; older ones copy routes with the prefix.
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    for route in (context, scope.get("route")):
+        path = getattr(route, "path", None)
+        if isinstance(path, str) and path:
+            return path
+    return "unmatched"
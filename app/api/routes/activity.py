@@ -0,0 +1,63 @@
+"""Recent-activity endpoint: tails the in-process activity feed by cursor."""
+
+from app.core.models.base import BaseAPIModel
+from app.dependencies import ActivityFeedDep, SettingsDep
+from fastapi import APIRouter, Query
+from pydantic import Field
+from typing import Annotated
+
+router = APIRouter(prefix="/activity", tags=["activity"])
+
+
+class ActivityItem(BaseAPIModel):
+    """One recent event."""
+
+    cursor: int = Field(description="Sequence number of the event in the feed")
+    ts: int = Field(description="Event time in epoch milliseconds")
+    name: str = Field(description="Event name")
+    user_id: str | None = Field(description="User identifier")
+    value: float = Field(description="Event value")
+
+
+class ActivityResponse(BaseAPIModel):
+    """Activity feed page response model."""
+
+    items: list[ActivityItem] = Field(description="Events after the requested cursor, oldest first")
+    cursor: int = Field(description="Cursor to pass as ``after`` in the next request")
+    feed: str = Field(description="Id of the feed that issued the cursor, to pass as ``feed`` with it")
+    missed: int = Field(description="Events overwritten in the feed before they could be returned")
+
+
+@router.get("", response_model=ActivityResponse)
+async def get_activity(
+    feed: ActivityFeedDep,
+    settings: SettingsDep,
+    after: Annotated[
+        int | None, Query(ge=0, description="Cursor of the last event seen (default: newest events)")
+    ] = None,
+    feed_id: Annotated[
+        str | None, Query(alias="feed", description="Feed id returned with the cursor; other feeds ignore the cursor")
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=1000, description="Maximum events returned")] = 100,
+    wait: Annotated[float, Query(ge=0, description="Seconds to wait for new events (long poll)")] = 0,
+) -> ActivityResponse:
+    """Get recent events after a cursor.
+
+    Events come from a fixed-size in-memory buffer of the most recently
+    committed events of this process, so a poll costs O(events returned)
+    and never touches the database. Without ``after``, the newest ``limit``
+    events are returned; pass the returned ``cursor`` back to get only
+    newer ones, together with the returned ``feed``. Each server worker
+    has its own feed; a cursor issued by another worker's feed is ignored,
+    as if ``after`` were omitted. With ``wait``, the request is held until
+    a new event arrives or the wait (capped by the server) expires.
+
+    Returns:
+        ActivityResponse: Events, the next cursor and the number of missed events.
+    """
+    if feed_id is not None and feed_id != feed.id:
+        after = None
+    page = await feed.wait(after, min(wait, settings.activity_max_wait), limit)
+    return ActivityResponse.from_row(
+        {"items": ActivityItem.from_rows(page.items), "cursor": page.cursor, "feed": feed.id, "missed": page.missed}
+    )
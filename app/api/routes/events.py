@@ -0,0 +1,260 @@
+"""Event endpoints: NDJSON ingestion of streamed bodies and a paged, sortable event list."""
+
+from app.core.models.base import BaseAPIModel, PaginatedResponse, PaginationParams, get_type_adapter
+from app.core.repositories.base import Repository
+from app.core.services.ingest import EventIngestor, IngestBufferFullError, IngestDroppedError
+from app.core.services.rollups import now_ms
+from app.database.models.event import Event
+from app.dependencies import DBSessionDep, EventIngestorDep, QueryCacheDep, SettingsDep
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import Field, ValidationError
+from typing import Annotated, Any, Literal, NoReturn
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Longest accepted NDJSON line; protects memory against bodies without newlines.
+MAX_LINE_BYTES = 64 * 1024
+
+
+class EventIn(BaseAPIModel):
+    """One analytics event (one NDJSON line)."""
+
+    name: str = Field(min_length=1, max_length=100, description="Event name")
+    ts: int | None = Field(default=None, ge=0, description="Event time in epoch milliseconds (default: now)")
+    user_id: str | None = Field(default=None, max_length=64, description="User identifier")
+    value: float = Field(default=0.0, description="Event value")
+
+
+class EventIngestResponse(BaseAPIModel):
+    """Event ingestion response model."""
+
+    accepted: int = Field(description="Number of events accepted")
+    committed: bool = Field(description="Whether the accepted events are already committed")
+
+
+class EventOut(BaseAPIModel):
+    """Stored event response model."""
+
+    id: int
+    ts: int = Field(description="Event time in epoch milliseconds")
+    name: str
+    user_id: str | None
+    value: float
+
+
+# Columns the event list may be sorted by ("-" prefix for descending).
+SORTABLE_COLUMNS = ("id", "ts", "name", "user_id", "value")
+
+
+class _Chunk:
+    """NDJSON lines of the current chunk with their line numbers."""
+
+    def __init__(self) -> None:
+        self.lines: list[bytes] = []
+        self.numbers: list[int] = []
+
+
+def _rows(events: list[EventIn], now: int) -> list[dict[str, Any]]:
+    """Convert validated events to ``events`` table rows."""
+    return [
+        {
+            "ts": now if event.ts is None else event.ts,
+            "name": event.name,
+            "user_id": event.user_id,
+            "value": event.value,
+        }
+        for event in events
+    ]
+
+
+def _offer(ingestor: EventIngestor, rows: list[dict[str, Any]], accepted: int) -> int:
+    """Buffer rows or raise 429 with the number of events accepted so far."""
+    try:
+        return ingestor.offer(rows)
+    except IngestBufferFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"message": str(e), "accepted": accepted},
+            headers={"Retry-After": "1"},
+        ) from e
+
+
+def _line_too_long(number: int, accepted: int) -> NoReturn:
+    """Raise 400 for a line longer than ``MAX_LINE_BYTES``."""
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"message": f"Line {number} exceeds {MAX_LINE_BYTES} bytes", "accepted": accepted},
+    )
+
+
+def _ingest_chunk(ingestor: EventIngestor, chunk: _Chunk, accepted: int) -> tuple[int, int | None]:
+    """Validate and buffer a chunk of lines.
+
+    Returns:
+        tuple[int, int | None]: Events accepted from the chunk and the sequence
+        number of the last one (None if the chunk was empty).
+
+    Raises:
+        HTTPException: 400 at the first invalid line, after buffering the valid
+            lines before it; 429 when the buffer is full.
+    """
+    if not chunk.lines:
+        return 0, None
+    now = now_ms()
+    try:
+        events = get_type_adapter(list[EventIn]).validate_json(b"[" + b",".join(chunk.lines) + b"]")
+    except ValidationError:
+        pass
+    else:
+        return len(events), _offer(ingestor, _rows(events, now), accepted)
+
+    # Find the first invalid line and keep the valid ones before it.
+    adapter = get_type_adapter(EventIn)
+    valid: list[EventIn] = []
+    for line, number in zip(chunk.lines, chunk.numbers, strict=True):
+        try:
+            valid.append(adapter.validate_json(line))
+        except ValidationError as e:
+            if valid:
+                _offer(ingestor, _rows(valid, now), accepted)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "message": f"Invalid event on line {number}",
+                    "line": number,
+                    "errors": e.errors(include_url=False, include_context=False, include_input=False),
+                    "accepted": accepted + len(valid),
+                },
+            ) from None
+    raise AssertionError("chunk failed validation but every line is valid")  # pragma: no cover
+
+
+@router.post(
+    "",
+    response_model=EventIngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def ingest_events(
+    request: Request,
+    response: Response,
+    ingestor: EventIngestorDep,
+    settings: SettingsDep,
+    ack: Literal["buffer", "commit"] | None = Query(
+        default=None, description="Acknowledge after buffering or after commit (default: server setting)"
+    ),
+) -> EventIngestResponse:
+    """Ingest events from a streamed NDJSON body, one JSON object per line.
+
+    Lines are validated and buffered in chunks while the body streams in;
+    the buffer is written to the database in batches. When a request fails
+    part-way, ``detail.accepted`` tells how many leading events were taken.
+
+    Returns:
+        EventIngestResponse: Accepted count; 202 when buffered, 200 when committed.
+
+    Raises:
+        HTTPException: 400 for an invalid line, 429 when the buffer is full,
+            503 when ``ack=commit`` times out, 500 when ``ack=commit`` and
+            events were dropped after repeated write failures.
+    """
+    accepted = 0
+    first: int | None = None
+    sequence: int | None = None
+    chunk = _Chunk()
+    remainder = b""
+    line_number = 0
+
+    async for data in request.stream():
+        lines = (remainder + data).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            line_number += 1
+            if len(line) > MAX_LINE_BYTES:
+                _line_too_long(line_number, accepted)
+            if line.strip():
+                chunk.lines.append(line)
+                chunk.numbers.append(line_number)
+            if len(chunk.lines) >= settings.ingest_chunk_size:
+                count, sequence = _ingest_chunk(ingestor, chunk, accepted)
+                if first is None and sequence is not None:
+                    first = sequence - count + 1
+                accepted += count
+                chunk = _Chunk()
+        if len(remainder) > MAX_LINE_BYTES:
+            _line_too_long(line_number + 1, accepted)
+    if remainder.strip():
+        chunk.lines.append(remainder)
+        chunk.numbers.append(line_number + 1)
+    count, last = _ingest_chunk(ingestor, chunk, accepted)
+    if first is None and last is not None:
+        first = last - count + 1
+    accepted += count
+    sequence = last or sequence
+
+    committed = sequence is None
+    if sequence is not None and (ack or settings.ingest_ack_mode) == "commit":
+        try:
+            await ingestor.wait_committed(sequence, settings.ingest_commit_timeout, first=first)
+        except TimeoutError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"message": "Events are buffered but not yet committed", "accepted": accepted},
+                headers={"Retry-After": "5"},
+            ) from e
+        except IngestDroppedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={"message": str(e), "accepted": accepted},
+            ) from e
+        committed = True
+    if committed:
+        response.status_code = status.HTTP_200_OK
+    return EventIngestResponse(accepted=accepted, committed=committed)
+
+
+@router.get("", response_model=PaginatedResponse)
+async def list_events(
+    session: DBSessionDep,
+    cache: QueryCacheDep,
+    pagination: Annotated[PaginationParams, Depends()],
+    sort: Annotated[
+        str, Query(description=f"Column to sort by, \"-\" prefix for descending: {', '.join(SORTABLE_COLUMNS)}")
+    ] = "-id",
+    name: Annotated[str | None, Query(description="Only events with this name")] = None,
+    user_id: Annotated[str | None, Query(description="Only events of this user")] = None,
+    start: Annotated[int | None, Query(ge=0, description="Only events at or after this epoch ms")] = None,
+    end: Annotated[int | None, Query(ge=0, description="Only events before this epoch ms")] = None,
+) -> PaginatedResponse:
+    """List stored events one page at a time.
+
+    Sorting and filtering run in the database, so clients fetch only the
+    page they display; results go through the query cache, which commits
+    to the events table invalidate. Ties are broken by ``id`` so pages do
+    not overlap or skip rows.
+
+    Returns:
+        PaginatedResponse: Page of events with the total number of matches.
+
+    Raises:
+        HTTPException: 400 for an unknown sort column.
+    """
+    if sort.lstrip("-") not in SORTABLE_COLUMNS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cannot sort by {sort!r}")
+    where = []
+    if start is not None:
+        where.append(Event.ts >= start)
+    if end is not None:
+        where.append(Event.ts < end)
+    equals = {key: value for key, value in (("name", name), ("user_id", user_id)) if value is not None}
+    order_by = [sort] if sort.lstrip("-") == "id" else [sort, "-id" if sort.startswith("-") else "id"]
+
+    repository = Repository(session, Event, cache=cache)
+    total = await repository.count(*where, **equals)
+    rows = await repository.rows(*where, offset=pagination.offset, limit=pagination.size, order_by=order_by, **equals)
+    return PaginatedResponse.create_trusted(EventOut.from_rows(rows), total, pagination.page, pagination.size)
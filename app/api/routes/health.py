@@ -1,9 +1,13 @@
 """Health check endpoints for monitoring application status."""
 
+from app.api.coalesce import coalesce
+from app.database.cache import get_query_cache
 from app.dependencies import SettingsDep
+from dataclasses import asdict
 from datetime import datetime
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 from pydantic import BaseModel
+from sqlalchemy import text
 from typing import Any
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -30,6 +34,21 @@ class DetailedHealthResponse(BaseModel):
     services: dict[str, Any]
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness probe response model."""
+
+    status: str
+    warmup: dict[str, Any] | None = None
+
+
+class MetricsResponse(BaseModel):
+    """Request latency metrics response model."""
+
+    timestamp: datetime
+    window_seconds: float
+    routes: dict[str, dict[str, Any]]
+
+
 @router.get("/", response_model=HealthResponse)
 async def health_check(settings: SettingsDep) -> HealthResponse:
     """Basic health check endpoint.
@@ -46,20 +65,55 @@ async def health_check(settings: SettingsDep) -> HealthResponse:
 
 
 @router.get("/detailed", response_model=DetailedHealthResponse)
-async def detailed_health_check(settings: SettingsDep) -> DetailedHealthResponse:
+@coalesce(timeout=10)
+async def detailed_health_check(request: Request, settings: SettingsDep) -> DetailedHealthResponse:
     """Detailed health check endpoint with service status.
 
+    Concurrent calls share one run of the checks, so a burst of probes or
+    dashboards costs one database round trip.
+
     Returns:
         DetailedHealthResponse: Detailed health status with service information.
     """
     # Check database connectivity
     database_status = await _check_database_health()
 
-    services = {
+    services: dict[str, dict[str, Any]] = {
         "database": database_status,
         "api": {"status": "healthy", "details": "API is responding"},
     }
 
+    query_cache = get_query_cache()
+    if query_cache is not None:
+        stats = query_cache.stats()
+        services["query_cache"] = {"status": "healthy", "details": {**asdict(stats), "hit_rate": stats.hit_rate}}
+
+    job_manager = getattr(request.app.state, "job_manager", None)
+    if job_manager is not None:
+        services["jobs"] = {
+            "status": "healthy",
+            "details": {"workers": job_manager.workers, "queued": job_manager.queued, "running": job_manager.running},
+        }
+
+    compute_pool = getattr(request.app.state, "compute_pool", None)
+    if compute_pool is not None:
+        services["compute"] = {
+            "status": "healthy",
+            "details": {"workers": compute_pool.max_workers, "running": compute_pool.running, **asdict(compute_pool.stats())},
+        }
+
+    ingestor = getattr(request.app.state, "ingestor", None)
+    if ingestor is not None:
+        services["ingest"] = {
+            "status": "healthy",
+            "details": {
+                "buffered": ingestor.buffered,
+                "capacity": ingestor.max_buffered,
+                "committed": ingestor.committed,
+                "dropped": ingestor.dropped,
+            },
+        }
+
     # Determine overall status
     overall_status = (
         "healthy" if all(service.get("status") == "healthy" for service in services.values()) else "unhealthy"
@@ -74,14 +128,46 @@ async def detailed_health_check(settings: SettingsDep) -> DetailedHealthResponse
     )
 
 
-@router.get("/ready")
-async def readiness_check() -> dict[str, str]:
+@router.get("/metrics", response_model=MetricsResponse)
+async def metrics(request: Request) -> MetricsResponse:
+    """Request latency percentiles per route over the recent window.
+
+    Latencies come from t-digests kept by the latency middleware, so the
+    percentiles are estimates computed in bounded memory.
+
+    Returns:
+        MetricsResponse: Per route, request count and p50/p95/p99/max latency in milliseconds.
+    """
+    latency = getattr(request.app.state, "latency", None)
+    return MetricsResponse(
+        timestamp=datetime.utcnow(),
+        window_seconds=latency.window_seconds if latency is not None else 0,
+        routes=latency.snapshot() if latency is not None else {},
+    )
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse, "description": "Warming up"}},
+)
+async def readiness_check(request: Request, response: Response) -> ReadinessResponse:
     """Kubernetes readiness probe endpoint.
 
+    Answers 503 with status "warming_up" until the startup warm-up has
+    finished or its deadline has passed, so no traffic reaches a cold worker.
+
     Returns:
-        dict[str, str]: Readiness status.
+        ReadinessResponse: Readiness status with the warm-up progress and
+        per-step timings (None when warm-up is disabled).
     """
-    return {"status": "ready"}
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None:
+        return ReadinessResponse(status="ready")
+    ready = warmup.ready
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(status="ready" if ready else "warming_up", warmup=warmup.snapshot())
 
 
 @router.get("/live")
@@ -105,7 +191,7 @@ async def _check_database_health() -> dict[str, Any]:
         from app.database.connection import async_engine
 
         async with async_engine.connect() as conn:
-            await conn.execute("SELECT 1")
+            await conn.execute(text("SELECT 1"))
 
         return {
             "status": "healthy",
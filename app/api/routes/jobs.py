@@ -0,0 +1,72 @@
+"""Background job endpoints: submit a job and poll its state."""
+
+from app.core.models.base import BaseAPIModel
+from app.core.services.jobs import JobQueueFullError, UnknownJobKindError
+from app.dependencies import JobManagerDep
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, status
+from pydantic import Field
+from typing import Any
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+class JobCreate(BaseAPIModel):
+    """Job submission request model."""
+
+    kind: str = Field(description="Registered job kind")
+    payload: dict[str, Any] = Field(default_factory=dict, description="Handler input")
+    priority: int = Field(default=0, ge=0, le=9, description="Priority (0-9, higher runs first)")
+
+
+class JobResponse(BaseAPIModel):
+    """Job state response model."""
+
+    id: str
+    kind: str
+    status: str
+    priority: int
+    progress: float
+    attempts: int
+    result: Any | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(job_in: JobCreate, jobs: JobManagerDep) -> JobResponse:
+    """Queue a background job.
+
+    Returns:
+        JobResponse: The queued job; poll ``GET /jobs/{id}`` for its outcome.
+
+    Raises:
+        HTTPException: 400 for an unknown job kind, 503 when the queue is full.
+    """
+    try:
+        job = await jobs.submit(job_in.kind, job_in.payload, job_in.priority)
+    except UnknownJobKindError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "5"}
+        ) from e
+    return JobResponse.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, jobs: JobManagerDep) -> JobResponse:
+    """Get the state of a background job.
+
+    Returns:
+        JobResponse: Current job state, including result or error once finished.
+
+    Raises:
+        HTTPException: 404 if the job does not exist.
+    """
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return JobResponse.model_validate(job)
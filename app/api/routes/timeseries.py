@@ -0,0 +1,100 @@
+"""Time-series endpoint: server-side bucketed, gap-filled event metrics."""
+
+from app.core.models.base import BaseAPIModel
+from app.core.services.timeseries import parse_metric, query_series
+from app.dependencies import EventStoreDep, RollupServiceDep, SettingsDep
+from datetime import UTC, datetime
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import Field
+from typing import Annotated, Literal
+
+router = APIRouter(prefix="/timeseries", tags=["timeseries"])
+
+Granularity = Literal["minute", "hour", "day", "week"]
+
+
+class TimeSeriesResponse(BaseAPIModel):
+    """Dense time-series response model."""
+
+    start: int = Field(description="First bucket start in epoch milliseconds")
+    end: int = Field(description="End of the last bucket in epoch milliseconds")
+    granularity: str = Field(description="Bucket granularity")
+    step_ms: int = Field(description="Bucket width in milliseconds")
+    source: str = Field(description="Data source (rollups or event_store)")
+    timestamps: list[int] = Field(description="Bucket start times in epoch milliseconds")
+    series: dict[str, list[float | None]] = Field(
+        description="Values per metric, one per bucket; empty buckets are 0 for count/sum/distinct and null otherwise"
+    )
+    totals: dict[str, float | None] = Field(
+        description="Value per metric over the whole range; distinct counts and percentiles come from merged sketches"
+    )
+    errors: dict[str, float] = Field(description="Relative standard error of each distinct-count metric")
+
+
+def _epoch_ms(value: datetime) -> int:
+    """Convert a datetime to epoch milliseconds; naive values are UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp() * 1000)
+
+
+@router.get("", response_model=TimeSeriesResponse)
+async def get_timeseries(
+    start: datetime,
+    end: datetime,
+    rollups: RollupServiceDep,
+    event_store: EventStoreDep,
+    settings: SettingsDep,
+    metrics: Annotated[
+        list[str],
+        Query(
+            min_length=1,
+            description=(
+                'Metrics as "<event>[:count|sum|min|max|mean|distinct|p<percentile>]", e.g. "session_end:p95" '
+                '("*:distinct": users of any event)'
+            ),
+        ),
+    ],
+    granularity: Granularity = "day",
+) -> TimeSeriesResponse:
+    """Get metrics per time bucket over ``[start, end)``.
+
+    The range is widened to whole buckets (weeks start on Monday, UTC).
+    Values are aggregated on the server, so the response holds one value
+    per bucket and metric regardless of the number of events. Distinct
+    user counts (HyperLogLog) and percentiles (t-digest) are estimated from
+    mergeable sketches; the relative standard error of distinct counts is
+    returned in ``errors``.
+
+    Returns:
+        TimeSeriesResponse: Bucket start times, one gap-filled array and one
+        range total per metric.
+
+    Raises:
+        HTTPException: 400 for an invalid metric or range, or too many buckets.
+    """
+    try:
+        specs = list({spec.key: spec for spec in map(parse_metric, metrics)}.values())
+        series = await query_series(
+            rollups,
+            _epoch_ms(start),
+            _epoch_ms(end),
+            granularity,
+            specs,
+            event_store=event_store,
+            max_buckets=settings.timeseries_max_buckets,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    data = series.to_dict()
+    return TimeSeriesResponse.from_row(
+        {
+            "start": data["timestamps"][0],
+            "end": data["timestamps"][-1] + series.step_ms,
+            "granularity": granularity,
+            "step_ms": series.step_ms,
+            "source": series.source,
+            **data,
+        }
+    )
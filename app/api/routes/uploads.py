@@ -0,0 +1,149 @@
+"""Resumable upload endpoints: create an upload, stream its bytes, check its offset."""
+
+from app.core.models.base import BaseAPIModel
+from app.core.services.uploads import (
+    UploadChecksumError,
+    UploadConflictError,
+    UploadInfo,
+    UploadNotFoundError,
+    UploadTooLargeError,
+)
+from app.dependencies import UploadManagerDep
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from pydantic import Field
+from typing import NoReturn
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+class UploadCreate(BaseAPIModel):
+    """Upload creation request model."""
+
+    filename: str = Field(min_length=1, max_length=255, description="Original file name")
+    size: int = Field(ge=0, description="Total size in bytes")
+    sha256: str | None = Field(
+        default=None, pattern=r"^[0-9a-fA-F]{64}$", description="Expected SHA-256, verified on completion"
+    )
+
+
+class UploadResponse(BaseAPIModel):
+    """Upload state response model."""
+
+    id: str
+    filename: str
+    size: int = Field(description="Total size in bytes")
+    offset: int = Field(description="Bytes received; the next chunk starts here")
+    complete: bool = Field(description="Whether all bytes were received and verified")
+    sha256: str | None = Field(description="SHA-256 of the file once complete")
+    created_at: datetime
+
+    @classmethod
+    def from_info(cls, info: UploadInfo) -> "UploadResponse":
+        """Build the response from an upload state."""
+        return cls.from_row({**vars(info), "complete": info.complete})
+
+
+def _raise(error: Exception) -> NoReturn:
+    """Translate an upload error to an HTTP error."""
+    if isinstance(error, UploadNotFoundError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    if isinstance(error, UploadTooLargeError):
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(error)) from error
+    if isinstance(error, UploadConflictError):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail={"message": str(error), "offset": error.offset}
+        ) from error
+    if isinstance(error, UploadChecksumError):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(error)) from error
+    raise error
+
+
+@router.post("", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(upload_in: UploadCreate, uploads: UploadManagerDep) -> UploadResponse:
+    """Start a resumable upload.
+
+    Returns:
+        UploadResponse: The empty upload; send its bytes with ``PUT /uploads/{id}``.
+
+    Raises:
+        HTTPException: 413 if the size exceeds the server limit.
+    """
+    try:
+        info = await uploads.create(upload_in.filename, upload_in.size, upload_in.sha256)
+    except UploadTooLargeError as e:
+        _raise(e)
+    return UploadResponse.from_info(info)
+
+
+@router.put(
+    "/{upload_id}",
+    response_model=UploadResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    uploads: UploadManagerDep,
+    offset: int = Query(ge=0, description="Offset of the first byte in the body; must equal the upload offset"),
+) -> UploadResponse:
+    """Append the raw request body to an upload.
+
+    The body is streamed to disk as it arrives, so it can be any size up to
+    the remaining bytes of the upload. After an interrupted request, get the
+    offset with ``GET /uploads/{id}`` and send the rest from there.
+
+    Returns:
+        UploadResponse: Upload state; ``complete`` with ``sha256`` after the last byte.
+
+    Raises:
+        HTTPException: 404 for an unknown upload, 409 with ``detail.offset``
+            for a wrong offset or a complete or busy upload, 413 for data past
+            the declared size, 422 if the file does not match the expected
+            SHA-256 (the upload is deleted).
+    """
+    length = request.headers.get("content-length")
+    try:
+        info = await uploads.write(
+            upload_id, offset, request.stream(), int(length) if length and length.isdigit() else None
+        )
+    except (UploadNotFoundError, UploadConflictError, UploadTooLargeError, UploadChecksumError) as e:
+        _raise(e)
+    return UploadResponse.from_info(info)
+
+
+@router.get("/{upload_id}", response_model=UploadResponse)
+async def get_upload(upload_id: str, uploads: UploadManagerDep) -> UploadResponse:
+    """Get the state of an upload, e.g. the offset to resume from.
+
+    Returns:
+        UploadResponse: Upload state.
+
+    Raises:
+        HTTPException: 404 if the upload does not exist.
+    """
+    try:
+        info = await uploads.get(upload_id)
+    except UploadNotFoundError as e:
+        _raise(e)
+    return UploadResponse.from_info(info)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_upload(upload_id: str, uploads: UploadManagerDep) -> Response:
+    """Delete an upload and its data.
+
+    Raises:
+        HTTPException: 404 if the upload does not exist, 409 while a request
+            is writing to it.
+    """
+    try:
+        await uploads.delete(upload_id)
+    except (UploadNotFoundError, UploadConflictError) as e:
+        _raise(e)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
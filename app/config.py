@@ -3,6 +3,7 @@
 from functools import lru_cache
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Literal
 
 
 class Settings(BaseSettings):
@@ -36,6 +37,109 @@ class Settings(BaseSettings):
     # Database Configuration
     database_url: str = Field(default="sqlite+aiosqlite:///./app.db", description="Database URL")
     database_echo: bool = Field(default=False, description="Echo SQL queries")
+    schema_init_mode: str = Field(
+        default="auto", description="Schema initialization at startup (auto/migrations/off)"
+    )
+
+    # Query Cache
+    query_cache_enabled: bool = Field(default=False, description="Enable the query result cache")
+    query_cache_max_entries: int = Field(default=1024, description="Maximum cached query results")
+    query_cache_ttl: float = Field(default=60.0, description="Query cache entry TTL in seconds")
+
+    # Background Jobs
+    job_workers: int = Field(default=2, description="Number of concurrently running background jobs")
+    job_queue_size: int = Field(default=1000, description="Maximum number of queued background jobs")
+    job_lease_seconds: float = Field(default=60.0, description="Heartbeat lease after which a running job is re-queued")
+    job_shutdown_timeout: float = Field(default=10.0, description="Seconds to let running jobs finish on shutdown")
+
+    # Compute Pool
+    compute_workers: int | None = Field(
+        default=None,
+        description="Worker processes for CPU-bound work per API process (default: usable CPUs minus one, "
+        "divided among WEB_CONCURRENCY API processes)",
+    )
+    web_concurrency: int = Field(
+        default=1, description="API worker processes on this host (set by 'cli.py serve'; also read by gunicorn/uvicorn)"
+    )
+    compute_task_timeout: float = Field(default=30.0, description="Default compute task timeout in seconds")
+    compute_cancel_grace: float = Field(
+        default=5.0, description="Seconds a cancelled compute task may run before its worker is killed"
+    )
+    compute_share_threshold: int = Field(
+        default=1_048_576, description="Minimum array size in bytes passed through shared memory"
+    )
+
+    # Event Rollups
+    rollup_interval: float = Field(default=5.0, description="Seconds between scheduled rollup catch-ups")
+    rollup_batch_size: int = Field(default=10_000, description="Events folded into rollups per transaction")
+    rollup_minute_retention_days: float = Field(default=0, description="Days to keep minute rollups (0 = forever)")
+    rollup_hour_retention_days: float = Field(default=0, description="Days to keep hour rollups (0 = forever)")
+    rollup_day_retention_days: float = Field(default=0, description="Days to keep day rollups (0 = forever)")
+    event_retention_days: float = Field(default=0, description="Days to keep rolled-up raw events (0 = forever)")
+    distinct_error: float = Field(
+        default=0.01, description="Target relative standard error of distinct-user counts (sets sketch size)"
+    )
+    digest_compression: float = Field(
+        default=100.0, description="t-digest compression of per-bucket value percentiles (higher is more accurate)"
+    )
+
+    # Time Series
+    timeseries_max_buckets: int = Field(default=5000, description="Maximum buckets per time-series request")
+
+    # Event Ingestion
+    ingest_buffer_size: int = Field(default=100_000, description="Maximum buffered events before returning 429")
+    ingest_batch_size: int = Field(default=5_000, description="Maximum events written per transaction")
+    ingest_flush_interval: float = Field(default=0.2, description="Seconds to wait for a full batch before flushing")
+    ingest_chunk_size: int = Field(default=1_000, description="NDJSON lines validated and buffered together")
+    ingest_ack_mode: Literal["buffer", "commit"] = Field(
+        default="buffer", description="Acknowledge events after buffer or after commit"
+    )
+    ingest_commit_timeout: float = Field(default=10.0, description="Seconds to wait for commit when ack=commit")
+    ingest_max_attempts: int = Field(
+        default=5, description="Failed flushes (other than operational errors) before a batch is dropped"
+    )
+    ingest_dead_letter_path: str = Field(
+        default="./data/ingest-dead-letter.ndjson", description="NDJSON file dropped events are appended to"
+    )
+
+    # Columnar Event Store
+    event_store_enabled: bool = Field(default=False, description="Enable the memory-mapped columnar event store")
+    event_store_path: str = Field(default="./data/events", description="Directory of the columnar event store")
+    event_store_segment_rows: int = Field(default=1_048_576, description="Rows per active event store segment")
+    event_store_rotate_seconds: float = Field(default=300.0, description="Seconds before an active segment is sealed")
+    event_store_compact_rows: int = Field(default=16_777_216, description="Target rows of compacted segments")
+    event_store_maintenance_interval: float = Field(
+        default=60.0, description="Seconds between event store rotation, compaction and retention runs"
+    )
+    event_store_retention_days: float = Field(default=0, description="Days to keep columnar events (0 = forever)")
+
+    # Uploads
+    upload_dir: str = Field(default="./data/uploads", description="Directory of resumable uploads")
+    upload_max_bytes: int = Field(default=10 * 1024**3, description="Maximum size of one upload in bytes")
+    upload_chunk_size: int = Field(default=1024**2, description="Bytes buffered per upload write to disk")
+    upload_ttl_hours: float = Field(
+        default=24.0, description="Delete uploads not written to for this many hours (0 = keep forever)"
+    )
+    upload_sweep_interval: float = Field(default=600.0, description="Seconds between sweeps for expired uploads")
+
+    # CSV Import
+    csv_import_tables: list[str] = Field(default=["events"], description="Tables the csv_import job may write to")
+    csv_import_chunk_rows: int = Field(default=100_000, description="CSV rows parsed and written per chunk")
+
+    # Activity Feed
+    activity_capacity: int = Field(default=1_000, description="Recent events kept for the activity feed")
+    activity_max_wait: float = Field(default=30.0, description="Maximum seconds an activity long poll may wait")
+
+    # Latency Metrics
+    latency_metrics_enabled: bool = Field(default=True, description="Record request latency percentiles per route")
+    latency_window_seconds: float = Field(default=300.0, description="Sliding window of /health/metrics in seconds")
+
+    # Warm-up
+    warmup_enabled: bool = Field(default=True, description="Warm up after startup and gate /health/ready on it")
+    warmup_deadline: float = Field(
+        default=30.0, description="Seconds after startup when /health/ready reports ready even if warm-up is unfinished"
+    )
+    warmup_pool_connections: int = Field(default=5, description="Database connections opened during warm-up")
 
     # Security Settings
     secret_key: str = Field(
@@ -45,6 +149,11 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(
         default=30, description="Access token expiration time in minutes"
     )
+    password_hash_rounds: int = Field(default=12, description="bcrypt cost factor")
+    password_hash_workers: int = Field(default=2, description="Threads hashing passwords")
+    password_hash_concurrency: int = Field(default=32, description="Password hashes admitted at once before waiting")
+    token_cache_size: int = Field(default=10_000, description="Verified access tokens kept in the claims cache")
+    token_cache_ttl: float = Field(default=300.0, description="Seconds a verified token is served from the cache")
 
     # CORS Settings
     allowed_origins: list[str] = Field(
@@ -1,8 +1,28 @@
 """Base Pydantic models for common functionality."""
 
+from collections.abc import Iterable, Mapping
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Any
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Any, Self
+
+_object_setattr = object.__setattr__
+
+
+@lru_cache(maxsize=256)
+def get_type_adapter(type_: Any) -> TypeAdapter[Any]:
+    """Get a cached TypeAdapter for a type.
+
+    Building a TypeAdapter compiles a validator and serializer; caching it
+    avoids paying that on every request.
+
+    Args:
+        type_: Hashable type to adapt (e.g. ``list[ItemResponse]``).
+
+    Returns:
+        TypeAdapter[Any]: Adapter for validating and serializing the type.
+    """
+    return TypeAdapter(type_)
 
 
 class BaseAPIModel(BaseModel):
@@ -16,6 +36,56 @@ class BaseAPIModel(BaseModel):
         use_enum_values=True,
     )
 
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Self:
+        """Build an instance from trusted data without validation.
+
+        Only for data we produced ourselves, such as database rows; keys that
+        are not model fields are ignored. Values are not coerced, so they must
+        already have the field types.
+
+        Args:
+            row: Mapping of field names to values, e.g. from ``Repository.rows``.
+
+        Returns:
+            Self: Model instance.
+        """
+        return cls.from_rows((row,))[0]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> list[Self]:
+        """Build instances from trusted rows without validation.
+
+        Rows that carry every field are assigned directly, which is roughly
+        twice as fast as validating and several times faster than
+        ``model_construct``; rows missing fields go through ``model_construct``
+        so defaults apply.
+
+        Args:
+            rows: Mappings of field names to values.
+
+        Returns:
+            list[Self]: Model instances.
+        """
+        fields = tuple(cls.model_fields)
+        if cls.__private_attributes__:
+            return [cls.model_construct(**{name: row[name] for name in fields if name in row}) for row in rows]
+
+        instances = []
+        for row in rows:
+            try:
+                values = {name: row[name] for name in fields}
+            except KeyError:
+                instances.append(cls.model_construct(**{name: row[name] for name in fields if name in row}))
+                continue
+            instance = cls.__new__(cls)
+            _object_setattr(instance, "__dict__", values)
+            _object_setattr(instance, "__pydantic_fields_set__", set(fields))
+            _object_setattr(instance, "__pydantic_extra__", None)
+            _object_setattr(instance, "__pydantic_private__", None)
+            instances.append(instance)
+        return instances
+
 
 class TimestampMixin(BaseModel):
     """Mixin for models with timestamp fields."""
@@ -64,11 +134,45 @@ class PaginatedResponse(BaseAPIModel):
         Returns:
             PaginatedResponse: Paginated response instance.
         """
-        pages = (total + size - 1) // size if total > 0 else 0
         return cls(
             items=items,
             total=total,
             page=page,
             size=size,
-            pages=pages,
+            pages=cls._page_count(total, size),
         )
+
+    @classmethod
+    def create_trusted(
+        cls,
+        items: list[Any],
+        total: int,
+        page: int,
+        size: int,
+    ) -> "PaginatedResponse":
+        """Create paginated response from trusted data without validation.
+
+        Produces the same schema as ``create``; use it when items were built
+        by the application (e.g. with ``BaseAPIModel.from_rows``).
+
+        Args:
+            items: List of items for current page.
+            total: Total number of items.
+            page: Current page number.
+            size: Page size.
+
+        Returns:
+            PaginatedResponse: Paginated response instance.
+        """
+        return cls.model_construct(
+            items=items,
+            total=total,
+            page=page,
+            size=size,
+            pages=cls._page_count(total, size),
+        )
+
+    @staticmethod
+    def _page_count(total: int, size: int) -> int:
+        """Calculate the number of pages."""
+        return (total + size - 1) // size if total > 0 else 0
@@ -0,0 +1 @@
+"""Data-access repositories package initialization."""
@@ -0,0 +1,293 @@
+"""Generic async repository for SQLAlchemy models."""
+
+from app.database.cache import QueryCache, ResultMode
+from collections.abc import Iterable, Mapping, Sequence
+from sqlalchemy import ColumnElement, Select, exists, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    InstrumentedAttribute,
+    joinedload,
+    noload,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+from typing import Any, ClassVar, Generic, Literal, TypeVar
+
+ModelT = TypeVar("ModelT", bound=DeclarativeBase)
+
+LoadStrategy = Literal["selectin", "joined", "subquery", "noload", "raise"]
+ColumnSpec = str | InstrumentedAttribute[Any]
+OrderSpec = str | ColumnElement[Any] | InstrumentedAttribute[Any]
+
+_LOADERS = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+    "noload": noload,
+    "raise": raiseload,
+}
+
+
+class Repository(Generic[ModelT]):
+    """Async data-access layer for a single mapped model.
+
+    Entity queries (``get``, ``list``, ``filter``) return tracked ORM instances
+    with relationships loaded according to ``eager_loads``. Any relationship
+    not listed is set to raise on access when ``strict_loading`` is enabled, so
+    an accidental lazy load fails loudly instead of issuing one query per row.
+
+    Row queries (``get_row``, ``rows``) select only the requested columns and
+    return ``RowMapping`` objects, skipping the identity map entirely. Prefer
+    them for read-only responses. When a ``QueryCache`` is supplied, row,
+    count and exists queries are answered from it and rows come back as dicts.
+
+    Example:
+        class UserRepository(Repository[User]):
+            model = User
+            eager_loads = {"items": "selectin"}
+    """
+
+    model: type[ModelT]
+    eager_loads: ClassVar[Mapping[str, LoadStrategy]] = {}
+    strict_loading: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: type[ModelT] | None = None,
+        *,
+        cache: QueryCache | None = None,
+    ) -> None:
+        """Initialize the repository.
+
+        Args:
+            session: Database session used for all queries.
+            model: Mapped model class, if not declared on the subclass.
+            cache: Optional result cache for row, count and exists queries.
+
+        Raises:
+            TypeError: If no model class is available.
+        """
+        if model is not None:
+            self.model = model
+        if getattr(self, "model", None) is None:
+            raise TypeError(f"{type(self).__name__} requires a model class")
+        self.session = session
+        self.cache = cache
+
+    async def get(self, ident: Any, *, load: Mapping[str, LoadStrategy] | None = None) -> ModelT | None:
+        """Get an entity by primary key.
+
+        Args:
+            ident: Primary key value (tuple for composite keys).
+            load: Extra eager-loading strategies merged over ``eager_loads``.
+
+        Returns:
+            ModelT | None: The entity, or None if it does not exist.
+        """
+        return await self.session.get(self.model, ident, options=self._load_options(load))
+
+    async def get_row(self, ident: Any, *, columns: Iterable[ColumnSpec] | None = None) -> Mapping[str, Any] | None:
+        """Get a single row mapping by primary key.
+
+        Args:
+            ident: Primary key value (tuple for composite keys).
+            columns: Columns to load; defaults to every table column.
+
+        Returns:
+            Mapping[str, Any] | None: The projected row, or None if it does not exist.
+        """
+        pk_columns = inspect(self.model).primary_key
+        values = ident if isinstance(ident, tuple) else (ident,)
+        if len(values) != len(pk_columns):
+            raise ValueError(f"Expected {len(pk_columns)} primary key value(s), got {len(values)}")
+
+        stmt = select(*self._columns(columns)).where(
+            *(column == value for column, value in zip(pk_columns, values, strict=True))
+        )
+        rows = await self._fetch(stmt, "mappings")
+        return rows[0] if rows else None
+
+    async def list(
+        self,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        order_by: Sequence[OrderSpec] | None = None,
+        load: Mapping[str, LoadStrategy] | None = None,
+    ) -> Sequence[ModelT]:
+        """List entities.
+
+        Args:
+            offset: Number of rows to skip.
+            limit: Maximum number of rows to return.
+            order_by: Columns or names to order by (prefix a name with "-" for descending).
+            load: Extra eager-loading strategies merged over ``eager_loads``.
+
+        Returns:
+            Sequence[ModelT]: Matching entities.
+        """
+        return await self.filter(offset=offset, limit=limit, order_by=order_by, load=load)
+
+    async def filter(
+        self,
+        *where: ColumnElement[bool],
+        offset: int = 0,
+        limit: int | None = None,
+        order_by: Sequence[OrderSpec] | None = None,
+        load: Mapping[str, LoadStrategy] | None = None,
+        **equals: Any,
+    ) -> Sequence[ModelT]:
+        """Filter entities by SQL expressions and attribute equality.
+
+        Args:
+            *where: SQL boolean expressions.
+            offset: Number of rows to skip.
+            limit: Maximum number of rows to return.
+            order_by: Columns or names to order by (prefix a name with "-" for descending).
+            load: Extra eager-loading strategies merged over ``eager_loads``.
+            **equals: Attribute values to match; list/tuple/set values match with IN.
+
+        Returns:
+            Sequence[ModelT]: Matching entities.
+        """
+        stmt = self._paginate(select(self.model), where, equals, offset, limit, order_by)
+        stmt = stmt.options(*self._load_options(load))
+        result = await self.session.execute(stmt)
+        entities: Sequence[ModelT] = result.unique().scalars().all()
+        return entities
+
+    async def rows(
+        self,
+        *where: ColumnElement[bool],
+        columns: Iterable[ColumnSpec] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        order_by: Sequence[OrderSpec] | None = None,
+        **equals: Any,
+    ) -> Sequence[Mapping[str, Any]]:
+        """Select projected rows as mappings, bypassing the ORM identity map.
+
+        Args:
+            *where: SQL boolean expressions.
+            columns: Columns to load; defaults to every table column.
+            offset: Number of rows to skip.
+            limit: Maximum number of rows to return.
+            order_by: Columns or names to order by (prefix a name with "-" for descending).
+            **equals: Attribute values to match; list/tuple/set values match with IN.
+
+        Returns:
+            Sequence[Mapping[str, Any]]: Matching rows keyed by column name.
+        """
+        stmt = self._paginate(select(*self._columns(columns)), where, equals, offset, limit, order_by)
+        return await self._fetch(stmt, "mappings")  # type: ignore[no-any-return]
+
+    async def count(self, *where: ColumnElement[bool], **equals: Any) -> int:
+        """Count rows matching the given criteria.
+
+        Args:
+            *where: SQL boolean expressions.
+            **equals: Attribute values to match; list/tuple/set values match with IN.
+
+        Returns:
+            int: Number of matching rows.
+        """
+        stmt = select(func.count()).select_from(self.model).where(*self._criteria(where, equals))
+        return int(await self._fetch(stmt, "scalar"))
+
+    async def exists(self, *where: ColumnElement[bool], **equals: Any) -> bool:
+        """Check whether any row matches the given criteria.
+
+        Args:
+            *where: SQL boolean expressions.
+            **equals: Attribute values to match; list/tuple/set values match with IN.
+
+        Returns:
+            bool: True if at least one row matches.
+        """
+        subquery = select(inspect(self.model).primary_key[0]).where(*self._criteria(where, equals))
+        return bool(await self._fetch(select(exists(subquery)), "scalar"))
+
+    async def _fetch(self, stmt: Select[Any], mode: ResultMode) -> Any:
+        """Execute a read-only statement, through the cache when configured."""
+        if self.cache is not None:
+            return await self.cache.fetch(self.session, stmt, mode)
+        result = await self.session.execute(stmt)
+        if mode == "mappings":
+            return result.mappings().all()
+        return result.scalar()
+
+    def _attribute(self, name: str) -> InstrumentedAttribute[Any]:
+        """Resolve a mapped attribute by name."""
+        attribute = getattr(self.model, name, None)
+        if not isinstance(attribute, InstrumentedAttribute):
+            raise ValueError(f"{self.model.__name__} has no mapped attribute {name!r}")
+        return attribute
+
+    def _columns(self, columns: Iterable[ColumnSpec] | None) -> Sequence[Any]:
+        """Resolve a column projection, defaulting to all table columns."""
+        if columns is None:
+            return list(inspect(self.model).columns)
+        return [self._attribute(column) if isinstance(column, str) else column for column in columns]
+
+    def _criteria(self, where: Iterable[ColumnElement[bool]], equals: Mapping[str, Any]) -> Sequence[Any]:
+        """Combine SQL expressions with keyword equality filters."""
+        criteria: list[Any] = list(where)
+        for name, value in equals.items():
+            attribute = self._attribute(name)
+            if isinstance(value, list | tuple | set | frozenset):
+                criteria.append(attribute.in_(value))
+            else:
+                criteria.append(attribute == value)
+        return criteria
+
+    def _paginate(
+        self,
+        stmt: Select[Any],
+        where: Iterable[ColumnElement[bool]],
+        equals: Mapping[str, Any],
+        offset: int,
+        limit: int | None,
+        order_by: Sequence[OrderSpec] | None,
+    ) -> Select[Any]:
+        """Apply filtering, ordering and pagination to a statement."""
+        stmt = stmt.where(*self._criteria(where, equals))
+        for spec in order_by or ():
+            if isinstance(spec, str):
+                descending = spec.startswith("-")
+                attribute = self._attribute(spec.lstrip("-"))
+                stmt = stmt.order_by(attribute.desc() if descending else attribute.asc())
+            else:
+                stmt = stmt.order_by(spec)
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    def _load_options(self, load: Mapping[str, LoadStrategy] | None) -> Sequence[_AbstractLoad]:
+        """Build loader options from declarative eager-loading strategies.
+
+        Paths may be dotted (``"items.tags"``) to load nested relationships.
+        """
+        strategies = {**self.eager_loads, **(load or {})}
+        options: list[_AbstractLoad] = []
+        for path, strategy in strategies.items():
+            if strategy not in _LOADERS:
+                raise ValueError(f"Unknown loading strategy {strategy!r} for {path!r}")
+            model: Any = self.model
+            option: Any = None
+            for name in path.split("."):
+                attribute = getattr(model, name, None)
+                if attribute is None or not hasattr(attribute.property, "mapper"):
+                    raise ValueError(f"{model.__name__} has no relationship {name!r}")
+                loader = _LOADERS[strategy]
+                option = loader(attribute) if option is None else getattr(option, loader.__name__)(attribute)
+                model = attribute.property.mapper.class_
+            options.append(option)
+        if self.strict_loading:
+            options.append(raiseload("*"))
+        return options
@@ -0,0 +1,208 @@
+"""Authentication primitives: password hashing off the event loop and cached JWT verification.
+
+bcrypt costs tens to hundreds of milliseconds of CPU per call by design, so
+``PasswordHasher`` runs it in a small dedicated thread pool (bcrypt releases
+the GIL) and bounds the number of operations in flight, so a burst of logins
+queues up instead of starving the pool or the event loop.
+
+Decoding a JWT means a signature check and JSON parsing on every request.
+``TokenVerifier`` verifies each token once and keeps its claims in an LRU
+cache keyed by the SHA-256 digest of the token; entries expire after a TTL
+or at the token's ``exp``, whichever comes first, so a cached token is never
+accepted after it expires. Only successfully verified tokens are cached.
+"""
+
+import asyncio
+import bcrypt
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from jose import JWTError, jwt
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+# bcrypt only uses the first 72 bytes of a password; longer ones are rejected
+# rather than silently truncated.
+MAX_PASSWORD_BYTES = 72
+
+
+class AuthenticationError(Exception):
+    """Raised when a token is missing, malformed, expired or has a bad signature."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with bcrypt in a bounded thread pool."""
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_concurrency: int = 32) -> None:
+        """Initialize the hasher.
+
+        Args:
+            rounds: bcrypt cost factor (work doubles per round).
+            max_workers: Threads running bcrypt, i.e. CPUs it may occupy.
+            max_concurrency: Operations admitted at once (running or queued
+                in the pool); further callers wait on the event loop.
+        """
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password.
+
+        Args:
+            password: Plain-text password.
+
+        Returns:
+            str: bcrypt hash including salt and cost.
+
+        Raises:
+            ValueError: If the password is longer than ``MAX_PASSWORD_BYTES`` bytes.
+        """
+        secret = _encode_password(password)
+        if secret is None:
+            raise ValueError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes")
+        hashed = await self._run(bcrypt.hashpw, secret, bcrypt.gensalt(self.rounds))
+        return hashed.decode()
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a hash.
+
+        Args:
+            password: Plain-text password.
+            hashed: Hash produced by ``hash``.
+
+        Returns:
+            bool: Whether the password matches; False for malformed hashes.
+        """
+        secret = _encode_password(password)
+        if secret is None:
+            return False
+        try:
+            return await self._run(bcrypt.checkpw, secret, hashed.encode())
+        except ValueError:
+            return False
+
+    def close(self) -> None:
+        """Shut down the thread pool, waiting for running operations."""
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a bcrypt call in the pool once admitted by the semaphore."""
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+@dataclass(frozen=True)
+class TokenCacheStats:
+    """Snapshot of token cache counters."""
+
+    hits: int
+    misses: int
+    size: int
+    max_entries: int
+
+
+class TokenVerifier:
+    """Issues JWTs and verifies them with an LRU/TTL cache of claims."""
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        max_entries: int = 10_000,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the verifier.
+
+        Args:
+            secret_key: Signing key.
+            algorithm: JWT algorithm, e.g. "HS256".
+            max_entries: Maximum cached tokens before LRU eviction.
+            ttl: Seconds a verified token is served from the cache.
+            clock: Wall clock in epoch seconds (``exp`` is wall-clock time).
+        """
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[bytes, tuple[Mapping[str, Any], float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def create_token(self, subject: str, expires_in: timedelta, claims: Mapping[str, Any] | None = None) -> str:
+        """Create a signed access token.
+
+        Args:
+            subject: Token subject (``sub``), e.g. a user id.
+            expires_in: Lifetime of the token.
+            claims: Additional claims.
+
+        Returns:
+            str: Encoded JWT.
+        """
+        expires_at = datetime.fromtimestamp(self.clock(), UTC) + expires_in
+        payload = {**(claims or {}), "sub": subject, "exp": int(expires_at.timestamp())}
+        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def verify(self, token: str) -> Mapping[str, Any]:
+        """Verify a token and get its claims.
+
+        Args:
+            token: Encoded JWT.
+
+        Returns:
+            Mapping[str, Any]: Verified claims; shared with the cache, so treat
+            them as read-only.
+
+        Raises:
+            AuthenticationError: If the token is invalid or expired.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry[1]:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            del self._entries[key]
+
+        self._misses += 1
+        try:
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm], options={"verify_exp": False})
+        except JWTError as e:
+            raise AuthenticationError("Invalid token") from e
+        expires_at = now + self.ttl
+        if "exp" in claims:
+            if not isinstance(claims["exp"], int | float):
+                raise AuthenticationError("Invalid token expiry")
+            if claims["exp"] <= now:
+                raise AuthenticationError("Token has expired")
+            expires_at = min(expires_at, claims["exp"])
+
+        self._entries[key] = (claims, expires_at)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return claims
+
+    def clear(self) -> None:
+        """Drop all cached tokens, e.g. after rotating the key."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> TokenCacheStats:
+        """Get the cache counters."""
+        return TokenCacheStats(self._hits, self._misses, len(self._entries), self.max_entries)
+
+
+def _encode_password(password: str) -> bytes | None:
+    """Encode a password for bcrypt, or None if it is too long."""
+    secret = password.encode()
+    return secret if len(secret) <= MAX_PASSWORD_BYTES else None
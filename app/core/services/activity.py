@@ -0,0 +1,133 @@
+"""Recent-activity feed: a fixed-capacity ring buffer of committed events.
+
+The ingestor publishes each committed batch; readers tail the feed with a
+cursor (the sequence number of the last event they saw) and get only newer
+events, optionally waiting for them (long polling). The buffer holds the
+last ``capacity`` events, so memory is bounded and a read costs O(events
+returned); readers that fall more than ``capacity`` events behind are told
+how many they missed.
+
+The feed lives in the memory of one server process and holds the events
+that process ingested. With several workers (``cli.py serve`` defaults to
+one per CPU), each worker has its own feed and cursors: every feed has a
+random ``id``, and a cursor is only meaningful together with the id of the
+feed that issued it. Run a single worker when the feed must show every
+event.
+
+Everything runs on the event loop, so reads need no lock: a read never
+observes a half-published batch. Waiters share one ``asyncio.Event`` per
+publication, so waking any number of them is a single ``set``.
+"""
+
+import asyncio
+import contextlib
+import secrets
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ActivityPage:
+    """Events after a cursor."""
+
+    items: list[dict[str, Any]]
+    cursor: int
+    missed: int = 0
+
+
+class ActivityFeed:
+    """Ring buffer of recent events with cursor-based tailing."""
+
+    def __init__(self, capacity: int = 1000) -> None:
+        """Initialize an empty feed.
+
+        Args:
+            capacity: Number of most recent events kept.
+
+        Raises:
+            ValueError: If the capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        # Distinguishes this feed's cursors from those of other processes or earlier runs.
+        self.id = secrets.token_hex(4)
+        self._slots: list[tuple[Any, ...] | None] = [None] * capacity
+        self._head = 0
+        self._published = asyncio.Event()
+
+    @property
+    def cursor(self) -> int:
+        """Sequence number of the newest event (0 before the first)."""
+        return self._head
+
+    def publish(self, events: Iterable[dict[str, Any]]) -> int:
+        """Append events, overwriting the oldest, and wake waiting readers.
+
+        Args:
+            events: Rows with ``ts``, ``name``, ``user_id`` and ``value``.
+
+        Returns:
+            int: Cursor after the last event.
+        """
+        head = self._head
+        for event in events:
+            head += 1
+            self._slots[head % self.capacity] = (head, event["ts"], event["name"], event["user_id"], event["value"])
+        if head != self._head:
+            self._head = head
+            published, self._published = self._published, asyncio.Event()
+            published.set()
+        return head
+
+    def since(self, cursor: int | None = None, limit: int = 100) -> ActivityPage:
+        """Get events after a cursor, oldest first.
+
+        Args:
+            cursor: Last sequence number seen; None for the newest ``limit``
+                events. A cursor ahead of the feed (e.g. from before a
+                restart) is treated like None.
+            limit: Maximum events returned; pass the returned cursor again
+                to get the rest.
+
+        Returns:
+            ActivityPage: Events, the cursor to pass next, and the number of
+            events that were overwritten before they could be read.
+        """
+        head = self._head
+        oldest = max(head - self.capacity + 1, 1)
+        if cursor is None or cursor > head:
+            start = max(head - limit + 1, oldest)
+            missed = 0
+        else:
+            start = max(cursor + 1, oldest)
+            missed = start - cursor - 1
+        end = min(start + limit - 1, head)
+        items = [_item(self._slots[sequence % self.capacity]) for sequence in range(start, end + 1)]
+        return ActivityPage(items=items, cursor=end, missed=missed)
+
+    async def wait(self, cursor: int | None, timeout: float, limit: int = 100) -> ActivityPage:
+        """Get events after a cursor, waiting up to ``timeout`` seconds for new ones.
+
+        Args:
+            cursor: Last sequence number seen (see ``since``).
+            timeout: Maximum seconds to wait when there is nothing new.
+            limit: Maximum events returned.
+
+        Returns:
+            ActivityPage: As ``since``; empty if nothing arrived in time.
+        """
+        if cursor is None or cursor != self._head or timeout <= 0:
+            return self.since(cursor, limit)
+        published = self._published
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(published.wait(), timeout)
+        return self.since(cursor, limit)
+
+
+def _item(slot: tuple[Any, ...] | None) -> dict[str, Any]:
+    """Convert a buffer slot to an event dictionary."""
+    assert slot is not None
+    cursor, ts, name, user_id, value = slot
+    return {"cursor": cursor, "ts": ts, "name": name, "user_id": user_id, "value": value}
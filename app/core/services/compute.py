@@ -0,0 +1,416 @@
+"""Process pool for CPU-bound work, kept off the API event loop.
+
+NumPy/pandas aggregations hold the GIL long enough to stall every request on
+the loop; ``ComputePool.run`` ships them to worker processes instead and
+awaits the result. Functions must be importable module-level callables.
+
+NumPy arrays of at least ``share_threshold`` bytes, passed as top-level
+arguments or returned as the result, travel through POSIX shared memory:
+the sender copies the array into a segment and only a small handle is
+pickled.
+
+Tasks have a timeout and can be cancelled. A queued task is simply dropped.
+A running task first gets a cooperative cancellation flag (see
+``raise_if_cancelled``); if it is still running after ``cancel_grace``
+seconds its worker process is killed and the pool is replaced, and tasks
+that were running on the old pool are retried once on the new one.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import numpy as np
+import os
+import signal
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Worker process state, set by ``_initialize_worker``.
+_worker_control: SharedMemory | None = None
+_worker_cancel: np.ndarray | None = None
+_worker_slots = 0
+_worker_slot: int | None = None
+
+
+class ComputeError(Exception):
+    """Raised when a task could not be executed by the pool."""
+
+
+class ComputeCancelledError(ComputeError):
+    """Raised inside a task that was cancelled cooperatively."""
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle to a NumPy array stored in shared memory."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> tuple["SharedArray", SharedMemory]:
+        """Copy an array into a new shared memory segment.
+
+        Args:
+            array: Array to share.
+
+        Returns:
+            tuple[SharedArray, SharedMemory]: Handle and the owning segment.
+        """
+        segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        return cls(segment.name, array.shape, array.dtype.str), segment
+
+    def copy(self) -> np.ndarray:
+        """Copy the shared array into process-local memory.
+
+        Returns:
+            np.ndarray: Private copy of the array.
+        """
+        segment = SharedMemory(name=self.name)
+        try:
+            return np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=segment.buf).copy()
+        finally:
+            segment.close()
+
+
+@dataclass
+class ComputeStats:
+    """Counters describing pool activity."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    restarts: int = 0
+    shared_bytes: int = 0
+
+
+def raise_if_cancelled() -> None:
+    """Stop the current task if it was cancelled or timed out.
+
+    Long-running compute functions should call this between chunks of work
+    so cancellation does not need to kill the worker process.
+
+    Raises:
+        ComputeCancelledError: If the task has been cancelled.
+    """
+    if _worker_cancel is not None and _worker_slot is not None and _worker_cancel[_worker_slot]:
+        raise ComputeCancelledError("Task cancelled")
+
+
+class ComputePool:
+    """Managed process pool running CPU-bound functions for async code."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        task_timeout: float = 30.0,
+        cancel_grace: float = 5.0,
+        share_threshold: int = 1 << 20,
+        max_tasks_per_child: int | None = None,
+    ) -> None:
+        """Initialize the pool; processes start with ``start``.
+
+        Args:
+            max_workers: Number of worker processes.
+            task_timeout: Default per-task timeout in seconds.
+            cancel_grace: Seconds a cancelled running task may take to stop
+                cooperatively before its worker is killed.
+            share_threshold: Minimum array size in bytes sent via shared memory.
+            max_tasks_per_child: Recycle a worker after this many tasks.
+        """
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self.cancel_grace = cancel_grace
+        self.share_threshold = share_threshold
+        self.max_tasks_per_child = max_tasks_per_child
+        self.slots = max_workers * 2
+        self._stats = ComputeStats()
+        self._executor: ProcessPoolExecutor | None = None
+        self._control: SharedMemory | None = None
+        self._cancel: np.ndarray | None = None
+        self._pids: np.ndarray | None = None
+        self._free_slots: asyncio.Queue[int] | None = None
+        self._reapers: set[asyncio.Task[None]] = set()
+
+    @property
+    def running(self) -> int:
+        """Number of submitted tasks that have not finished."""
+        return 0 if self._free_slots is None else self.slots - self._free_slots.qsize()
+
+    def stats(self) -> ComputeStats:
+        """Get a snapshot of the pool counters.
+
+        Returns:
+            ComputeStats: Copy of the counters.
+        """
+        return ComputeStats(**vars(self._stats))
+
+    async def start(self) -> None:
+        """Create the control block and the executor.
+
+        The control block holds one cancel flag and one worker pid per slot;
+        at most ``slots`` tasks are submitted at a time. Worker processes are
+        spawned on demand; call ``warm_up`` to start them ahead of the first
+        task.
+        """
+        pid_bytes = self.slots * np.dtype(np.int64).itemsize
+        self._control = SharedMemory(create=True, size=self.slots + pid_bytes)
+        self._cancel = np.ndarray((self.slots,), dtype=np.uint8, buffer=self._control.buf)
+        self._cancel[:] = 0
+        self._pids = np.ndarray((self.slots,), dtype=np.int64, buffer=self._control.buf, offset=self.slots)
+        self._free_slots = asyncio.Queue()
+        for slot in range(self.slots):
+            self._free_slots.put_nowait(slot)
+        self._executor = self._create_executor()
+
+    async def warm_up(self) -> None:
+        """Start every worker process and import its modules."""
+        await asyncio.gather(*(self.run(os.getpid) for _ in range(self.max_workers)))
+
+    async def stop(self) -> None:
+        """Cancel outstanding work, stop the workers and free shared memory."""
+        for reaper in self._reapers:
+            reaper.cancel()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # shutdown() lets running tasks finish; terminate the workers instead.
+            processes = list((executor._processes or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+            await asyncio.to_thread(_join, processes)
+        if self._control is not None:
+            self._cancel = self._pids = None
+            self._control.close()
+            self._control.unlink()
+            self._control = None
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+        """Run a function in a worker process and await its result.
+
+        Args:
+            func: Importable module-level function.
+            *args: Positional arguments; large arrays go through shared memory.
+            timeout: Seconds before the task is cancelled (default ``task_timeout``).
+            **kwargs: Keyword arguments; large arrays go through shared memory.
+
+        Returns:
+            Any: The function's return value.
+
+        Raises:
+            TimeoutError: If the task exceeded its timeout.
+            ComputeError: If the worker process died or the pool is not started.
+            Exception: Any exception raised by ``func``.
+        """
+        if self._executor is None or self._free_slots is None:
+            raise ComputeError("Compute pool is not started")
+
+        segments: list[SharedMemory] = []
+        try:
+            args = tuple(self._share(value, segments) for value in args)
+            kwargs = {key: self._share(value, segments) for key, value in kwargs.items()}
+            slot = await self._free_slots.get()
+            return await self._run_in_slot(slot, func, args, kwargs, self.task_timeout if timeout is None else timeout)
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    async def _run_in_slot(
+        self,
+        slot: int,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        timeout: float,
+    ) -> Any:
+        """Run a task in a control slot and release the slot when it stops.
+
+        A task on a pool that was replaced is retried once on the new pool.
+        """
+        assert self._control is not None and self._free_slots is not None
+        release = True
+        try:
+            for attempt in range(2):
+                assert self._cancel is not None and self._pids is not None
+                self._cancel[slot] = 0
+                self._pids[slot] = 0
+                executor = self._executor
+                assert executor is not None
+                future = executor.submit(_invoke, slot, self.share_threshold, func, args, kwargs)
+                self._stats.submitted += 1
+                try:
+                    result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                except TimeoutError:
+                    self._stats.timed_out += 1
+                    release = not self._abandon(slot, future, executor)
+                    raise TimeoutError(f"{_name(func)} exceeded {timeout:g}s") from None
+                except asyncio.CancelledError:
+                    self._stats.cancelled += 1
+                    release = not self._abandon(slot, future, executor)
+                    raise
+                except BrokenProcessPool as e:
+                    if executor is not self._executor and attempt == 0:
+                        continue
+                    if executor is self._executor:
+                        self._replace_executor(executor)
+                    self._stats.failed += 1
+                    raise ComputeError(f"Worker process running {_name(func)} died") from e
+                except Exception:
+                    self._stats.failed += 1
+                    raise
+
+                self._stats.completed += 1
+                if isinstance(result, SharedArray):
+                    self._stats.shared_bytes += int(np.prod(result.shape)) * np.dtype(result.dtype).itemsize
+                    return _take_shared(result)
+                return result
+            raise AssertionError("unreachable")
+        finally:
+            if release:
+                self._free_slots.put_nowait(slot)
+
+    def _share(self, value: Any, segments: list[SharedMemory]) -> Any:
+        """Replace a large array argument with a shared memory handle."""
+        if not isinstance(value, np.ndarray) or value.nbytes < self.share_threshold or value.dtype.hasobject:
+            return value
+        handle, segment = SharedArray.create(value)
+        segments.append(segment)
+        self._stats.shared_bytes += value.nbytes
+        return handle
+
+    def _abandon(self, slot: int, future: Future[Any], executor: ProcessPoolExecutor) -> bool:
+        """Stop a task whose caller gave up.
+
+        Returns:
+            bool: True if the task is still running; a reaper then owns the slot.
+        """
+        if future.cancel() or future.done():
+            return False
+        assert self._cancel is not None
+        self._cancel[slot] = 1
+        reaper = asyncio.get_running_loop().create_task(self._reap(slot, future, executor))
+        self._reapers.add(reaper)
+        reaper.add_done_callback(self._reapers.discard)
+        return True
+
+    async def _reap(self, slot: int, future: Future[Any], executor: ProcessPoolExecutor) -> None:
+        """Wait for a cancelled task to stop; kill its worker if it does not.
+
+        The slot is released only once the task has stopped, so its cancel
+        flag and pid cannot be confused with those of a later task.
+        """
+        try:
+            wrapped = asyncio.wrap_future(future)
+            wrapped.add_done_callback(_discard_outcome)
+            while not wrapped.done():
+                await asyncio.wait([wrapped], timeout=self.cancel_grace)
+                # A pid of 0 means the task is still queued in the executor; it
+                # sees its cancel flag as soon as a worker picks it up.
+                pid = int(self._pids[slot]) if self._pids is not None else 0
+                if not wrapped.done() and pid > 0:
+                    logger.warning("Compute task in slot %d ignored cancellation; killing worker %d", slot, pid)
+                    if executor is self._executor:
+                        self._replace_executor(executor)
+                    with contextlib.suppress(ProcessLookupError):
+                        os.kill(pid, signal.SIGKILL)
+                    await asyncio.wait([wrapped])
+        finally:
+            if self._free_slots is not None:
+                self._free_slots.put_nowait(slot)
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Swap in a fresh executor; tasks still on the old one are retried."""
+        self._stats.restarts += 1
+        self._executor = self._create_executor()
+        executor.shutdown(wait=False, cancel_futures=False)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """Create a process pool whose workers attach to the control block."""
+        assert self._control is not None
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_initialize_worker,
+            initargs=(self._control.name, self.slots),
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+
+def _initialize_worker(control_name: str, slots: int) -> None:
+    """Attach a worker process to the shared control block."""
+    global _worker_control, _worker_cancel, _worker_slots
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_control = SharedMemory(name=control_name)
+    _worker_cancel = np.ndarray((slots,), dtype=np.uint8, buffer=_worker_control.buf)
+    _worker_slots = slots
+
+
+def _invoke(
+    slot: int,
+    share_threshold: int,
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """Run a task inside a worker process."""
+    global _worker_slot
+    assert _worker_control is not None
+    np.ndarray((_worker_slots,), dtype=np.int64, buffer=_worker_control.buf, offset=_worker_slots)[slot] = os.getpid()
+    _worker_slot = slot
+    try:
+        raise_if_cancelled()
+        result = func(
+            *(_unshare(value) for value in args),
+            **{key: _unshare(value) for key, value in kwargs.items()},
+        )
+    finally:
+        _worker_slot = None
+
+    if isinstance(result, np.ndarray) and result.nbytes >= share_threshold and not result.dtype.hasobject:
+        handle, segment = SharedArray.create(result)
+        segment.close()
+        return handle
+    return result
+
+
+def _unshare(value: Any) -> Any:
+    """Turn a shared memory handle back into an array."""
+    return value.copy() if isinstance(value, SharedArray) else value
+
+
+def _take_shared(handle: SharedArray) -> np.ndarray:
+    """Copy a worker-created shared array and free its segment."""
+    array = handle.copy()
+    SharedMemory(name=handle.name).unlink()
+    return array
+
+
+def _discard_outcome(future: "asyncio.Future[Any]") -> None:
+    """Retrieve the outcome of an abandoned task so it is not logged."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _join(processes: list[Any]) -> None:
+    """Wait for terminated worker processes to exit."""
+    for process in processes:
+        process.join(timeout=5)
+
+
+def _name(func: Callable[..., Any]) -> str:
+    """Get a readable name for a task function."""
+    return getattr(func, "__qualname__", repr(func))
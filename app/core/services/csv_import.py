@@ -0,0 +1,269 @@
+"""Chunked CSV import into database tables, run as a background job.
+
+A CSV file (typically a completed upload) is parsed with pandas in chunks of
+``chunk_rows`` rows, so peak memory depends on the chunk size, not the file
+size. Every field is read as text, so values such as ``00123`` in a string
+column are kept verbatim, and each chunk's columns are then coerced to the
+types of the target table's columns with vectorized pandas/NumPy
+operations; rows with values that cannot be coerced, or that are missing a
+required value, are counted as rejected and skipped. Every chunk is written in its own transaction with a single
+``executemany`` of plain tuples, the cheapest bulk path through SQLAlchemy.
+That path bypasses session events, so the query cache is invalidated for the
+table after each commit.
+
+Parsing and coercion run in a worker thread while the previous chunk is
+written on the database driver's thread, so the two overlap and the event
+loop stays responsive throughout; at most two chunks are in memory.
+
+Submit ``{"kind": "csv_import", "payload": {"upload_id": ..., "table": ...}}``
+to ``POST /jobs``; the job reports the fraction of the file read as
+progress and returns row counts. Imports are not idempotent: a job retried
+after a crash re-inserts the chunks written before it. Imported events are
+picked up by the rollups but not published to the activity feed, which only
+shows live ingestion; importing into ``events`` is refused while the columnar
+event store is enabled, since the store would not contain the imported rows.
+
+pandas is imported on first use, so registering the job does not add its
+import time to API startup.
+"""
+
+import asyncio
+import csv
+import numpy as np
+import time
+from app.config import get_settings
+from app.core.services.jobs import JobContext, job_handler
+from app.core.services.uploads import UploadManager
+from app.database.cache import invalidate_cached_tables
+from app.database.connection import AsyncSessionLocal, Base
+from app.database.models.event import Event
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from sqlalchemy import Column, ColumnDefault, Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class ImportStats:
+    """Outcome of a CSV import."""
+
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_rejected: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+
+def importable_columns(table: Table) -> list[Column[Any]]:
+    """Get the columns a CSV may fill: all except auto-incremented primary keys.
+
+    Args:
+        table: Target table.
+
+    Returns:
+        list[Column[Any]]: Columns in table order.
+    """
+    return [column for column in table.columns if column is not table.autoincrement_column]
+
+
+async def import_csv(
+    path: str | Path,
+    table: Table,
+    session_factory: Callable[[], AsyncSession],
+    chunk_rows: int = 100_000,
+    on_progress: Callable[[float], None] | None = None,
+) -> ImportStats:
+    """Import a CSV file with a header row into a table.
+
+    Header names select table columns; other CSV columns are ignored.
+    Columns missing from the file get their default (evaluated once per
+    chunk) or NULL.
+
+    Args:
+        path: CSV file.
+        table: Target table.
+        session_factory: Factory for database sessions.
+        chunk_rows: Rows parsed and written per chunk.
+        on_progress: Called with the fraction of the file read after each chunk.
+
+    Returns:
+        ImportStats: Rows read, written and rejected.
+
+    Raises:
+        ValueError: If the header lacks a column that is required (not
+            nullable and without a default) or has no column of the table.
+    """
+    started = time.perf_counter()
+    stats = ImportStats()
+    with open(path, "rb") as file:
+        size = Path(path).stat().st_size
+        header = next(csv.reader([file.readline().decode("utf-8-sig")]), [])
+        file.seek(0)
+        columns, defaulted = _plan_columns(table, header)
+        # The compiled statement lists its columns in table order.
+        keys = [column.key for column in importable_columns(table) if column in {*columns, *defaulted}]
+        sql: str | None = None
+        chunks = _chunks(file, columns, defaulted, chunk_rows)
+
+        # Parse the next chunk while the current one is written.
+        pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+        try:
+            while (chunk := await pending) is not None:
+                position = file.tell()
+                pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+                rows, read = chunk
+                stats.rows_read += read
+                stats.rows_rejected += read - len(rows)
+                stats.chunks += 1
+                if rows:
+                    async with session_factory() as session:
+                        connection = await session.connection()
+                        if sql is None:
+                            sql = str(insert(table).compile(dialect=connection.dialect, column_keys=keys))
+                        await connection.exec_driver_sql(sql, rows)
+                        await session.commit()
+                    invalidate_cached_tables({table.name})
+                    stats.rows_written += len(rows)
+                if on_progress is not None:
+                    on_progress(position / size if size else 1.0)
+        finally:
+            # The parser thread cannot be interrupted; let it finish before the file closes.
+            await asyncio.gather(asyncio.shield(pending), return_exceptions=True)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+@job_handler("csv_import")
+async def csv_import_job(context: JobContext) -> dict[str, Any]:
+    """Import a completed upload into a table.
+
+    Payload: ``upload_id``, ``table`` (one of ``csv_import_tables``) and
+    optionally ``chunk_rows``.
+
+    Raises:
+        ValueError: For a table that may not be imported into, including
+            ``events`` while the columnar event store is enabled.
+    """
+    settings = get_settings()
+    table_name = context.payload["table"]
+    if table_name not in settings.csv_import_tables or table_name not in Base.metadata.tables:
+        raise ValueError(f"CSV import into table {table_name!r} is not allowed")
+    if table_name == Event.__tablename__ and settings.event_store_enabled:
+        raise ValueError("CSV import into 'events' is not allowed while the columnar event store is enabled")
+    path = await UploadManager(settings.upload_dir).path(context.payload["upload_id"])
+    stats = await import_csv(
+        path,
+        Base.metadata.tables[table_name],
+        AsyncSessionLocal,
+        chunk_rows=int(context.payload.get("chunk_rows", settings.csv_import_chunk_rows)),
+        on_progress=context.report_progress,
+    )
+    return asdict(stats)
+
+
+def _plan_columns(table: Table, header: list[str]) -> tuple[list[Column[Any]], list[Column[Any]]]:
+    """Split the importable columns into those read from the CSV and those filled from Python defaults.
+
+    Raises:
+        ValueError: If a required column is missing from the header.
+    """
+    present = set(header)
+    columns: list[Column[Any]] = []
+    defaulted: list[Column[Any]] = []
+    missing: list[str] = []
+    for column in importable_columns(table):
+        if column.name in present:
+            columns.append(column)
+        elif isinstance(column.default, ColumnDefault):
+            defaulted.append(column)
+        elif not column.nullable and column.server_default is None:
+            missing.append(column.name)
+    if missing:
+        raise ValueError(f"CSV lacks required column(s): {', '.join(missing)}")
+    if not columns:
+        raise ValueError(f"CSV has none of the columns of table {table.name!r}")
+    return columns, defaulted
+
+
+def _chunks(
+    file: IO[bytes], columns: list[Column[Any]], defaulted: list[Column[Any]], chunk_rows: int
+) -> Iterator[tuple[list[tuple[Any, ...]], int]]:
+    """Parse and coerce the CSV chunk by chunk.
+
+    Yields:
+        tuple[list[tuple[Any, ...]], int]: Valid rows as tuples in table column order,
+        and the number of rows read.
+    """
+    import pandas as pd
+
+    names = [column.name for column in columns]
+    order = [column for column in importable_columns(columns[0].table) if column in {*columns, *defaulted}]
+    # Text only: letting pandas infer types would turn "00123" into 123.0 before coercion.
+    reader = pd.read_csv(file, usecols=names, dtype=str, chunksize=chunk_rows)
+    for frame in reader:
+        valid = np.ones(len(frame), dtype=bool)
+        coerced: list[tuple[pd.Series, np.ndarray]] = []
+        for column in columns:
+            original = frame[column.name]
+            series = _coerce(original, column)
+            missing = series.isna().to_numpy()
+            # Values that are present but could not be coerced reject the row.
+            valid &= ~(missing & original.notna().to_numpy())
+            if not column.nullable:
+                valid &= ~missing
+            coerced.append((series, missing))
+
+        # Convert to Python objects (NaN/NaT become None) one column at a time.
+        count = int(valid.sum())
+        lists: dict[Column[Any], list[Any]] = {}
+        for column, (series, missing) in zip(columns, coerced, strict=True):
+            series = series[valid]
+            if missing[valid].any():
+                series = series.astype(object).where(~missing[valid], None)
+            lists[column] = series.tolist()
+        lists.update((column, [_default(column)] * count) for column in defaulted)
+        yield list(zip(*(lists[column] for column in order), strict=True)), len(frame)
+
+
+def _default(column: Column[Any]) -> Any:
+    """Evaluate the Python-side default of a column."""
+    default = column.default
+    assert isinstance(default, ColumnDefault)
+    return default.arg(None) if default.is_callable else default.arg
+
+
+def _coerce(series: "pd.Series", column: Column[Any]) -> "pd.Series":
+    """Convert a text column to the Python type of a table column; bad values become missing."""
+    import pandas as pd
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return series
+    if python_type is bool:
+        lowered = series.str.strip().str.lower()
+        mapped = lowered.map({"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False})
+        return mapped.where(series.notna())
+    if python_type is int:
+        numbers = pd.to_numeric(series, errors="coerce")
+        whole = numbers.notna() & (numbers == np.floor(numbers))
+        return numbers.where(whole).astype("Int64")
+    if python_type is float:
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+    if python_type is datetime:
+        values = pd.to_datetime(series, errors="coerce", utc=True, format="ISO8601").dt.tz_localize(None)
+        datetimes = np.asarray(values.dt.to_pydatetime(), dtype=object)
+        return pd.Series(datetimes, index=series.index, dtype=object).where(values.notna())
+    if python_type is date:
+        return pd.to_datetime(series, errors="coerce", format="ISO8601").dt.date
+    if python_type is str:
+        length = getattr(column.type, "length", None)
+        return series if length is None else series.where(series.str.len() <= length)
+    return series
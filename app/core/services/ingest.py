@@ -0,0 +1,302 @@
+"""Micro-batched event ingestion: a bounded in-memory buffer flushed in batches.
+
+Producers (the ``POST /events`` endpoint) offer validated events to an
+``EventIngestor``, which holds at most ``max_buffered`` events in memory. A
+flusher task writes them to the ``events`` table in one transaction per batch
+of up to ``batch_size`` events, as soon as a batch is full or
+``flush_interval`` seconds after the buffer became non-empty. When the buffer
+is full, ``offer`` fails immediately so callers can push back on clients.
+
+Events get consecutive sequence numbers; callers that acknowledge only after
+commit wait until the committed sequence passes their last event. Failed
+flushes are retried with backoff, keeping the events buffered. Operational
+database errors (connection loss, a locked database) are retried until they
+clear, while the buffer pushes back on clients; a batch that fails with any
+other error ``max_attempts`` times in a row cannot succeed, so it is removed
+and appended to the ``dead_letter`` NDJSON file, and commit waiters for its
+events fail with ``IngestDroppedError``.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import time
+from app.core.services.activity import ActivityFeed
+from app.database.columnar import EventStore
+from app.database.models.event import Event
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class IngestBufferFullError(Exception):
+    """Raised when the ingestion buffer cannot take more events."""
+
+
+class IngestDroppedError(Exception):
+    """Raised to commit waiters whose events were dropped after repeated flush failures."""
+
+
+class EventIngestor:
+    """Buffers incoming events and writes them to the database in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_buffered: int = 100_000,
+        batch_size: int = 5_000,
+        flush_interval: float = 0.2,
+        on_commit: Callable[[], None] | None = None,
+        event_store: EventStore | None = None,
+        activity_feed: ActivityFeed | None = None,
+        max_attempts: int = 5,
+        dead_letter: str | Path | None = None,
+    ) -> None:
+        """Initialize the ingestor; the flusher runs after ``start``.
+
+        Args:
+            session_factory: Factory for database sessions.
+            max_buffered: Maximum number of events held in memory, including
+                events being written.
+            batch_size: Maximum events per transaction.
+            flush_interval: Seconds to wait for a full batch before flushing.
+            on_commit: Called after each committed batch (e.g. ``rollups.notify``).
+            event_store: Columnar store that committed events are also appended to.
+            activity_feed: Feed that committed events are published to.
+            max_attempts: Consecutive non-operational failures after which a
+                batch is dropped.
+            dead_letter: NDJSON file dropped events are appended to (None to
+                only log them).
+        """
+        self.session_factory = session_factory
+        self.max_buffered = max_buffered
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_commit = on_commit
+        self.event_store = event_store
+        self.activity_feed = activity_feed
+        self.max_attempts = max_attempts
+        self.dead_letter = Path(dead_letter) if dead_letter else None
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._offered = 0
+        self._committed = 0
+        self._dropped = 0
+        # Sequence ranges (first, last) of recently dropped batches.
+        self._dropped_ranges: deque[tuple[int, int]] = deque(maxlen=1000)
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of events not yet committed."""
+        return len(self._buffer)
+
+    @property
+    def committed(self) -> int:
+        """Number of events committed since start."""
+        return self._committed
+
+    @property
+    def dropped(self) -> int:
+        """Number of events dropped after repeated flush failures since start."""
+        return self._dropped
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="event-flusher")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush buffered events and stop the flusher.
+
+        Args:
+            timeout: Seconds to wait for the buffer to drain.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        deadline = time.monotonic() + timeout
+        while self._buffer and time.monotonic() < deadline and not self._task.done():
+            await asyncio.sleep(0.01)
+        if self._buffer:
+            logger.warning("Dropping %d buffered event(s) on shutdown", len(self._buffer))
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def offer(self, events: list[dict[str, Any]]) -> int:
+        """Buffer events, all or nothing.
+
+        Args:
+            events: Rows with ``ts``, ``name``, ``user_id`` and ``value``.
+
+        Returns:
+            int: Sequence number of the last event, for ``wait_committed``.
+
+        Raises:
+            IngestBufferFullError: If the events do not fit into the buffer.
+        """
+        if len(self._buffer) + len(events) > self.max_buffered:
+            raise IngestBufferFullError("Event buffer is full")
+        was_empty = not self._buffer
+        self._buffer.extend(events)
+        self._offered += len(events)
+        if was_empty or len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return self._offered
+
+    async def wait_committed(self, sequence: int, timeout: float | None = None, first: int | None = None) -> None:
+        """Wait until all events up to ``sequence`` are committed.
+
+        Args:
+            sequence: Value returned by ``offer``.
+            timeout: Maximum seconds to wait.
+            first: Sequence number of the caller's first event (default
+                ``sequence``); the wait fails if any event from ``first`` to
+                ``sequence`` was dropped.
+
+        Raises:
+            TimeoutError: If the events were not committed in time.
+            IngestDroppedError: If some of the events were dropped.
+        """
+        first = sequence if first is None else first
+        if sequence <= self._resolved:
+            self._check_dropped(first, sequence)
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((first, sequence, waiter))
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        finally:
+            if (first, sequence, waiter) in self._waiters:
+                self._waiters.remove((first, sequence, waiter))
+
+    async def flush(self) -> int:
+        """Write up to one batch of buffered events.
+
+        Returns:
+            int: Number of events committed.
+        """
+        count = min(len(self._buffer), self.batch_size)
+        if not count:
+            return 0
+        batch = list(itertools.islice(self._buffer, count))
+        async with self.session_factory() as session:
+            await session.execute(insert(Event), batch)
+            await session.commit()
+
+        for _ in range(count):
+            self._buffer.popleft()
+        self._committed += count
+        self._release_waiters()
+        if self.on_commit is not None:
+            self.on_commit()
+        if self.activity_feed is not None:
+            self.activity_feed.publish(batch)
+        if self.event_store is not None:
+            try:
+                await asyncio.to_thread(
+                    self.event_store.append,
+                    [row["ts"] for row in batch],
+                    [row["name"] for row in batch],
+                    [row["user_id"] for row in batch],
+                    [row["value"] for row in batch],
+                )
+            except Exception:
+                logger.exception("Failed to append %d event(s) to the columnar store", count)
+        return count
+
+    @property
+    def _resolved(self) -> int:
+        """Sequence number up to which events were committed or dropped."""
+        return self._committed + self._dropped
+
+    def _check_dropped(self, first: int, last: int) -> None:
+        """Raise if an event from ``first`` to ``last`` was dropped."""
+        for low, high in self._dropped_ranges:
+            if low <= last and first <= high:
+                raise IngestDroppedError("Events could not be written to the database and were dropped")
+
+    def _release_waiters(self) -> None:
+        """Resolve waiters whose events are all committed or dropped."""
+        pending = []
+        for first, sequence, waiter in self._waiters:
+            if sequence <= self._resolved:
+                if not waiter.done():
+                    try:
+                        self._check_dropped(first, sequence)
+                    except IngestDroppedError as e:
+                        waiter.set_exception(e)
+                    else:
+                        waiter.set_result(None)
+            else:
+                pending.append((first, sequence, waiter))
+        self._waiters = pending
+
+    async def _drop_batch(self) -> None:
+        """Remove the oldest batch from the buffer and append it to the dead-letter file."""
+        count = min(len(self._buffer), self.batch_size)
+        batch = [self._buffer.popleft() for _ in range(count)]
+        self._dropped_ranges.append((self._resolved + 1, self._resolved + count))
+        self._dropped += count
+        self._release_waiters()
+        if self.dead_letter is None:
+            logger.error("Dropped %d event(s) after %d failed flushes", count, self.max_attempts)
+            return
+        try:
+            await asyncio.to_thread(_append_ndjson, self.dead_letter, batch)
+        except OSError:
+            logger.exception("Dropped %d event(s); writing them to %s failed", count, self.dead_letter)
+        else:
+            logger.error(
+                "Dropped %d event(s) after %d failed flushes; appended to %s", count, self.max_attempts, self.dead_letter
+            )
+
+    async def _run(self) -> None:
+        """Flush full batches immediately and partial ones after ``flush_interval``."""
+        backoff = self.flush_interval
+        attempts = 0
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if len(self._buffer) < self.batch_size and not self._stopping:
+                # Give the batch a chance to fill up; offer() wakes us when it does.
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                self._wakeup.clear()
+            try:
+                while await self.flush() and len(self._buffer) >= self.batch_size:
+                    attempts = 0
+            except Exception as e:
+                logger.exception("Failed to flush %d buffered event(s)", len(self._buffer))
+                # Operational errors (connection loss, a locked database) may clear; others repeat.
+                attempts = 0 if isinstance(e, OperationalError) else attempts + 1
+                if attempts >= self.max_attempts:
+                    attempts = 0
+                    await self._drop_batch()
+                else:
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 5.0)
+            else:
+                attempts = 0
+                backoff = self.flush_interval
+            if self._buffer:
+                self._wakeup.set()
+
+
+def _append_ndjson(path: Path, rows: list[dict[str, Any]]) -> None:
+    """Append rows to a file as JSON lines."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(json.dumps(row) + "\n" for row in rows)
@@ -0,0 +1,342 @@
+"""In-process background job queue with a worker pool and persisted state.
+
+Jobs are stored in the ``jobs`` table and dispatched through a bounded
+priority queue to a fixed number of worker tasks running on the API's event
+loop. Coroutine handlers run on the loop and must not block it; plain
+functions are run in a thread so CPU- or IO-heavy work does not stall request
+handling.
+
+Several server processes may share the table: a worker claims a job with a
+conditional update, and running jobs renew a heartbeat lease. On start, a
+manager re-queues jobs left ``queued`` and jobs whose lease expired because
+their process died.
+"""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import uuid
+from app.database.models.job import Job, JobStatus
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import CursorResult, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, cast
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[["JobContext"], Awaitable[Any]] | Callable[["JobContext"], Any]
+
+# Handlers registered with ``job_handler``, keyed by job kind.
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+class JobError(Exception):
+    """Base class for job submission errors."""
+
+
+class UnknownJobKindError(JobError):
+    """Raised when no handler is registered for a job kind."""
+
+
+class JobQueueFullError(JobError):
+    """Raised when the job queue has no free slot."""
+
+
+@dataclass
+class JobContext:
+    """Information and progress reporting passed to a job handler."""
+
+    job_id: str
+    kind: str
+    payload: dict[str, Any]
+    attempt: int
+    progress: float = field(default=0.0)
+
+    def report_progress(self, fraction: float) -> None:
+        """Record progress; persisted with the next heartbeat.
+
+        Safe to call from threads running synchronous handlers.
+
+        Args:
+            fraction: Completed fraction between 0 and 1.
+        """
+        self.progress = min(max(fraction, 0.0), 1.0)
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a function as the handler for a job kind.
+
+    Args:
+        kind: Job kind clients submit.
+
+    Returns:
+        Callable[[JobHandler], JobHandler]: Decorator returning the handler unchanged.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+class JobManager:
+    """Bounded priority job queue drained by a pool of worker tasks."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        workers: int = 2,
+        queue_size: int = 1000,
+        lease_seconds: float = 60.0,
+        handlers: dict[str, JobHandler] | None = None,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            session_factory: Factory for database sessions; must not expire
+                objects on commit.
+            workers: Number of concurrently running jobs.
+            queue_size: Maximum number of queued jobs held in memory.
+            lease_seconds: Time after which a running job without heartbeat is
+                considered abandoned and re-queued on start.
+            handlers: Handlers by job kind; defaults to ``JOB_HANDLERS``.
+        """
+        self.session_factory = session_factory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.lease_seconds = lease_seconds
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue(queue_size)
+        self._sequence = itertools.count()
+        self._tasks: list[asyncio.Task[None]] = []
+        self._busy: set[asyncio.Task[None]] = set()
+        self._running: dict[str, JobContext] = {}
+        self._stopping = False
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting in the in-memory queue."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently executing in this process."""
+        return len(self._running)
+
+    async def start(self) -> None:
+        """Start workers and re-queue persisted jobs."""
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat(), name="job-heartbeat"))
+        self._tasks.append(asyncio.create_task(self._recover(), name="job-recovery"))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop workers, giving running jobs time to finish.
+
+        Coroutine jobs still running after ``timeout`` are cancelled and
+        re-queued in the database, so the next start runs them again. Threads
+        running plain-function jobs cannot be stopped and may still complete
+        their work, so those jobs are marked failed instead of running twice.
+
+        Args:
+            timeout: Seconds to wait for running jobs.
+        """
+        self._stopping = True
+        for task in self._tasks:
+            if task not in self._busy:
+                task.cancel()
+        busy = [task for task in self._tasks if task in self._busy]
+        if busy:
+            _, pending = await asyncio.wait(busy, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, payload: dict[str, Any] | None = None, priority: int = 0) -> Job:
+        """Persist a job and queue it for execution.
+
+        Args:
+            kind: Registered job kind.
+            payload: JSON-serializable handler input.
+            priority: Higher values run first.
+
+        Returns:
+            Job: The persisted job.
+
+        Raises:
+            UnknownJobKindError: If no handler is registered for ``kind``.
+            JobQueueFullError: If the queue is full.
+        """
+        if kind not in self.handlers:
+            raise UnknownJobKindError(f"Unknown job kind {kind!r}")
+        if self._queue.full():
+            raise JobQueueFullError("Job queue is full")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status=JobStatus.QUEUED,
+            priority=priority,
+            payload=payload or {},
+            progress=0.0,
+            attempts=0,
+            created_at=datetime.utcnow(),
+        )
+        async with self.session_factory() as session:
+            session.add(job)
+            await session.commit()
+
+        try:
+            self._enqueue(job.id, priority)
+        except asyncio.QueueFull:
+            async with self.session_factory() as session:
+                await session.delete(await session.get(Job, job.id))
+                await session.commit()
+            raise JobQueueFullError("Job queue is full") from None
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        """Load a job, with live progress if it runs in this process.
+
+        Args:
+            job_id: Job identifier.
+
+        Returns:
+            Job | None: The job, or None if it does not exist.
+        """
+        async with self.session_factory() as session:
+            job = await session.get(Job, job_id)
+        if job is not None and job_id in self._running:
+            job.progress = self._running[job_id].progress
+        return job
+
+    def _enqueue(self, job_id: str, priority: int) -> None:
+        """Put a job on the in-memory queue without waiting."""
+        self._queue.put_nowait((-priority, next(self._sequence), job_id))
+
+    async def _recover(self) -> None:
+        """Re-queue persisted jobs left over from previous runs."""
+        stale_before = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(
+                    Job.status == JobStatus.RUNNING,
+                    or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < stale_before),
+                )
+                .values(status=JobStatus.QUEUED)
+            )
+            await session.commit()
+            result = await session.execute(
+                select(Job.id, Job.priority)
+                .where(Job.status == JobStatus.QUEUED)
+                .order_by(Job.priority.desc(), Job.created_at)
+            )
+            pending = result.all()
+
+        for job_id, priority in pending:
+            await self._queue.put((-priority, next(self._sequence), job_id))
+        if pending:
+            logger.info("Re-queued %d persisted job(s)", len(pending))
+
+    async def _worker(self) -> None:
+        """Take jobs off the queue and run them until stopped."""
+        task = asyncio.current_task()
+        assert task is not None
+        while not self._stopping:
+            _, _, job_id = await self._queue.get()
+            self._busy.add(task)
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception("Could not run job %s", job_id)
+            finally:
+                self._busy.discard(task)
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        """Claim and execute one job, recording its outcome."""
+        context = await self._claim(job_id)
+        if context is None:
+            return
+
+        handler = self.handlers.get(context.kind)
+        threaded = handler is not None and not inspect.iscoroutinefunction(handler)
+        self._running[job_id] = context
+        try:
+            if handler is None:
+                raise UnknownJobKindError(f"No handler registered for job kind {context.kind!r}")
+            if threaded:
+                result = await asyncio.to_thread(handler, context)
+            else:
+                result = await handler(context)
+        except asyncio.CancelledError:
+            if threaded:
+                # The thread keeps running and may finish the job; re-queueing would repeat its side effects.
+                await self._finish(
+                    job_id,
+                    status=JobStatus.FAILED,
+                    error="Interrupted by shutdown while running in a thread",
+                    progress=context.progress,
+                )
+            else:
+                await self._finish(job_id, status=JobStatus.QUEUED, progress=context.progress, started_at=None)
+            raise
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, context.kind)
+            error = f"{type(e).__name__}: {e}"
+            await self._finish(job_id, status=JobStatus.FAILED, error=error, progress=context.progress)
+        else:
+            await self._finish(job_id, status=JobStatus.SUCCEEDED, result=result, progress=1.0)
+        finally:
+            self._running.pop(job_id, None)
+
+    async def _claim(self, job_id: str) -> JobContext | None:
+        """Atomically mark a queued job as running in this process."""
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            claimed = cast(
+                CursorResult[Any],
+                await session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+                    .values(status=JobStatus.RUNNING, started_at=now, heartbeat_at=now, attempts=Job.attempts + 1)
+                ),
+            )
+            await session.commit()
+            if claimed.rowcount != 1:
+                return None
+            job = await session.get(Job, job_id)
+        assert job is not None
+        return JobContext(job_id=job.id, kind=job.kind, payload=job.payload, attempt=job.attempts)
+
+    async def _finish(self, job_id: str, **values: Any) -> None:
+        """Record the final (or re-queued) state of a job."""
+        if values["status"] != JobStatus.QUEUED:
+            values["finished_at"] = datetime.utcnow()
+        async with self.session_factory() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(**values))
+            await session.commit()
+
+    async def _heartbeat(self) -> None:
+        """Renew leases and persist progress of running jobs."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self._running:
+                continue
+            try:
+                async with self.session_factory() as session:
+                    for job_id, context in list(self._running.items()):
+                        await session.execute(
+                            update(Job)
+                            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+                            .values(heartbeat_at=datetime.utcnow(), progress=context.progress)
+                        )
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to renew job leases")
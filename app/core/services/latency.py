@@ -0,0 +1,87 @@
+"""Request latency percentiles per route over a sliding window.
+
+Latencies are added to one t-digest per route and time slot; a snapshot
+merges the digests of the slots still inside the window, so memory stays
+bounded by routes x slots x digest size however many requests are served.
+"""
+
+import time
+from app.core.sketches import TDigest
+from collections import deque
+from collections.abc import Callable, Sequence
+from typing import Any
+
+
+class LatencyRecorder:
+    """Records request latencies and reports percentiles per route."""
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        slots: int = 5,
+        compression: float = 100.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            window_seconds: Length of the sliding window reported by ``snapshot``.
+            slots: Number of slots the window is divided into; the window
+                advances one slot at a time.
+            compression: t-digest compression.
+            clock: Monotonic clock in seconds.
+        """
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self.slots = slots
+        self.compression = compression
+        self.clock = clock
+        self._slots: deque[tuple[int, dict[str, TDigest]]] = deque()
+
+    def record(self, route: str, seconds: float) -> None:
+        """Record the latency of one request.
+
+        Args:
+            route: Route label, e.g. ``"GET /api/v1/health/"``.
+            seconds: Request duration in seconds.
+        """
+        digests = self._current()
+        digest = digests.get(route)
+        if digest is None:
+            digest = digests[route] = TDigest(self.compression)
+        digest.add(seconds * 1000)
+
+    def snapshot(self, quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> dict[str, dict[str, Any]]:
+        """Get latency percentiles per route over the window.
+
+        Args:
+            quantiles: Quantiles to report, e.g. 0.95 as ``"p95"``.
+
+        Returns:
+            dict[str, dict[str, Any]]: Per route, the request ``count`` and
+            latencies in milliseconds (``p50``, ..., ``max``).
+        """
+        self._current()
+        merged: dict[str, TDigest] = {}
+        for _, digests in self._slots:
+            for route, digest in digests.items():
+                merged.setdefault(route, TDigest(self.compression)).merge(digest)
+
+        labels = [f"p{quantile * 100:g}" for quantile in quantiles]
+        return {
+            route: {
+                "count": len(digest),
+                **dict(zip(labels, digest.quantiles(quantiles), strict=True)),
+                "max": digest.max,
+            }
+            for route, digest in sorted(merged.items())
+        }
+
+    def _current(self) -> dict[str, TDigest]:
+        """Get the digests of the current slot, dropping slots outside the window."""
+        index = int(self.clock() // self.slot_seconds)
+        while self._slots and self._slots[0][0] <= index - self.slots:
+            self._slots.popleft()
+        if not self._slots or self._slots[-1][0] != index:
+            self._slots.append((index, {}))
+        return self._slots[-1][1]
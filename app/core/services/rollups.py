@@ -0,0 +1,818 @@
+"""Incrementally maintained minute/hour/day rollups of raw events.
+
+Raw events are folded into per-bucket aggregates in batches, in id order,
+starting after a stored watermark. The aggregates of one batch are merged
+into existing rollup rows and the watermark is advanced in the same
+transaction with a compare-and-set, so concurrent catch-ups in several
+processes cannot count an event twice. Late events (old ``ts``, new ``id``)
+are merged into their historical buckets.
+
+Queries read rollups only, so their cost depends on the number of buckets
+in the range, not the number of events: totals cover a range with the
+coarsest aligned buckets (whole days, then hours, then minutes at the
+edges), and series use the coarsest granularity that divides the step.
+
+Distinct users are tracked the same way with HyperLogLog sketches per
+bucket (per name and across all events as ``ALL_EVENTS``), and value
+quantiles with t-digests per name and bucket; both are merged at query time,
+in memory bounded by the sketch size.
+"""
+
+import asyncio
+import contextlib
+import logging
+import numpy as np
+import time
+from app.core.sketches import HyperLogLog, TDigest, hash64
+from app.database.models.event import Event
+from app.database.models.rollup import (
+    DayRollup,
+    DayUserSketch,
+    DayValueDigest,
+    HourRollup,
+    HourUserSketch,
+    HourValueDigest,
+    MinuteRollup,
+    MinuteUserSketch,
+    MinuteValueDigest,
+    RollupMixin,
+    RollupWatermark,
+    UserSketchMixin,
+    ValueDigestMixin,
+)
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from sqlalchemy import CursorResult, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, cast
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+WATERMARK_KEY = "events"
+# Sketch name covering the users of all events.
+ALL_EVENTS = "*"
+# Rollup keys looked up per query when merging a batch.
+_KEY_CHUNK = 400
+
+
+@dataclass(frozen=True)
+class Granularity:
+    """A rollup granularity and the tables holding it."""
+
+    name: str
+    ms: int
+    model: type[RollupMixin]
+    sketch_model: type[UserSketchMixin]
+    digest_model: type[ValueDigestMixin]
+
+    @property
+    def sketch_models(self) -> tuple[type[UserSketchMixin] | type[ValueDigestMixin], ...]:
+        """Tables holding serialized sketches of this granularity."""
+        return self.sketch_model, self.digest_model
+
+
+# Ordered from finest to coarsest.
+GRANULARITIES: tuple[Granularity, ...] = (
+    Granularity("minute", MINUTE_MS, MinuteRollup, MinuteUserSketch, MinuteValueDigest),
+    Granularity("hour", HOUR_MS, HourRollup, HourUserSketch, HourValueDigest),
+    Granularity("day", DAY_MS, DayRollup, DayUserSketch, DayValueDigest),
+)
+
+
+@dataclass
+class Aggregate:
+    """Mergeable aggregate of event values."""
+
+    count: int = 0
+    sum: float = 0.0
+    min: float | None = None
+    max: float | None = None
+
+    @property
+    def mean(self) -> float | None:
+        """Mean value, or None without events."""
+        return self.sum / self.count if self.count else None
+
+    @classmethod
+    def from_row(cls, row: Any) -> "Aggregate":
+        """Build an aggregate from a rollup row.
+
+        Args:
+            row: Rollup model instance or row with the aggregate columns.
+
+        Returns:
+            Aggregate: Aggregate of the row.
+        """
+        return cls(count=row.count, sum=row.sum, min=row.min, max=row.max)
+
+    def add(self, value: float) -> None:
+        """Add one event value.
+
+        Args:
+            value: Event value.
+        """
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Aggregate") -> None:
+        """Merge another aggregate into this one.
+
+        Args:
+            other: Aggregate to merge.
+        """
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: Count, sum, min, max and mean.
+        """
+        return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max, "mean": self.mean}
+
+    def apply_to(self, row: RollupMixin) -> None:
+        """Write the aggregate columns onto a rollup row.
+
+        Args:
+            row: Rollup model instance.
+        """
+        row.count, row.sum, row.min, row.max = self.count, self.sum, self.min, self.max
+
+
+def now_ms() -> int:
+    """Get the current time in epoch milliseconds."""
+    return int(time.time() * 1000)
+
+
+def granularity_for_step(step_ms: int) -> Granularity:
+    """Pick the coarsest granularity whose buckets tile a step exactly.
+
+    Args:
+        step_ms: Requested series step in milliseconds.
+
+    Returns:
+        Granularity: Granularity to read.
+
+    Raises:
+        ValueError: If the step is not a positive multiple of one minute.
+    """
+    if step_ms <= 0 or step_ms % MINUTE_MS:
+        raise ValueError("Step must be a positive multiple of one minute")
+    return next(g for g in reversed(GRANULARITIES) if step_ms % g.ms == 0)
+
+
+def plan_range(
+    start_ms: int, end_ms: int, retained_from: Mapping[str, int] | None = None
+) -> list[tuple[Granularity, int, int]]:
+    """Cover ``[start_ms, end_ms)`` with the coarsest aligned buckets.
+
+    The range is widened to whole minutes. Whole days come from the day
+    rollup, the remaining whole hours from the hour rollup and the edges
+    from the minute rollup.
+
+    Args:
+        start_ms: Range start (inclusive) in epoch milliseconds.
+        end_ms: Range end (exclusive) in epoch milliseconds.
+        retained_from: Earliest bucket kept per granularity name, for
+            granularities with a retention (see ``RollupService.retained_from``).
+
+    Returns:
+        list[tuple[Granularity, int, int]]: Non-overlapping segments in time order.
+
+    Raises:
+        ValueError: If a segment needs rollups that retention has pruned.
+    """
+    segments: list[tuple[Granularity, int, int]] = []
+
+    def cover(low: int, high: int, level: int) -> None:
+        if low >= high:
+            return
+        granularity = GRANULARITIES[level]
+        if level == 0:
+            segments.append((granularity, low, high))
+            return
+        first = -(-low // granularity.ms) * granularity.ms
+        last = high // granularity.ms * granularity.ms
+        if first >= last:
+            cover(low, high, level - 1)
+            return
+        cover(low, first, level - 1)
+        segments.append((granularity, first, last))
+        cover(last, high, level - 1)
+
+    start = start_ms // MINUTE_MS * MINUTE_MS
+    end = -(-end_ms // MINUTE_MS) * MINUTE_MS
+    cover(start, end, len(GRANULARITIES) - 1)
+    for granularity, low, _ in segments:
+        check_retained(granularity, low, retained_from)
+    return segments
+
+
+def check_retained(granularity: Granularity, low: int, retained_from: Mapping[str, int] | None) -> None:
+    """Refuse to read rollups from before their retention horizon, which would undercount.
+
+    Args:
+        granularity: Granularity to be read.
+        low: Earliest bucket start to be read.
+        retained_from: Earliest bucket kept per granularity name.
+
+    Raises:
+        ValueError: If buckets from ``low`` on may have been pruned.
+    """
+    horizon = (retained_from or {}).get(granularity.name)
+    if horizon is not None and low < horizon:
+        since = datetime.fromtimestamp(horizon / 1000, UTC).isoformat(timespec="minutes")
+        raise ValueError(
+            f"Range needs {granularity.name} rollups from before {since}, which retention has pruned; "
+            "use a coarser granularity or a more recent range"
+        )
+
+
+class RollupService:
+    """Maintains rollup tables and answers aggregate queries from them."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 10_000,
+        interval: float = 5.0,
+        retention_days: dict[str, float] | None = None,
+        event_retention_days: float = 0,
+        retention_interval: float = 3600.0,
+        distinct_precision: int = 14,
+        digest_compression: float = 100.0,
+    ) -> None:
+        """Initialize the service; the scheduler runs after ``start``.
+
+        Args:
+            session_factory: Factory for database sessions; must not expire
+                objects on commit.
+            batch_size: Events folded per transaction.
+            interval: Seconds between scheduled catch-ups.
+            retention_days: Days to keep per granularity name; 0 or missing
+                keeps rows forever.
+            event_retention_days: Days to keep raw events already rolled up;
+                0 keeps them forever.
+            retention_interval: Seconds between retention runs.
+            distinct_precision: HyperLogLog precision of new distinct-user
+                sketches (see ``precision_for_error``).
+            digest_compression: t-digest compression of value digests.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retention_days = retention_days or {}
+        self.event_retention_days = event_retention_days
+        self.retention_interval = retention_interval
+        self.distinct_precision = distinct_precision
+        self.digest_compression = digest_compression
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._horizon = 0
+
+    async def start(self) -> None:
+        """Start the background catch-up and retention loop."""
+        self._task = asyncio.create_task(self._run(), name="rollup-scheduler")
+
+    async def stop(self) -> None:
+        """Stop the background loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        """Signal that new events were written; catch-up runs promptly.
+
+        Notifications arriving while a catch-up runs are coalesced.
+        """
+        self._wakeup.set()
+
+    def retained_from(self, now: int | None = None) -> dict[str, int]:
+        """Get the earliest bucket start kept per granularity with a retention.
+
+        Queries reading buckets before it fail instead of silently counting
+        pruned buckets as empty.
+
+        Args:
+            now: Current time in epoch milliseconds (default: wall clock).
+
+        Returns:
+            dict[str, int]: Horizon in epoch milliseconds by granularity name.
+        """
+        now = now_ms() if now is None else now
+        return {name: int(now - days * DAY_MS) for name, days in self.retention_days.items() if days}
+
+    async def catch_up(self) -> int:
+        """Fold the next batch of events after the watermark into the rollups.
+
+        Returns:
+            int: Number of events folded (0 when up to date or another process
+            advanced the watermark concurrently).
+        """
+        async with self._lock, self.session_factory() as session:
+            watermark = await self._watermark(session)
+            horizon = await self._read_horizon(session)
+            rows = (
+                await session.execute(
+                    select(Event.id, Event.ts, Event.name, Event.value, Event.user_id)
+                    .where(Event.id > watermark, Event.id <= horizon)
+                    .order_by(Event.id)
+                    .limit(self.batch_size)
+                )
+            ).all()
+            if not rows:
+                return 0
+
+            for granularity, aggregates in _aggregate(rows).items():
+                await self._merge(session, granularity, aggregates)
+            for granularity, sketches in _sketch(rows, self.distinct_precision).items():
+                await self._merge_sketches(session, granularity.sketch_model, HyperLogLog, sketches)
+            for granularity, digests in _digest(rows, self.digest_compression).items():
+                await self._merge_sketches(session, granularity.digest_model, TDigest, digests)
+
+            advanced = cast(
+                CursorResult[Any],
+                await session.execute(
+                    update(RollupWatermark)
+                    .where(RollupWatermark.key == WATERMARK_KEY, RollupWatermark.last_event_id == watermark)
+                    .values(last_event_id=rows[-1].id, updated_at=datetime.utcnow())
+                ),
+            )
+            if advanced.rowcount != 1:
+                await session.rollback()
+                return 0
+            await session.commit()
+            return len(rows)
+
+    async def catch_up_all(self) -> int:
+        """Fold all pending events.
+
+        Returns:
+            int: Number of events folded.
+        """
+        total = 0
+        while (folded := await self.catch_up()) > 0:
+            total += folded
+            if folded < self.batch_size:
+                break
+        return total
+
+    async def apply_retention(self, now: int | None = None) -> dict[str, int]:
+        """Delete rollup rows and rolled-up raw events past their retention.
+
+        Args:
+            now: Current time in epoch milliseconds (default: wall clock).
+
+        Returns:
+            dict[str, int]: Deleted row counts per granularity and "events".
+        """
+        now = now_ms() if now is None else now
+        deleted: dict[str, int] = {}
+        async with self.session_factory() as session:
+            for granularity in GRANULARITIES:
+                days = self.retention_days.get(granularity.name)
+                if days:
+                    model = granularity.model
+                    expired = delete(model).where(model.bucket < now - days * DAY_MS)
+                    deleted[granularity.name] = cast(CursorResult[Any], await session.execute(expired)).rowcount
+                    for sketch_model in granularity.sketch_models:
+                        await session.execute(delete(sketch_model).where(sketch_model.bucket < now - days * DAY_MS))
+            if self.event_retention_days:
+                watermark = await self._watermark(session)
+                rolled_up = delete(Event).where(
+                    Event.ts < now - self.event_retention_days * DAY_MS,
+                    Event.id <= watermark,
+                )
+                deleted["events"] = cast(CursorResult[Any], await session.execute(rolled_up)).rowcount
+            await session.commit()
+        return deleted
+
+    async def totals(self, start_ms: int, end_ms: int, names: Iterable[str] | None = None) -> dict[str, Aggregate]:
+        """Aggregate events per name over a range.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            names: Event names to include (default: all).
+
+        Returns:
+            dict[str, Aggregate]: Aggregate per event name.
+
+        Raises:
+            ValueError: If the range needs rollups that retention has pruned.
+        """
+        names = list(names) if names is not None else None
+        totals: dict[str, Aggregate] = {}
+        async with self.session_factory() as session:
+            for granularity, low, high in plan_range(start_ms, end_ms, self.retained_from()):
+                for row in await self._read(session, granularity, low, high, names):
+                    totals.setdefault(row.name, Aggregate()).merge(Aggregate.from_row(row))
+        return totals
+
+    async def series(
+        self,
+        start_ms: int,
+        end_ms: int,
+        step_ms: int,
+        names: Iterable[str] | None = None,
+        origin_ms: int = 0,
+    ) -> dict[str, dict[int, Aggregate]]:
+        """Aggregate events per name and step-aligned bucket.
+
+        Buckets start at ``origin_ms`` plus multiples of ``step_ms``; the
+        range is widened to whole steps. Rollup rows are bucketed by the
+        database (``GROUP BY``), so only one row per name and step is read.
+        Buckets without events are omitted.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            step_ms: Bucket width; a multiple of one minute.
+            names: Event names to include (default: all).
+            origin_ms: Alignment of the buckets, e.g. a Monday for weeks; a
+                multiple of the granularity read.
+
+        Returns:
+            dict[str, dict[int, Aggregate]]: Per name, aggregates by bucket start.
+
+        Raises:
+            ValueError: If the step is not a positive multiple of one minute,
+                the origin is not aligned to the granularity read or the range
+                starts before that granularity's retention horizon.
+        """
+        granularity = granularity_for_step(step_ms)
+        if origin_ms % granularity.ms:
+            raise ValueError(f"Origin must be aligned to whole {granularity.name}s")
+        low = origin_ms + (start_ms - origin_ms) // step_ms * step_ms
+        high = origin_ms - (-(end_ms - origin_ms) // step_ms) * step_ms
+        check_retained(granularity, low, self.retained_from())
+
+        model = granularity.model
+        index = ((model.bucket - low) // step_ms).label("index")
+        stmt = (
+            select(
+                model.name, index, func.sum(model.count), func.sum(model.sum), func.min(model.min), func.max(model.max)
+            )
+            .where(model.bucket >= low, model.bucket < high)
+            .group_by(model.name, index)
+        )
+        if names is not None:
+            stmt = stmt.where(model.name.in_(list(names)))
+
+        series: dict[str, dict[int, Aggregate]] = {}
+        async with self.session_factory() as session:
+            for name, bucket_index, count, total, minimum, maximum in await session.execute(stmt):
+                series.setdefault(name, {})[low + bucket_index * step_ms] = Aggregate(count, total, minimum, maximum)
+        return series
+
+    async def distinct(
+        self,
+        start_ms: int,
+        end_ms: int,
+        names: Iterable[str] | None = None,
+    ) -> dict[str, HyperLogLog]:
+        """Union the distinct-user sketches per name over a range.
+
+        The range is covered like ``totals``, so the work depends on the
+        number of days, not on the number of events or users, and memory
+        stays at one sketch per name.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            names: Event names to include, ``ALL_EVENTS`` for users of any
+                event (default: all).
+
+        Returns:
+            dict[str, HyperLogLog]: Sketch per name; names without users are omitted.
+
+        Raises:
+            ValueError: If the range needs rollups that retention has pruned.
+        """
+        return await self._union_range("sketch_model", HyperLogLog, start_ms, end_ms, names)
+
+    async def distinct_series(
+        self,
+        start_ms: int,
+        end_ms: int,
+        step_ms: int,
+        names: Iterable[str] | None = None,
+        origin_ms: int = 0,
+    ) -> dict[str, dict[int, HyperLogLog]]:
+        """Union the distinct-user sketches per name and step-aligned bucket.
+
+        Buckets are aligned as in ``series``; buckets without users are omitted.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            step_ms: Bucket width; a multiple of one minute.
+            names: Event names to include, ``ALL_EVENTS`` for users of any event.
+            origin_ms: Alignment of the buckets; a multiple of the granularity read.
+
+        Returns:
+            dict[str, dict[int, HyperLogLog]]: Per name, sketches by bucket start.
+
+        Raises:
+            ValueError: If the step, origin or range are invalid as in ``series``.
+        """
+        return await self._union_series("sketch_model", HyperLogLog, start_ms, end_ms, step_ms, names, origin_ms)
+
+    async def digests(
+        self,
+        start_ms: int,
+        end_ms: int,
+        names: Iterable[str] | None = None,
+    ) -> dict[str, TDigest]:
+        """Merge the value digests per name over a range, for quantiles.
+
+        Like ``distinct``, the work depends on the number of buckets covering
+        the range and memory stays at one digest per name.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            names: Event names to include (default: all).
+
+        Returns:
+            dict[str, TDigest]: Digest per name; names without events are omitted.
+
+        Raises:
+            ValueError: If the range needs rollups that retention has pruned.
+        """
+        return await self._union_range("digest_model", TDigest, start_ms, end_ms, names)
+
+    async def digest_series(
+        self,
+        start_ms: int,
+        end_ms: int,
+        step_ms: int,
+        names: Iterable[str] | None = None,
+        origin_ms: int = 0,
+    ) -> dict[str, dict[int, TDigest]]:
+        """Merge the value digests per name and step-aligned bucket.
+
+        Buckets are aligned as in ``series``; buckets without events are omitted.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            step_ms: Bucket width; a multiple of one minute.
+            names: Event names to include (default: all).
+            origin_ms: Alignment of the buckets; a multiple of the granularity read.
+
+        Returns:
+            dict[str, dict[int, TDigest]]: Per name, digests by bucket start.
+
+        Raises:
+            ValueError: If the step, origin or range are invalid as in ``series``.
+        """
+        return await self._union_series("digest_model", TDigest, start_ms, end_ms, step_ms, names, origin_ms)
+
+    async def _union_range(
+        self,
+        table: str,
+        sketch_type: type[Any],
+        start_ms: int,
+        end_ms: int,
+        names: Iterable[str] | None,
+    ) -> dict[str, Any]:
+        """Merge the sketches of a ``Granularity`` table attribute per name over a range."""
+        names = list(names) if names is not None else None
+        sketches: dict[str, Any] = {}
+        async with self.session_factory() as session:
+            for granularity, low, high in plan_range(start_ms, end_ms, self.retained_from()):
+                model = getattr(granularity, table)
+                async for name, data in await self._stream_sketches(session, model, low, high, names):
+                    _union_into(sketches, name, sketch_type.from_bytes(data))
+        return sketches
+
+    async def _union_series(
+        self,
+        table: str,
+        sketch_type: type[Any],
+        start_ms: int,
+        end_ms: int,
+        step_ms: int,
+        names: Iterable[str] | None,
+        origin_ms: int,
+    ) -> dict[str, dict[int, Any]]:
+        """Merge the sketches of a ``Granularity`` table attribute per name and bucket."""
+        granularity = granularity_for_step(step_ms)
+        if origin_ms % granularity.ms:
+            raise ValueError(f"Origin must be aligned to whole {granularity.name}s")
+        low = origin_ms + (start_ms - origin_ms) // step_ms * step_ms
+        high = origin_ms - (-(end_ms - origin_ms) // step_ms) * step_ms
+        check_retained(granularity, low, self.retained_from())
+        names = list(names) if names is not None else None
+
+        series: dict[str, dict[int, Any]] = {}
+        async with self.session_factory() as session:
+            model = getattr(granularity, table)
+            result = await self._stream_sketches(session, model, low, high, names, with_bucket=True)
+            async for name, bucket, data in result:
+                start = low + (bucket - low) // step_ms * step_ms
+                _union_into(series.setdefault(name, {}), start, sketch_type.from_bytes(data))
+        return series
+
+    async def _stream_sketches(
+        self,
+        session: AsyncSession,
+        model: type[UserSketchMixin] | type[ValueDigestMixin],
+        low: int,
+        high: int,
+        names: list[str] | None,
+        with_bucket: bool = False,
+    ) -> Any:
+        """Stream sketch rows of one table within ``[low, high)``."""
+        columns = (model.name, model.bucket, model.sketch) if with_bucket else (model.name, model.sketch)
+        stmt = select(*columns).where(model.bucket >= low, model.bucket < high)
+        if names is not None:
+            stmt = stmt.where(model.name.in_(names))
+        return await session.stream(stmt)
+
+    async def _read(
+        self,
+        session: AsyncSession,
+        granularity: Granularity,
+        low: int,
+        high: int,
+        names: list[str] | None,
+    ) -> Sequence[RollupMixin]:
+        """Read rollup rows of one granularity within ``[low, high)``."""
+        model = granularity.model
+        stmt = select(model).where(model.bucket >= low, model.bucket < high)
+        if names is not None:
+            stmt = stmt.where(model.name.in_(names))
+        return (await session.scalars(stmt)).all()
+
+    async def _watermark(self, session: AsyncSession) -> int:
+        """Get the watermark, creating it on first use."""
+        row = await session.get(RollupWatermark, WATERMARK_KEY)
+        if row is None:
+            session.add(RollupWatermark(key=WATERMARK_KEY, last_event_id=0, updated_at=datetime.utcnow()))
+            await session.flush()
+            return 0
+        return row.last_event_id
+
+    async def _read_horizon(self, session: AsyncSession) -> int:
+        """Get the highest event id that is safe to fold.
+
+        With concurrent writers (e.g. PostgreSQL) ids are allocated before
+        commit, so a lower id can become visible after a higher one. Folding
+        only up to the highest id seen on the previous run gives such
+        transactions one interval to commit. SQLite serializes writers, so
+        everything visible is safe there.
+        """
+        max_id = await session.scalar(select(func.max(Event.id))) or 0
+        if session.get_bind().dialect.name == "sqlite":
+            return max_id
+        horizon, self._horizon = self._horizon, max_id
+        return horizon
+
+    async def _merge(
+        self,
+        session: AsyncSession,
+        granularity: Granularity,
+        aggregates: dict[tuple[str, int], Aggregate],
+    ) -> None:
+        """Merge batch aggregates into existing rollup rows of one granularity."""
+        model = granularity.model
+        keys = list(aggregates)
+        for index in range(0, len(keys), _KEY_CHUNK):
+            chunk = keys[index : index + _KEY_CHUNK]
+            existing = await session.scalars(select(model).where(tuple_(model.name, model.bucket).in_(chunk)))
+            for row in existing:
+                merged = Aggregate.from_row(row)
+                merged.merge(aggregates.pop((row.name, row.bucket)))
+                merged.apply_to(row)
+        for (name, bucket), aggregate in aggregates.items():
+            row = model()
+            row.name, row.bucket = name, bucket
+            aggregate.apply_to(row)
+            session.add(row)
+        await session.flush()
+
+    async def _merge_sketches(
+        self,
+        session: AsyncSession,
+        model: type[UserSketchMixin] | type[ValueDigestMixin],
+        sketch_type: type[HyperLogLog] | type[TDigest],
+        sketches: dict[tuple[str, int], Any],
+    ) -> None:
+        """Merge batch sketches into existing rows of a sketch table.
+
+        Sketch rows are read and written as plain column values in bulk; they
+        are never needed as ORM objects.
+        """
+        keys = list(sketches)
+        updates = []
+        for index in range(0, len(keys), _KEY_CHUNK):
+            chunk = keys[index : index + _KEY_CHUNK]
+            existing = await session.execute(
+                select(model.name, model.bucket, model.sketch).where(tuple_(model.name, model.bucket).in_(chunk))
+            )
+            for name, bucket, data in existing:
+                merged = sketch_type.from_bytes(data)
+                merged.merge(sketches.pop((name, bucket)))
+                updates.append({"name": name, "bucket": bucket, "sketch": merged.to_bytes()})
+        if updates:
+            await session.execute(update(model), updates)
+        if sketches:
+            rows = [{"name": key[0], "bucket": key[1], "sketch": sketch.to_bytes()} for key, sketch in sketches.items()]
+            await session.execute(insert(model), rows)
+
+    async def _run(self) -> None:
+        """Catch up on notification or every ``interval``; apply retention periodically."""
+        last_retention = 0.0
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            self._wakeup.clear()
+            try:
+                await self.catch_up_all()
+                if time.monotonic() - last_retention >= self.retention_interval:
+                    await self.apply_retention()
+                    last_retention = time.monotonic()
+            except Exception:
+                logger.exception("Rollup maintenance failed; retrying in %.0fs", self.interval)
+
+
+def _aggregate(rows: Sequence[Any]) -> dict[Granularity, dict[tuple[str, int], Aggregate]]:
+    """Aggregate event rows per granularity, name and bucket."""
+    finest, *coarser = GRANULARITIES
+    minutes: dict[tuple[str, int], Aggregate] = {}
+    for row in rows:
+        key = (row.name, row.ts - row.ts % finest.ms)
+        aggregate = minutes.get(key)
+        if aggregate is None:
+            aggregate = minutes[key] = Aggregate()
+        aggregate.add(row.value)
+
+    result = {finest: minutes}
+    for granularity in coarser:
+        buckets: dict[tuple[str, int], Aggregate] = {}
+        for (name, bucket), aggregate in minutes.items():
+            buckets.setdefault((name, bucket - bucket % granularity.ms), Aggregate()).merge(aggregate)
+        result[granularity] = buckets
+    return result
+
+
+def _sketch(rows: Sequence[Any], precision: int) -> dict[Granularity, dict[tuple[str, int], HyperLogLog]]:
+    """Build distinct-user sketches per granularity, name and bucket.
+
+    Each user also goes into the ``ALL_EVENTS`` sketch of its bucket.
+    """
+    users = [row for row in rows if row.user_id is not None]
+    if not users:
+        return {}
+    hashes = np.fromiter((hash64(row.user_id) for row in users), dtype=np.uint64, count=len(users))
+    result: dict[Granularity, dict[tuple[str, int], HyperLogLog]] = {}
+    for granularity in GRANULARITIES:
+        positions: dict[tuple[str, int], list[int]] = {}
+        for position, row in enumerate(users):
+            bucket = row.ts - row.ts % granularity.ms
+            positions.setdefault((row.name, bucket), []).append(position)
+            positions.setdefault((ALL_EVENTS, bucket), []).append(position)
+        sketches = result[granularity] = {}
+        for key, members in positions.items():
+            sketch = sketches[key] = HyperLogLog(precision)
+            sketch.add_hashes(hashes[members])
+    return result
+
+
+def _digest(rows: Sequence[Any], compression: float) -> dict[Granularity, dict[tuple[str, int], TDigest]]:
+    """Build value digests per granularity, name and bucket."""
+    values = np.fromiter((row.value for row in rows), dtype=np.float64, count=len(rows))
+    result: dict[Granularity, dict[tuple[str, int], TDigest]] = {}
+    for granularity in GRANULARITIES:
+        positions: dict[tuple[str, int], list[int]] = {}
+        for position, row in enumerate(rows):
+            positions.setdefault((row.name, row.ts - row.ts % granularity.ms), []).append(position)
+        digests = result[granularity] = {}
+        for key, members in positions.items():
+            digest = digests[key] = TDigest(compression)
+            digest.add_many(values[members])
+    return result
+
+
+def _union_into(sketches: dict[Any, Any], key: Any, sketch: Any) -> None:
+    """Merge a sketch into ``sketches[key]``, taking ownership when the key is new."""
+    existing = sketches.get(key)
+    if existing is None:
+        sketches[key] = sketch
+    else:
+        existing.merge(sketch)
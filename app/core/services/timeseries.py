@@ -0,0 +1,253 @@
+"""Dense, gap-filled time series of event metrics.
+
+A metric is an event name with an optional aggregate, ``"<event>[:<aggregate>]"``
+(``count`` by default; ``sum``, ``min``, ``max``, ``mean``, ``distinct``
+users, or a percentile of the values such as ``p95``; ``*:distinct`` counts
+users of any event). Series are bucketed on the
+server, by the rollup tables (SQL ``GROUP BY``) or the columnar event store
+(NumPy), and returned as one array per metric aligned to a shared list of
+bucket start times, so the response size depends only on the number of
+buckets.
+
+Distinct counts and percentiles are estimated from the rollup sketches
+(HyperLogLog and t-digest): per bucket, and for the whole range from the
+union of the sketches, never by combining per-bucket results. The relative
+standard error of distinct counts is reported with them.
+
+Each request is answered from a single source, so all of its metrics cover
+the same events: the event store is only used when every metric is a plain
+value aggregate and the range starts at or after the store's
+``covered_from`` (the store lacks events from before it was enabled, CSV
+imports and ranges dropped by its retention); otherwise the rollups answer.
+"""
+
+import asyncio
+import numpy as np
+import re
+from app.core.services.rollups import DAY_MS, HOUR_MS, MINUTE_MS, Aggregate, RollupService
+from app.core.sketches import HyperLogLog
+from app.database.columnar import EventStore
+from dataclasses import dataclass, field
+from typing import Any
+
+WEEK_MS = 7 * DAY_MS
+# 1970-01-05T00:00:00Z, the first Monday after the epoch; weeks start on Mondays.
+WEEK_ORIGIN_MS = 4 * DAY_MS
+
+GRANULARITY_STEPS: dict[str, int] = {"minute": MINUTE_MS, "hour": HOUR_MS, "day": DAY_MS, "week": WEEK_MS}
+AGGREGATES = ("count", "sum", "min", "max", "mean", "distinct")
+# Percentile aggregates: "p50", "p95", "p99.9", ...
+PERCENTILE = re.compile(r"p(\d{1,2}(?:\.\d+)?)")
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """A requested metric: an aggregate of one event name."""
+
+    event: str
+    aggregate: str = "count"
+
+    @property
+    def key(self) -> str:
+        """Canonical metric name used in responses."""
+        return f"{self.event}:{self.aggregate}"
+
+    @property
+    def quantile(self) -> float | None:
+        """Quantile of a percentile aggregate (0.95 for "p95"), else None."""
+        match = PERCENTILE.fullmatch(self.aggregate)
+        return float(match.group(1)) / 100 if match else None
+
+
+@dataclass
+class DenseSeries:
+    """Metric values per bucket; gaps hold 0 for count/sum/distinct and NaN otherwise."""
+
+    step_ms: int
+    timestamps: np.ndarray
+    values: dict[str, np.ndarray] = field(default_factory=dict)
+    totals: dict[str, float | None] = field(default_factory=dict)
+    errors: dict[str, float] = field(default_factory=dict)
+    source: str = "rollups"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON-serializable lists (NaN becomes None).
+
+        Returns:
+            dict[str, Any]: ``timestamps``, plus ``series``, ``totals`` and
+            ``errors`` (relative standard error of distinct counts) by metric key.
+        """
+        series = {}
+        for key, values in self.values.items():
+            gaps = np.isnan(values)
+            if gaps.any():
+                values = values.astype(object)
+                values[gaps] = None
+            series[key] = values.tolist()
+        return {
+            "timestamps": self.timestamps.tolist(),
+            "series": series,
+            "totals": self.totals,
+            "errors": self.errors,
+        }
+
+
+def parse_metric(spec: str) -> MetricSpec:
+    """Parse ``"<event>[:<aggregate>]"``.
+
+    Args:
+        spec: Metric specification.
+
+    Returns:
+        MetricSpec: Parsed metric.
+
+    Raises:
+        ValueError: If the event name is empty or the aggregate is unknown.
+    """
+    event, separator, aggregate = spec.strip().rpartition(":")
+    if not separator:
+        event, aggregate = aggregate, "count"
+    if not event:
+        raise ValueError(f"Metric {spec!r} has no event name")
+    if aggregate not in AGGREGATES and not PERCENTILE.fullmatch(aggregate):
+        raise ValueError(
+            f"Unknown aggregate {aggregate!r} in metric {spec!r} (expected {', '.join(AGGREGATES)} or p<percentile>)"
+        )
+    return MetricSpec(event, aggregate)
+
+
+def bucket_range(start_ms: int, end_ms: int, granularity: str) -> tuple[int, int, int, int]:
+    """Align a range to whole buckets of a granularity.
+
+    Args:
+        start_ms: Range start (inclusive) in epoch milliseconds.
+        end_ms: Range end (exclusive) in epoch milliseconds.
+        granularity: "minute", "hour", "day" or "week" (weeks start on Monday).
+
+    Returns:
+        tuple[int, int, int, int]: Step, origin, first bucket start and number
+        of buckets.
+
+    Raises:
+        ValueError: If the granularity is unknown or the range is empty.
+    """
+    if granularity not in GRANULARITY_STEPS:
+        raise ValueError(f"Unknown granularity {granularity!r}")
+    if end_ms <= start_ms:
+        raise ValueError("Range end must be after its start")
+    step = GRANULARITY_STEPS[granularity]
+    origin = WEEK_ORIGIN_MS if granularity == "week" else 0
+    low = origin + (start_ms - origin) // step * step
+    count = -(-(end_ms - low) // step)
+    return step, origin, low, count
+
+
+async def query_series(
+    rollups: RollupService,
+    start_ms: int,
+    end_ms: int,
+    granularity: str,
+    metrics: list[MetricSpec],
+    event_store: EventStore | None = None,
+    max_buckets: int = 5000,
+) -> DenseSeries:
+    """Compute dense series and range totals of metrics.
+
+    Args:
+        rollups: Rollup service, used when no event store is given.
+        start_ms: Range start (inclusive) in epoch milliseconds.
+        end_ms: Range end (exclusive) in epoch milliseconds.
+        granularity: Bucket granularity (see ``GRANULARITY_STEPS``).
+        metrics: Metrics to compute.
+        event_store: Columnar store to aggregate instead of the rollups, when
+            it covers the range and all metrics are value aggregates.
+        max_buckets: Maximum number of buckets.
+
+    Returns:
+        DenseSeries: One value per bucket and metric, plus totals and the
+        source that answered.
+
+    Raises:
+        ValueError: For an invalid range or granularity, or too many buckets.
+    """
+    step, origin, low, count = bucket_range(start_ms, end_ms, granularity)
+    if count > max_buckets:
+        raise ValueError(f"Range spans {count} {granularity} buckets; at most {max_buckets} are allowed")
+    high = low + count * step
+    distinct = [metric for metric in metrics if metric.aggregate == "distinct"]
+    quantiles = [metric for metric in metrics if metric.quantile is not None]
+    values = [metric for metric in metrics if metric not in distinct and metric not in quantiles]
+    # One source per request, so all metrics cover the same events.
+    if distinct or quantiles or (event_store is not None and low < event_store.covered_from):
+        event_store = None
+    series = DenseSeries(
+        step_ms=step,
+        timestamps=low + step * np.arange(count, dtype=np.int64),
+        source="rollups" if event_store is None else "event_store",
+    )
+
+    if values:
+        names = sorted({metric.event for metric in values})
+        if event_store is not None:
+            grouped = await asyncio.to_thread(event_store.aggregate, low, high, step, names, origin)
+            buckets: dict[str, dict[int, Aggregate]] = {}
+            for record in grouped.to_records():
+                buckets.setdefault(record["name"], {})[record["bucket"]] = Aggregate(
+                    record["count"], record["sum"], record["min"], record["max"]
+                )
+        else:
+            buckets = await rollups.series(low, high, step, names, origin_ms=origin)
+
+        for metric in values:
+            by_bucket = buckets.get(metric.event, {})
+            overall = Aggregate()
+            for aggregate in by_bucket.values():
+                overall.merge(aggregate)
+            series.values[metric.key] = _dense(
+                by_bucket, low, step, count, metric, lambda aggregate, name=metric.aggregate: getattr(aggregate, name)
+            )
+            series.totals[metric.key] = getattr(overall, metric.aggregate)
+
+    if distinct:
+        names = sorted({metric.event for metric in distinct})
+        sketches = await rollups.distinct_series(low, high, step, names, origin_ms=origin)
+        unions = await rollups.distinct(low, high, names)
+        for metric in distinct:
+            union = unions.get(metric.event) or HyperLogLog(rollups.distinct_precision)
+            series.values[metric.key] = _dense(
+                sketches.get(metric.event, {}), low, step, count, metric, HyperLogLog.estimate
+            )
+            series.totals[metric.key] = round(union.estimate())
+            series.errors[metric.key] = union.relative_error
+
+    if quantiles:
+        names = sorted({metric.event for metric in quantiles})
+        digests = await rollups.digest_series(low, high, step, names, origin_ms=origin)
+        merged = await rollups.digests(low, high, names)
+        for metric in quantiles:
+            quantile = metric.quantile
+            assert quantile is not None
+            series.values[metric.key] = _dense(
+                digests.get(metric.event, {}), low, step, count, metric, lambda digest, q=quantile: digest.quantile(q)
+            )
+            digest = merged.get(metric.event)
+            series.totals[metric.key] = digest.quantile(quantile) if digest is not None else None
+    return series
+
+
+def _dense(
+    by_bucket: dict[int, Any],
+    low: int,
+    step: int,
+    count: int,
+    metric: MetricSpec,
+    value: Any,
+) -> np.ndarray:
+    """Spread per-bucket values over a gap-filled array."""
+    values = np.zeros(count) if metric.aggregate in ("count", "sum", "distinct") else np.full(count, np.nan)
+    if by_bucket:
+        index = (np.fromiter(by_bucket, dtype=np.int64, count=len(by_bucket)) - low) // step
+        values[index] = [value(item) for item in by_bucket.values()]
+    if metric.aggregate == "distinct":
+        values = np.round(values)
+    return values
@@ -0,0 +1,403 @@
+"""Resumable file uploads streamed to disk with incremental hashing.
+
+An upload is created with its final size (and optionally the expected
+SHA-256), then its bytes are sent in one or more requests, each starting at
+the current offset. Request bodies are streamed straight to a file with
+``aiofiles`` in ``chunk_size`` pieces while a SHA-256 is updated alongside,
+so memory use is constant whatever the file size; bytes beyond the declared
+size are rejected as soon as they arrive.
+
+Each upload is two files in ``directory``: ``<id>.data`` with the bytes
+received so far (its length is the offset, so an interrupted request can be
+resumed from whatever reached the disk) and ``<id>.json`` with the metadata.
+The running hash lives in memory; after a restart, or when a write failed
+part-way, it is rebuilt by re-reading the partial file once.
+
+Only one request writes to an upload at a time, across all worker processes:
+a write holds an exclusive ``flock`` on ``<id>.lock`` and a concurrent one is
+rejected. ``sweep`` deletes uploads nobody has written to for a while, so
+abandoned uploads do not fill the disk.
+"""
+
+import aiofiles
+import aiofiles.os
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+if sys.platform != "win32":
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class UploadError(Exception):
+    """Base class for upload errors."""
+
+
+class UploadNotFoundError(UploadError):
+    """Raised for unknown upload ids."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds the size limit or its declared size."""
+
+
+class UploadConflictError(UploadError):
+    """Raised when data is sent at the wrong offset, to a complete upload, or concurrently."""
+
+    def __init__(self, message: str, offset: int) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Error message.
+            offset: Current offset of the upload, to resume from.
+        """
+        super().__init__(message)
+        self.offset = offset
+
+
+class UploadChecksumError(UploadError):
+    """Raised when a complete upload does not match its expected SHA-256; the upload is deleted."""
+
+
+@dataclass
+class UploadInfo:
+    """State of an upload."""
+
+    id: str
+    filename: str
+    size: int
+    offset: int
+    created_at: datetime
+    expected_sha256: str | None = None
+    sha256: str | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Whether all bytes have been received and verified."""
+        return self.sha256 is not None
+
+
+class UploadManager:
+    """Stores resumable uploads in a directory."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = 10 * 1024**3, chunk_size: int = 1024**2) -> None:
+        """Initialize the manager.
+
+        Args:
+            directory: Directory for upload data and metadata (created if missing).
+            max_bytes: Maximum size of one upload.
+            chunk_size: Bytes buffered before each write to disk.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._hashers: dict[str, tuple[int, Any]] = {}
+
+    async def create(self, filename: str, size: int, sha256: str | None = None) -> UploadInfo:
+        """Start an upload.
+
+        Args:
+            filename: Original file name (informational).
+            size: Total size in bytes.
+            sha256: Expected SHA-256 (hex), checked once all bytes arrived.
+
+        Returns:
+            UploadInfo: The new, empty upload.
+
+        Raises:
+            UploadTooLargeError: If ``size`` exceeds ``max_bytes``.
+        """
+        if size > self.max_bytes:
+            raise UploadTooLargeError(f"Upload size exceeds {self.max_bytes} bytes")
+        await aiofiles.os.makedirs(self.directory, exist_ok=True)
+        info = UploadInfo(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            size=size,
+            offset=0,
+            created_at=datetime.now(UTC),
+            expected_sha256=sha256.lower() if sha256 else None,
+        )
+        if size == 0:
+            info.sha256 = hashlib.sha256().hexdigest()
+            self._check_digest(info)
+        async with aiofiles.open(self._data_path(info.id), "wb"):
+            pass
+        await self._save(info)
+        return info
+
+    async def get(self, upload_id: str) -> UploadInfo:
+        """Get the state of an upload.
+
+        Args:
+            upload_id: Upload identifier.
+
+        Returns:
+            UploadInfo: Current state; ``offset`` is where to resume.
+
+        Raises:
+            UploadNotFoundError: If the upload does not exist.
+        """
+        if not _UPLOAD_ID.fullmatch(upload_id):
+            raise UploadNotFoundError("Upload not found")
+        try:
+            async with aiofiles.open(self._meta_path(upload_id)) as file:
+                meta = json.loads(await file.read())
+            stat = await aiofiles.os.stat(self._data_path(upload_id))
+        except FileNotFoundError as e:
+            raise UploadNotFoundError("Upload not found") from e
+        meta["created_at"] = datetime.fromisoformat(meta["created_at"])
+        return UploadInfo(**meta, offset=stat.st_size)
+
+    async def write(
+        self, upload_id: str, offset: int, chunks: AsyncIterable[bytes], length: int | None = None
+    ) -> UploadInfo:
+        """Append streamed bytes to an upload.
+
+        Bytes are written as they arrive; if the stream fails part-way, the
+        bytes already on disk count and the upload can be resumed from the
+        returned (or ``get``) offset.
+
+        Args:
+            upload_id: Upload identifier.
+            offset: Offset the data starts at; must equal the current offset.
+            chunks: Request body chunks.
+            length: Declared body length, checked before reading.
+
+        Returns:
+            UploadInfo: State after the write, with ``sha256`` once complete.
+
+        Raises:
+            UploadNotFoundError: If the upload does not exist.
+            UploadConflictError: If the offset is wrong, the upload is
+                complete, or another request is writing to it.
+            UploadTooLargeError: If the data goes past the declared size.
+            UploadChecksumError: If the complete file does not match the
+                expected SHA-256.
+        """
+        info = await self.get(upload_id)
+        with self._lock(upload_id) as acquired:
+            if not acquired:
+                raise UploadConflictError("Upload is being written by another request", info.offset)
+            # Re-read under the lock: another process may have written or deleted it meanwhile.
+            return await self._write(await self.get(upload_id), offset, chunks, length)
+
+    async def _write(
+        self, info: UploadInfo, offset: int, chunks: AsyncIterable[bytes], length: int | None
+    ) -> UploadInfo:
+        """Append streamed bytes to an upload while holding its lock."""
+        upload_id = info.id
+        if info.complete:
+            raise UploadConflictError("Upload is already complete", info.offset)
+        if offset != info.offset:
+            raise UploadConflictError(f"Upload continues at offset {info.offset}", info.offset)
+        if length is not None and offset + length > info.size:
+            raise UploadTooLargeError(f"Data exceeds the upload size of {info.size} bytes")
+
+        hasher = await self._hasher(upload_id, offset)
+        async with aiofiles.open(self._data_path(upload_id), "ab") as file:
+            buffer = bytearray()
+            async for data in chunks:
+                if info.offset + len(buffer) + len(data) > info.size:
+                    raise UploadTooLargeError(f"Data exceeds the upload size of {info.size} bytes")
+                buffer += data
+                if len(buffer) >= self.chunk_size:
+                    await self._append(upload_id, file, hasher, info, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await self._append(upload_id, file, hasher, info, bytes(buffer))
+
+        if info.offset == info.size:
+            self._hashers.pop(upload_id, None)
+            info.sha256 = hasher.hexdigest()
+            try:
+                self._check_digest(info)
+            except UploadChecksumError:
+                await self._remove(upload_id)
+                raise
+            await self._save(info)
+        return info
+
+    async def delete(self, upload_id: str) -> None:
+        """Delete an upload and its data.
+
+        Args:
+            upload_id: Upload identifier.
+
+        Raises:
+            UploadNotFoundError: If the upload does not exist.
+            UploadConflictError: If a request is writing to it.
+        """
+        info = await self.get(upload_id)
+        with self._lock(upload_id) as acquired:
+            if not acquired:
+                raise UploadConflictError("Upload is being written by another request", info.offset)
+            await self._remove(upload_id)
+
+    async def sweep(self, max_age_seconds: float) -> int:
+        """Delete uploads, complete or not, that nobody has written to for ``max_age_seconds``.
+
+        Uploads being written are skipped.
+
+        Args:
+            max_age_seconds: Age of the last write after which an upload is deleted.
+
+        Returns:
+            int: Number of uploads deleted.
+        """
+        expired = await asyncio.to_thread(self._expired, time.time() - max_age_seconds)
+        deleted = 0
+        for upload_id in expired:
+            with self._lock(upload_id) as acquired:
+                if acquired:
+                    await self._remove(upload_id)
+                    deleted += 1
+        return deleted
+
+    async def path(self, upload_id: str) -> Path:
+        """Get the data file of a complete upload, e.g. to import it.
+
+        Args:
+            upload_id: Upload identifier.
+
+        Returns:
+            Path: Path of the uploaded file.
+
+        Raises:
+            UploadNotFoundError: If the upload does not exist or is incomplete.
+        """
+        info = await self.get(upload_id)
+        if not info.complete:
+            raise UploadNotFoundError("Upload is not complete")
+        return self._data_path(upload_id)
+
+    async def _remove(self, upload_id: str) -> None:
+        """Delete the files of an upload; the caller holds its lock."""
+        self._hashers.pop(upload_id, None)
+        for path in (self._meta_path(upload_id), self._data_path(upload_id), self._lock_path(upload_id)):
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(path)
+
+    def _expired(self, cutoff: float) -> list[str]:
+        """List the uploads whose files were last modified before ``cutoff`` (epoch seconds)."""
+        expired = []
+        with contextlib.suppress(FileNotFoundError):
+            for path in self.directory.glob("*.json"):
+                if not _UPLOAD_ID.fullmatch(path.stem):
+                    continue
+                try:
+                    modified = max(path.stat().st_mtime, self._data_path(path.stem).stat().st_mtime)
+                except FileNotFoundError:
+                    modified = 0.0  # left behind by an interrupted create or delete
+                if modified < cutoff:
+                    expired.append(path.stem)
+        return expired
+
+    @contextlib.contextmanager
+    def _lock(self, upload_id: str) -> Iterator[bool]:
+        """Try to take the exclusive lock of an upload without blocking.
+
+        ``flock`` locks belong to the open file, so this also excludes other
+        requests in the same process.
+        """
+        if sys.platform == "win32":  # pragma: no cover - no flock on Windows
+            yield True
+            return
+        fd = os.open(self._lock_path(upload_id), os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+        finally:
+            os.close(fd)
+
+    async def _append(self, upload_id: str, file: Any, hasher: Any, info: UploadInfo, data: bytes) -> None:
+        """Write data and update the hash concurrently (both release the GIL)."""
+        try:
+            await asyncio.gather(file.write(data), asyncio.to_thread(hasher.update, data))
+            await file.flush()
+        except BaseException:
+            # The file and the hash may disagree now; rebuild the hash on resume.
+            self._hashers.pop(upload_id, None)
+            raise
+        info.offset += len(data)
+        self._hashers[upload_id] = (info.offset, hasher)
+
+    async def _hasher(self, upload_id: str, offset: int) -> Any:
+        """Get the running hash of an upload, re-reading the partial file if it is not at ``offset``."""
+        covered, hasher = self._hashers.get(upload_id, (0, None))
+        if hasher is not None and covered == offset:
+            return hasher
+        hasher = hashlib.sha256()
+        async with aiofiles.open(self._data_path(upload_id), "rb") as file:
+            remaining = offset
+            while remaining:
+                data = await file.read(min(self.chunk_size, remaining))
+                if not data:
+                    break
+                await asyncio.to_thread(hasher.update, data)
+                remaining -= len(data)
+        self._hashers[upload_id] = (offset, hasher)
+        return hasher
+
+    async def _save(self, info: UploadInfo) -> None:
+        """Write the metadata of an upload atomically."""
+        meta = asdict(info)
+        del meta["offset"]
+        meta["created_at"] = info.created_at.isoformat()
+        temporary = self._meta_path(info.id).with_suffix(".tmp")
+        async with aiofiles.open(temporary, "w") as file:
+            await file.write(json.dumps(meta))
+        await aiofiles.os.replace(temporary, self._meta_path(info.id))
+
+    def _check_digest(self, info: UploadInfo) -> None:
+        """Raise if a complete upload does not match its expected digest."""
+        if info.expected_sha256 is not None and info.sha256 != info.expected_sha256:
+            raise UploadChecksumError(f"SHA-256 mismatch: expected {info.expected_sha256}, got {info.sha256}")
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.data"
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.json"
+
+    def _lock_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.lock"
+
+
+async def sweep_forever(manager: UploadManager, interval: float, max_age_seconds: float) -> None:
+    """Run ``manager.sweep`` every ``interval`` seconds.
+
+    Args:
+        manager: Upload manager to clean up.
+        interval: Seconds between runs.
+        max_age_seconds: Age of the last write after which an upload is deleted.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await manager.sweep(max_age_seconds)
+        except Exception:
+            logger.exception("Upload sweep failed")
+        else:
+            if deleted:
+                logger.info("Deleted %d expired uploads", deleted)
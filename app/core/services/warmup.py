@@ -0,0 +1,181 @@
+"""Warm-up of a starting worker, gating readiness until it is done.
+
+A fresh worker has an empty connection pool, no compiled statements in
+SQLAlchemy's cache, lazily built validators and cold result caches, so the
+first requests it serves are slow. ``Warmup`` runs named warm-up steps
+concurrently in the background after startup and records each step's
+status and duration; ``/health/ready`` answers 503 until every step has
+finished or the deadline has passed, so the orchestrator only routes
+traffic to warm workers. A failing or slow step never keeps a worker out of
+service for longer than the deadline.
+
+The step functions below cover the database pool, hot statements, request
+validators and the query cache; ``main.py`` wires them to the application.
+"""
+
+import asyncio
+import logging
+import time
+from app.core.models.base import PaginationParams, get_type_adapter
+from app.core.repositories.base import Repository
+from app.core.services.rollups import HOUR_MS, RollupService, now_ms
+from app.core.services.timeseries import parse_metric, query_series
+from app.database.cache import QueryCache
+from app.database.columnar import EventStore
+from app.database.models.event import Event
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+StepStatus = Literal["pending", "done", "failed", "timed_out"]
+
+# Metrics read by the dashboard: one per rollup read path (sums, distinct counts, percentiles).
+HOT_METRICS = ("page_view:count", "page_view:distinct", "session_end:p50")
+
+
+@dataclass
+class WarmupStep:
+    """Outcome of one warm-up step."""
+
+    status: StepStatus = "pending"
+    seconds: float | None = None
+    error: str | None = None
+
+
+class Warmup:
+    """Runs warm-up steps concurrently and tells whether the worker is ready."""
+
+    def __init__(
+        self,
+        steps: Mapping[str, Callable[[], Awaitable[Any]]],
+        deadline: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the warm-up; the deadline starts now.
+
+        Args:
+            steps: Step name to coroutine function.
+            deadline: Seconds after which the worker is ready even if steps are still running.
+            clock: Monotonic clock in seconds.
+        """
+        self.deadline = deadline
+        self.clock = clock
+        self.started_at = clock()
+        self._steps = dict(steps)
+        self.results = {name: WarmupStep() for name in self._steps}
+        self._finished = not self._steps
+
+    @property
+    def ready(self) -> bool:
+        """Whether every step has finished or the deadline has passed."""
+        return self._finished or self.clock() - self.started_at >= self.deadline
+
+    async def run(self) -> None:
+        """Run all steps concurrently; steps still running at the deadline are cancelled."""
+        tasks = {asyncio.create_task(self._run_step(name, step)): name for name, step in self._steps.items()}
+        try:
+            remaining = max(0.0, self.deadline - (self.clock() - self.started_at))
+            _, pending = await asyncio.wait(tasks, timeout=remaining) if tasks else (set(), set())
+            for task in pending:
+                task.cancel()
+                result = self.results[tasks[task]]
+                result.status = "timed_out"
+                result.seconds = self.clock() - self.started_at
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._finished = True
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get readiness, elapsed time and per-step results.
+
+        Returns:
+            dict[str, Any]: ``ready``, ``elapsed_seconds``, ``deadline_seconds``
+            and ``steps`` by name with ``status``, ``seconds`` and ``error``.
+        """
+        return {
+            "ready": self.ready,
+            "elapsed_seconds": self.clock() - self.started_at,
+            "deadline_seconds": self.deadline,
+            "steps": {name: asdict(result) for name, result in self.results.items()},
+        }
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        """Run one step, recording its duration and outcome."""
+        result = self.results[name]
+        started = self.clock()
+        try:
+            await step()
+        except Exception as e:
+            result.status = "failed"
+            result.error = f"{type(e).__name__}: {e}"
+            logger.warning("Warm-up step %s failed: %s", name, result.error)
+        else:
+            result.status = "done"
+        result.seconds = self.clock() - started
+
+
+async def prime_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open pool connections concurrently so the first requests find them ready.
+
+    Args:
+        engine: Database engine.
+        connections: Connections to open and check in (at most the pool size are kept).
+    """
+
+    async def check(stack: AsyncExitStack) -> None:
+        connection = await stack.enter_async_context(engine.connect())
+        await connection.execute(text("SELECT 1"))
+
+    # All connections are held at once, otherwise the pool would hand out the same one.
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(check(stack) for _ in range(connections)))
+
+
+async def run_hot_queries(
+    session_factory: Callable[[], AsyncSession],
+    rollups: RollupService,
+    event_store: EventStore | None = None,
+    cache: QueryCache | None = None,
+) -> None:
+    """Run the statements behind the hottest read endpoints once.
+
+    Executing them fills SQLAlchemy's compiled statement cache; with a query
+    cache, the results of the first event list page are cached as well.
+
+    Args:
+        session_factory: Factory for database sessions.
+        rollups: Rollup service behind ``/timeseries``.
+        event_store: Columnar store, when it serves ``/timeseries``.
+        cache: Query cache to fill, if enabled.
+    """
+    async with session_factory() as session:
+        repository = Repository(session, Event, cache=cache)
+        page = PaginationParams()
+        await repository.rows(offset=page.offset, limit=page.size, order_by=["-id"])
+        await repository.count()
+    end = now_ms()
+    await query_series(rollups, end - HOUR_MS, end, "minute", [parse_metric(spec) for spec in HOT_METRICS], event_store)
+
+
+async def build_validators(application: FastAPI, types: Iterable[Any]) -> None:
+    """Build validators that are otherwise built by the first request using them.
+
+    Route response serializers are compiled when routes are registered; the
+    type adapters routes create on demand and the OpenAPI schema are not.
+
+    Args:
+        application: Application whose OpenAPI schema is built when docs are served.
+        types: Types routes adapt with ``get_type_adapter``.
+    """
+    for type_ in types:
+        get_type_adapter(type_)
+    if application.openapi_url is not None:
+        await asyncio.to_thread(application.openapi)
@@ -0,0 +1,6 @@
+"""Mergeable probabilistic sketches for analytics aggregates."""
+
+from app.core.sketches.hyperloglog import HyperLogLog, hash64, precision_for_error
+from app.core.sketches.tdigest import TDigest
+
+__all__ = ["HyperLogLog", "TDigest", "hash64", "precision_for_error"]
@@ -0,0 +1,238 @@
+"""t-digest sketch for approximate quantiles.
+
+A t-digest summarizes a distribution as a sorted list of centroids (mean,
+weight). Centroids are small near the tails and large near the median, as
+set by the scale function ``k(q) = compression / (2 pi) * asin(2q - 1)``, so
+extreme quantiles (p99, p99.9) stay accurate while the digest keeps at most
+about ``compression / 2`` centroids regardless of the number of values.
+Digests are mergeable: merging pools the centroids and compresses them
+again, so per-bucket digests can be combined over any range in bounded
+memory.
+
+Values are buffered and compressed in batches with NumPy. Serialized
+digests store the extremes plus the centroid means and weights.
+"""
+
+import math
+import numpy as np
+import struct
+from collections.abc import Iterable, Sequence
+from typing import Self
+
+_VERSION = 1
+_HEADER = struct.Struct("<BfddI")
+
+
+class TDigest:
+    """Mergeable quantile sketch."""
+
+    __slots__ = ("_buffer", "compression", "max", "means", "min", "weights")
+
+    def __init__(
+        self,
+        compression: float = 100.0,
+        means: np.ndarray | None = None,
+        weights: np.ndarray | None = None,
+        minimum: float = math.inf,
+        maximum: float = -math.inf,
+    ) -> None:
+        """Create an empty digest (or wrap existing centroids).
+
+        Args:
+            compression: Accuracy parameter; higher keeps more centroids.
+            means: Sorted centroid means.
+            weights: Centroid weights, aligned with ``means``.
+            minimum: Smallest value added.
+            maximum: Largest value added.
+
+        Raises:
+            ValueError: If the compression is not positive or the centroids do
+                not match.
+        """
+        if compression <= 0:
+            raise ValueError("Compression must be positive")
+        means = np.empty(0) if means is None else np.asarray(means, dtype=np.float64)
+        weights = np.empty(0) if weights is None else np.asarray(weights, dtype=np.float64)
+        if means.shape != weights.shape or means.ndim != 1:
+            raise ValueError("Centroid means and weights must be 1-D arrays of equal length")
+        self.compression = compression
+        self.means = means
+        self.weights = weights
+        self.min = minimum
+        self.max = maximum
+        self._buffer: list[float] = []
+
+    @property
+    def count(self) -> float:
+        """Total weight (number of values) added."""
+        return float(self.weights.sum()) + len(self._buffer)
+
+    def __len__(self) -> int:
+        return round(self.count)
+
+    def add(self, value: float) -> None:
+        """Add one value.
+
+        Args:
+            value: Value to add; NaN is ignored.
+        """
+        if value != value:
+            return
+        self._buffer.append(value)
+        if len(self._buffer) >= 10 * self.compression:
+            self._flush()
+
+    def add_many(self, values: Sequence[float] | np.ndarray) -> None:
+        """Add many values at once.
+
+        Args:
+            values: Values to add; NaN is ignored.
+        """
+        array = np.asarray(values, dtype=np.float64)
+        array = array[~np.isnan(array)]
+        if len(array):
+            self._compress(array, np.ones(len(array)))
+
+    def merge(self, other: "TDigest") -> None:
+        """Merge another digest into this one.
+
+        Args:
+            other: Digest to merge; the compression of this digest is kept.
+        """
+        other._flush()
+        if len(other.means):
+            self._compress(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            float | None: Estimated value, or None for an empty digest.
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[float]) -> list[float | None]:
+        """Estimate several quantiles.
+
+        Values are interpolated between centroid centers, and between the
+        extremes and the outermost centroids.
+
+        Args:
+            qs: Quantiles between 0 and 1.
+
+        Returns:
+            list[float | None]: Estimated values (None for an empty digest).
+
+        Raises:
+            ValueError: If a quantile is outside ``[0, 1]``.
+        """
+        points = np.asarray(qs, dtype=np.float64)
+        if ((points < 0) | (points > 1)).any():
+            raise ValueError("Quantiles must be between 0 and 1")
+        self._flush()
+        if not len(self.means):
+            return [None] * len(qs)
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate(([0.0], centers, [total]))
+        values = np.concatenate(([self.min], self.means, [self.max]))
+        estimates: list[float | None] = np.interp(points * total, positions, values).tolist()
+        return estimates
+
+    def copy(self) -> Self:
+        """Copy the digest.
+
+        Returns:
+            Self: Independent digest with the same centroids.
+        """
+        self._flush()
+        return type(self)(self.compression, self.means.copy(), self.weights.copy(), self.min, self.max)
+
+    @classmethod
+    def union(cls, digests: Iterable["TDigest"], compression: float = 100.0) -> Self:
+        """Merge digests into a new one.
+
+        Args:
+            digests: Digests to merge.
+            compression: Compression of the result.
+
+        Returns:
+            Self: Union of the digests.
+        """
+        result = cls(compression)
+        for digest in digests:
+            result.merge(digest)
+        return result
+
+    def to_bytes(self) -> bytes:
+        """Serialize the digest.
+
+        Returns:
+            bytes: Serialized digest.
+        """
+        self._flush()
+        header = _HEADER.pack(_VERSION, self.compression, self.min, self.max, len(self.means))
+        return header + self.means.astype("<f8").tobytes() + self.weights.astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """Deserialize a digest produced by ``to_bytes``.
+
+        Args:
+            data: Serialized digest.
+
+        Returns:
+            Self: The digest.
+
+        Raises:
+            ValueError: If the data is not a valid digest.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated t-digest")
+        version, compression, minimum, maximum, size = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unknown t-digest version {version}")
+        if len(data) != _HEADER.size + 16 * size:
+            raise ValueError("Malformed t-digest")
+        means = np.frombuffer(data, dtype="<f8", count=size, offset=_HEADER.size)
+        weights = np.frombuffer(data, dtype="<f8", count=size, offset=_HEADER.size + 8 * size)
+        return cls(compression, means.astype(np.float64), weights.astype(np.float64), minimum, maximum)
+
+    def _flush(self) -> None:
+        """Compress buffered values into the centroids."""
+        if self._buffer:
+            values = np.array(self._buffer)
+            self._buffer.clear()
+            self._compress(values, np.ones(len(values)))
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """Merge new centroids into the digest and re-cluster by the scale function.
+
+        Sorted centroids are grouped by the integer part of ``k`` at their
+        center, so each cluster spans at most about one unit of ``k``.
+        """
+        if len(means):
+            self.min = min(self.min, float(means.min()))
+            self.max = max(self.max, float(means.max()))
+        means = np.concatenate((self.means, means))
+        weights = np.concatenate((self.weights, weights))
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        total = weights.sum()
+        if total <= self.compression / np.pi:
+            # Neighbouring centers are at least 1/total apart in q, i.e. at
+            # least one unit apart in k: no two centroids would be merged.
+            self.means, self.weights = means, weights
+            return
+        centers = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * centers - 1))
+        starts = np.flatnonzero(np.concatenate(([True], k[1:] != k[:-1])))
+        cluster_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / cluster_weights
+        self.weights = cluster_weights
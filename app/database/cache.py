@@ -0,0 +1,288 @@
+"""Opt-in query result cache with TTL, LRU bounds and table-tag invalidation."""
+
+import time
+import weakref
+from app.config import get_settings
+from app.database.connection import AppSession
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from sqlalchemy import Executable, Table, event, inspect
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.sql import ClauseElement, visitors
+from typing import Any, Literal, cast
+
+ResultMode = Literal["mappings", "scalars", "scalar", "all"]
+# Result mode, compiled SQL and bound parameters.
+_Key = tuple[str, str, str]
+
+_PENDING_TABLES_KEY = "query_cache_pending_tables"
+_registered_caches: "weakref.WeakSet[QueryCache]" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of query cache counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    """Cached result with its expiry time and table tags."""
+
+    value: Any
+    expires_at: float
+    tags: frozenset[str]
+
+
+class QueryCache:
+    """LRU cache of materialized query results.
+
+    Entries are keyed by the compiled SQL and its bound parameters, and tagged
+    with every table the statement reads. Commits and rollbacks made through
+    sessions of ``AppSession`` (the class behind ``AsyncSessionLocal``) that
+    wrote to a table drop every entry tagged with it. Invalidation is per
+    process, so the TTL bounds staleness for writes made by other workers or
+    raw SQL.
+
+    A session with uncommitted writes bypasses the cache, since what it reads
+    may never be committed. A result whose tables are invalidated while it is
+    being fetched is returned but not stored.
+
+    Results are materialized (mappings become dicts) so they can be shared
+    safely across sessions; treat returned values as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results before LRU eviction.
+            ttl: Seconds an entry stays valid.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._tags: dict[str, set[_Key]] = {}
+        # Bumped on every invalidation of a table, to detect it during a miss.
+        self._generations: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        _registered_caches.add(self)
+
+    async def fetch(
+        self,
+        session: AsyncSession,
+        stmt: Executable,
+        mode: ResultMode = "mappings",
+        ttl: float | None = None,
+    ) -> Any:
+        """Execute a statement through the cache.
+
+        Args:
+            session: Session used on a cache miss.
+            stmt: Read-only statement to execute.
+            mode: How to materialize the result: list of dicts ("mappings"),
+                list of first-column values ("scalars"), a single value
+                ("scalar") or list of tuples ("all").
+            ttl: Per-entry TTL override in seconds.
+
+        Returns:
+            Any: The materialized result.
+        """
+        if _has_uncommitted_writes(session.sync_session):
+            return _materialize(await session.execute(stmt), mode)
+
+        key = self._make_key(stmt, session, mode)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and entry.expires_at > now:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+        self._misses += 1
+        if entry is not None:
+            self._discard(key)
+
+        tags = _tables(stmt)
+        generations = self._tag_generations(tags)
+        result = await session.execute(stmt)
+        value = _materialize(result, mode)
+        # Autoflush may have written pending changes; a concurrent commit may have invalidated the tables.
+        if not _has_uncommitted_writes(session.sync_session) and generations == self._tag_generations(tags):
+            self._store(key, value, now + (self.ttl if ttl is None else ttl), tags)
+        return value
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """Drop every entry tagged with any of the given tables.
+
+        Args:
+            tables: Table names that were written to.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        removed = 0
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for key in self._tags.pop(table, set()):
+                if self._discard(key):
+                    removed += 1
+        self._invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the cache counters.
+
+        Returns:
+            CacheStats: Current hit/miss/eviction counters and size.
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+            max_entries=self.max_entries,
+        )
+
+    def _tag_generations(self, tags: frozenset[str]) -> tuple[int, ...]:
+        """Get the invalidation generations of the given tables, in sorted order."""
+        return tuple(self._generations.get(tag, 0) for tag in sorted(tags))
+
+    def _make_key(self, stmt: Executable, session: AsyncSession, mode: ResultMode) -> _Key:
+        """Build the cache key from the result mode, the compiled SQL and its parameters."""
+        compiled = cast(ClauseElement, stmt).compile(dialect=session.get_bind().dialect)
+        return mode, str(compiled), repr(sorted(compiled.params.items()))
+
+    def _store(self, key: _Key, value: Any, expires_at: float, tags: frozenset[str]) -> None:
+        """Insert an entry, evicting the least recently used ones if full."""
+        self._entries[key] = _Entry(value=value, expires_at=expires_at, tags=tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._evictions += 1
+
+    def _discard(self, key: _Key) -> bool:
+        """Remove a single entry and its tag references."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+
+def _materialize(result: Result[Any], mode: ResultMode) -> Any:
+    """Convert a result into plain Python objects safe to share."""
+    if mode == "mappings":
+        return [dict(row) for row in result.mappings()]
+    if mode == "scalars":
+        return list(result.scalars())
+    if mode == "scalar":
+        return result.scalar()
+    return [tuple(row) for row in result]
+
+
+def _tables(stmt: Executable) -> frozenset[str]:
+    """Collect the names of all tables a statement reads from."""
+    return frozenset(node.name for node in visitors.iterate(cast(ClauseElement, stmt)) if isinstance(node, Table))
+
+
+def _pending_tables(session: Session) -> set[str]:
+    """Get the set of tables written in the session's current transaction."""
+    return session.info.setdefault(_PENDING_TABLES_KEY, set())  # type: ignore[no-any-return]
+
+
+def _has_uncommitted_writes(session: Session) -> bool:
+    """Whether the session has flushed or pending writes that are not committed yet."""
+    return bool(session.info.get(_PENDING_TABLES_KEY) or session.new or session.dirty or session.deleted)
+
+
+def invalidate_cached_tables(tables: Iterable[str]) -> None:
+    """Invalidate tables in every query cache of the process.
+
+    Commits through ``AppSession`` do this automatically; call it after
+    writing with raw SQL on a driver connection, which bypasses session events.
+
+    Args:
+        tables: Table names that were written to.
+    """
+    names = set(tables)
+    for cache in list(_registered_caches):
+        cache.invalidate_tables(names)
+
+
+@event.listens_for(AppSession, "after_flush")
+def _record_flushed_tables(session: Session, _flush_context: UOWTransaction) -> None:
+    """Record tables touched by ORM unit-of-work flushes."""
+    pending = _pending_tables(session)
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        pending.update(table.name for table in inspect(instance).mapper.tables)
+
+
+@event.listens_for(AppSession, "do_orm_execute")
+def _record_dml_tables(state: ORMExecuteState) -> None:
+    """Record tables targeted by bulk INSERT/UPDATE/DELETE statements."""
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if isinstance(table, Table):
+            _pending_tables(state.session).add(table.name)
+
+
+@event.listens_for(AppSession, "after_commit")
+def _invalidate_committed_tables(session: Session) -> None:
+    """Invalidate cached results for tables written by the committed transaction."""
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if tables:
+        invalidate_cached_tables(tables)
+
+
+@event.listens_for(AppSession, "after_rollback")
+def _invalidate_rolled_back_tables(session: Session) -> None:
+    """Invalidate cached results for tables written by a transaction that was rolled back."""
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if tables:
+        invalidate_cached_tables(tables)
+
+
+@lru_cache
+def get_query_cache() -> QueryCache | None:
+    """Get the process-wide query cache, or None when caching is disabled."""
+    settings = get_settings()
+    if not settings.query_cache_enabled:
+        return None
+    return QueryCache(max_entries=settings.query_cache_max_entries, ttl=settings.query_cache_ttl)
@@ -0,0 +1,746 @@
+"""Append-only, memory-mapped columnar store for analytics events.
+
+Events are stored column-wise as NumPy ``.npy`` files, one directory per
+segment:
+
+- ``active-<pid>-<id>``: the segment a process currently appends to. Columns
+  are preallocated to ``segment_rows`` and ``meta.json`` records how many rows
+  are valid; it is replaced atomically after the data is written, so readers
+  in other processes never see partial rows. Each process writes its own
+  active segment, so appends need no cross-process locking.
+- ``part-<id>``: an immutable, sealed segment sorted by ``ts``. Active
+  segments are sealed into parts when full or after ``rotate_seconds``;
+  compaction merges small parts into larger ones.
+
+Event names are dictionary-encoded per segment; user ids are stored as
+64-bit hashes. Reads memory-map the columns (zero-copy): segment min/max
+timestamps prune whole segments and, within a part, ``searchsorted`` on the
+sorted ``ts`` column finds the range. New parts list the segments they
+replace in ``sources``, so readers see either the sources or the new part,
+never both; replaced directories are deleted after a grace period.
+
+The store only receives events appended after it was created, and retention
+drops old parts, so ``.store.json`` records ``covered_from``: the time from
+which every ingested event is in the store. Older ranges must be read from
+the rollups.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import numpy as np
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from app.core.sketches import hash64
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+if sys.platform != "win32":
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+COLUMNS: dict[str, np.dtype] = {
+    "ts": np.dtype(np.int64),
+    "name": np.dtype(np.int32),
+    "user": np.dtype(np.uint64),
+    "value": np.dtype(np.float64),
+}
+META_FILE = "meta.json"
+# Store-wide metadata: the time from which the store holds every event.
+STORE_FILE = ".store.json"
+# Bits reserved for the bucket index in combined group-by keys.
+_BUCKET_BITS = 40
+# Rows merged per step when writing a part; bounds the memory used by compaction.
+_MERGE_ROWS = 1 << 20
+
+
+def user_hash(user_id: str | None) -> int:
+    """Hash a user id to a stable non-zero 64-bit integer (0 means no user).
+
+    Uses the HyperLogLog hash, so stored hashes can feed distinct-count sketches.
+
+    Args:
+        user_id: User identifier.
+
+    Returns:
+        int: 64-bit hash.
+    """
+    if user_id is None:
+        return 0
+    return hash64(user_id) or 1
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A readable segment: its directory and metadata."""
+
+    path: Path
+    meta: dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        """Directory name of the segment."""
+        return self.path.name
+
+    @property
+    def rows(self) -> int:
+        """Number of valid rows."""
+        return int(self.meta["rows"])
+
+    @property
+    def sealed(self) -> bool:
+        """Whether the segment is an immutable part sorted by ``ts``."""
+        return self.name.startswith("part-")
+
+
+@dataclass(frozen=True)
+class SegmentSlice:
+    """Column views of the rows of one segment matching a scan."""
+
+    names: list[str]
+    ts: np.ndarray
+    name: np.ndarray
+    user: np.ndarray
+    value: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+@dataclass
+class ColumnarAggregate:
+    """Grouped aggregates: one entry per (name, bucket) with events."""
+
+    names: list[str]
+    name: np.ndarray
+    bucket: np.ndarray
+    count: np.ndarray
+    sum: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Convert to JSON-serializable records.
+
+        Returns:
+            list[dict[str, Any]]: Name, bucket start and aggregates per group.
+        """
+        return [
+            {
+                "name": self.names[code],
+                "bucket": int(bucket),
+                "count": int(count),
+                "sum": float(total),
+                "min": float(low),
+                "max": float(high),
+            }
+            for code, bucket, count, total, low, high in zip(
+                self.name, self.bucket, self.count, self.sum, self.min, self.max, strict=True
+            )
+        ]
+
+
+class _ActiveSegment:
+    """Writable segment owned by this process."""
+
+    def __init__(self, root: Path, capacity: int) -> None:
+        self.path = root / f"active-{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.path.mkdir(parents=True)
+        self.capacity = capacity
+        self.created = time.time()
+        self.columns = {
+            column: np.lib.format.open_memmap(self.path / f"{column}.npy", mode="w+", dtype=dtype, shape=(capacity,))
+            for column, dtype in COLUMNS.items()
+        }
+        self.names: list[str] = []
+        self.codes: dict[str, int] = {}
+        self.rows = 0
+        self.min_ts: int | None = None
+        self.max_ts: int | None = None
+        self.is_sorted = True
+        self._write_meta()
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.rows
+
+    def append(self, ts: np.ndarray, names: Sequence[str], users: np.ndarray, values: np.ndarray) -> None:
+        """Append rows that fit; the caller rotates when the segment is full."""
+        count = len(ts)
+        codes = np.fromiter((self._code(name) for name in names), dtype=np.int32, count=count)
+        end = self.rows + count
+        self.columns["ts"][self.rows : end] = ts
+        self.columns["name"][self.rows : end] = codes
+        self.columns["user"][self.rows : end] = users
+        self.columns["value"][self.rows : end] = values
+
+        first, low, high = int(ts[0]), int(ts.min()), int(ts.max())
+        sorted_batch = bool(np.all(ts[1:] >= ts[:-1]))
+        self.is_sorted = self.is_sorted and sorted_batch and (self.max_ts is None or first >= self.max_ts)
+        self.min_ts = low if self.min_ts is None else min(self.min_ts, low)
+        self.max_ts = high if self.max_ts is None else max(self.max_ts, high)
+        self.rows = end
+        self._write_meta()
+
+    def close(self) -> None:
+        for column in self.columns.values():
+            column.flush()
+        self.columns.clear()
+
+    def _code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def _write_meta(self) -> None:
+        _write_json(
+            self.path / META_FILE,
+            {
+                "rows": self.rows,
+                "capacity": self.capacity,
+                "names": self.names,
+                "min_ts": self.min_ts,
+                "max_ts": self.max_ts,
+                "sorted": self.is_sorted,
+                "pid": os.getpid(),
+                "created": self.created,
+            },
+        )
+
+
+class EventStore:
+    """Columnar event store: appends, segment maintenance and vectorized queries."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        segment_rows: int = 1 << 20,
+        rotate_seconds: float = 300.0,
+        compact_rows: int = 1 << 24,
+        gc_grace_seconds: float = 60.0,
+    ) -> None:
+        """Open (or create) a store.
+
+        Args:
+            root: Directory holding the segments.
+            segment_rows: Capacity of an active segment.
+            rotate_seconds: Seal a non-empty active segment after this age.
+            compact_rows: Target size of compacted parts; smaller parts are merged.
+            gc_grace_seconds: Delay before replaced segment directories are
+                deleted, so concurrent readers can finish.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_rows = segment_rows
+        self.rotate_seconds = rotate_seconds
+        self.compact_rows = compact_rows
+        self.gc_grace_seconds = gc_grace_seconds
+        self._active: _ActiveSegment | None = None
+        self._write_lock = threading.Lock()
+        # Readers on the event loop and maintenance in a worker thread share the caches.
+        self._cache_lock = threading.Lock()
+        self._meta_cache: dict[str, dict[str, Any]] = {}
+        self._column_cache: dict[str, dict[str, np.ndarray]] = {}
+        if not (self.root / STORE_FILE).exists():
+            _write_json(self.root / STORE_FILE, {"covered_from": int(time.time() * 1000)})
+
+    @property
+    def covered_from(self) -> int:
+        """Time (epoch ms) from which the store holds every ingested event.
+
+        Events are only appended while the store is enabled, so earlier
+        events, and those removed by retention, are missing from it.
+        """
+        try:
+            return int(json.loads((self.root / STORE_FILE).read_text())["covered_from"])
+        except (OSError, ValueError, KeyError):
+            return int(time.time() * 1000)
+
+    def append(
+        self,
+        ts: Sequence[int] | np.ndarray,
+        names: Sequence[str],
+        users: Sequence[str | None] | None = None,
+        values: Sequence[float] | np.ndarray | None = None,
+    ) -> int:
+        """Append events.
+
+        Args:
+            ts: Event times in epoch milliseconds.
+            names: Event names.
+            users: User ids (None for anonymous events).
+            values: Event values (default 0).
+
+        Returns:
+            int: Number of rows appended.
+        """
+        ts_array = np.asarray(ts, dtype=np.int64)
+        count = len(ts_array)
+        if count == 0:
+            return 0
+        user_array = np.fromiter(
+            (user_hash(user) for user in users) if users is not None else (0 for _ in range(count)),
+            dtype=np.uint64,
+            count=count,
+        )
+        value_array = np.zeros(count) if values is None else np.asarray(values, dtype=np.float64)
+
+        with self._write_lock:
+            offset = 0
+            while offset < count:
+                if self._active is None:
+                    self._active = _ActiveSegment(self.root, self.segment_rows)
+                take = min(self._active.free, count - offset)
+                chunk = slice(offset, offset + take)
+                self._active.append(ts_array[chunk], names[chunk], user_array[chunk], value_array[chunk])
+                offset += take
+                if self._active.free == 0:
+                    self._seal_active()
+        return count
+
+    def rotate(self, force: bool = False) -> bool:
+        """Seal this process's active segment if it is due.
+
+        Args:
+            force: Seal regardless of age.
+
+        Returns:
+            bool: True if a segment was sealed.
+        """
+        with self._write_lock:
+            active = self._active
+            if active is None or active.rows == 0:
+                return False
+            if not force and time.time() - active.created < self.rotate_seconds:
+                return False
+            self._seal_active()
+            return True
+
+    def compact(self) -> int:
+        """Merge parts smaller than ``compact_rows`` into larger parts.
+
+        Only one process compacts at a time; others skip.
+
+        Returns:
+            int: Number of parts merged.
+        """
+        with self._maintenance_lock() as acquired:
+            if not acquired:
+                return 0
+            self._seal_abandoned()
+            small = sorted(
+                (segment for segment in self.segments() if segment.sealed and segment.rows < self.compact_rows),
+                key=lambda segment: segment.meta["min_ts"],
+            )
+            merged = 0
+            group: list[Segment] = []
+            for segment in small:
+                if group and sum(part.rows for part in group) + segment.rows > self.compact_rows:
+                    merged += self._merge_group(group)
+                    group = []
+                group.append(segment)
+            merged += self._merge_group(group)
+            return merged
+
+    def drop_before(self, ts: int) -> int:
+        """Delete parts whose events are all older than ``ts``.
+
+        Like compaction, only one process does this at a time; others skip.
+        Afterwards ``covered_from`` is at least ``ts``.
+
+        Args:
+            ts: Cutoff in epoch milliseconds.
+
+        Returns:
+            int: Number of parts deleted.
+        """
+        with self._maintenance_lock() as acquired:
+            if not acquired:
+                return 0
+            dropped = 0
+            for segment in self.segments():
+                if segment.sealed and segment.meta["max_ts"] < ts:
+                    self._delete(segment.name)
+                    dropped += 1
+            if dropped and ts > self.covered_from:
+                _write_json(self.root / STORE_FILE, {"covered_from": ts})
+            return dropped
+
+    def collect_garbage(self) -> int:
+        """Delete segment directories replaced by a part more than the grace period ago.
+
+        Like compaction, only one process does this at a time; others skip.
+
+        Returns:
+            int: Number of directories deleted.
+        """
+        with self._maintenance_lock() as acquired:
+            if not acquired:
+                return 0
+            deleted = 0
+            now = time.time()
+            for path, meta in self._list():
+                if not path.name.startswith("part-") or now - meta.get("created", now) < self.gc_grace_seconds:
+                    continue
+                for source in meta.get("sources", []):
+                    deleted += self._delete(source)
+            return deleted
+
+    def maintain(self, retention_ms: int | None = None) -> None:
+        """Run periodic maintenance: rotation, compaction, retention and cleanup.
+
+        Args:
+            retention_ms: Drop parts older than this many milliseconds.
+        """
+        self.rotate()
+        self.compact()
+        if retention_ms:
+            self.drop_before(int(time.time() * 1000) - retention_ms)
+        self.collect_garbage()
+
+    def close(self) -> None:
+        """Seal this process's active segment and release memory maps."""
+        self.rotate(force=True)
+        with self._cache_lock:
+            self._column_cache.clear()
+
+    def segments(self) -> list[Segment]:
+        """List the segments visible to readers.
+
+        Returns:
+            list[Segment]: Non-empty segments, excluding replaced ones.
+        """
+        listed = self._list()
+        replaced = {source for _, meta in listed for source in meta.get("sources", [])}
+        visible = [Segment(path, meta) for path, meta in listed if path.name not in replaced and meta["rows"]]
+        names = {segment.name for segment in visible}
+        with self._cache_lock:
+            for cache in (self._meta_cache, self._column_cache):
+                for name in [name for name in cache if name not in names]:
+                    del cache[name]
+        return visible
+
+    def scan(self, start_ms: int, end_ms: int, names: Iterable[str] | None = None) -> Iterator[SegmentSlice]:
+        """Yield the rows within ``[start_ms, end_ms)``, segment by segment.
+
+        Rows of sealed parts are zero-copy views of the memory-mapped columns
+        when no name filter applies.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            names: Event names to include (default: all).
+
+        Yields:
+            SegmentSlice: Matching rows of one segment.
+        """
+        wanted = set(names) if names is not None else None
+        for segment in self.segments():
+            meta = segment.meta
+            if meta["max_ts"] < start_ms or meta["min_ts"] >= end_ms:
+                continue
+            codes = None
+            if wanted is not None:
+                codes = [code for code, name in enumerate(meta["names"]) if name in wanted]
+                if not codes:
+                    continue
+
+            columns = self._columns(segment)
+            if meta["sorted"]:
+                ts = columns["ts"]
+                rows = slice(int(np.searchsorted(ts, start_ms, "left")), int(np.searchsorted(ts, end_ms, "left")))
+                selected = {column: values[rows] for column, values in columns.items()}
+            else:
+                ts = columns["ts"]
+                mask = (ts >= start_ms) & (ts < end_ms)
+                selected = {column: values[mask] for column, values in columns.items()}
+            if codes is not None and len(codes) < len(meta["names"]):
+                mask = np.isin(selected["name"], codes)
+                selected = {column: values[mask] for column, values in selected.items()}
+            if len(selected["ts"]):
+                yield SegmentSlice(names=meta["names"], **selected)
+
+    def aggregate(
+        self,
+        start_ms: int,
+        end_ms: int,
+        step_ms: int | None = None,
+        names: Iterable[str] | None = None,
+        origin_ms: int = 0,
+    ) -> ColumnarAggregate:
+        """Count, sum, min and max of event values per name and time bucket.
+
+        Each segment is reduced with vectorized NumPy operations and the
+        per-segment partial aggregates are merged, so memory stays bounded by
+        the segment size.
+
+        Args:
+            start_ms: Range start (inclusive) in epoch milliseconds.
+            end_ms: Range end (exclusive) in epoch milliseconds.
+            step_ms: Bucket width; None for one bucket starting at ``start_ms``.
+            names: Event names to include (default: all).
+            origin_ms: Alignment of the buckets when ``step_ms`` is given.
+
+        Returns:
+            ColumnarAggregate: One entry per (name, bucket) with events.
+        """
+        base = start_ms if step_ms is None else origin_ms + (start_ms - origin_ms) // step_ms * step_ms
+        global_names: list[str] = []
+        global_codes: dict[str, int] = {}
+        partials: list[tuple[np.ndarray, ...]] = []
+
+        for part in self.scan(start_ms, end_ms, names):
+            lookup = np.array([_intern(name, global_names, global_codes) for name in part.names], dtype=np.int64)
+            bucket_index = np.zeros(len(part), dtype=np.int64) if step_ms is None else (part.ts - base) // step_ms
+            keys = (lookup[part.name] << _BUCKET_BITS) | bucket_index
+            ones = np.ones(len(part), dtype=np.int64)
+            partials.append(_reduce(keys, ones, part.value, part.value, part.value))
+
+        if not partials:
+            empty = np.array([], dtype=np.int64)
+            return ColumnarAggregate(global_names, empty, empty, empty, np.array([]), np.array([]), np.array([]))
+
+        keys, count, total, low, high = _reduce(*(np.concatenate(column) for column in zip(*partials, strict=True)))
+        bucket_index = keys & ((1 << _BUCKET_BITS) - 1)
+        return ColumnarAggregate(
+            names=global_names,
+            name=keys >> _BUCKET_BITS,
+            bucket=base + bucket_index * (step_ms or 0),
+            count=count,
+            sum=total,
+            min=low,
+            max=high,
+        )
+
+    def _list(self) -> list[tuple[Path, dict[str, Any]]]:
+        """Read segment directories and their metadata (sealed metadata is cached)."""
+        listed = []
+        for path in sorted(self.root.iterdir()):
+            if not path.name.startswith(("part-", "active-")):
+                continue
+            with self._cache_lock:
+                meta = self._meta_cache.get(path.name)
+            if meta is None:
+                try:
+                    meta = json.loads((path / META_FILE).read_text())
+                except (OSError, ValueError):
+                    continue  # being created or deleted
+                if path.name.startswith("part-"):
+                    with self._cache_lock:
+                        self._meta_cache[path.name] = meta
+            listed.append((path, meta))
+        return listed
+
+    def _delete(self, name: str) -> int:
+        """Delete a segment directory after the segments it replaced.
+
+        Sources go first so that they never become visible again.
+        """
+        path = self.root / name
+        try:
+            meta = json.loads((path / META_FILE).read_text())
+        except (OSError, ValueError):
+            meta = {}
+        deleted = sum(self._delete(source) for source in meta.get("sources", []))
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+            deleted += 1
+        return deleted
+
+    def _columns(self, segment: Segment) -> dict[str, np.ndarray]:
+        """Memory-map the columns of a segment, limited to its valid rows."""
+        with self._cache_lock:
+            columns = self._column_cache.get(segment.name)
+        if columns is None:
+            columns = {column: np.load(segment.path / f"{column}.npy", mmap_mode="r") for column in COLUMNS}
+            with self._cache_lock:
+                columns = self._column_cache.setdefault(segment.name, columns)
+        return {column: values[: segment.rows] for column, values in columns.items()}
+
+    def _seal_active(self) -> None:
+        """Seal this process's active segment into a part (write lock held)."""
+        active, self._active = self._active, None
+        assert active is not None
+        active.close()
+        if active.rows:
+            self._write_part([Segment(active.path, json.loads((active.path / META_FILE).read_text()))])
+        else:
+            shutil.rmtree(active.path, ignore_errors=True)
+
+    def _seal_abandoned(self) -> None:
+        """Seal active segments whose owning process has exited."""
+        for segment in self.segments():
+            pid = segment.meta.get("pid")
+            if segment.sealed or pid == os.getpid() or _process_alive(pid):
+                continue
+            self._write_part([segment])
+
+    def _merge_group(self, group: list[Segment]) -> int:
+        """Merge a group of parts into one; single parts are left alone."""
+        if len(group) < 2:
+            return 0
+        self._write_part(group)
+        return len(group)
+
+    def _write_part(self, sources: list[Segment]) -> Path:
+        """Write the rows of ``sources`` into a new part sorted by ``ts``.
+
+        Sorted sources are merged window by window straight into the part's
+        memory-mapped columns, so memory stays bounded by ``_MERGE_ROWS``
+        rather than by the size of the part. Unsorted sources (active
+        segments, at most ``segment_rows`` long) are sorted in memory first.
+        """
+        names: list[str] = []
+        codes: dict[str, int] = {}
+        inputs = []
+        for source in sources:
+            columns = self._columns(source)
+            lookup = np.array([_intern(name, names, codes) for name in source.meta["names"]], dtype=np.int32)
+            if not source.meta["sorted"]:
+                order = np.argsort(columns["ts"], kind="stable")
+                columns = {column: values[order] for column, values in columns.items()}
+            inputs.append((columns, lookup))
+
+        total = sum(source.rows for source in sources)
+        part_id = uuid.uuid4().hex[:12]
+        staging = self.root / f"tmp-{part_id}"
+        staging.mkdir()
+        output = {
+            column: np.lib.format.open_memmap(staging / f"{column}.npy", mode="w+", dtype=dtype, shape=(total,))
+            for column, dtype in COLUMNS.items()
+        }
+        step = max(1, _MERGE_ROWS // len(inputs))
+        positions = [0] * len(inputs)
+        written = 0
+        while written < total:
+            # Every row up to the cutoff is in this window, so later windows only hold larger timestamps.
+            cutoff = min(
+                int(columns["ts"][min(position + step, len(columns["ts"])) - 1])
+                for (columns, _), position in zip(inputs, positions, strict=True)
+                if position < len(columns["ts"])
+            )
+            pieces: dict[str, list[np.ndarray]] = {column: [] for column in COLUMNS}
+            for index, (columns, lookup) in enumerate(inputs):
+                position = positions[index]
+                end = position + int(np.searchsorted(columns["ts"][position:], cutoff, "right"))
+                for column, values in columns.items():
+                    window = values[position:end]
+                    pieces[column].append(lookup[window] if column == "name" and len(lookup) else window)
+                positions[index] = end
+            merged = {column: np.concatenate(values) for column, values in pieces.items()}
+            order = np.argsort(merged["ts"], kind="stable")
+            for column, values in merged.items():
+                output[column][written : written + len(order)] = values[order]
+            written += len(order)
+
+        min_ts, max_ts = int(output["ts"][0]), int(output["ts"][-1])
+        for values in output.values():
+            values.flush()
+        output.clear()
+        _write_json(
+            staging / META_FILE,
+            {
+                "rows": total,
+                "names": names,
+                "min_ts": min_ts,
+                "max_ts": max_ts,
+                "sorted": True,
+                "sources": [source.name for source in sources],
+                "created": time.time(),
+            },
+        )
+        final = self.root / f"part-{part_id}"
+        staging.rename(final)
+        return final
+
+    @contextlib.contextmanager
+    def _maintenance_lock(self) -> Iterator[bool]:
+        """Try to take the store-wide maintenance lock without blocking."""
+        if sys.platform == "win32":  # pragma: no cover - no flock on Windows
+            yield True
+            return
+        with open(self.root / ".maintenance.lock", "a+") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+async def maintain_forever(store: EventStore, interval: float, retention_ms: int | None = None) -> None:
+    """Run ``store.maintain`` in a thread every ``interval`` seconds.
+
+    Args:
+        store: Event store to maintain.
+        interval: Seconds between runs.
+        retention_ms: Drop parts older than this many milliseconds.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(store.maintain, retention_ms)
+        except Exception:
+            logger.exception("Event store maintenance failed")
+
+
+def _reduce(
+    keys: np.ndarray,
+    count: np.ndarray,
+    total: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Group partial aggregates by key with sort + reduceat."""
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return (
+        keys[starts],
+        np.add.reduceat(count[order], starts),
+        np.add.reduceat(total[order], starts),
+        np.minimum.reduceat(low[order], starts),
+        np.maximum.reduceat(high[order], starts),
+    )
+
+
+def _intern(name: str, names: list[str], codes: dict[str, int]) -> int:
+    """Get the code of a name in a dictionary, adding it if new."""
+    code = codes.get(name)
+    if code is None:
+        code = codes[name] = len(names)
+        names.append(name)
+    return code
+
+
+def _process_alive(pid: int | None) -> bool:
+    """Check whether a process with this pid exists."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    """Write JSON atomically via a temporary file and rename."""
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
@@ -3,7 +3,7 @@
 from app.config import get_settings
 from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 settings = get_settings()
 
@@ -14,10 +14,20 @@ async_engine = create_async_engine(
     future=True,
 )
 
+
+class AppSession(Session):
+    """Synchronous session class behind ``AsyncSessionLocal``.
+
+    Session events cannot be attached to an ``async_sessionmaker`` directly, so
+    listeners (such as query cache invalidation) are registered on this class.
+    """
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
+    sync_session_class=AppSession,
     expire_on_commit=False,
 )
 
@@ -0,0 +1,42 @@
+"""SQLAlchemy models package.
+
+Import model modules here so they register on ``Base.metadata`` before the
+schema is initialized or migrations are autogenerated.
+"""
+
+from app.database.models.event import Event
+from app.database.models.job import Job, JobStatus
+from app.database.models.rollup import (
+    DayRollup,
+    DayUserSketch,
+    DayValueDigest,
+    HourRollup,
+    HourUserSketch,
+    HourValueDigest,
+    MinuteRollup,
+    MinuteUserSketch,
+    MinuteValueDigest,
+    RollupMixin,
+    RollupWatermark,
+    UserSketchMixin,
+    ValueDigestMixin,
+)
+
+__all__ = [
+    "DayRollup",
+    "DayUserSketch",
+    "DayValueDigest",
+    "Event",
+    "HourRollup",
+    "HourUserSketch",
+    "HourValueDigest",
+    "Job",
+    "JobStatus",
+    "MinuteRollup",
+    "MinuteUserSketch",
+    "MinuteValueDigest",
+    "RollupMixin",
+    "RollupWatermark",
+    "UserSketchMixin",
+    "ValueDigestMixin",
+]
@@ -0,0 +1,23 @@
+"""Raw analytics event model."""
+
+from app.database.connection import Base
+from sqlalchemy import BigInteger, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class Event(Base):
+    """A raw analytics event (page view, session start, purchase, ...).
+
+    ``ts`` is the event time in epoch milliseconds (UTC). ``id`` grows with
+    insertion order and drives incremental rollups, so late events with an
+    old ``ts`` are still picked up.
+    """
+
+    __tablename__ = "events"
+    __table_args__ = (Index("ix_events_name_ts", "name", "ts"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ts: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    user_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    value: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
@@ -0,0 +1,108 @@
+"""Time-bucket rollup models for events."""
+
+from app.database.connection import Base
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class RollupMixin:
+    """Columns shared by all rollup granularities.
+
+    One row aggregates the events of one name within the bucket starting at
+    ``bucket`` (epoch milliseconds, aligned to the granularity).
+    """
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class MinuteRollup(RollupMixin, Base):
+    """Per-minute event aggregates."""
+
+    __tablename__ = "event_rollups_minute"
+
+
+class HourRollup(RollupMixin, Base):
+    """Per-hour event aggregates."""
+
+    __tablename__ = "event_rollups_hour"
+
+
+class DayRollup(RollupMixin, Base):
+    """Per-day (UTC) event aggregates."""
+
+    __tablename__ = "event_rollups_day"
+
+
+class UserSketchMixin:
+    """HyperLogLog sketch of the distinct users of one name within a bucket.
+
+    Kept apart from the rollup rows so that count/sum queries do not read
+    sketch bytes. The name ``*`` covers users of all events.
+    """
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class MinuteUserSketch(UserSketchMixin, Base):
+    """Per-minute distinct-user sketches."""
+
+    __tablename__ = "event_user_sketches_minute"
+
+
+class HourUserSketch(UserSketchMixin, Base):
+    """Per-hour distinct-user sketches."""
+
+    __tablename__ = "event_user_sketches_hour"
+
+
+class DayUserSketch(UserSketchMixin, Base):
+    """Per-day (UTC) distinct-user sketches."""
+
+    __tablename__ = "event_user_sketches_day"
+
+
+class ValueDigestMixin:
+    """t-digest of the event values of one name within a bucket, for quantiles.
+
+    Kept apart from the rollup rows like the user sketches.
+    """
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class MinuteValueDigest(ValueDigestMixin, Base):
+    """Per-minute value digests."""
+
+    __tablename__ = "event_value_digests_minute"
+
+
+class HourValueDigest(ValueDigestMixin, Base):
+    """Per-hour value digests."""
+
+    __tablename__ = "event_value_digests_hour"
+
+
+class DayValueDigest(ValueDigestMixin, Base):
+    """Per-day (UTC) value digests."""
+
+    __tablename__ = "event_value_digests_day"
+
+
+class RollupWatermark(Base):
+    """Highest event id already folded into the rollup tables."""
+
+    __tablename__ = "rollup_watermarks"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
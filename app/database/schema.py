@@ -0,0 +1,249 @@
+"""Schema initialization gated by a stored schema fingerprint.
+
+Running ``Base.metadata.create_all`` on every process start inspects every
+table, which grows with the model count and contends when many workers boot
+at once. Instead, a SHA-256 fingerprint of the declared metadata is stored in
+the ``schema_state`` table: startup compares it with a single primary-key read
+and only runs DDL, under a cross-process lock, when it differs.
+
+``create_all`` only creates missing tables; it never alters existing ones. So
+when the fingerprint differs, tables that already exist are compared with the
+models first, and a table lacking a declared column or index raises
+``SchemaMismatchError`` instead of recording a fingerprint for a schema the
+database does not have.
+
+Production deployments should manage the schema with Alembic
+(``alembic upgrade head``) and set ``SCHEMA_INIT_MODE=migrations``; the
+migration environment records the fingerprint after upgrading to head.
+"""
+
+import app.database.models  # noqa: F401  (registers models on Base.metadata)
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from app.config import get_settings
+from app.database.connection import Base, async_engine
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from sqlalchemy import Column, Connection, DateTime, MetaData, String, Table, delete, insert, inspect, select, text
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STATE_KEY = "base"
+# Arbitrary constant identifying the schema lock for pg_advisory_xact_lock.
+_ADVISORY_LOCK_ID = 7_311_202_406
+
+
+class SchemaMismatchError(RuntimeError):
+    """Existing tables differ from the models in a way ``create_all`` cannot fix."""
+
+
+_state_metadata = MetaData()
+schema_state = Table(
+    "schema_state",
+    _state_metadata,
+    Column("key", String(64), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData = Base.metadata) -> str:
+    """Compute a stable fingerprint of the declared schema.
+
+    Args:
+        metadata: Metadata describing the expected schema.
+
+    Returns:
+        str: Hex SHA-256 digest of the tables, columns, keys and indexes.
+    """
+    description = [_describe_table(table) for table in sorted(metadata.tables.values(), key=lambda t: t.key)]
+    payload = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def ensure_schema(engine: AsyncEngine = async_engine, metadata: MetaData = Base.metadata) -> bool:
+    """Create missing tables unless the stored fingerprint is current.
+
+    Args:
+        engine: Engine to initialize.
+        metadata: Metadata describing the expected schema.
+
+    Returns:
+        bool: True if DDL was run, False if the schema was already current.
+
+    Raises:
+        SchemaMismatchError: If an existing table lacks a declared column or
+            index; such changes must be applied with Alembic.
+    """
+    fingerprint = schema_fingerprint(metadata)
+    if await stored_fingerprint(engine) == fingerprint:
+        return False
+
+    async with _ddl_lock(engine.url), engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+
+        # Another worker may have finished while we waited for the lock.
+        await conn.run_sync(_state_metadata.create_all)
+        if await _read_fingerprint(conn) == fingerprint:
+            return False
+
+        problems = await conn.run_sync(_compare_existing_tables, metadata)
+        if problems:
+            raise SchemaMismatchError(
+                "Database schema does not match the models and tables cannot be altered at startup "
+                f"({'; '.join(problems)}); run 'alembic upgrade head'"
+            )
+        logger.info("Schema fingerprint changed, creating missing tables")
+        await conn.run_sync(metadata.create_all)
+        await conn.run_sync(record_fingerprint, fingerprint)
+    return True
+
+
+async def stored_fingerprint(engine: AsyncEngine = async_engine) -> str | None:
+    """Read the stored schema fingerprint.
+
+    Args:
+        engine: Engine to read from.
+
+    Returns:
+        str | None: The stored fingerprint, or None if none has been recorded.
+    """
+    try:
+        async with engine.connect() as conn:
+            return await _read_fingerprint(conn)
+    except DBAPIError:
+        # The state table does not exist yet.
+        return None
+
+
+def record_fingerprint(connection: Connection, fingerprint: str | None = None) -> None:
+    """Store the schema fingerprint using a synchronous connection.
+
+    Used both by ``ensure_schema`` and by the Alembic environment after
+    migrating to head.
+
+    Args:
+        connection: Synchronous connection inside an open transaction.
+        fingerprint: Fingerprint to store; defaults to the current metadata's.
+    """
+    _state_metadata.create_all(connection)
+    connection.execute(delete(schema_state).where(schema_state.c.key == SCHEMA_STATE_KEY))
+    connection.execute(
+        insert(schema_state).values(
+            key=SCHEMA_STATE_KEY,
+            fingerprint=fingerprint or schema_fingerprint(),
+            applied_at=datetime.utcnow(),
+        )
+    )
+
+
+async def initialize_schema() -> None:
+    """Initialize the schema at startup according to ``schema_init_mode``.
+
+    ``auto`` creates missing tables when the fingerprint changed,
+    ``migrations`` only warns when the database is behind the models (run
+    ``alembic upgrade head``), and ``off`` skips the check entirely.
+    """
+    mode = get_settings().schema_init_mode
+    if mode == "auto":
+        await ensure_schema()
+    elif mode == "migrations":
+        if await stored_fingerprint() != schema_fingerprint():
+            logger.warning("Database schema does not match the models; run 'alembic upgrade head'")
+    elif mode != "off":
+        raise ValueError(f"Unknown schema_init_mode: {mode!r}")
+
+
+async def _read_fingerprint(conn: AsyncConnection) -> str | None:
+    """Read the stored fingerprint with a single primary-key lookup."""
+    result = await conn.execute(
+        select(schema_state.c.fingerprint).where(schema_state.c.key == SCHEMA_STATE_KEY)
+    )
+    return result.scalar_one_or_none()
+
+
+def _compare_existing_tables(connection: Connection, metadata: MetaData) -> list[str]:
+    """List the declared columns and indexes missing from tables that already exist."""
+    inspector = inspect(connection)
+    existing = set(inspector.get_table_names())
+    problems = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [column.name for column in table.columns if column.name not in columns]
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += [f"index {index.name}" for index in table.indexes if index.name and index.name not in indexes]
+        if missing:
+            problems.append(f"{table.name} lacks {', '.join(missing)}")
+    return problems
+
+
+def _describe_table(table: Table) -> dict[str, Any]:
+    """Build a canonical, JSON-serializable description of a table."""
+    return {
+        "name": table.fullname,
+        "columns": [
+            {
+                "name": column.name,
+                "type": str(column.type),
+                "nullable": column.nullable,
+                "primary_key": column.primary_key,
+                "default": str(column.server_default.arg) if column.server_default is not None else None,  # type: ignore[attr-defined]
+                "foreign_keys": sorted(fk.target_fullname for fk in column.foreign_keys),
+            }
+            for column in table.columns
+        ],
+        "indexes": sorted(
+            [index.name or "", [column.name for column in index.columns], bool(index.unique)]
+            for index in table.indexes
+        ),
+        "constraints": sorted(
+            [type(constraint).__name__, constraint.name or "", sorted(column.name for column in constraint.columns)]
+            for constraint in table.constraints
+            if hasattr(constraint, "columns")
+        ),
+    }
+
+
+@asynccontextmanager
+async def _ddl_lock(url: URL) -> AsyncIterator[None]:
+    """Serialize schema initialization across worker processes on this host.
+
+    Uses an advisory file lock in the temp directory, named after the
+    database (the absolute path of a SQLite file). PostgreSQL additionally
+    takes a transaction-scoped advisory lock, which also covers other hosts.
+    """
+    database = url.database
+    if fcntl is None or not database or database == ":memory:":
+        yield
+        return
+
+    if url.get_backend_name() == "sqlite":
+        key = os.path.abspath(database)
+    else:
+        key = url.render_as_string(hide_password=True)
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    path = os.path.join(tempfile.gettempdir(), f"schema-{digest}.lock")
+
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
@@ -1,10 +1,23 @@
 """FastAPI dependencies for dependency injection."""
 
 from app.config import Settings, get_settings
+from app.core.security import AuthenticationError, PasswordHasher, TokenVerifier
+from app.core.services.activity import ActivityFeed
+from app.core.services.compute import ComputePool
+from app.core.services.ingest import EventIngestor
+from app.core.services.jobs import JobManager
+from app.core.services.rollups import RollupService
+from app.core.services.uploads import UploadManager
+from app.database.cache import QueryCache, get_query_cache
+from app.database.columnar import EventStore
 from app.database.connection import get_async_session
-from fastapi import Depends
+from collections.abc import AsyncGenerator, Mapping
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated
+from typing import Annotated, Any
+
+_bearer = HTTPBearer(auto_error=False)
 
 
 def get_current_settings() -> Settings:
@@ -16,7 +29,7 @@ def get_current_settings() -> Settings:
     return get_settings()
 
 
-async def get_db_session() -> AsyncSession:
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session.
 
     Yields:
@@ -26,6 +39,179 @@ async def get_db_session() -> AsyncSession:
         yield session
 
 
+def get_current_query_cache() -> QueryCache | None:
+    """Get the query result cache.
+
+    Returns:
+        QueryCache | None: Process-wide query cache, or None when disabled.
+    """
+    return get_query_cache()
+
+
+def get_job_manager(request: Request) -> JobManager:
+    """Get the background job manager started by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        JobManager: Job manager of this process.
+    """
+    manager: JobManager = request.app.state.job_manager
+    return manager
+
+
+def get_compute_pool(request: Request) -> ComputePool:
+    """Get the process pool for CPU-bound work started by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        ComputePool: Compute pool of this process.
+    """
+    pool: ComputePool = request.app.state.compute_pool
+    return pool
+
+
+def get_rollup_service(request: Request) -> RollupService:
+    """Get the event rollup service started by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        RollupService: Rollup service of this process.
+    """
+    rollups: RollupService = request.app.state.rollups
+    return rollups
+
+
+def get_event_ingestor(request: Request) -> EventIngestor:
+    """Get the event ingestion buffer started by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        EventIngestor: Event ingestor of this process.
+    """
+    ingestor: EventIngestor = request.app.state.ingestor
+    return ingestor
+
+
+def get_event_store(request: Request) -> EventStore | None:
+    """Get the columnar event store opened by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        EventStore | None: Event store, or None when disabled.
+    """
+    store: EventStore | None = request.app.state.event_store
+    return store
+
+
+def get_activity_feed(request: Request) -> ActivityFeed:
+    """Get the recent-activity feed created by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        ActivityFeed: Activity feed of this process.
+    """
+    feed: ActivityFeed = request.app.state.activity
+    return feed
+
+
+def get_upload_manager(request: Request) -> UploadManager:
+    """Get the resumable upload store created by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        UploadManager: Upload manager of this process.
+    """
+    uploads: UploadManager = request.app.state.uploads
+    return uploads
+
+
+def get_password_hasher(request: Request) -> PasswordHasher:
+    """Get the password hasher created by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        PasswordHasher: Password hasher of this process.
+    """
+    hasher: PasswordHasher = request.app.state.password_hasher
+    return hasher
+
+
+def get_token_verifier(request: Request) -> TokenVerifier:
+    """Get the access token verifier created by the application lifespan.
+
+    Args:
+        request: Current request.
+
+    Returns:
+        TokenVerifier: Token verifier of this process.
+    """
+    verifier: TokenVerifier = request.app.state.token_verifier
+    return verifier
+
+
+async def get_current_claims(
+    request: Request, credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(_bearer)]
+) -> Mapping[str, Any]:
+    """Get the verified claims of the request's bearer token.
+
+    Async although it never awaits: FastAPI runs sync dependencies in a
+    thread pool, and for tokens seen before verification is a cache lookup,
+    far cheaper than the thread hop.
+
+    Args:
+        request: Current request.
+        credentials: Bearer credentials from the Authorization header.
+
+    Returns:
+        Mapping[str, Any]: Verified token claims (read-only).
+
+    Raises:
+        HTTPException: 401 if the token is missing, invalid or expired.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    verifier: TokenVerifier = request.app.state.token_verifier
+    try:
+        return verifier.verify(credentials.credentials)
+    except AuthenticationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+
+
 # Type aliases for common dependencies
 SettingsDep = Annotated[Settings, Depends(get_current_settings)]
 DBSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
+QueryCacheDep = Annotated[QueryCache | None, Depends(get_current_query_cache)]
+JobManagerDep = Annotated[JobManager, Depends(get_job_manager)]
+ComputePoolDep = Annotated[ComputePool, Depends(get_compute_pool)]
+RollupServiceDep = Annotated[RollupService, Depends(get_rollup_service)]
+EventIngestorDep = Annotated[EventIngestor, Depends(get_event_ingestor)]
+EventStoreDep = Annotated[EventStore | None, Depends(get_event_store)]
+ActivityFeedDep = Annotated[ActivityFeed, Depends(get_activity_feed)]
+UploadManagerDep = Annotated[UploadManager, Depends(get_upload_manager)]
+PasswordHasherDep = Annotated[PasswordHasher, Depends(get_password_hasher)]
+TokenVerifierDep = Annotated[TokenVerifier, Depends(get_token_verifier)]
+CurrentClaimsDep = Annotated[Mapping[str, Any], Depends(get_current_claims)]
@@ -1,28 +1,167 @@
 """FastAPI main application module."""
 
-from app.api.routes import health
+import asyncio
+import functools
+from app.api.middleware import LatencyMiddleware
+from app.api.routes import activity, events, health, jobs, timeseries, uploads
 from app.config import get_settings
-from app.database.connection import create_tables
-from contextlib import asynccontextmanager
+from app.core.security import PasswordHasher, TokenVerifier
+from app.core.services import csv_import  # noqa: F401  (registers the "csv_import" job handler)
+from app.core.services.activity import ActivityFeed
+from app.core.services.compute import ComputePool
+from app.core.services.ingest import EventIngestor
+from app.core.services.jobs import JobManager
+from app.core.services.latency import LatencyRecorder
+from app.core.services.rollups import DAY_MS, RollupService
+from app.core.services.uploads import UploadManager, sweep_forever
+from app.core.services.warmup import Warmup, build_validators, prime_pool, run_hot_queries
+from app.core.sketches import precision_for_error
+from app.database.columnar import EventStore, maintain_forever
+from app.database.cache import get_query_cache
+from app.database.connection import AsyncSessionLocal, async_engine
+from app.database.schema import initialize_schema
+from app.server import default_compute_workers
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import AsyncExitStack, asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from typing import Any
 
 settings = get_settings()
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI):
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
     """Application lifespan manager for startup and shutdown events.
 
+    Each service registers its shutdown as soon as it has started, so a
+    failed startup, or an error while serving, stops whatever was started,
+    in reverse order.
+
     Args:
-        _app: FastAPI application instance.
+        application: FastAPI application instance.
     """
-    # Startup
-    await create_tables()
-    yield
-    # Shutdown
-    # Add cleanup logic here if needed
+    async with AsyncExitStack() as stack:
+        # Startup
+        await initialize_schema()
+        compute_pool = ComputePool(
+            max_workers=settings.compute_workers or default_compute_workers(settings.web_concurrency),
+            task_timeout=settings.compute_task_timeout,
+            cancel_grace=settings.compute_cancel_grace,
+            share_threshold=settings.compute_share_threshold,
+        )
+        await compute_pool.start()
+        stack.push_async_callback(compute_pool.stop)
+        application.state.compute_pool = compute_pool
+        job_manager = JobManager(
+            AsyncSessionLocal,
+            workers=settings.job_workers,
+            queue_size=settings.job_queue_size,
+            lease_seconds=settings.job_lease_seconds,
+        )
+        await job_manager.start()
+        stack.push_async_callback(job_manager.stop, settings.job_shutdown_timeout)
+        application.state.job_manager = job_manager
+        rollups = RollupService(
+            AsyncSessionLocal,
+            batch_size=settings.rollup_batch_size,
+            interval=settings.rollup_interval,
+            retention_days={
+                "minute": settings.rollup_minute_retention_days,
+                "hour": settings.rollup_hour_retention_days,
+                "day": settings.rollup_day_retention_days,
+            },
+            event_retention_days=settings.event_retention_days,
+            distinct_precision=precision_for_error(settings.distinct_error),
+            digest_compression=settings.digest_compression,
+        )
+        await rollups.start()
+        stack.push_async_callback(rollups.stop)
+        application.state.rollups = rollups
+        event_store = None
+        if settings.event_store_enabled:
+            event_store = EventStore(
+                settings.event_store_path,
+                segment_rows=settings.event_store_segment_rows,
+                rotate_seconds=settings.event_store_rotate_seconds,
+                compact_rows=settings.event_store_compact_rows,
+            )
+            stack.push_async_callback(asyncio.to_thread, event_store.close)
+            _start_task(
+                stack,
+                maintain_forever(
+                    event_store,
+                    settings.event_store_maintenance_interval,
+                    int(settings.event_store_retention_days * DAY_MS) or None,
+                ),
+            )
+        application.state.event_store = event_store
+        application.state.activity = ActivityFeed(settings.activity_capacity)
+        ingestor = EventIngestor(
+            AsyncSessionLocal,
+            max_buffered=settings.ingest_buffer_size,
+            batch_size=settings.ingest_batch_size,
+            flush_interval=settings.ingest_flush_interval,
+            on_commit=rollups.notify,
+            event_store=event_store,
+            activity_feed=application.state.activity,
+            max_attempts=settings.ingest_max_attempts,
+            dead_letter=settings.ingest_dead_letter_path or None,
+        )
+        await ingestor.start()
+        stack.push_async_callback(ingestor.stop)
+        application.state.ingestor = ingestor
+        application.state.password_hasher = PasswordHasher(
+            rounds=settings.password_hash_rounds,
+            max_workers=settings.password_hash_workers,
+            max_concurrency=settings.password_hash_concurrency,
+        )
+        stack.push_async_callback(asyncio.to_thread, application.state.password_hasher.close)
+        application.state.uploads = UploadManager(
+            settings.upload_dir, max_bytes=settings.upload_max_bytes, chunk_size=settings.upload_chunk_size
+        )
+        if settings.upload_ttl_hours:
+            _start_task(
+                stack,
+                sweep_forever(
+                    application.state.uploads, settings.upload_sweep_interval, settings.upload_ttl_hours * 3600
+                ),
+            )
+        application.state.token_verifier = TokenVerifier(
+            settings.secret_key,
+            settings.algorithm,
+            max_entries=settings.token_cache_size,
+            ttl=settings.token_cache_ttl,
+        )
+        if settings.warmup_enabled:
+            # Runs while the server already accepts requests; /health/ready gates traffic on it.
+            application.state.warmup = Warmup(
+                {
+                    "database_pool": functools.partial(prime_pool, async_engine, settings.warmup_pool_connections),
+                    "hot_queries": functools.partial(
+                        run_hot_queries, AsyncSessionLocal, rollups, event_store, get_query_cache()
+                    ),
+                    "validators": functools.partial(
+                        build_validators, application, (list[events.EventIn], events.EventIn)
+                    ),
+                },
+                deadline=settings.warmup_deadline,
+            )
+            _start_task(stack, application.state.warmup.run())
+        yield
+        # Shutdown: the exit stack stops the services in reverse order.
+
+
+def _start_task(stack: AsyncExitStack, coroutine: Coroutine[Any, Any, Any]) -> None:
+    """Run a background coroutine until the exit stack unwinds, then cancel and await it."""
+    task = asyncio.create_task(coroutine)
+
+    async def cancel() -> None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    stack.push_async_callback(cancel)
 
 
 # Create FastAPI application
@@ -50,8 +189,18 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", settings.api_host],
 )
 
+# Added last so it is outermost and times the whole middleware stack
+if settings.latency_metrics_enabled:
+    app.state.latency = LatencyRecorder(window_seconds=settings.latency_window_seconds)
+    app.add_middleware(LatencyMiddleware, recorder=app.state.latency)
+
 # Include routers
 app.include_router(health.router, prefix=settings.api_prefix)
+app.include_router(events.router, prefix=settings.api_prefix)
+app.include_router(jobs.router, prefix=settings.api_prefix)
+app.include_router(timeseries.router, prefix=settings.api_prefix)
+app.include_router(activity.router, prefix=settings.api_prefix)
+app.include_router(uploads.router, prefix=settings.api_prefix)
 
 
 @app.get("/")
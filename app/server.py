@@ -0,0 +1,191 @@
+"""Production server launcher sized to the available CPUs."""
+
+import importlib.util
+import inspect
+import math
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+APP_IMPORT_PATH = "app.main:app"
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+@dataclass(frozen=True)
+class ServerOptions:
+    """Options for running the API with multiple worker processes."""
+
+    host: str
+    port: int
+    workers: int
+    log_level: str = "info"
+    backlog: int = 2048
+    keep_alive: int = 5
+    max_requests: int = 10_000
+    max_requests_jitter: int = 1_000
+    graceful_timeout: int = 30
+    timeout: int = 60
+    preload: bool = True
+    access_log: bool = False
+
+
+def available_cpus(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """Count the CPUs this process may actually use.
+
+    Takes the minimum of the scheduler affinity mask and any CFS quota set by
+    cgroup v2 (``cpu.max``) or v1 (``cpu.cfs_quota_us``), so containers with a
+    CPU limit are not oversubscribed.
+
+    Args:
+        cgroup_root: Mount point of the cgroup filesystem.
+
+    Returns:
+        int: Number of usable CPUs (at least 1).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover - macOS/Windows
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+def default_workers(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """Get the default worker count: one async worker per usable CPU.
+
+    Args:
+        cgroup_root: Mount point of the cgroup filesystem.
+
+    Returns:
+        int: Number of worker processes.
+    """
+    return available_cpus(cgroup_root)
+
+
+def default_compute_workers(server_workers: int = 1, cgroup_root: Path = CGROUP_ROOT) -> int:
+    """Get the default compute pool size of one API worker process.
+
+    Every API worker starts its own pool, so the usable CPUs minus one (left
+    for the event loops) are divided among them.
+
+    Args:
+        server_workers: Number of API worker processes on this host.
+        cgroup_root: Mount point of the cgroup filesystem.
+
+    Returns:
+        int: Number of compute processes (at least 1).
+    """
+    return max(1, (available_cpus(cgroup_root) - 1) // max(1, server_workers))
+
+
+def gunicorn_available() -> bool:
+    """Check whether gunicorn is installed (``production`` extra)."""
+    return importlib.util.find_spec("gunicorn") is not None
+
+
+def event_loop_implementation() -> str:
+    """Get the fastest installed event loop implementation name."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_implementation() -> str:
+    """Get the fastest installed HTTP/1.1 parser implementation name."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def build_gunicorn_command(options: ServerOptions) -> list[str]:
+    """Build the gunicorn command line running uvicorn workers.
+
+    Args:
+        options: Server options.
+
+    Returns:
+        list[str]: Command line arguments.
+    """
+    worker_class = (
+        "uvicorn_worker.UvicornWorker"
+        if importlib.util.find_spec("uvicorn_worker")
+        else "uvicorn.workers.UvicornWorker"
+    )
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        APP_IMPORT_PATH,
+        "--worker-class",
+        worker_class,
+        "--workers",
+        str(options.workers),
+        "--bind",
+        f"{options.host}:{options.port}",
+        "--backlog",
+        str(options.backlog),
+        "--keep-alive",
+        str(options.keep_alive),
+        "--max-requests",
+        str(options.max_requests),
+        "--max-requests-jitter",
+        str(options.max_requests_jitter),
+        "--graceful-timeout",
+        str(options.graceful_timeout),
+        "--timeout",
+        str(options.timeout),
+        "--log-level",
+        options.log_level,
+    ]
+    if options.preload:
+        command.append("--preload")
+    if options.access_log:
+        command.extend(["--access-logfile", "-"])
+    return command
+
+
+def run_uvicorn(options: ServerOptions) -> None:
+    """Run the API with uvicorn's own multi-process supervisor.
+
+    Uvicorn cannot preload the application; each worker imports it.
+
+    Args:
+        options: Server options.
+    """
+    import uvicorn
+
+    kwargs = {
+        "host": options.host,
+        "port": options.port,
+        "workers": options.workers,
+        "loop": event_loop_implementation(),
+        "http": http_implementation(),
+        "backlog": options.backlog,
+        "timeout_keep_alive": options.keep_alive,
+        "limit_max_requests": options.max_requests or None,
+        "timeout_graceful_shutdown": options.graceful_timeout,
+        "log_level": options.log_level,
+        "access_log": options.access_log,
+    }
+    if "limit_max_requests_jitter" in inspect.signature(uvicorn.run).parameters:
+        kwargs["limit_max_requests_jitter"] = options.max_requests_jitter
+
+    uvicorn.run(APP_IMPORT_PATH, **kwargs)  # type: ignore[arg-type]
+
+
+def _cgroup_cpu_quota(cgroup_root: Path) -> float | None:
+    """Read the CFS CPU quota in CPUs, or None when unlimited or unknown."""
+    try:
+        cpu_max = (cgroup_root / "cpu.max").read_text().split()
+        if cpu_max and cpu_max[0] != "max":
+            return int(cpu_max[0]) / int(cpu_max[1])
+        return None
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        quota = int((cgroup_root / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((cgroup_root / "cpu" / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
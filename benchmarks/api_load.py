@@ -0,0 +1,418 @@
+"""Asynchronous HTTP load generator for the FastAPI application.
+
+Scenarios are lists of weighted requests. Built-in scenarios cover the health
+endpoints; others (list/pagination, batch, export) are described in a JSON
+file::
+
+    {
+      "name": "items",
+      "requests": [
+        {"path": "{api_prefix}/items", "params": {"page": "{page}", "size": 50}, "pages": 20},
+        {"method": "POST", "path": "{api_prefix}/items/batch", "json": [{"name": "a"}], "weight": 2},
+        {"path": "{api_prefix}/items/export", "params": {"format": "csv"}}
+      ]
+    }
+
+``pages`` expands a request into one request per page, substituting
+``{page}``. Two load models are supported: closed loop (a fixed number of
+concurrent clients issuing back-to-back requests) and open loop (requests
+started at a fixed arrival rate, with latency measured from the scheduled
+start so queueing delay is not hidden).
+"""
+
+import asyncio
+import httpx
+import itertools
+import json
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """A single request issued by a scenario."""
+
+    path: str
+    method: str = "GET"
+    params: dict[str, Any] | None = None
+    json: Any = None
+    weight: int = 1
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A named, weighted mix of requests."""
+
+    name: str
+    requests: list[RequestSpec]
+    description: str = ""
+
+    def schedule(self) -> list[RequestSpec]:
+        """Expand weights into a flat round-robin request schedule."""
+        return [spec for spec in self.requests for _ in range(max(1, spec.weight))]
+
+
+BUILTIN_SCENARIOS = {
+    "health": Scenario(
+        name="health",
+        description="Basic, liveness and readiness health endpoints",
+        requests=[
+            RequestSpec("{api_prefix}/health/"),
+            RequestSpec("{api_prefix}/health/live"),
+            RequestSpec("{api_prefix}/health/ready"),
+        ],
+    ),
+    "health-detailed": Scenario(
+        name="health-detailed",
+        description="Detailed health check including the database round trip",
+        requests=[RequestSpec("{api_prefix}/health/detailed")],
+    ),
+}
+
+
+@dataclass
+class LoadResult:
+    """Measurements collected during a load run."""
+
+    latencies: list[float] = field(default_factory=list)
+    status_codes: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def record(self, latency: float, status: str, ok: bool) -> None:
+        """Record one completed request."""
+        self.latencies.append(latency)
+        self.status_codes[status] += 1
+        if not ok:
+            self.errors += 1
+
+
+def load_scenario(name_or_path: str, api_prefix: str) -> Scenario:
+    """Load a built-in scenario by name or a custom one from a JSON file.
+
+    Args:
+        name_or_path: Built-in scenario name or path to a scenario JSON file.
+        api_prefix: API prefix substituted for ``{api_prefix}`` in paths.
+
+    Returns:
+        Scenario: Scenario with placeholders and pages expanded.
+
+    Raises:
+        ValueError: If the scenario is unknown or malformed.
+    """
+    if name_or_path in BUILTIN_SCENARIOS:
+        scenario = BUILTIN_SCENARIOS[name_or_path]
+        raw_requests: list[dict[str, Any]] = [
+            {"path": spec.path, "method": spec.method, "params": spec.params, "json": spec.json, "weight": spec.weight}
+            for spec in scenario.requests
+        ]
+        name, description = scenario.name, scenario.description
+    else:
+        path = Path(name_or_path)
+        if not path.is_file():
+            raise ValueError(f"Unknown scenario {name_or_path!r}; built-ins: {', '.join(BUILTIN_SCENARIOS)}")
+        data = json.loads(path.read_text())
+        raw_requests = data.get("requests") or []
+        name, description = data.get("name", path.stem), data.get("description", "")
+
+    requests = [
+        spec
+        for raw in raw_requests
+        for spec in _expand_request(raw, api_prefix)
+    ]
+    if not requests:
+        raise ValueError(f"Scenario {name!r} has no requests")
+    return Scenario(name=name, requests=requests, description=description)
+
+
+@asynccontextmanager
+async def open_client(url: str | None, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Open a client against a URL, or against the app in-process.
+
+    In-process runs go through ``httpx.ASGITransport`` with the application
+    lifespan started, so middleware and routing are exercised without sockets;
+    the client is yielded once ``/health/ready`` reports the warm-up done.
+
+    Args:
+        url: Base URL of a running API, or None for in-process.
+        concurrency: Expected number of concurrent requests (sizes the pool).
+
+    Yields:
+        httpx.AsyncClient: Client to issue requests with.
+    """
+    if url:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+            yield client
+        return
+
+    from app.main import app, settings
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=30.0) as client:
+            # Like a load balancer, send traffic only once the startup warm-up is done.
+            while (await client.get(f"{settings.api_prefix}/health/ready")).status_code == 503:
+                await asyncio.sleep(0.01)
+            yield client
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+) -> LoadResult:
+    """Drive the scenario with a fixed number of concurrent clients.
+
+    Args:
+        client: HTTP client.
+        scenario: Scenario to run.
+        concurrency: Number of concurrent clients.
+        duration: Run time in seconds.
+
+    Returns:
+        LoadResult: Collected measurements.
+    """
+    result = LoadResult()
+    schedule = scenario.schedule()
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset: int) -> None:
+        for spec in itertools.islice(itertools.cycle(schedule), offset % len(schedule), None):
+            if time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            status, ok = await _send(client, spec)
+            result.record(time.perf_counter() - started, status, ok)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    rate: float,
+    duration: float,
+    max_in_flight: int = 10_000,
+) -> LoadResult:
+    """Drive the scenario at a fixed arrival rate.
+
+    Latency is measured from each request's scheduled start time, so time
+    spent waiting behind a slow server counts against it.
+
+    Args:
+        client: HTTP client.
+        scenario: Scenario to run.
+        rate: Requests started per second.
+        duration: Run time in seconds.
+        max_in_flight: Upper bound on concurrently outstanding requests.
+
+    Returns:
+        LoadResult: Collected measurements.
+    """
+    result = LoadResult()
+    schedule = scenario.schedule()
+    slots = asyncio.Semaphore(max_in_flight)
+    total = max(1, int(rate * duration))
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def fire(spec: RequestSpec, scheduled: float) -> None:
+        try:
+            status, ok = await _send(client, spec)
+            result.record(time.perf_counter() - scheduled, status, ok)
+        finally:
+            slots.release()
+
+    started = time.perf_counter()
+    for index in range(total):
+        scheduled = started + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        task = asyncio.create_task(fire(schedule[index % len(schedule)], scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_benchmark(
+    scenario: Scenario,
+    url: str | None = None,
+    concurrency: int = 16,
+    rate: float | None = None,
+    duration: float = 10.0,
+    warmup: float = 1.0,
+) -> dict[str, Any]:
+    """Run a scenario and summarize the results.
+
+    Args:
+        scenario: Scenario to run.
+        url: Base URL of a running API, or None to run the app in-process.
+        concurrency: Concurrent clients (closed loop) or connection pool size.
+        rate: Fixed arrival rate in requests/second; None for closed loop.
+        duration: Measured run time in seconds.
+        warmup: Unmeasured closed-loop warm-up time in seconds.
+
+    Returns:
+        dict[str, Any]: JSON-serializable summary.
+    """
+    async with open_client(url, concurrency) as client:
+        if warmup > 0:
+            await run_closed_loop(client, scenario, concurrency, warmup)
+
+        if rate:
+            result = await run_open_loop(client, scenario, rate, duration)
+        else:
+            result = await run_closed_loop(client, scenario, concurrency, duration)
+
+    return summarize(result, scenario, url=url, concurrency=concurrency, rate=rate)
+
+
+def summarize(
+    result: LoadResult,
+    scenario: Scenario,
+    url: str | None,
+    concurrency: int,
+    rate: float | None,
+) -> dict[str, Any]:
+    """Build the JSON report for a load run.
+
+    Args:
+        result: Collected measurements.
+        scenario: Scenario that was run.
+        url: Target URL, or None for in-process.
+        concurrency: Concurrency used.
+        rate: Arrival rate used, if any.
+
+    Returns:
+        dict[str, Any]: Report with throughput and latency percentiles in ms.
+    """
+    latencies = sorted(result.latencies)
+    count = len(latencies)
+    latency_ms = {name: percentile(latencies, q) * 1000 for name, q in PERCENTILES.items()}
+    latency_ms["mean"] = (sum(latencies) / count * 1000) if count else 0.0
+    latency_ms["max"] = (latencies[-1] * 1000) if count else 0.0
+
+    return {
+        "scenario": scenario.name,
+        "target": url or "in-process",
+        "mode": "open" if rate else "closed",
+        "concurrency": concurrency,
+        "rate": rate,
+        "timestamp": datetime.utcnow().isoformat(),
+        "duration_s": result.elapsed,
+        "requests": count,
+        "errors": result.errors,
+        "throughput_rps": count / result.elapsed if result.elapsed else 0.0,
+        "latency_ms": latency_ms,
+        "status_codes": dict(result.status_codes),
+    }
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Get the nearest-rank percentile of pre-sorted values.
+
+    Args:
+        sorted_values: Values in ascending order.
+        q: Percentile in [0, 100].
+
+    Returns:
+        float: The percentile value, or 0.0 for no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_throughput_drop: float = 0.10,
+    max_latency_increase: float = 0.20,
+) -> list[str]:
+    """Compare a run against a stored baseline.
+
+    Args:
+        current: Report of the current run.
+        baseline: Report of the baseline run.
+        max_throughput_drop: Allowed relative throughput decrease.
+        max_latency_increase: Allowed relative increase of each latency percentile.
+
+    Returns:
+        list[str]: Human-readable regressions; empty if within thresholds.
+    """
+    regressions = []
+
+    base_rps, rps = baseline["throughput_rps"], current["throughput_rps"]
+    if base_rps and rps < base_rps * (1 - max_throughput_drop):
+        regressions.append(f"throughput {rps:.1f} rps < baseline {base_rps:.1f} rps (-{1 - rps / base_rps:.1%})")
+
+    for name in PERCENTILES:
+        base_ms, ms = baseline["latency_ms"].get(name), current["latency_ms"].get(name)
+        if base_ms and ms is not None and ms > base_ms * (1 + max_latency_increase):
+            regressions.append(f"{name} {ms:.2f} ms > baseline {base_ms:.2f} ms (+{ms / base_ms - 1:.1%})")
+
+    if current["errors"] > baseline["errors"]:
+        regressions.append(f"errors {current['errors']} > baseline {baseline['errors']}")
+
+    return regressions
+
+
+async def _send(client: httpx.AsyncClient, spec: RequestSpec) -> tuple[str, bool]:
+    """Send one request, reading the full body; returns (status, ok)."""
+    try:
+        async with client.stream(spec.method, spec.path, params=spec.params, json=spec.json) as response:
+            async for _ in response.aiter_raw():
+                pass
+        return str(response.status_code), response.is_success
+    except httpx.HTTPError as e:
+        return type(e).__name__, False
+
+
+def _expand_request(raw: dict[str, Any], api_prefix: str) -> list[RequestSpec]:
+    """Build request specs from a raw scenario entry, expanding ``pages``."""
+    if "path" not in raw:
+        raise ValueError(f"Scenario request is missing 'path': {raw}")
+
+    pages = int(raw.get("pages") or 0)
+    specs = []
+    for page in range(1, pages + 1) if pages else [None]:
+        substitutions = {"api_prefix": api_prefix, "page": page}
+        params = raw.get("params")
+        specs.append(
+            RequestSpec(
+                path=_substitute(raw["path"], substitutions),
+                method=raw.get("method", "GET").upper(),
+                params={key: _substitute(value, substitutions) for key, value in params.items()} if params else None,
+                json=raw.get("json"),
+                weight=int(raw.get("weight", 1)),
+            )
+        )
+    return specs
+
+
+def _substitute(value: Any, substitutions: dict[str, Any]) -> Any:
+    """Replace ``{name}`` placeholders in string values."""
+    if not isinstance(value, str):
+        return value
+    for name, replacement in substitutions.items():
+        if replacement is not None:
+            value = value.replace(f"{{{name}}}", str(replacement))
+    return value
@@ -0,0 +1,314 @@
+"""Headless render benchmark for the Streamlit pages.
+
+Each page is executed through Streamlit's ``AppTest`` against a local stub API
+that answers every request with canned JSON and counts calls. For each page
+the benchmark records the cold run (project modules and Streamlit caches
+cleared), the mean/p50/max of repeated reruns, API calls made per run and the
+peak Python memory allocated by a run.
+"""
+
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
+
+STUB_RESPONSES: dict[str, dict[str, Any]] = {
+    "/health/": {
+        "status": "healthy",
+        "timestamp": "2024-01-01T00:00:00",
+        "version": "1.0.0",
+        "environment": "benchmark",
+    },
+    "/health/detailed": {
+        "status": "healthy",
+        "timestamp": "2024-01-01T00:00:00",
+        "version": "1.0.0",
+        "environment": "benchmark",
+        "services": {"database": {"status": "healthy"}, "api": {"status": "healthy"}},
+    },
+    "/timeseries": {
+        "start": 1_704_067_200_000,
+        "end": 1_704_326_400_000,
+        "granularity": "day",
+        "step_ms": 86_400_000,
+        "source": "rollups",
+        "timestamps": [1_704_067_200_000, 1_704_153_600_000, 1_704_240_000_000],
+        "series": {
+            "purchase:sum": [1200.0, 0.0, 980.5],
+            "purchase:count": [12.0, 0.0, 9.0],
+            "signup:count": [30.0, 25.0, 41.0],
+            "session_start:count": [400.0, 380.0, 415.0],
+            "page_view:count": [2100.0, 1950.0, 2230.0],
+            "page_view:distinct": [830.0, 790.0, 905.0],
+            "*:distinct": [1020.0, 960.0, 1110.0],
+            "session_end:p50": [265.0, 250.0, 281.0],
+            "session_end:p95": [1310.0, 1190.0, 1402.0],
+        },
+        "totals": {
+            "purchase:sum": 2180.5,
+            "purchase:count": 21.0,
+            "signup:count": 96.0,
+            "session_start:count": 1195.0,
+            "page_view:count": 6280.0,
+            "page_view:distinct": 1874.0,
+            "*:distinct": 2310.0,
+            "session_end:p50": 268.0,
+            "session_end:p95": 1325.0,
+        },
+        "errors": {"page_view:distinct": 0.0081, "*:distinct": 0.0081},
+    },
+    "/activity": {
+        "items": [
+            {"cursor": 41, "ts": 1_704_326_280_000, "name": "signup", "user_id": "user-17", "value": 0.0},
+            {"cursor": 42, "ts": 1_704_326_340_000, "name": "purchase", "user_id": "user-17", "value": 129.99},
+        ],
+        "cursor": 42,
+        "feed": "stub",
+        "missed": 0,
+    },
+    "/events": {
+        "items": [
+            {"id": 42, "ts": 1_704_326_340_000, "name": "purchase", "user_id": "user-17", "value": 129.99},
+            {"id": 41, "ts": 1_704_326_280_000, "name": "signup", "user_id": "user-17", "value": 0.0},
+        ],
+        "total": 2,
+        "page": 1,
+        "size": 50,
+        "pages": 1,
+    },
+}
+
+
+class StubAPI:
+    """Threaded HTTP server answering API requests with canned JSON."""
+
+    def __init__(self, api_prefix: str = "/api/v1") -> None:
+        """Initialize the stub.
+
+        Args:
+            api_prefix: Prefix stripped before looking up canned responses.
+        """
+        self.api_prefix = api_prefix
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the stub server."""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def total_calls(self) -> int:
+        """Total number of requests served."""
+        with self._lock:
+            return sum(self.calls.values())
+
+    def __enter__(self) -> "StubAPI":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        """Build the request handler class bound to this stub."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                self._respond()
+
+            def do_POST(self) -> None:  # noqa: N802
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                self._respond()
+
+            def _respond(self) -> None:
+                path = self.path.split("?", 1)[0].removeprefix(stub.api_prefix)
+                with stub._lock:
+                    stub.calls[path] += 1
+                body = json.dumps(STUB_RESPONSES.get(path, {})).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def discover_pages() -> dict[str, Path]:
+    """Find the Streamlit entrypoint and multipage scripts.
+
+    Returns:
+        dict[str, Path]: Page name to script path.
+    """
+    pages = {"main": FRONTEND_DIR / "main.py"}
+    for path in sorted((FRONTEND_DIR / "pages").glob("*.py")):
+        pages[path.stem] = path
+    return pages
+
+
+def benchmark_page(script: Path, stub: StubAPI, reruns: int = 10, timeout: float = 60.0) -> dict[str, Any]:
+    """Benchmark one page.
+
+    Args:
+        script: Path to the Streamlit script.
+        stub: Running stub API the frontend is pointed at.
+        reruns: Number of measured reruns after the cold run.
+        timeout: Per-run timeout in seconds.
+
+    Returns:
+        dict[str, Any]: Timings in milliseconds, API call counts and peak memory.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    _reset_frontend_state()
+    app_test = AppTest.from_file(str(script), default_timeout=timeout)
+
+    calls_before = stub.total_calls
+    started = time.perf_counter()
+    app_test.run()
+    cold_ms = (time.perf_counter() - started) * 1000
+    cold_calls = stub.total_calls - calls_before
+
+    rerun_ms = []
+    calls_before = stub.total_calls
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app_test.run()
+        rerun_ms.append((time.perf_counter() - started) * 1000)
+    rerun_calls = stub.total_calls - calls_before
+
+    # Measured separately: tracing allocations slows execution considerably.
+    tracemalloc.start()
+    try:
+        app_test.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "script": str(script.relative_to(FRONTEND_DIR.parent)),
+        "cold_run_ms": cold_ms,
+        "rerun_ms": {
+            "mean": statistics.fmean(rerun_ms) if rerun_ms else 0.0,
+            "p50": statistics.median(rerun_ms) if rerun_ms else 0.0,
+            "max": max(rerun_ms, default=0.0),
+        },
+        "api_calls_cold": cold_calls,
+        "api_calls_per_rerun": rerun_calls / reruns if reruns else 0.0,
+        "peak_memory_kib": peak / 1024,
+        "exceptions": [str(exception.value) for exception in app_test.exception],
+    }
+
+
+def run_benchmark(pages: list[str] | None = None, reruns: int = 10) -> dict[str, Any]:
+    """Benchmark the selected pages against a stub API.
+
+    Args:
+        pages: Page names to run (default: all discovered pages).
+        reruns: Number of measured reruns per page.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report keyed by page name.
+
+    Raises:
+        ValueError: If an unknown page is requested.
+    """
+    available = discover_pages()
+    selected = pages or list(available)
+    unknown = sorted(set(selected) - set(available))
+    if unknown:
+        raise ValueError(f"Unknown page(s): {', '.join(unknown)}; available: {', '.join(available)}")
+
+    with StubAPI() as stub, _frontend_env(API_BASE_URL=stub.base_url, API_PREFIX=stub.api_prefix):
+        results = {name: benchmark_page(available[name], stub, reruns) for name in selected}
+
+    return {"timestamp": datetime.utcnow().isoformat(), "reruns": reruns, "pages": results}
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_time_increase: float = 0.25,
+    max_memory_increase: float = 0.25,
+) -> list[str]:
+    """Compare a run against a stored baseline.
+
+    Args:
+        current: Report of the current run.
+        baseline: Report of the baseline run.
+        max_time_increase: Allowed relative increase of cold and mean rerun time.
+        max_memory_increase: Allowed relative increase of peak memory.
+
+    Returns:
+        list[str]: Human-readable regressions; empty if within thresholds.
+    """
+    regressions = []
+    for name, page in current["pages"].items():
+        base = baseline.get("pages", {}).get(name)
+        if base is None:
+            continue
+
+        checks = [
+            ("cold run", page["cold_run_ms"], base["cold_run_ms"], max_time_increase, "ms"),
+            ("mean rerun", page["rerun_ms"]["mean"], base["rerun_ms"]["mean"], max_time_increase, "ms"),
+            ("peak memory", page["peak_memory_kib"], base["peak_memory_kib"], max_memory_increase, "KiB"),
+        ]
+        for label, value, base_value, threshold, unit in checks:
+            if base_value and value > base_value * (1 + threshold):
+                regressions.append(
+                    f"{name}: {label} {value:.1f} {unit} > baseline {base_value:.1f} {unit} (+{value / base_value - 1:.1%})"
+                )
+
+        if page["api_calls_per_rerun"] > base["api_calls_per_rerun"]:
+            regressions.append(
+                f"{name}: {page['api_calls_per_rerun']:g} API calls per rerun > baseline {base['api_calls_per_rerun']:g}"
+            )
+    return regressions
+
+
+def _reset_frontend_state() -> None:
+    """Drop imported frontend modules and Streamlit caches for a cold run."""
+    import streamlit as st
+
+    for module in [name for name in sys.modules if name == "frontend" or name.startswith("frontend.")]:
+        del sys.modules[module]
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+@contextmanager
+def _frontend_env(**values: str) -> Iterator[None]:
+    """Temporarily set environment variables read by ``FrontendSettings``."""
+    import streamlit.logger
+
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    streamlit.logger.set_log_level("error")
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
@@ -0,0 +1,115 @@
+"""Per-item cost of building and serializing paginated responses.
+
+Compares the validated path (``model_validate`` per row, then
+``PaginatedResponse.create``) with the trusted path (``BaseAPIModel.from_rows``
+and ``PaginatedResponse.create_trusted``) for pages built from database-style
+row mappings. Both pages are serialized the way FastAPI handles a
+``response_model``: validated against the response type, then dumped to JSON.
+"""
+
+import time
+from app.core.models.base import BaseAPIModel, PaginatedResponse, get_type_adapter
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+
+
+class BenchItem(BaseAPIModel):
+    """Representative list item as returned by a list endpoint."""
+
+    id: int
+    name: str
+    description: str | None = None
+    value: float
+    active: bool
+    created_at: datetime
+    tags: list[str]
+
+
+def make_rows(count: int) -> list[dict[str, Any]]:
+    """Build row mappings shaped like ``Repository.rows`` results.
+
+    Args:
+        count: Number of rows.
+
+    Returns:
+        list[dict[str, Any]]: Rows with correctly typed values.
+    """
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": index,
+            "name": f"item-{index}",
+            "description": None if index % 3 else f"description {index}",
+            "value": index * 0.5,
+            "active": index % 2 == 0,
+            "created_at": start + timedelta(seconds=index),
+            "tags": ["alpha", "beta"],
+        }
+        for index in range(count)
+    ]
+
+
+def build_validated(rows: list[dict[str, Any]]) -> PaginatedResponse:
+    """Build a page by validating every row."""
+    items = [BenchItem.model_validate(row) for row in rows]
+    return PaginatedResponse.create(items=items, total=len(rows), page=1, size=max(len(rows), 1))
+
+
+def build_trusted(rows: list[dict[str, Any]]) -> PaginatedResponse:
+    """Build a page from trusted rows without validation."""
+    items = BenchItem.from_rows(rows)
+    return PaginatedResponse.create_trusted(items=items, total=len(rows), page=1, size=max(len(rows), 1))
+
+
+def serialize(page: PaginatedResponse) -> bytes:
+    """Serialize a page the way FastAPI does for ``response_model``."""
+    adapter = get_type_adapter(PaginatedResponse)
+    return adapter.dump_json(adapter.validate_python(page))
+
+
+def run_benchmark(items: int = 10_000, repeat: int = 5) -> dict[str, Any]:
+    """Measure per-item build and serialization cost of both paths.
+
+    Args:
+        items: Items per page.
+        repeat: Timed repetitions; the fastest is reported.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report with microseconds per item.
+    """
+    rows = make_rows(items)
+    builders = {"validated": build_validated, "trusted": build_trusted}
+
+    paths: dict[str, dict[str, float]] = {}
+    payloads: dict[str, bytes] = {}
+    for name, build in builders.items():
+        page = build(rows)
+        payloads[name] = serialize(page)
+        build_us = _best_of(partial(build, rows), repeat) / max(items, 1)
+        serialize_us = _best_of(partial(serialize, page), repeat) / max(items, 1)
+        paths[name] = {
+            "build_us_per_item": build_us,
+            "serialize_us_per_item": serialize_us,
+            "total_us_per_item": build_us + serialize_us,
+        }
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "items": items,
+        "repeat": repeat,
+        "paths": paths,
+        "speedup": paths["validated"]["total_us_per_item"] / paths["trusted"]["total_us_per_item"],
+        "identical_output": payloads["validated"] == payloads["trusted"],
+    }
+
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs in microseconds."""
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1_000_000
@@ -0,0 +1,256 @@
+"""Startup and import-time benchmark for the API and frontend processes.
+
+Every measurement runs in a fresh interpreter (``python -X importtime -m
+benchmarks.startup probe-api|probe-frontend``) so module-level side effects
+such as ``settings = get_settings()`` and engine creation are paid exactly as
+in a newly scaled-out worker. The parent measures wall time from spawning the
+process until the probe reports its first response (API) or first render
+(frontend), collects per-stage timings from the probe and aggregates the
+``-X importtime`` output into per-module import costs. Each metric is checked
+against a budget in milliseconds.
+
+This module deliberately imports only the standard library at module level.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+READY_MARKER = "STARTUP_PROBE_RESULT "
+
+DEFAULT_BUDGETS_MS: dict[str, float] = {
+    "api.time_to_first_response": 3000.0,
+    "api.import_libraries": 1500.0,
+    "api.settings_load": 50.0,
+    "api.engine_create": 250.0,
+    "api.import_app": 500.0,
+    "api.lifespan_startup": 500.0,
+    "api.first_response": 100.0,
+    "frontend.time_to_first_render": 6000.0,
+    "frontend.import_streamlit": 3000.0,
+    "frontend.first_render": 2500.0,
+}
+
+
+def probe_api() -> dict[str, float]:
+    """Start the API in this process and time each startup stage.
+
+    Returns:
+        dict[str, float]: Stage durations in milliseconds.
+    """
+    stages: dict[str, float] = {}
+    mark = time.perf_counter()
+
+    def lap(name: str) -> None:
+        nonlocal mark
+        now = time.perf_counter()
+        stages[name] = (now - mark) * 1000
+        mark = now
+
+    import asyncio
+    import fastapi  # noqa: F401
+    import httpx
+    import pydantic_settings  # noqa: F401
+    import sqlalchemy.ext.asyncio
+
+    lap("import_libraries")
+
+    from app.config import get_settings
+
+    settings = get_settings()
+    lap("settings_load")
+
+    engine = sqlalchemy.ext.asyncio.create_async_engine(settings.database_url)
+    lap("engine_create")
+
+    from app.main import app
+
+    lap("import_app")
+
+    async def start_and_request() -> None:
+        async with app.router.lifespan_context(app):
+            lap("lifespan_startup")
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+                response = await client.get(f"{settings.api_prefix}/health/live")
+                response.raise_for_status()
+            lap("first_response")
+        await engine.dispose()
+
+    asyncio.run(start_and_request())
+    return stages
+
+
+def probe_frontend() -> dict[str, float]:
+    """Render the Streamlit entrypoint once in this process and time it.
+
+    Returns:
+        dict[str, float]: Stage durations in milliseconds.
+    """
+    stages: dict[str, float] = {}
+    started = time.perf_counter()
+
+    from benchmarks.frontend_render import FRONTEND_DIR, StubAPI
+    from streamlit.testing.v1 import AppTest
+
+    stages["import_streamlit"] = (time.perf_counter() - started) * 1000
+
+    with StubAPI() as stub:
+        os.environ["API_BASE_URL"] = stub.base_url
+        os.environ["API_PREFIX"] = stub.api_prefix
+        render_started = time.perf_counter()
+        AppTest.from_file(str(FRONTEND_DIR / "main.py"), default_timeout=60).run()
+        stages["first_render"] = (time.perf_counter() - render_started) * 1000
+
+    return stages
+
+
+def measure(target: str) -> dict[str, Any]:
+    """Measure one cold start of the API or frontend in a subprocess.
+
+    Args:
+        target: "api" or "frontend".
+
+    Returns:
+        dict[str, Any]: Wall time to ready, stage timings and import costs.
+
+    Raises:
+        RuntimeError: If the probe process fails.
+    """
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", f"probe-{target}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "0"},
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    result_line = next((line for line in process.stdout.splitlines() if line.startswith(READY_MARKER)), None)
+    if process.returncode != 0 or result_line is None:
+        raise RuntimeError(f"{target} startup probe failed:\n{_strip_importtime(process.stderr)[-2000:]}")
+
+    return {
+        "wall_ms": wall_ms,
+        "stages_ms": json.loads(result_line.removeprefix(READY_MARKER)),
+        "imports_ms": parse_importtime(process.stderr),
+    }
+
+
+def parse_importtime(stderr: str) -> dict[str, dict[str, float]]:
+    """Aggregate ``-X importtime`` output into cumulative cost per module.
+
+    Args:
+        stderr: Captured standard error of a ``-X importtime`` run.
+
+    Returns:
+        dict[str, dict[str, float]]: ``top_level`` maps modules imported
+        directly by top-level code to their cumulative import time in
+        milliseconds (these add up without double counting); ``project`` maps
+        every ``app``/``frontend`` module, at any depth, to its cumulative time.
+    """
+    top_level: dict[str, float] = defaultdict(float)
+    project: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line.removeprefix("import time:").split("|")
+        name = raw_name.strip()
+        cost = int(cumulative) / 1000
+        if not raw_name.startswith("  "):
+            top_level[name] += cost
+        if name.split(".")[0] in ("app", "frontend"):
+            project[name] = cost
+    return {"top_level": dict(top_level), "project": project}
+
+
+def run_benchmark(
+    targets: list[str] | None = None,
+    repeat: int = 3,
+    budgets: dict[str, float] | None = None,
+    top_imports: int = 15,
+) -> dict[str, Any]:
+    """Run cold-start measurements and check them against budgets.
+
+    Args:
+        targets: Processes to measure ("api", "frontend"); default both.
+        repeat: Cold starts per target; medians are reported.
+        budgets: Metric budgets in ms, merged over ``DEFAULT_BUDGETS_MS``.
+        top_imports: Number of most expensive top-level imports to report.
+
+    Returns:
+        dict[str, Any]: JSON-serializable report with metrics, budgets and imports.
+    """
+    budgets = {**DEFAULT_BUDGETS_MS, **(budgets or {})}
+    ready_metric = {"api": "time_to_first_response", "frontend": "time_to_first_render"}
+    report: dict[str, Any] = {"timestamp": datetime.utcnow().isoformat(), "repeat": repeat, "targets": {}}
+
+    for target in targets or ["api", "frontend"]:
+        if target not in ready_metric:
+            raise ValueError(f"Unknown target {target!r}; expected 'api' or 'frontend'")
+        runs = [measure(target) for _ in range(repeat)]
+
+        metrics = {ready_metric[target]: statistics.median(run["wall_ms"] for run in runs)}
+        for stage in runs[0]["stages_ms"]:
+            metrics[stage] = statistics.median(run["stages_ms"][stage] for run in runs)
+
+        imports = {kind: _median_costs([run["imports_ms"][kind] for run in runs]) for kind in ("top_level", "project")}
+        top = dict(sorted(imports["top_level"].items(), key=lambda item: item[1], reverse=True)[:top_imports])
+
+        report["targets"][target] = {
+            "metrics": {
+                name: {
+                    "value_ms": value,
+                    "budget_ms": budgets.get(f"{target}.{name}"),
+                    "within_budget": value <= budgets.get(f"{target}.{name}", float("inf")),
+                }
+                for name, value in metrics.items()
+            },
+            "imports_ms": top,
+            "project_imports_ms": dict(sorted(imports["project"].items(), key=lambda item: item[1], reverse=True)),
+        }
+    return report
+
+
+def over_budget(report: dict[str, Any]) -> list[str]:
+    """List metrics that exceeded their budget.
+
+    Args:
+        report: Report produced by ``run_benchmark``.
+
+    Returns:
+        list[str]: Human-readable budget violations.
+    """
+    return [
+        f"{target}.{name}: {metric['value_ms']:.1f} ms > budget {metric['budget_ms']:.1f} ms"
+        for target, result in report["targets"].items()
+        for name, metric in result["metrics"].items()
+        if not metric["within_budget"]
+    ]
+
+
+def _median_costs(samples: list[dict[str, float]]) -> dict[str, float]:
+    """Take the per-module median over several runs."""
+    return {module: statistics.median(sample.get(module, 0.0) for sample in samples) for module in samples[0]}
+
+
+def _strip_importtime(stderr: str) -> str:
+    """Remove ``-X importtime`` lines to surface real errors."""
+    return "\n".join(line for line in stderr.splitlines() if not line.startswith("import time:"))
+
+
+if __name__ == "__main__":
+    probes = {"probe-api": probe_api, "probe-frontend": probe_frontend}
+    if len(sys.argv) != 2 or sys.argv[1] not in probes:
+        sys.exit(f"usage: python -m benchmarks.startup {{{','.join(probes)}}}")
+    sys.path.insert(0, str(PROJECT_ROOT))
+    print(READY_MARKER + json.dumps(probes[sys.argv[1]]()), flush=True)
@@ -5,6 +5,7 @@ Project management CLI tool for Streamlit FastAPI Template.
 This script provides convenient commands for common development tasks.
 """
 
+import os
 import subprocess
 import typer
 from pathlib import Path
@@ -12,6 +13,8 @@ from rich.console import Console
 from rich.table import Table
 
 app = typer.Typer(help="🚀 Streamlit FastAPI Template CLI")
+bench_app = typer.Typer(help="📈 Run performance benchmarks")
+app.add_typer(bench_app, name="bench")
 console = Console()
 
 
@@ -46,6 +49,82 @@ def dev() -> None:
         raise typer.Exit(1)
 
 
+@app.command()
+def serve(
+    host: str | None = typer.Option(None, "--host", help="Bind host (default: API_HOST)"),
+    port: int | None = typer.Option(None, "--port", help="Bind port (default: API_PORT)"),
+    workers: int = typer.Option(0, "--workers", "-w", help="Worker processes (0 = one per usable CPU)"),
+    server: str = typer.Option("auto", "--server", help="Process manager: auto, gunicorn or uvicorn"),
+    max_requests: int = typer.Option(10_000, help="Recycle a worker after this many requests (0 = never)"),
+    max_requests_jitter: int = typer.Option(1_000, help="Random jitter added to --max-requests"),
+    keep_alive: int = typer.Option(5, help="Keep-alive timeout in seconds"),
+    backlog: int = typer.Option(2048, help="Maximum number of pending connections"),
+    graceful_timeout: int = typer.Option(30, help="Seconds to finish in-flight requests on restart"),
+    preload: bool = typer.Option(True, "--preload/--no-preload", help="Import the app before forking (gunicorn)"),
+    access_log: bool = typer.Option(False, "--access-log/--no-access-log", help="Log every request"),
+) -> None:
+    """Start the API for production with multiple workers."""
+    from app.config import get_settings
+    from app.server import (
+        ServerOptions,
+        available_cpus,
+        build_gunicorn_command,
+        default_workers,
+        event_loop_implementation,
+        gunicorn_available,
+        http_implementation,
+        run_uvicorn,
+    )
+
+    settings = get_settings()
+    if server == "auto":
+        server = "gunicorn" if gunicorn_available() else "uvicorn"
+    elif server not in ("gunicorn", "uvicorn"):
+        console.print(f"❌ Unknown server: {server}", style="bold red")
+        raise typer.Exit(1)
+    elif server == "gunicorn" and not gunicorn_available():
+        console.print("❌ gunicorn is not installed (uv sync --extra production)", style="bold red")
+        raise typer.Exit(1)
+
+    options = ServerOptions(
+        host=host or settings.api_host,
+        port=port or settings.api_port,
+        workers=workers or default_workers(),
+        log_level=settings.log_level.lower(),
+        backlog=backlog,
+        keep_alive=keep_alive,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+        graceful_timeout=graceful_timeout,
+        preload=preload,
+        access_log=access_log,
+    )
+
+    # Workers inherit this and size their compute pools to share the CPUs.
+    os.environ["WEB_CONCURRENCY"] = str(options.workers)
+
+    console.print(f"🚀 Starting API with {server}...", style="bold blue")
+    console.print(f"📍 http://{options.host}:{options.port}", style="dim")
+    console.print(
+        f"⚙️  {options.workers} workers (of {available_cpus()} usable CPUs), "
+        f"loop={event_loop_implementation()}, http={http_implementation()}",
+        style="dim",
+    )
+    if options.workers > 1:
+        console.print("ℹ️  Each worker keeps its own activity feed; use --workers 1 for a complete feed.", style="dim")
+
+    try:
+        if server == "gunicorn":
+            subprocess.run(build_gunicorn_command(options), check=True)
+        else:
+            run_uvicorn(options)
+    except KeyboardInterrupt:
+        console.print("\n⏹️ Server stopped.", style="bold yellow")
+    except subprocess.CalledProcessError as e:
+        console.print(f"❌ Server failed: {e}", style="bold red")
+        raise typer.Exit(1)
+
+
 @app.command()
 def test(
     coverage: bool = typer.Option(False, "--coverage", "-c", help="Run with coverage"),
@@ -73,6 +152,206 @@ def test(
         raise typer.Exit(1)
 
 
+@bench_app.command("api")
+def bench_api(
+    scenario: str = typer.Option("health", "--scenario", "-s", help="Built-in scenario name or scenario JSON file"),
+    url: str | None = typer.Option(None, "--url", help="Target a running API instead of the in-process app"),
+    concurrency: int = typer.Option(16, "--concurrency", "-c", help="Concurrent clients (closed loop)"),
+    rate: float | None = typer.Option(None, "--rate", "-r", help="Fixed arrival rate in requests/second"),
+    duration: float = typer.Option(10.0, "--duration", "-d", help="Measured run time in seconds"),
+    warmup: float = typer.Option(1.0, "--warmup", help="Warm-up time in seconds (not measured)"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report to this file"),
+    baseline: Path | None = typer.Option(None, "--baseline", "-b", help="Baseline JSON report to compare against"),
+    max_throughput_drop: float = typer.Option(0.10, help="Allowed relative throughput drop vs baseline"),
+    max_latency_increase: float = typer.Option(0.20, help="Allowed relative latency percentile increase vs baseline"),
+) -> None:
+    """Load-test the API and report throughput and latency percentiles."""
+    import asyncio
+    import json
+    from app.config import get_settings
+    from benchmarks.api_load import compare, load_scenario, run_benchmark
+
+    try:
+        selected = load_scenario(scenario, get_settings().api_prefix)
+    except ValueError as e:
+        console.print(f"❌ {e}", style="bold red")
+        raise typer.Exit(1)
+
+    mode = f"{rate:g} req/s" if rate else f"{concurrency} concurrent clients"
+    console.print(f"📈 Benchmarking '{selected.name}' ({mode}, {duration:g}s) against {url or 'in-process app'}...", style="bold blue")
+    report = asyncio.run(run_benchmark(selected, url, concurrency, rate, duration, warmup))
+
+    table = Table(title=f"Scenario: {report['scenario']}")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+    table.add_row("Requests", str(report["requests"]))
+    table.add_row("Errors", str(report["errors"]))
+    table.add_row("Throughput", f"{report['throughput_rps']:.1f} req/s")
+    for name, value in report["latency_ms"].items():
+        table.add_row(f"Latency {name}", f"{value:.2f} ms")
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"💾 Report saved to {output}", style="dim")
+
+    if baseline:
+        regressions = compare(
+            report,
+            json.loads(baseline.read_text()),
+            max_throughput_drop=max_throughput_drop,
+            max_latency_increase=max_latency_increase,
+        )
+        if regressions:
+            for regression in regressions:
+                console.print(f"❌ {regression}", style="bold red")
+            raise typer.Exit(1)
+        console.print("✅ No regressions against baseline", style="bold green")
+
+
+@bench_app.command("frontend")
+def bench_frontend(
+    page: list[str] | None = typer.Option(None, "--page", "-p", help="Page to run (repeatable; default: all)"),
+    reruns: int = typer.Option(10, "--reruns", "-n", help="Measured reruns per page"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report to this file"),
+    baseline: Path | None = typer.Option(None, "--baseline", "-b", help="Baseline JSON report to compare against"),
+    max_time_increase: float = typer.Option(0.25, help="Allowed relative run time increase vs baseline"),
+    max_memory_increase: float = typer.Option(0.25, help="Allowed relative peak memory increase vs baseline"),
+) -> None:
+    """Render Streamlit pages headlessly against a stub API and time them."""
+    import json
+    from benchmarks.frontend_render import compare, run_benchmark
+
+    console.print("🎨 Benchmarking Streamlit pages...", style="bold blue")
+    try:
+        report = run_benchmark(page or None, reruns)
+    except ValueError as e:
+        console.print(f"❌ {e}", style="bold red")
+        raise typer.Exit(1)
+
+    table = Table(title="Frontend render")
+    table.add_column("Page", style="cyan")
+    table.add_column("Cold run", style="green", justify="right")
+    table.add_column("Rerun (mean)", style="green", justify="right")
+    table.add_column("API calls cold/rerun", style="magenta", justify="right")
+    table.add_column("Peak memory", style="green", justify="right")
+    for name, result in report["pages"].items():
+        table.add_row(
+            name,
+            f"{result['cold_run_ms']:.1f} ms",
+            f"{result['rerun_ms']['mean']:.1f} ms",
+            f"{result['api_calls_cold']} / {result['api_calls_per_rerun']:g}",
+            f"{result['peak_memory_kib']:.0f} KiB",
+        )
+        for exception in result["exceptions"]:
+            console.print(f"⚠️  {name}: {exception}", style="yellow")
+    console.print(table)
+
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"💾 Report saved to {output}", style="dim")
+
+    if baseline:
+        regressions = compare(
+            report,
+            json.loads(baseline.read_text()),
+            max_time_increase=max_time_increase,
+            max_memory_increase=max_memory_increase,
+        )
+        if regressions:
+            for regression in regressions:
+                console.print(f"❌ {regression}", style="bold red")
+            raise typer.Exit(1)
+        console.print("✅ No regressions against baseline", style="bold green")
+
+
+@bench_app.command("startup")
+def bench_startup(
+    target: list[str] | None = typer.Option(None, "--target", "-t", help="api or frontend (repeatable; default: both)"),
+    repeat: int = typer.Option(3, "--repeat", "-n", help="Cold starts per target (medians are reported)"),
+    budgets: Path | None = typer.Option(None, "--budgets", help="JSON file of metric budgets in ms"),
+    top: int = typer.Option(15, "--top", help="Number of most expensive imports to list"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report to this file"),
+) -> None:
+    """Measure cold-start time and import costs of the API and frontend."""
+    import json
+    from benchmarks.startup import over_budget, run_benchmark
+
+    console.print("⏱️  Measuring cold starts...", style="bold blue")
+    try:
+        report = run_benchmark(
+            target or None, repeat, json.loads(budgets.read_text()) if budgets else None, top_imports=top
+        )
+    except (ValueError, RuntimeError) as e:
+        console.print(f"❌ {e}", style="bold red")
+        raise typer.Exit(1)
+
+    for name, result in report["targets"].items():
+        table = Table(title=f"Startup: {name}")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Time", style="green", justify="right")
+        table.add_column("Budget", style="magenta", justify="right")
+        for metric, values in result["metrics"].items():
+            budget = f"{values['budget_ms']:.0f} ms" if values["budget_ms"] is not None else "-"
+            table.add_row(metric, f"{values['value_ms']:.1f} ms", budget, style=None if values["within_budget"] else "red")
+        console.print(table)
+
+        imports = Table(title=f"Top-level imports: {name}")
+        imports.add_column("Module", style="cyan")
+        imports.add_column("Cumulative", style="green", justify="right")
+        for module, cost in result["imports_ms"].items():
+            imports.add_row(module, f"{cost:.1f} ms")
+        console.print(imports)
+
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"💾 Report saved to {output}", style="dim")
+
+    violations = over_budget(report)
+    if violations:
+        for violation in violations:
+            console.print(f"❌ {violation}", style="bold red")
+        raise typer.Exit(1)
+    console.print("✅ All startup metrics within budget", style="bold green")
+
+
+@bench_app.command("serializers")
+def bench_serializers(
+    items: int = typer.Option(10_000, "--items", "-n", help="Items per page"),
+    repeat: int = typer.Option(5, "--repeat", "-r", help="Timed repetitions (fastest is reported)"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report to this file"),
+) -> None:
+    """Compare validated and trusted construction of paginated responses."""
+    import json
+    from benchmarks.serializers import run_benchmark
+
+    console.print(f"🧮 Building and serializing {items} item pages...", style="bold blue")
+    report = run_benchmark(items, repeat)
+
+    table = Table(title="Response serialization (µs per item)")
+    table.add_column("Path", style="cyan")
+    table.add_column("Build", style="green", justify="right")
+    table.add_column("Serialize", style="green", justify="right")
+    table.add_column("Total", style="magenta", justify="right")
+    for name, result in report["paths"].items():
+        table.add_row(
+            name,
+            f"{result['build_us_per_item']:.2f}",
+            f"{result['serialize_us_per_item']:.2f}",
+            f"{result['total_us_per_item']:.2f}",
+        )
+    console.print(table)
+    console.print(f"⚡ Trusted path is {report['speedup']:.2f}x faster", style="bold green")
+
+    if output:
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"💾 Report saved to {output}", style="dim")
+
+    if not report["identical_output"]:
+        console.print("❌ Trusted and validated paths produced different JSON", style="bold red")
+        raise typer.Exit(1)
+
+
 @app.command()
 def lint() -> None:
     """Run code linting."""
@@ -214,8 +493,13 @@ def status() -> None:
     commands = [
         ("cli.py install", "Install dependencies"),
         ("cli.py dev", "Start development servers"),
+        ("cli.py serve", "Start production API server"),
         ("cli.py test", "Run tests"),
         ("cli.py quality", "Run all quality checks"),
+        ("cli.py bench api", "Load-test the API"),
+        ("cli.py bench frontend", "Benchmark Streamlit page renders"),
+        ("cli.py bench startup", "Measure cold-start and import time"),
+        ("cli.py bench serializers", "Compare response model construction paths"),
         ("cli.py docker", "Run with Docker"),
     ]
 
@@ -0,0 +1,124 @@
+"""Server-paged table component for large API collections.
+
+The table never downloads a whole collection: it requests one page of rows
+from a paginated list endpoint when that page is shown, and pushes sorting
+and filtering down to the API, so the first paint costs one small request
+and memory is bounded by the page window whatever the collection size.
+
+Fetched pages are kept per session in a small LRU window (``max_pages``
+pages, each reused for ``ttl`` seconds), so paging back and forth does not
+refetch. Changing the sort or a filter starts again at page 1 with an empty
+window. The component is a fragment: paging reruns only the table, not the
+page around it.
+"""
+
+import pandas as pd
+import streamlit as st
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# fetch(page=..., size=..., sort=..., **filters) returning a PaginatedResponse
+# payload: "items", "total", "page", "size" and "pages".
+PageFetcher = Callable[..., dict[str, Any]]
+
+
+@st.fragment
+def paged_table(
+    key: str,
+    fetch: PageFetcher,
+    columns: Mapping[str, str],
+    *,
+    sortable: tuple[str, ...] = (),
+    default_sort: str | None = None,
+    filters: Mapping[str, str] | None = None,
+    page_size: int = 50,
+    max_pages: int = 8,
+    ttl: float = 30.0,
+) -> None:
+    """Render a table that pages, sorts and filters through the API.
+
+    Args:
+        key: Unique key of the table; namespaces its widgets and session state.
+        fetch: Loads one page, e.g. ``APIClient.list_events``.
+        columns: Item field to column label, in display order.
+        sortable: Fields the API can sort by; the first one is the default.
+        default_sort: Initial sort, e.g. "-id" ("-" prefix for descending).
+        filters: Query parameter to label of text filters; empty ones are omitted.
+        page_size: Rows per page (at most the API's page size limit).
+        max_pages: Pages kept in the session window.
+        ttl: Seconds a fetched page is reused before it is requested again.
+    """
+    state = st.session_state.setdefault(key, {"query": None, "page": 1, "pages": 1, "window": OrderedDict()})
+
+    controls = st.columns([2, 1, *([2] * len(filters or {}))])
+    sort = default_sort or (sortable[0] if sortable else None)
+    if sortable:
+        default_field = (sort or "").lstrip("-")
+        field = controls[0].selectbox(
+            "Sort by",
+            options=sortable,
+            index=sortable.index(default_field) if default_field in sortable else 0,
+            format_func=lambda name: columns.get(name, name),
+            key=f"{key}_sort",
+        )
+        descending = controls[1].toggle("Descending", value=(sort or "").startswith("-"), key=f"{key}_desc")
+        sort = f"-{field}" if descending else field
+    values = {
+        param: controls[2 + index].text_input(label, key=f"{key}_filter_{param}").strip()
+        for index, (param, label) in enumerate((filters or {}).items())
+    }
+    query = (sort, tuple((param, value) for param, value in values.items() if value))
+
+    if query != state["query"]:
+        state.update(query=query, page=1, pages=1)
+        state["window"].clear()
+
+    try:
+        data = _page(state, fetch, query, page_size, max_pages, ttl)
+    except Exception as e:
+        st.error(f"❌ Cannot load rows: {e}")
+        return
+    state["pages"] = max(data["pages"], 1)
+
+    frame = pd.DataFrame(data["items"], columns=list(columns)).rename(columns=columns)
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+
+    first, previous, position, following, last = st.columns([1, 1, 3, 1, 1])
+    page, pages = state["page"], state["pages"]
+    first.button("⏮", key=f"{key}_first", disabled=page <= 1, on_click=_go, args=(state, 1))
+    previous.button("◀", key=f"{key}_prev", disabled=page <= 1, on_click=_go, args=(state, page - 1))
+    following.button("▶", key=f"{key}_next", disabled=page >= pages, on_click=_go, args=(state, page + 1))
+    last.button("⏭", key=f"{key}_last", disabled=page >= pages, on_click=_go, args=(state, pages))
+    start = (page - 1) * page_size
+    position.caption(
+        f"Rows {start + 1:,}–{start + len(data['items']):,} of {data['total']:,} · page {page:,} of {pages:,}"
+        if data["items"]
+        else "No rows match."
+    )
+
+
+def _page(
+    state: dict[str, Any], fetch: PageFetcher, query: tuple[Any, ...], page_size: int, max_pages: int, ttl: float
+) -> dict[str, Any]:
+    """Get the current page from the window, fetching it when missing or expired."""
+    page = state["page"]
+    window: OrderedDict[int, tuple[float, dict[str, Any]]] = state["window"]
+    entry = window.get(page)
+    if entry is not None and time.monotonic() - entry[0] < ttl:
+        window.move_to_end(page)
+        return entry[1]
+
+    sort, filters = query
+    data = fetch(page=page, size=page_size, sort=sort, **dict(filters))
+    window[page] = (time.monotonic(), data)
+    window.move_to_end(page)
+    while len(window) > max_pages:
+        window.popitem(last=False)
+    return data
+
+
+def _go(state: dict[str, Any], page: int) -> None:
+    """Move the table to a page (button callback)."""
+    state["page"] = min(max(page, 1), state["pages"])
@@ -23,6 +23,9 @@ class FrontendSettings(BaseSettings):
     # API Configuration
     api_base_url: str = Field(default="http://localhost:8000", description="API base URL")
     api_prefix: str = Field(default="/api/v1", description="API prefix")
+    api_in_process: bool = Field(
+        default=False, description="Serve API calls from app.main:app in this process instead of over HTTP"
+    )
 
     # UI Configuration
     layout: str = Field(default="wide", description="Streamlit layout")
@@ -4,13 +4,169 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import UTC, date, datetime, time, timedelta
+from frontend.components.paged_table import paged_table
 from frontend.services.api_client import APIClient
+from typing import Any
+
+# Dashboard metrics and the API metrics ("<event>:<aggregate>") behind them.
+METRICS = {
+    "Revenue": "purchase:sum",
+    "Users": "signup:count",
+    "Sessions": "session_start:count",
+    "Purchases": "purchase:count",
+}
+GRANULARITIES = ["hour", "day", "week"]
+# Distinct users: HyperLogLog estimates unioned over the whole range by the API.
+VISITORS = "page_view:distinct"
+ACTIVE_USERS = "*:distinct"
+ACTIVE_WINDOW = timedelta(minutes=30)
+# Performance table rows: label, API metric and value format. Session
+# durations are "session_end" values in seconds; percentiles come from
+# t-digests merged over the range by the API.
+PERFORMANCE_ROWS = [
+    ("Page Views", "page_view:count", "count"),
+    ("Unique Visitors", VISITORS, "count"),
+    ("Session Duration (median)", "session_end:p50", "duration"),
+    ("Session Duration (p95)", "session_end:p95", "duration"),
+]
+
+# Recent activity: events kept in the session and seconds between feed polls.
+ACTIVITY_ITEMS = 20
+ACTIVITY_REFRESH = 5
+
+# Event browser: displayed fields, sortable fields and text filters, all
+# applied by the API one page at a time.
+EVENT_COLUMNS = {"id": "ID", "ts": "Time (epoch ms)", "name": "Event", "user_id": "User", "value": "Value"}
+EVENT_SORTABLE = ("id", "ts", "name", "user_id", "value")
+EVENT_FILTERS = {"name": "Event name", "user_id": "User"}
+
+
+def date_bounds(date_range: date | tuple[date, ...]) -> tuple[datetime, datetime]:
+    """Turn the date picker value into a ``[start, end)`` range of whole days.
+
+    Args:
+        date_range: One date, or a (start, end) tuple while or after picking.
+
+    Returns:
+        tuple[datetime, datetime]: Midnight of the first day and of the day after the last.
+    """
+    dates = date_range if isinstance(date_range, tuple | list) else (date_range,)
+    return datetime.combine(dates[0], time.min), datetime.combine(dates[-1] + timedelta(days=1), time.min)
+
+
+def series_frame(data: dict[str, Any], columns: dict[str, str]) -> pd.DataFrame:
+    """Build a DataFrame from a time-series response.
+
+    Args:
+        data: Response of ``APIClient.get_timeseries``.
+        columns: Column label to API metric.
+
+    Returns:
+        pd.DataFrame: "Date" column plus one column per label (0 when missing).
+    """
+    frame = pd.DataFrame({"Date": pd.to_datetime(data["timestamps"], unit="ms")})
+    for label, metric in columns.items():
+        values = data["series"].get(metric)
+        frame[label] = pd.Series(values, dtype="float64") if values is not None else 0.0
+    if {"Purchases", "Sessions"} <= columns.keys():
+        frame["Conversion Rate"] = (frame["Purchases"] / frame["Sessions"].where(frame["Sessions"] > 0)) * 100
+    return frame
+
+
+def period_totals(
+    api_client: APIClient, start: datetime, end: datetime, metrics: tuple[str, ...]
+) -> dict[str, Any]:
+    """Get range totals of metrics, with the error of distinct counts.
+
+    Distinct counts cannot be summed from buckets, so each period is its own
+    request and the totals are read from the response.
+
+    Args:
+        api_client: API client.
+        start: Range start.
+        end: Range end.
+        metrics: API metrics.
+
+    Returns:
+        dict[str, Any]: ``totals`` and ``errors`` by metric.
+    """
+    granularity = "day" if start.time() == end.time() == time.min else "minute"
+    data = api_client.get_timeseries(start, end, metrics, granularity)
+    return {"totals": data["totals"], "errors": data["errors"]}
+
+
+def format_value(value: float | None, kind: str) -> str:
+    """Format a performance value: counts with separators, durations as minutes and seconds."""
+    if value is None:
+        return "–"
+    if kind == "duration":
+        minutes, seconds = divmod(round(value), 60)
+        return f"{minutes}m {seconds:02d}s"
+    return f"{value:,.0f}"
+
+
+def time_ago(ts: int, now: datetime) -> str:
+    """Format an epoch-millisecond timestamp relative to ``now``."""
+    seconds = max(0, int(now.timestamp() - ts / 1000))
+    if seconds < 60:
+        return f"{seconds}s ago"
+    if seconds < 3600:
+        return f"{seconds // 60} min ago"
+    if seconds < 86400:
+        return f"{seconds // 3600} h ago"
+    return f"{seconds // 86400} d ago"
+
+
+@st.fragment(run_every=ACTIVITY_REFRESH)
+def recent_activity(api_client: APIClient) -> None:
+    """Render the activity feed, fetching only events newer than the last ones seen.
+
+    The cursor and the latest events live in the session, so a rerun (or a
+    fragment refresh every ``ACTIVITY_REFRESH`` seconds) costs one request
+    that returns just the new events. When more events arrived than are
+    shown, or the cursor belongs to another API worker's feed, the list
+    restarts from the newest events instead of catching up from the oldest.
+    """
+    feed = st.session_state.setdefault(
+        "activity", {"cursor": None, "feed": None, "items": deque(maxlen=ACTIVITY_ITEMS)}
+    )
+    try:
+        page = api_client.get_activity(after=feed["cursor"], limit=ACTIVITY_ITEMS, feed=feed["feed"])
+        if feed["cursor"] is not None and page["feed"] == feed["feed"]:
+            if page["missed"] or len(page["items"]) >= ACTIVITY_ITEMS:
+                page = api_client.get_activity(limit=ACTIVITY_ITEMS)
+                feed["items"].clear()
+        else:
+            # First load, or another worker's feed ignored the cursor and returned its newest events.
+            feed["items"].clear()
+        feed["cursor"], feed["feed"] = page["cursor"], page["feed"]
+        feed["items"].extendleft(page["items"])
+    except Exception as e:
+        st.error(f"❌ Cannot load recent activity: {e}")
+
+    if not feed["items"]:
+        st.info("No events yet.")
+    now = datetime.now(UTC)
+    for item in feed["items"]:
+        with st.container():
+            st.write(f"**{time_ago(item['ts'], now)}** - {item['name']}")
+            st.caption(" · ".join(filter(None, [item["user_id"], f"{item['value']:g}" if item["value"] else None])))
+            st.markdown("---")
+
+
+def change(current: float, previous: float) -> str | None:
+    """Format the change against the previous period, or None without a baseline."""
+    if not previous:
+        return None
+    percent = (current - previous) / previous * 100
+    return f"{'↗️' if percent >= 0 else '↘️'} {percent:+.1f}%"
 
 
 def main() -> None:
     """Main dashboard page function."""
-    st.set_page_config(page_title="Dashboard - Streamlit FastAPI", page_icon="📊" layout="wide")
+    st.set_page_config(page_title="Dashboard - Streamlit FastAPI", page_icon="📊", layout="wide")
 
     st.title("📊 Analytics Dashboard")
     st.markdown("Real-time data visualization and key performance indicators")
@@ -23,7 +179,7 @@ def main() -> None:
 
         # Refresh button
         if st.button("🔄 Refresh Data", type="primary"):
-            st.cache_data.clear()
+            api_client.clear_cache()
             st.rerun()
 
         # Date range selector
@@ -32,6 +188,14 @@ def main() -> None:
             value=(datetime.now() - timedelta(days=30), datetime.now()),
             max_value=datetime.now(),
         )
+        start, end = date_bounds(date_range)
+        days = (end - start).days
+
+        granularity = st.selectbox(
+            "🕒 Granularity",
+            options=GRANULARITIES,
+            index=0 if days <= 2 else 1 if days <= 120 else 2,
+        )
 
         # Metrics selector
         selected_metrics = st.multiselect(
@@ -40,29 +204,52 @@ def main() -> None:
             default=["Revenue", "Users"],
         )
 
-    # Main dashboard content
+    # KPI Cards: selected period against the preceding period of equal length
+    try:
+        kpi_data = api_client.get_timeseries(start - (end - start), end, tuple(METRICS.values()), "day")
+        kpi_frame = series_frame(kpi_data, METRICS)
+        current = kpi_frame[kpi_frame["Date"] >= start].sum(numeric_only=True)
+        previous = kpi_frame[kpi_frame["Date"] < start].sum(numeric_only=True)
+    except Exception as e:
+        st.error(f"❌ Cannot load metrics: {e}")
+        current = previous = pd.Series(0.0, index=list(METRICS))
+
+    conversion = current["Purchases"] / current["Sessions"] * 100 if current["Sessions"] else 0.0
+    previous_conversion = previous["Purchases"] / previous["Sessions"] * 100 if previous["Sessions"] else 0.0
+
     col1, col2, col3, col4 = st.columns(4)
 
-    # KPI Cards
     with col1:
         st.metric(
-            label="💰 Revenue" value="$45,231", delta="↗️ +12.5%", help="Total revenue for selected period"
+            label="💰 Revenue",
+            value=f"${current['Revenue']:,.0f}",
+            delta=change(current["Revenue"], previous["Revenue"]),
+            help="Total revenue for selected period",
         )
 
     with col2:
-        st.metric(label="👥 Active Users" value="1,234", delta="↗️ +8.2%", help="Number of active users")
+        st.metric(
+            label="👥 New Users",
+            value=f"{current['Users']:,.0f}",
+            delta=change(current["Users"], previous["Users"]),
+            help="Number of sign-ups",
+        )
 
     with col3:
         st.metric(
             label="📊 Sessions",
-            value="8,456",
-            delta="↘️ -2.1%",
+            value=f"{current['Sessions']:,.0f}",
+            delta=change(current["Sessions"], previous["Sessions"]),
             help="Total sessions count",
-            delta_color="inverse",
         )
 
     with col4:
-        st.metric(label="🎯 Conversion" value="3.42%", delta="↗️ +0.8%", help="Conversion rate percentage")
+        st.metric(
+            label="🎯 Conversion",
+            value=f"{conversion:.2f}%",
+            delta=change(conversion, previous_conversion),
+            help="Purchases per session",
+        )
 
     st.markdown("---")
 
@@ -70,27 +257,27 @@ def main() -> None:
     col1, col2 = st.columns(2)
 
     with col1:
-        st.subheader("📈 Revenue Trend")
-
-        # Generate sample revenue data
-        dates = pd.date_range(start=datetime.now() - timedelta(days=30), end=datetime.now(), freq="D")
-        revenue_data = pd.DataFrame(
-            {
-                "Date": dates,
-                "Revenue": np.cumsum(np.random.normal(1500, 300, len(dates))) + 10000,
-                "Target": np.linspace(25000, 35000, len(dates)),
-            }
-        )
-
-        fig_revenue = px.line(
-            revenue_data,
-            x="Date",
-            y=["Revenue", "Target"],
-            title="Daily Revenue vs Target",
-            color_discrete_map={"Revenue": "#1f77b4", "Target": "#ff7f0e"},
-        )
-        fig_revenue.update_layout(height=400)
-        st.plotly_chart(fig_revenue, use_container_width=True)
+        st.subheader("📈 Trend")
+
+        columns: dict[str, str] = {label: METRICS[label] for label in ("Revenue", "Users", "Sessions") if label in selected_metrics}
+        if "Conversion Rate" in selected_metrics:
+            columns.update(Purchases=METRICS["Purchases"], Sessions=METRICS["Sessions"])
+        if columns:
+            try:
+                trend_data = api_client.get_timeseries(start, end, tuple(columns.values()), granularity)
+                trend = series_frame(trend_data, columns)
+                fig_trend = px.line(
+                    trend,
+                    x="Date",
+                    y=[label for label in selected_metrics if label in trend],
+                    title=f"Selected metrics per {granularity}",
+                )
+                fig_trend.update_layout(height=400)
+                st.plotly_chart(fig_trend, use_container_width=True)
+            except Exception as e:
+                st.error(f"❌ Cannot load trend: {e}")
+        else:
+            st.info("Select metrics in the sidebar to plot them.")
 
     with col2:
         st.subheader("👥 User Acquisition")
@@ -107,34 +294,44 @@ def main() -> None:
     st.subheader("📋 Detailed Analytics")
 
     # Tabs for different views
-    tab1, tab2, tab3 = st.tabs(["📊 Performance", "🌍 Geography", "🕒 Real-time"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Performance", "🌍 Geography", "🕒 Real-time", "📜 Events"])
 
     with tab1:
-        # Performance metrics table
+        # Performance metrics table: selected period against the preceding one
+        performance_metrics = tuple(metric for _, metric, _ in PERFORMANCE_ROWS)
+        try:
+            current_totals = period_totals(api_client, start, end, performance_metrics)["totals"]
+            previous_totals = period_totals(api_client, start - (end - start), start, performance_metrics)["totals"]
+        except Exception as e:
+            st.error(f"❌ Cannot load performance metrics: {e}")
+            current_totals = previous_totals = dict.fromkeys(performance_metrics)
         performance_data = pd.DataFrame(
             {
-                "Metric": ["Page Views", "Unique Visitors", "Bounce Rate", "Avg. Session Duration"],
-                "Current": ["125,456", "45,123", "32.5%", "4m 32s"],
-                "Previous": ["118,234", "42,567", "35.1%", "4m 12s"],
-                "Change": ["+6.1%", "+6.0%", "-7.4%", "+4.8%"],
+                "Metric": [label for label, _, _ in PERFORMANCE_ROWS],
+                "Current": [format_value(current_totals[metric], kind) for _, metric, kind in PERFORMANCE_ROWS],
+                "Previous": [format_value(previous_totals[metric], kind) for _, metric, kind in PERFORMANCE_ROWS],
+                "Change": [
+                    change(current_totals[metric] or 0, previous_totals[metric] or 0) or "–"
+                    for _, metric, _ in PERFORMANCE_ROWS
+                ],
             }
         )
         st.dataframe(performance_data, use_container_width=True)
 
         # Performance trend chart
-        perf_dates = pd.date_range(start=datetime.now() - timedelta(days=7), periods=7)
-        perf_data = pd.DataFrame(
-            {
-                "Date": perf_dates,
-                "Page Views": np.random.randint(15000, 25000, 7),
-                "Sessions": np.random.randint(8000, 15000, 7),
-                "Users": np.random.randint(5000, 12000, 7),
-            }
-        )
+        perf_columns = {"Page Views": "page_view:count", "Sessions": METRICS["Sessions"], "Users": METRICS["Users"]}
+        # Buckets are UTC days, as are the naive bounds sent to the API.
+        perf_end = datetime.combine(datetime.now(UTC).date() + timedelta(days=1), time.min)
+        try:
+            perf_data = series_frame(
+                api_client.get_timeseries(perf_end - timedelta(days=7), perf_end, tuple(perf_columns.values()), "day"),
+                perf_columns,
+            )
+        except Exception as e:
+            st.error(f"❌ Cannot load performance trend: {e}")
+            perf_data = pd.DataFrame(columns=["Date", *perf_columns])
 
-        fig_perf = px.line(
-            perf_data, x="Date", y=["Page Views", "Sessions", "Users"], title="7-Day Performance Trend"
-        )
+        fig_perf = px.line(perf_data, x="Date", y=list(perf_columns), title="7-Day Performance Trend")
         st.plotly_chart(fig_perf, use_container_width=True)
 
     with tab2:
@@ -162,7 +359,20 @@ def main() -> None:
         realtime_col1, realtime_col2, realtime_col3 = st.columns(3)
 
         with realtime_col1:
-            st.metric("🔴 Active Users", "127", "↗️ +5")
+            window_end = datetime.now(UTC).replace(second=0, microsecond=0) + timedelta(minutes=1)
+            try:
+                active = period_totals(api_client, window_end - ACTIVE_WINDOW, window_end, (ACTIVE_USERS,))
+                previous_active = period_totals(
+                    api_client, window_end - 2 * ACTIVE_WINDOW, window_end - ACTIVE_WINDOW, (ACTIVE_USERS,)
+                )["totals"][ACTIVE_USERS]
+                st.metric(
+                    "🔴 Active Users",
+                    f"{active['totals'][ACTIVE_USERS]:,.0f}",
+                    change(active["totals"][ACTIVE_USERS], previous_active),
+                    help=f"Distinct users in the last 30 minutes (±{active['errors'][ACTIVE_USERS]:.1%})",
+                )
+            except Exception as e:
+                st.error(f"❌ Cannot load active users: {e}")
 
         with realtime_col2:
             st.metric("📄 Page Views/min", "2,345", "↗️ +12")
@@ -172,18 +382,17 @@ def main() -> None:
 
         # Activity feed
         st.subheader("📱 Recent Activity")
-        activity_data = [
-            {"time": "2 min ago", "event": "New user registration", "details": "user@example.com"},
-            {"time": "3 min ago", "event": "Purchase completed", "details": "$129.99"},
-            {"time": "5 min ago", "event": "Page view", "details": "/products/premium"},
-            {"time": "7 min ago", "event": "User login", "details": "john.doe@email.com"},
-        ]
-
-        for activity in activity_data:
-            with st.container():
-                st.write(f"**{activity['time']}** - {activity['event']}")
-                st.caption(activity["details"])
-                st.markdown("---")
+        recent_activity(api_client)
+
+    with tab4:
+        paged_table(
+            "events_table",
+            api_client.list_events,
+            EVENT_COLUMNS,
+            sortable=EVENT_SORTABLE,
+            default_sort="-id",
+            filters=EVENT_FILTERS,
+        )
 
     # API Health Status
     with st.expander("🔗 API Status"):
@@ -1,23 +1,43 @@
 """API client for communicating with the FastAPI backend."""
 
 import httpx
-import streamlit as st
+import time
+from datetime import datetime
 from frontend.config import get_frontend_settings
+from frontend.services.asgi_transport import IN_PROCESS_BASE_URL, get_in_process_transport
+from frontend.services.request_cache import RequestCache
 from typing import Any
 
+# Shared by every session of the process: identical concurrent GETs send one
+# request, and cached responses are refreshed early by a single session.
+_request_cache = RequestCache()
+
 
 class APIClient:
-    """HTTP client for API communication."""
+    """HTTP client for API communication.
+
+    GET requests go through a process-wide ``RequestCache``: concurrent
+    identical GETs from any session share one in-flight request, and GETs
+    made with a ``ttl`` are cached and refreshed early, so N sessions viewing
+    the same page cost the API about one session's requests.
+
+    With ``api_in_process`` enabled, requests are served by the FastAPI app
+    running in this process (see ``InProcessTransport``) instead of over HTTP.
+    """
 
     def __init__(self) -> None:
         """Initialize the API client."""
         self.settings = get_frontend_settings()
-        self.base_url = self.settings.api_url
         self.timeout = 30.0
+        self.transport: httpx.BaseTransport | None = None
+        if self.settings.api_in_process:
+            self.base_url = f"{IN_PROCESS_BASE_URL}{self.settings.api_prefix}"
+            self.transport = get_in_process_transport()
+        else:
+            self.base_url = self.settings.api_url
 
-    @st.cache_data(ttl=30)
     def get_health(self) -> dict[str, Any]:
-        """Get API health status.
+        """Get API health status (cached for 30 seconds).
 
         Returns:
             dict[str, Any]: Health status data.
@@ -25,19 +45,10 @@ class APIClient:
         Raises:
             Exception: If API request fails.
         """
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(f"{self.base_url}/health/")
-                response.raise_for_status()
-                return response.json()
-        except httpx.RequestError as e:
-            raise Exception(f"Connection error: {e}") from e
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}") from e
+        return self.get("/health/", ttl=30)
 
-    @st.cache_data(ttl=30)
     def get_detailed_health(self) -> dict[str, Any]:
-        """Get detailed API health status.
+        """Get detailed API health status (cached for 30 seconds).
 
         Returns:
             dict[str, Any]: Detailed health status data.
@@ -45,41 +56,38 @@ class APIClient:
         Raises:
             Exception: If API request fails.
         """
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(f"{self.base_url}/health/detailed")
-                response.raise_for_status()
-                return response.json()
-        except httpx.RequestError as e:
-            raise Exception(f"Connection error: {e}") from e
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}") from e
+        return self.get("/health/detailed", ttl=30)
 
-    def get(self, endpoint: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    def get(self, endpoint: str, params: dict[str, Any] | None = None, ttl: float | None = None) -> dict[str, Any]:
         """Make a GET request to the API.
 
+        Identical requests in flight at the same time, from any session,
+        share one request and its result.
+
         Args:
             endpoint: API endpoint (without base URL).
             params: Query parameters.
+            ttl: Seconds to cache the response for all sessions (None: not
+                cached); ignored when caching is disabled in the settings.
 
         Returns:
-            dict[str, Any]: Response data.
+            dict[str, Any]: Response data, shared between sessions; do not modify.
 
         Raises:
             Exception: If API request fails.
         """
-        try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(
-                    f"{self.base_url}/{endpoint.lstrip('/')}",
-                    params=params or {},
-                )
-                response.raise_for_status()
-                return response.json()
-        except httpx.RequestError as e:
-            raise Exception(f"Connection error: {e}") from e
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}") from e
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        query = httpx.QueryParams(params or {})
+        result: dict[str, Any] = _request_cache.get(
+            f"{url}?{query}",
+            lambda: self._fetch(url, query),
+            ttl if self.settings.enable_caching else None,
+        )
+        return result
+
+    def clear_cache(self) -> None:
+        """Drop cached responses of all sessions, e.g. for a manual refresh."""
+        _request_cache.clear()
 
     def post(
         self,
@@ -101,14 +109,15 @@ class APIClient:
             Exception: If API request fails.
         """
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with self._client() as client:
                 response = client.post(
                     f"{self.base_url}/{endpoint.lstrip('/')}",
                     data=data,
                     json=json_data,
                 )
                 response.raise_for_status()
-                return response.json()
+                result: dict[str, Any] = response.json()
+                return result
         except httpx.RequestError as e:
             raise Exception(f"Connection error: {e}") from e
         except httpx.HTTPStatusError as e:
@@ -134,14 +143,15 @@ class APIClient:
             Exception: If API request fails.
         """
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with self._client() as client:
                 response = client.put(
                     f"{self.base_url}/{endpoint.lstrip('/')}",
                     data=data,
                     json=json_data,
                 )
                 response.raise_for_status()
-                return response.json()
+                result: dict[str, Any] = response.json()
+                return result
         except httpx.RequestError as e:
             raise Exception(f"Connection error: {e}") from e
         except httpx.HTTPStatusError as e:
@@ -160,10 +170,176 @@ class APIClient:
             Exception: If API request fails.
         """
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with self._client() as client:
                 response = client.delete(f"{self.base_url}/{endpoint.lstrip('/')}")
                 response.raise_for_status()
-                return response.json()
+                result: dict[str, Any] = response.json()
+                return result
+        except httpx.RequestError as e:
+            raise Exception(f"Connection error: {e}") from e
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}") from e
+
+    def get_timeseries(
+        self,
+        start: datetime,
+        end: datetime,
+        metrics: tuple[str, ...],
+        granularity: str = "day",
+    ) -> dict[str, Any]:
+        """Get server-side bucketed metric series for a time range (cached for 30 seconds).
+
+        Args:
+            start: Range start (inclusive, UTC).
+            end: Range end (exclusive, UTC).
+            metrics: Metrics as "<event>[:count|sum|min|max|mean]".
+            granularity: "minute", "hour", "day" or "week".
+
+        Returns:
+            dict[str, Any]: Bucket ``timestamps`` (epoch ms) and ``series`` by metric.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        return self.get(
+            "/timeseries",
+            params={
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "granularity": granularity,
+                "metrics": list(metrics),
+            },
+            ttl=30,
+        )
+
+    def get_activity(
+        self, after: int | None = None, limit: int = 100, wait: float = 0, feed: str | None = None
+    ) -> dict[str, Any]:
+        """Get recent events after a cursor (not cached: each call returns only new events).
+
+        Args:
+            after: Cursor returned by the previous call; None for the newest events.
+            limit: Maximum events returned.
+            wait: Seconds the API may hold the request waiting for new events.
+            feed: Feed id returned with the cursor; a different feed ignores the cursor.
+
+        Returns:
+            dict[str, Any]: Event ``items`` (oldest first), the next ``cursor``,
+            the ``feed`` that issued it and the number of ``missed`` events.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        params: dict[str, Any] = {"limit": limit, "wait": wait}
+        if after is not None:
+            params["after"] = after
+        if feed is not None:
+            params["feed"] = feed
+        return self.get("/activity", params=params)
+
+    def list_events(
+        self, page: int = 1, size: int = 50, sort: str | None = None, **filters: str | int
+    ) -> dict[str, Any]:
+        """Get one page of stored events, sorted and filtered by the API.
+
+        Args:
+            page: Page number (1-based).
+            size: Events per page (1-100).
+            sort: Column to sort by, "-" prefix for descending (default: newest first).
+            **filters: ``name``, ``user_id``, ``start`` or ``end`` (epoch ms).
+
+        Returns:
+            dict[str, Any]: Event ``items`` with ``total``, ``page``, ``size`` and ``pages``.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        params: dict[str, Any] = {"page": page, "size": size, **filters}
+        if sort is not None:
+            params["sort"] = sort
+        return self.get("/events", params=params)
+
+    def submit_job(self, kind: str, payload: dict[str, Any] | None = None, priority: int = 0) -> dict[str, Any]:
+        """Submit a background job.
+
+        Args:
+            kind: Registered job kind.
+            payload: Job input.
+            priority: Priority (0-9, higher runs first).
+
+        Returns:
+            dict[str, Any]: The queued job.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        return self.post("/jobs", json_data={"kind": kind, "payload": payload or {}, "priority": priority})
+
+    def get_job(self, job_id: str) -> dict[str, Any]:
+        """Get the current state of a background job.
+
+        Args:
+            job_id: Job identifier.
+
+        Returns:
+            dict[str, Any]: Job state, including result or error once finished.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        return self.get(f"/jobs/{job_id}")
+
+    def wait_for_job(
+        self,
+        job_id: str,
+        timeout: float = 60.0,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 5.0,
+    ) -> dict[str, Any]:
+        """Poll a background job until it finishes.
+
+        The poll interval doubles after each check up to ``max_poll_interval``.
+
+        Args:
+            job_id: Job identifier.
+            timeout: Maximum seconds to wait.
+            poll_interval: Initial seconds between polls.
+            max_poll_interval: Upper bound for the poll interval.
+
+        Returns:
+            dict[str, Any]: Final job state ("succeeded" or "failed").
+
+        Raises:
+            TimeoutError: If the job does not finish within ``timeout``.
+            Exception: If API request fails.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout:.0f}s")
+            time.sleep(min(poll_interval, remaining))
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+
+    def _client(self) -> httpx.Client:
+        """Create an HTTP client, using the in-process transport when enabled."""
+        return httpx.Client(timeout=self.timeout, transport=self.transport)
+
+    def _fetch(self, url: str, params: httpx.QueryParams) -> dict[str, Any]:
+        """Send a GET request.
+
+        Raises:
+            Exception: If API request fails.
+        """
+        try:
+            with self._client() as client:
+                response = client.get(url, params=params)
+                response.raise_for_status()
+                result: dict[str, Any] = response.json()
+                return result
         except httpx.RequestError as e:
             raise Exception(f"Connection error: {e}") from e
         except httpx.HTTPStatusError as e:
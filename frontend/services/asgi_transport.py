@@ -0,0 +1,105 @@
+"""In-process transport that serves ``APIClient`` requests from the FastAPI app directly.
+
+When the frontend and the API are deployed together, calling the API over
+loopback TCP costs a socket round trip and HTTP parsing on both sides per
+call, plus a separate uvicorn process. With ``API_IN_PROCESS=true`` the
+client sends its requests through ``InProcessTransport`` instead: the ASGI
+app (``app.main:app``) runs on an event loop in a background thread of the
+Streamlit process, and each request is handed to it with
+``httpx.ASGITransport``. Middleware, routing, validation and serialization
+all still apply; only the network is skipped.
+
+The app's lifespan (database setup, ingestor, job workers, ...) runs once
+per process when the transport is first used and shuts down at exit, so the
+Streamlit process hosts the API. Streamlit runs each session on its own
+thread; their requests are all served concurrently by the one event loop.
+"""
+
+import asyncio
+import atexit
+import httpx
+import threading
+from collections.abc import Coroutine
+from contextlib import AbstractAsyncContextManager
+from functools import lru_cache
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+# Host the requests are addressed to; accepted by the app's TrustedHostMiddleware.
+IN_PROCESS_BASE_URL = "http://localhost"
+
+
+class InProcessTransport(httpx.BaseTransport):
+    """Synchronous httpx transport calling an ASGI app on a background event loop."""
+
+    def __init__(self, app: Any, timeout: float = 60.0) -> None:
+        """Start the event loop thread and the app's lifespan.
+
+        Args:
+            app: ASGI application; its lifespan runs if it has a Starlette router.
+            timeout: Seconds to wait for startup, shutdown and each request.
+        """
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="asgi-in-process", daemon=True)
+        self._thread.start()
+        self._transport = httpx.ASGITransport(app=app)
+        router = getattr(app, "router", None)
+        self._lifespan: AbstractAsyncContextManager[Any] | None = (
+            router.lifespan_context(app) if router is not None else None
+        )
+        if self._lifespan is not None:
+            self._run(self._lifespan.__aenter__())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request to the app and wait for the complete response.
+
+        Args:
+            request: Outgoing request.
+
+        Returns:
+            httpx.Response: Response with its body read.
+        """
+        request.read()
+        return self._run(self._send(request))
+
+    def close(self) -> None:
+        """Keep running: ``httpx.Client`` closes its transport on exit, but this one is shared."""
+
+    def shutdown(self) -> None:
+        """Run the app's shutdown and stop the event loop thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            if self._lifespan is not None:
+                self._run(self._lifespan.__aexit__(None, None, None))
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(self.timeout)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Call the app and read the response on the event loop."""
+        response = await self._transport.handle_async_request(request)
+        content = await response.aread()
+        return httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+
+    def _run(self, coroutine: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine on the event loop thread and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(self.timeout)
+
+
+@lru_cache
+def get_in_process_transport() -> InProcessTransport:
+    """Get the process-wide transport, importing and starting the API on first use.
+
+    Returns:
+        InProcessTransport: Transport serving requests from ``app.main:app``.
+    """
+    from app.main import app
+
+    transport = InProcessTransport(app)
+    # The app's shutdown uses thread pools, which refuse work once interpreter
+    # exit begins; threading's exit hooks run before they are shut down.
+    getattr(threading, "_register_atexit", atexit.register)(transport.shutdown)
+    return transport
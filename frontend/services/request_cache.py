@@ -0,0 +1,184 @@
+"""Process-wide single-flight cache for API responses.
+
+Every Streamlit session of a server runs its script on a thread of the same
+process, so when a cached response expires, all sessions viewing the page
+miss at the same moment and each sends the same request (a cache stampede).
+``RequestCache`` prevents this twice over:
+
+- single flight: while a key is being loaded, other callers asking for it
+  wait for that load and share its result (or error) instead of sending
+  their own request;
+- probabilistic early refresh ("XFetch"): each hit may refresh the entry
+  shortly before it expires, with a probability that rises as expiry nears
+  and with the time the last load took. One caller refreshes while the
+  others keep getting the still-valid value, so a popular entry is usually
+  replaced before it ever expires.
+
+Together, N sessions on the same dashboard cost the backend about as much
+as one. Values are shared between sessions; treat them as read-only.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RequestCacheStats:
+    """Snapshot of request cache counters."""
+
+    hits: int
+    loads: int
+    coalesced: int
+    early_refreshes: int
+    size: int
+
+
+@dataclass
+class _Entry:
+    """Cached value with its expiry and the seconds its load took."""
+
+    value: Any
+    expires_at: float
+    load_time: float
+
+
+class _Flight:
+    """A load in progress that other callers can wait for."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class RequestCache:
+    """Thread-safe TTL cache with single-flight loads and early refresh."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        beta: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached values before LRU eviction.
+            beta: Eagerness of early refresh; 0 disables it, above 1 refreshes earlier.
+            clock: Monotonic clock in seconds.
+            rand: Uniform random numbers in [0, 1).
+        """
+        self.max_entries = max_entries
+        self.beta = beta
+        self.clock = clock
+        self.rand = rand
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self._generation = 0
+        self._hits = 0
+        self._loads = 0
+        self._coalesced = 0
+        self._early_refreshes = 0
+
+    def get(self, key: str, load: Callable[[], Any], ttl: float | None = None) -> Any:
+        """Get a value, loading it at most once at a time per key.
+
+        Args:
+            key: Cache key, e.g. the request URL with its query string.
+            load: Loads the value; called by one caller while the others wait.
+            ttl: Seconds the loaded value is cached; None only coalesces
+                concurrent calls without caching.
+
+        Returns:
+            Any: Cached, shared or freshly loaded value.
+
+        Raises:
+            Exception: Whatever ``load`` raised, for every caller sharing the
+                load; a failed early refresh returns the still-valid value instead.
+        """
+        with self._lock:
+            now = self.clock()
+            entry = self._entries.get(key) if ttl is not None else None
+            flight = self._flights.get(key)
+            if entry is not None and now < entry.expires_at and (flight is not None or not self._due(entry, now)):
+                # Valid and either not due for refresh or already being refreshed by another caller.
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+            if flight is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                generation = self._generation
+                self._loads += 1
+                # Refreshing a still-valid entry: keep it as the fallback if the load fails.
+                fallback = entry if entry is not None and now < entry.expires_at else None
+                if fallback is not None:
+                    self._early_refreshes += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        started = self.clock()
+        try:
+            flight.value = load()
+        except Exception as e:
+            if fallback is None:
+                flight.error = e
+                raise
+            flight.value = fallback.value
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            if ttl is not None and ttl > 0:
+                finished = self.clock()
+                with self._lock:
+                    # A clear() during the load means the value may predate it.
+                    if generation == self._generation:
+                        self._store(key, _Entry(flight.value, finished + ttl, finished - started))
+            return flight.value
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def clear(self) -> None:
+        """Drop all cached values; loads in progress are not cached when they finish."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    @property
+    def stats(self) -> RequestCacheStats:
+        """Get the cache counters."""
+        with self._lock:
+            return RequestCacheStats(
+                self._hits, self._loads, self._coalesced, self._early_refreshes, len(self._entries)
+            )
+
+    def _due(self, entry: _Entry, now: float) -> bool:
+        """Decide whether a valid entry is refreshed early (XFetch: ``now - load_time * beta * ln(u) >= expiry``)."""
+        return now - entry.load_time * self.beta * math.log(1.0 - self.rand()) >= entry.expires_at
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        """Insert an entry, evicting the least recently used beyond ``max_entries``."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
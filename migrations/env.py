@@ -0,0 +1,84 @@
+"""Alembic migration environment using the application's async engine settings."""
+
+import asyncio
+from alembic import context
+from alembic.script import ScriptDirectory
+from app.config import get_settings
+from app.database.connection import Base
+from app.database.schema import record_fingerprint, schema_state
+from logging.config import fileConfig
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
+from typing import Any
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+config.set_main_option("sqlalchemy.url", get_settings().database_url)
+target_metadata = Base.metadata
+
+
+def include_object(_obj: Any, name: str | None, type_: str, _reflected: bool, _compare_to: Any) -> bool:
+    """Exclude the schema fingerprint table from autogenerate."""
+    return not (type_ == "table" and name == schema_state.name)
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode, emitting SQL to the script output."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    """Run migrations on a synchronous connection.
+
+    After upgrading to head the schema fingerprint is recorded, so workers
+    started with ``SCHEMA_INIT_MODE=migrations`` see a current schema.
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    destination = context.get_revision_argument()
+    destinations = set(destination) if isinstance(destination, tuple) else {destination}
+    if heads and destinations == heads:
+        record_fingerprint(connection)
+        connection.commit()
+
+
+async def run_async_migrations() -> None:
+    """Create an async engine and run migrations through it."""
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
@@ -1,5 +1,14 @@
 """Pytest configuration and fixtures."""
 
+import os
+import tempfile
+
+# The application's lifespan (schema setup, job queue, rollups, ingestion)
+# writes to DATABASE_URL; point it at a throwaway directory before the app
+# is imported so test runs never touch ./app.db.
+_TEST_DIR = tempfile.TemporaryDirectory(prefix="app-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TEST_DIR.name}/app.db"
+
 import asyncio
 import pytest
 import pytest_asyncio
@@ -8,8 +17,7 @@ from app.dependencies import get_db_session
 from app.main import app
 from collections.abc import AsyncGenerator, Generator
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -22,7 +30,7 @@ test_engine = create_async_engine(
 )
 
 # Create test session factory
-TestSessionLocal = sessionmaker(
+TestSessionLocal = async_sessionmaker(
     test_engine,
     class_=AsyncSession,
     expire_on_commit=False,
@@ -54,7 +62,8 @@ def client(test_db: AsyncSession) -> Generator[TestClient, None, None]:
 
     app.dependency_overrides[get_db_session] = override_get_db
 
-    with TestClient(app) as test_client:
+    # TrustedHostMiddleware rejects TestClient's default "testserver" host.
+    with TestClient(app, base_url="http://localhost") as test_client:
         yield test_client
 
     # Clean up
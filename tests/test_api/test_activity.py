@@ -0,0 +1,43 @@
+"""Tests for the recent-activity endpoint."""
+
+import json
+from app.main import app
+from fastapi.testclient import TestClient
+
+
+def test_activity_tails_committed_events(client: TestClient) -> None:
+    """Test that a cursor returns only events committed after it."""
+    cursor = client.get("/api/v1/activity").json()["cursor"]
+    body = "\n".join(json.dumps({"name": "test.activity", "ts": ts, "user_id": "u1"}) for ts in (1, 2)) + "\n"
+    assert client.post("/api/v1/events?ack=commit", content=body).status_code == 200
+
+    response = client.get("/api/v1/activity", params={"after": cursor, "limit": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == [{"cursor": cursor + 1, "ts": 1, "name": "test.activity", "user_id": "u1", "value": 0.0}]
+    assert data["cursor"] == cursor + 1
+    assert data["missed"] == 0
+    assert client.get("/api/v1/activity", params={"after": data["cursor"]}).json()["items"][0]["ts"] == 2
+
+
+def test_activity_long_poll_times_out_empty(client: TestClient) -> None:
+    """Test that a long poll without new events ends empty at the cursor."""
+    first = client.get("/api/v1/activity").json()
+    cursor = first["cursor"]
+
+    response = client.get("/api/v1/activity", params={"after": cursor, "feed": first["feed"], "wait": 0.05})
+
+    assert response.json() == {"items": [], "cursor": cursor, "feed": first["feed"], "missed": 0}
+    assert client.get("/api/v1/activity", params={"limit": 0}).status_code == 422
+
+
+def test_activity_ignores_cursor_of_another_feed(client: TestClient) -> None:
+    """Test that a cursor issued by another worker's feed returns the newest events instead."""
+    events = [{"ts": ts, "name": "test.activity", "user_id": None, "value": 0.0} for ts in (1, 2, 3)]
+    client.portal.call(app.state.activity.publish, events)  # type: ignore[union-attr]
+    latest = client.get("/api/v1/activity", params={"limit": 2}).json()
+
+    response = client.get("/api/v1/activity", params={"after": 0, "feed": "other", "limit": 2})
+
+    assert response.json() == latest
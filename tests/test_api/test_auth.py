@@ -0,0 +1,41 @@
+"""Tests for the bearer-token authentication dependency."""
+
+from app.core.security import TokenVerifier
+from app.dependencies import CurrentClaimsDep
+from datetime import timedelta
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def _client() -> tuple[TestClient, TokenVerifier]:
+    """Build an app with one authenticated route."""
+    app = FastAPI()
+    app.state.token_verifier = TokenVerifier("secret")
+
+    @app.get("/me")
+    async def me(claims: CurrentClaimsDep) -> dict[str, str]:
+        return {"sub": claims["sub"]}
+
+    return TestClient(app), app.state.token_verifier
+
+
+def test_current_claims_from_bearer_token() -> None:
+    """Test that valid tokens pass and their claims are cached."""
+    client, verifier = _client()
+    token = verifier.create_token("user-1", timedelta(minutes=5))
+
+    for _ in range(2):
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        assert response.json() == {"sub": "user-1"}
+    assert verifier.stats.hits == 1
+
+
+def test_missing_or_invalid_token_is_unauthorized() -> None:
+    """Test 401 with a Bearer challenge."""
+    client, _ = _client()
+
+    for headers in ({}, {"Authorization": "Bearer garbage"}, {"Authorization": "Basic dXNlcjpwdw=="}):
+        response = client.get("/me", headers=headers)
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
@@ -0,0 +1,153 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import httpx
+import pytest
+from app.api.coalesce import coalesce
+from collections.abc import AsyncIterator, Callable
+from fastapi import Depends, FastAPI, HTTPException, Request
+from typing import Annotated
+
+
+def _app(gate: asyncio.Event, runs: list[str], timeout: float = 5.0) -> FastAPI:
+    """Build an app whose routes block until ``gate`` is set and record each run."""
+    app = FastAPI()
+
+    @app.get("/report")
+    @coalesce(timeout=timeout)
+    async def report(region: str = "all") -> dict[str, object]:
+        runs.append(region)
+        await gate.wait()
+        return {"region": region, "runs": len(runs)}
+
+    @app.get("/failing")
+    @coalesce(timeout=timeout)
+    async def failing(request: Request) -> dict[str, str]:
+        runs.append(request.url.path)
+        await gate.wait()
+        raise HTTPException(status_code=503, detail="backend down")
+
+    return app
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def _until(condition: Callable[[], object], attempts: int = 100) -> None:
+    """Yield to the event loop until a condition holds."""
+    for _ in range(attempts):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+
+
+async def test_identical_requests_share_one_run() -> None:
+    """Test that concurrent identical requests run the handler once and all get its result."""
+    gate = asyncio.Event()
+    runs: list[str] = []
+    async with _client(_app(gate, runs)) as client:
+        requests = [asyncio.create_task(client.get("/report", params={"region": "eu"})) for _ in range(10)]
+        await _until(lambda: runs)
+        await asyncio.sleep(0.01)
+        gate.set()
+        responses = await asyncio.gather(*requests)
+
+        assert runs == ["eu"]
+        assert {response.status_code for response in responses} == {200}
+        assert all(response.json() == {"region": "eu", "runs": 1} for response in responses)
+
+        # The flight is over: the next request runs the handler again.
+        assert (await client.get("/report", params={"region": "eu"})).json()["runs"] == 2
+
+
+async def test_different_queries_and_credentials_run_separately() -> None:
+    """Test that requests differing in query or Authorization header are not coalesced."""
+    gate = asyncio.Event()
+    runs: list[str] = []
+    async with _client(_app(gate, runs)) as client:
+        requests = [
+            asyncio.create_task(client.get("/report", params={"region": "eu"})),
+            asyncio.create_task(client.get("/report", params={"region": "us"})),
+            asyncio.create_task(
+                client.get("/report", params={"region": "eu"}, headers={"Authorization": "Bearer a"})
+            ),
+        ]
+        await _until(lambda: len(runs) == 3)
+        gate.set()
+        await asyncio.gather(*requests)
+
+    assert sorted(runs) == ["eu", "eu", "us"]
+
+
+async def test_errors_reach_every_waiter() -> None:
+    """Test that an exception from the shared run is raised for each request."""
+    gate = asyncio.Event()
+    runs: list[str] = []
+    async with _client(_app(gate, runs)) as client:
+        requests = [asyncio.create_task(client.get("/failing")) for _ in range(3)]
+        await _until(lambda: runs)
+        await asyncio.sleep(0.01)
+        gate.set()
+        responses = await asyncio.gather(*requests)
+
+    assert runs == ["/failing"]
+    assert [response.status_code for response in responses] == [503, 503, 503]
+    assert responses[0].json() == {"detail": "backend down"}
+
+
+async def test_timeout_answers_504() -> None:
+    """Test that a run exceeding the timeout fails all waiters with 504 and is forgotten."""
+    gate = asyncio.Event()
+    runs: list[str] = []
+    async with _client(_app(gate, runs, timeout=0.05)) as client:
+        responses = await asyncio.gather(*(client.get("/report") for _ in range(3)))
+        assert [response.status_code for response in responses] == [504, 504, 504]
+        assert len(runs) == 1
+
+        gate.set()
+        assert (await client.get("/report")).status_code == 200
+
+
+def test_sync_handlers_are_rejected() -> None:
+    """Test that only async handlers can be coalesced."""
+    with pytest.raises(TypeError, match="async handler"):
+        coalesce()(lambda: None)  # type: ignore[arg-type, return-value]
+
+
+async def test_cancelled_leader_keeps_dependencies_open() -> None:
+    """Test that cancelling the leader neither tears down the run's dependencies nor fails the others."""
+    gate, closed = asyncio.Event(), []
+    app = FastAPI()
+
+    async def resource() -> AsyncIterator[list[str]]:
+        used: list[str] = []
+        try:
+            yield used
+        finally:
+            closed.append(f"closed after {used}")
+
+    @app.get("/report")
+    @coalesce()
+    async def report(used: Annotated[list[str], Depends(resource)]) -> dict[str, str]:
+        await gate.wait()
+        used.append("run")
+        return {"status": "ok"}
+
+    async with _client(app) as client:
+        leader = asyncio.create_task(client.get("/report"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(client.get("/report"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        assert closed == []
+
+        gate.set()
+        response = await follower
+
+    assert response.json() == {"status": "ok"}
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    # The leader's dependency, used by the run, closed after it; the follower's was never used.
+    assert sorted(closed) == ["closed after ['run']", "closed after []"]
@@ -0,0 +1,133 @@
+"""Tests for the NDJSON event ingestion and event list endpoints."""
+
+import json
+import pytest
+import pytest_asyncio
+from app.api.routes.events import MAX_LINE_BYTES
+from app.core.services.ingest import EventIngestor
+from app.database.models.event import Event
+from app.dependencies import get_event_ingestor
+from app.main import app
+from collections.abc import Iterator
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _ndjson(events: list[dict[str, object]]) -> bytes:
+    return b"\n".join(json.dumps(event).encode() for event in events) + b"\n"
+
+
+@pytest.fixture
+def small_ingestor(client: TestClient) -> EventIngestor:
+    """Replace the ingestor with an unstarted one holding at most three events."""
+    ingestor = EventIngestor(AsyncSession, max_buffered=3)
+    app.dependency_overrides[get_event_ingestor] = lambda: ingestor
+    return ingestor
+
+
+def test_ingest_and_commit(client: TestClient) -> None:
+    """Test that ack=commit answers after the events are written."""
+    body = _ndjson([{"name": "page_view", "ts": 1_000, "user_id": "u1"}, {"name": "purchase", "value": 9.5}])
+
+    response = client.post("/api/v1/events?ack=commit", content=body)
+
+    assert response.status_code == 200
+    assert response.json() == {"accepted": 2, "committed": True}
+
+
+def test_ingest_streamed_body(client: TestClient, small_ingestor: EventIngestor) -> None:
+    """Test that lines split across body chunks and blank lines are handled."""
+    body = _ndjson([{"name": "a"}, {"name": "b"}])
+
+    def chunks() -> Iterator[bytes]:
+        yield body[:5]
+        yield body[5:] + b"\n"
+
+    response = client.post("/api/v1/events", content=chunks())
+
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 2, "committed": False}
+    assert [row["name"] for row in small_ingestor._buffer] == ["a", "b"]
+    assert all(row["ts"] > 0 for row in small_ingestor._buffer)
+
+
+def test_invalid_line_reports_position(client: TestClient, small_ingestor: EventIngestor) -> None:
+    """Test that the first invalid line is reported and earlier lines are kept."""
+    body = b'{"name": "a"}\n{"name": ""}\n{"name": "c"}\n'
+
+    response = client.post("/api/v1/events", content=body)
+
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert detail["line"] == 2
+    assert detail["accepted"] == 1
+    assert small_ingestor.buffered == 1
+
+
+def test_full_buffer_returns_429(client: TestClient, small_ingestor: EventIngestor) -> None:
+    """Test that a full buffer pushes back with 429 and Retry-After."""
+    response = client.post("/api/v1/events", content=_ndjson([{"name": "a"}] * 4))
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["accepted"] == 0
+
+
+def test_oversized_lines_are_rejected(client: TestClient, small_ingestor: EventIngestor) -> None:
+    """Test that too long lines answer 400, whether complete within one body chunk or still unterminated."""
+    long_line = json.dumps({"name": "a", "user_id": "x" * MAX_LINE_BYTES}).encode()
+
+    complete = client.post("/api/v1/events", content=b'{"name": "ok"}\n' + long_line + b"\n")
+    assert complete.status_code == 400
+    assert complete.json()["detail"] == {"message": f"Line 2 exceeds {MAX_LINE_BYTES} bytes", "accepted": 0}
+
+    def unterminated() -> Iterator[bytes]:
+        yield long_line
+
+    partial = client.post("/api/v1/events", content=unterminated())
+    assert partial.status_code == 400
+    assert partial.json()["detail"]["message"] == f"Line 1 exceeds {MAX_LINE_BYTES} bytes"
+    assert small_ingestor.buffered == 0
+
+
+@pytest_asyncio.fixture
+async def stored_events(test_db: AsyncSession) -> str:
+    """Store five events in the test database and return their name."""
+    name = "page_view"
+    await test_db.execute(
+        insert(Event),
+        [{"name": name, "ts": ts, "user_id": f"u{ts % 2}", "value": float(5 - ts)} for ts in range(1, 6)],
+    )
+    await test_db.commit()
+    return name
+
+
+def test_list_events_pages_and_sorts(client: TestClient, stored_events: str) -> None:
+    """Test that pages follow the requested order and report the total."""
+    first = client.get("/api/v1/events", params={"name": stored_events, "sort": "ts", "size": 2}).json()
+    last = client.get("/api/v1/events", params={"name": stored_events, "sort": "ts", "size": 2, "page": 3}).json()
+    by_value = client.get("/api/v1/events", params={"name": stored_events, "sort": "-value"}).json()
+
+    assert first["total"] == 5
+    assert first["pages"] == 3
+    assert [item["ts"] for item in first["items"]] == [1, 2]
+    assert [item["ts"] for item in last["items"]] == [5]
+    assert [item["value"] for item in by_value["items"]] == [4.0, 3.0, 2.0, 1.0, 0.0]
+
+
+def test_list_events_filters(client: TestClient, stored_events: str) -> None:
+    """Test that user and time filters are applied before paging."""
+    params = {"name": stored_events, "user_id": "u1", "start": 2, "sort": "ts"}
+
+    body = client.get("/api/v1/events", params=params).json()
+
+    assert body["total"] == 2
+    assert [(item["ts"], item["user_id"]) for item in body["items"]] == [(3, "u1"), (5, "u1")]
+
+
+def test_list_events_rejects_unknown_sort(client: TestClient) -> None:
+    """Test that only whitelisted columns can be sorted by."""
+    response = client.get("/api/v1/events", params={"sort": "-secret"})
+
+    assert response.status_code == 400
@@ -1,5 +1,9 @@
 """Tests for health check endpoints."""
 
+import asyncio
+import time
+from app.core.services.warmup import Warmup
+from app.main import app
 from fastapi.testclient import TestClient
 
 
@@ -32,13 +36,35 @@ def test_detailed_health_check(client: TestClient) -> None:
 
 
 def test_readiness_check(client: TestClient) -> None:
-    """Test Kubernetes readiness probe."""
-    response = client.get("/api/v1/health/ready")
+    """Test Kubernetes readiness probe: ready once the startup warm-up has run."""
+    deadline = time.monotonic() + 10
+    while (response := client.get("/api/v1/health/ready")).status_code == 503 and time.monotonic() < deadline:
+        assert response.json()["status"] == "warming_up"
+        time.sleep(0.01)
 
     assert response.status_code == 200
 
     data = response.json()
     assert data["status"] == "ready"
+    steps = data["warmup"]["steps"]
+    assert set(steps) == {"database_pool", "hot_queries", "validators"}
+    assert {step["status"] for step in steps.values()} == {"done"}
+    assert all(step["seconds"] >= 0 for step in steps.values())
+
+
+def test_readiness_check_while_warming_up(client: TestClient) -> None:
+    """Test that the probe answers 503 with the pending steps until warm-up finishes."""
+
+    async def never() -> None:
+        await asyncio.Event().wait()
+
+    app.state.warmup = Warmup({"slow": never}, deadline=60)
+
+    response = client.get("/api/v1/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+    assert response.json()["warmup"]["steps"] == {"slow": {"status": "pending", "seconds": None, "error": None}}
 
 
 def test_liveness_check(client: TestClient) -> None:
@@ -49,3 +75,18 @@ def test_liveness_check(client: TestClient) -> None:
 
     data = response.json()
     assert data["status"] == "alive"
+
+
+def test_metrics_report_latency_per_route(client: TestClient) -> None:
+    """Test that request latencies are reported per route template."""
+    for job_id in ("a", "b", "c"):
+        client.get(f"/api/v1/jobs/{job_id}")
+
+    response = client.get("/api/v1/health/metrics")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["window_seconds"] > 0
+    route = data["routes"]["GET /api/v1/jobs/{job_id}"]
+    assert route["count"] >= 3
+    assert 0 <= route["p50"] <= route["p95"] <= route["p99"] <= route["max"]
@@ -0,0 +1,44 @@
+"""Tests for background job endpoints."""
+
+import pytest
+import time
+from app.core.services.jobs import JOB_HANDLERS, JobContext
+from fastapi.testclient import TestClient
+
+
+async def _echo(context: JobContext) -> dict[str, object]:
+    return {"echo": context.payload}
+
+
+def test_submit_and_poll_job(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a submitted job can be polled until it succeeds."""
+    monkeypatch.setitem(JOB_HANDLERS, "test.echo", _echo)
+
+    response = client.post("/api/v1/jobs", json={"kind": "test.echo", "payload": {"x": 1}, "priority": 5})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["priority"] == 5
+
+    deadline = time.monotonic() + 5
+    while job["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.02)
+        job = client.get(f"/api/v1/jobs/{job['id']}").json()
+
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"echo": {"x": 1}}
+    assert job["progress"] == 1.0
+
+
+def test_submit_unknown_kind(client: TestClient) -> None:
+    """Test that unknown job kinds are rejected."""
+    response = client.post("/api/v1/jobs", json={"kind": "test.missing"})
+
+    assert response.status_code == 400
+
+
+def test_get_missing_job(client: TestClient) -> None:
+    """Test that unknown job ids return 404."""
+    response = client.get("/api/v1/jobs/does-not-exist")
+
+    assert response.status_code == 404
@@ -0,0 +1,54 @@
+"""Tests for the time-series endpoint."""
+
+from fastapi.testclient import TestClient
+
+
+def test_timeseries_returns_dense_arrays(client: TestClient) -> None:
+    """Test that every bucket of the range is present for every metric."""
+    response = client.get(
+        "/api/v1/timeseries",
+        params={
+            "start": "2000-01-01T00:00:00",
+            "end": "2000-01-04T00:00:00",
+            "granularity": "day",
+            "metrics": ["test.none:sum", "test.none:mean"],
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["step_ms"] == 86_400_000
+    assert data["start"] == 946_684_800_000
+    assert len(data["timestamps"]) == 3
+    assert data["series"] == {"test.none:sum": [0.0, 0.0, 0.0], "test.none:mean": [None, None, None]}
+    assert data["totals"] == {"test.none:sum": 0.0, "test.none:mean": None}
+    assert data["errors"] == {}
+
+
+def test_timeseries_reports_distinct_count_error(client: TestClient) -> None:
+    """Test that distinct-user metrics come with their relative standard error."""
+    response = client.get(
+        "/api/v1/timeseries",
+        params={"start": "2000-01-01T00:00:00", "end": "2000-01-03T00:00:00", "metrics": ["test.none:distinct"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["series"] == {"test.none:distinct": [0.0, 0.0]}
+    assert data["totals"] == {"test.none:distinct": 0}
+    assert 0 < data["errors"]["test.none:distinct"] <= 0.01
+
+
+def test_timeseries_rejects_invalid_requests(client: TestClient) -> None:
+    """Test validation of metrics, ranges and bucket limits."""
+    params = {"start": "2000-01-01T00:00:00", "end": "2000-01-02T00:00:00", "metrics": "x"}
+
+    def status_of(**overrides: str) -> int:
+        status: int = client.get("/api/v1/timeseries", params={**params, **overrides}).status_code
+        return status
+
+    assert status_of(metrics="x:median") == 400
+    assert status_of(granularity="month") == 422
+    assert status_of(end=params["start"]) == 400
+    assert status_of(end="2001-01-01T00:00:00", granularity="minute") == 400
+    assert client.get("/api/v1/timeseries", params={"start": params["start"], "end": params["end"]}).status_code == 422
@@ -0,0 +1,56 @@
+"""Tests for the resumable upload endpoints."""
+
+import hashlib
+import pytest
+from app.core.services.uploads import UploadManager
+from app.dependencies import get_upload_manager
+from app.main import app
+from collections.abc import Iterator
+from fastapi.testclient import TestClient
+from pathlib import Path
+
+
+@pytest.fixture
+def uploads(client: TestClient, tmp_path: Path) -> UploadManager:
+    """Store uploads in a temporary directory with a small size limit."""
+    manager = UploadManager(tmp_path, max_bytes=1_000_000, chunk_size=4_096)
+    app.dependency_overrides[get_upload_manager] = lambda: manager
+    return manager
+
+
+def test_streamed_resumable_upload(client: TestClient, uploads: UploadManager) -> None:
+    """Test create, a streamed chunk, a wrong offset, resume and completion."""
+    data = b"a,b\n1,2\n" * 10_000
+    created = client.post(
+        "/api/v1/uploads", json={"filename": "data.csv", "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+    )
+    assert created.status_code == 201
+    upload_id = created.json()["id"]
+
+    def body() -> Iterator[bytes]:
+        for start in range(0, 50_000, 8_192):
+            yield data[start : min(start + 8_192, 50_000)]
+
+    first = client.put(f"/api/v1/uploads/{upload_id}", params={"offset": 0}, content=body())
+    assert first.json()["offset"] == 50_000
+
+    conflict = client.put(f"/api/v1/uploads/{upload_id}", params={"offset": 0}, content=data)
+    assert conflict.status_code == 409
+    assert conflict.json()["detail"]["offset"] == 50_000
+
+    done = client.put(f"/api/v1/uploads/{upload_id}", params={"offset": 50_000}, content=data[50_000:])
+    assert done.status_code == 200
+    assert done.json()["complete"] is True
+    assert done.json()["sha256"] == hashlib.sha256(data).hexdigest()
+    assert client.get(f"/api/v1/uploads/{upload_id}").json()["offset"] == len(data)
+
+
+def test_upload_limits_and_missing_uploads(client: TestClient, uploads: UploadManager) -> None:
+    """Test 413 for oversized uploads and bodies, 404 for unknown ids and deletion."""
+    assert client.post("/api/v1/uploads", json={"filename": "big", "size": 2_000_000}).status_code == 413
+    upload_id = client.post("/api/v1/uploads", json={"filename": "small", "size": 10}).json()["id"]
+
+    assert client.put(f"/api/v1/uploads/{upload_id}", params={"offset": 0}, content=b"x" * 11).status_code == 413
+    assert client.delete(f"/api/v1/uploads/{upload_id}").status_code == 204
+    assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 404
+    assert client.put("/api/v1/uploads/missing", params={"offset": 0}, content=b"x").status_code == 404
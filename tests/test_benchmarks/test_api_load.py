@@ -0,0 +1,65 @@
+"""Tests for the API load-test benchmark."""
+
+import json
+import pytest
+from benchmarks.api_load import compare, load_scenario, percentile, run_benchmark
+from pathlib import Path
+
+
+def test_percentile_nearest_rank() -> None:
+    """Test nearest-rank percentiles."""
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 99.9) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_scenario_file_expands_pages(tmp_path: Path) -> None:
+    """Test that scenario files substitute the API prefix and expand pages."""
+    path = tmp_path / "items.json"
+    path.write_text(
+        json.dumps(
+            {
+                "name": "items",
+                "requests": [
+                    {"path": "{api_prefix}/items", "params": {"page": "{page}", "size": 10}, "pages": 3},
+                    {"method": "post", "path": "{api_prefix}/items/batch", "json": [1, 2], "weight": 2},
+                ],
+            }
+        )
+    )
+
+    scenario = load_scenario(str(path), "/api/v1")
+
+    assert [(spec.params or {}).get("page") for spec in scenario.requests[:3]] == ["1", "2", "3"]
+    assert scenario.requests[3].method == "POST"
+    assert len(scenario.schedule()) == 5
+
+    with pytest.raises(ValueError):
+        load_scenario("missing", "/api/v1")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("rate", [None, 200.0])
+async def test_in_process_health_benchmark(rate: float | None) -> None:
+    """Test a short in-process run in closed and open loop mode."""
+    report = await run_benchmark(
+        load_scenario("health", "/api/v1"), concurrency=4, rate=rate, duration=0.3, warmup=0
+    )
+
+    assert report["requests"] > 0
+    assert report["errors"] == 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+
+
+def test_compare_flags_regressions() -> None:
+    """Test throughput and latency regression thresholds."""
+    baseline = {"throughput_rps": 1000.0, "errors": 0, "latency_ms": {"p50": 1.0, "p95": 2.0, "p99": 3.0, "p999": 4.0}}
+    current = {"throughput_rps": 950.0, "errors": 0, "latency_ms": {"p50": 1.1, "p95": 2.0, "p99": 5.0, "p999": 4.0}}
+
+    assert compare(baseline, baseline) == []
+    regressions = compare(current, baseline, max_throughput_drop=0.1, max_latency_increase=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("p99")
@@ -0,0 +1,39 @@
+"""Tests for the headless Streamlit render benchmark."""
+
+import httpx
+import pytest
+from benchmarks.frontend_render import StubAPI, compare, discover_pages, run_benchmark
+
+
+def test_discover_pages() -> None:
+    """Test that the entrypoint and multipage scripts are found."""
+    pages = discover_pages()
+
+    assert "main" in pages
+    assert any("Dashboard" in name for name in pages)
+
+
+def test_stub_api_counts_calls() -> None:
+    """Test that the stub serves canned health data and counts requests."""
+    with StubAPI() as stub:
+        response = httpx.get(f"{stub.base_url}/api/v1/health/")
+
+        assert response.json()["status"] == "healthy"
+        assert stub.calls["/health/"] == 1
+
+
+@pytest.mark.slow
+def test_dashboard_renders_against_stub() -> None:
+    """Test a short benchmark run of the dashboard page."""
+    name = next(name for name in discover_pages() if "Dashboard" in name)
+
+    report = run_benchmark([name], reruns=1)
+    page = report["pages"][name]
+
+    assert page["exceptions"] == []
+    assert page["cold_run_ms"] > 0
+    assert page["api_calls_cold"] >= 1
+    assert compare(report, report) == []
+
+    with pytest.raises(ValueError):
+        run_benchmark(["missing"])
@@ -0,0 +1,12 @@
+"""Tests for the response serialization benchmark."""
+
+from benchmarks.serializers import run_benchmark
+
+
+def test_trusted_path_produces_identical_json() -> None:
+    """Test a short run of both construction paths."""
+    report = run_benchmark(items=200, repeat=1)
+
+    assert report["identical_output"] is True
+    assert set(report["paths"]) == {"validated", "trusted"}
+    assert all(path["total_us_per_item"] > 0 for path in report["paths"].values())
@@ -0,0 +1,36 @@
+"""Tests for the startup and import-time benchmark."""
+
+import pytest
+from benchmarks.startup import over_budget, parse_importtime, run_benchmark
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   encodings.utf_8
+import time:       300 |       1500 |   app.config
+import time:       200 |       2000 | app
+import time:      1000 |       5000 | fastapi
+"""
+
+
+def test_parse_importtime() -> None:
+    """Test that top-level and project module costs are extracted."""
+    imports = parse_importtime(IMPORTTIME_OUTPUT + "Traceback: unrelated line\n")
+
+    assert imports["top_level"] == {"app": 2.0, "fastapi": 5.0}
+    assert imports["project"] == {"app.config": 1.5, "app": 2.0}
+
+
+@pytest.mark.slow
+def test_api_startup_report() -> None:
+    """Test a single cold start of the API against budgets."""
+    report = run_benchmark(["api"], repeat=1, budgets={"api.first_response": 0.0})
+    metrics = report["targets"]["api"]["metrics"]
+
+    assert metrics["time_to_first_response"]["value_ms"] > metrics["import_app"]["value_ms"] > 0
+    assert "app.main" in report["targets"]["api"]["project_imports_ms"]
+    assert over_budget(report) == [
+        f"api.first_response: {metrics['first_response']['value_ms']:.1f} ms > budget 0.0 ms"
+    ]
+
+    with pytest.raises(ValueError):
+        run_benchmark(["worker"])
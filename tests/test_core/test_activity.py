@@ -0,0 +1,67 @@
+"""Tests for the recent-activity ring buffer."""
+
+import asyncio
+import pytest
+from app.core.services.activity import ActivityFeed
+
+
+def _events(count: int, start: int = 0) -> list[dict[str, object]]:
+    return [{"ts": start + i, "name": "view", "user_id": f"user-{start + i}", "value": 0.0} for i in range(count)]
+
+
+def test_since_returns_events_after_cursor() -> None:
+    """Test cursor tailing, paging by limit and the initial newest-first window."""
+    feed = ActivityFeed(capacity=10)
+    assert feed.since().items == []
+    assert feed.publish(_events(5)) == 5
+
+    latest = feed.since(limit=2)
+    assert [item["cursor"] for item in latest.items] == [4, 5]
+    assert latest.cursor == 5
+
+    page = feed.since(1, limit=3)
+    assert [item["ts"] for item in page.items] == [1, 2, 3]
+    assert page.cursor == 4
+    assert feed.since(page.cursor).cursor == 5
+    assert feed.since(5).items == []
+    assert feed.since(5).cursor == 5
+
+
+def test_ring_overwrites_oldest_and_reports_missed() -> None:
+    """Test that memory is bounded and slow readers learn how many events they missed."""
+    feed = ActivityFeed(capacity=4)
+    feed.publish(_events(10))
+
+    page = feed.since(2)
+    assert [item["cursor"] for item in page.items] == [7, 8, 9, 10]
+    assert page.missed == 4
+    assert len(feed._slots) == 4
+    # A cursor from before a restart is ahead of the feed: start over.
+    assert [item["cursor"] for item in feed.since(50, limit=1).items] == [10]
+    with pytest.raises(ValueError):
+        ActivityFeed(capacity=0)
+
+
+async def test_wait_wakes_on_publish() -> None:
+    """Test that long polls return as soon as events are published."""
+    feed = ActivityFeed()
+    feed.publish(_events(1))
+    waiters = [asyncio.create_task(feed.wait(1, timeout=5)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert not any(waiter.done() for waiter in waiters)
+
+    feed.publish(_events(2, start=1))
+    pages = await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+
+    assert all([item["cursor"] for item in page.items] == [2, 3] for page in pages)
+
+
+async def test_wait_times_out_or_returns_immediately() -> None:
+    """Test that long polls end empty after the timeout and never wait with pending events."""
+    feed = ActivityFeed()
+    feed.publish(_events(2))
+
+    assert (await feed.wait(0, timeout=5)).cursor == 2
+    page = await feed.wait(2, timeout=0.02)
+    assert page.items == []
+    assert page.cursor == 2
@@ -0,0 +1,150 @@
+"""Tests for the CPU-bound compute process pool."""
+
+import asyncio
+import numpy as np
+import os
+import pytest
+import pytest_asyncio
+import time
+from app.core.services.compute import ComputeError, ComputePool, raise_if_cancelled
+from collections.abc import AsyncGenerator
+
+
+def _column_sums(matrix: np.ndarray) -> np.ndarray:
+    sums: np.ndarray = matrix.sum(axis=0)
+    return sums
+
+
+def _scale(values: np.ndarray, factor: float) -> np.ndarray:
+    return values * factor
+
+
+def _cooperative_sleep(seconds: float) -> str:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        raise_if_cancelled()
+        time.sleep(0.01)
+    return "finished"
+
+
+def _stuck(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def _crash() -> None:
+    os._exit(1)
+
+
+def _busy_loop(seconds: float) -> int:
+    deadline = time.monotonic() + seconds
+    count = 0
+    while time.monotonic() < deadline:
+        count += 1
+    return count
+
+
+async def _wait_idle(pool: ComputePool, timeout: float = 5.0) -> None:
+    """Wait until abandoned tasks have released their slots."""
+    async with asyncio.timeout(timeout):
+        while pool.running:
+            await asyncio.sleep(0.01)
+
+
+async def _import_in_workers(pool: ComputePool) -> None:
+    """Import this module in every worker so tasks start promptly."""
+    await asyncio.gather(*(pool.run(_busy_loop, 0.2) for _ in range(pool.max_workers)))
+
+
+@pytest_asyncio.fixture
+async def pool() -> AsyncGenerator[ComputePool, None]:
+    """Create a small pool with a low shared memory threshold."""
+    compute_pool = ComputePool(max_workers=2, task_timeout=10, cancel_grace=0.2, share_threshold=1024)
+    await compute_pool.start()
+    yield compute_pool
+    await compute_pool.stop()
+
+
+async def test_runs_function_in_worker_process(pool: ComputePool) -> None:
+    """Test that tasks run in another process."""
+    assert await pool.run(os.getpid) != os.getpid()
+    assert await pool.run(_scale, np.arange(3), factor=2.0) == pytest.approx([0.0, 2.0, 4.0])
+
+
+async def test_large_arrays_use_shared_memory(pool: ComputePool) -> None:
+    """Test that large inputs and outputs round-trip through shared memory."""
+    matrix = np.random.default_rng(0).random((1000, 64))
+
+    sums = await pool.run(_column_sums, matrix)
+    scaled = await pool.run(_scale, matrix, 0.5)
+
+    np.testing.assert_allclose(sums, matrix.sum(axis=0))
+    np.testing.assert_allclose(scaled, matrix * 0.5)
+    assert pool.stats().shared_bytes >= 3 * matrix.nbytes
+
+
+async def test_timeout_cancels_cooperative_task(pool: ComputePool) -> None:
+    """Test that a timed-out task is stopped without restarting the pool."""
+    await _import_in_workers(pool)
+    with pytest.raises(TimeoutError):
+        await pool.run(_cooperative_sleep, 10, timeout=0.2)
+
+    await _wait_idle(pool)
+    stats = pool.stats()
+    assert stats.timed_out == 1
+    assert stats.restarts == 0
+    assert pool.running == 0
+
+
+async def test_stuck_task_is_killed_and_others_retried(pool: ComputePool) -> None:
+    """Test that a task ignoring cancellation is killed and the pool keeps working."""
+    await _import_in_workers(pool)
+    survivor = asyncio.create_task(pool.run(_cooperative_sleep, 0.5))
+    with pytest.raises(TimeoutError):
+        await pool.run(_stuck, 30, timeout=0.1)
+
+    assert await survivor == "finished"
+    assert pool.stats().restarts == 1
+    assert await pool.run(_scale, np.ones(2), 3.0) == pytest.approx([3.0, 3.0])
+
+
+async def test_caller_cancellation(pool: ComputePool) -> None:
+    """Test that cancelling the awaiting coroutine cancels the task."""
+    await _import_in_workers(pool)
+    task = asyncio.create_task(pool.run(_cooperative_sleep, 10))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await _wait_idle(pool)
+    assert pool.stats().cancelled == 1
+    assert pool.running == 0
+
+
+async def test_crashed_worker_raises_compute_error(pool: ComputePool) -> None:
+    """Test that a dying worker surfaces as ComputeError and the pool recovers."""
+    with pytest.raises(ComputeError):
+        await pool.run(_crash)
+
+    assert await pool.run(_scale, np.ones(1), 2.0) == pytest.approx([2.0])
+
+
+async def test_event_loop_stays_responsive(pool: ComputePool) -> None:
+    """Test that CPU-bound tasks do not block the event loop."""
+    await pool.warm_up()
+    work = asyncio.gather(*(pool.run(_busy_loop, 0.5) for _ in range(2)))
+
+    lags = []
+    while not work.done():
+        started = time.perf_counter()
+        await asyncio.sleep(0)
+        lags.append(time.perf_counter() - started)
+    await work
+
+    assert max(lags) < 0.05
+
+
+async def test_run_requires_start() -> None:
+    """Test that an unstarted pool rejects tasks."""
+    with pytest.raises(ComputeError):
+        await ComputePool(max_workers=1).run(os.getpid)
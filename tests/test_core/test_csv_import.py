@@ -0,0 +1,175 @@
+"""Tests for chunked CSV import."""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from app.config import get_settings
+from app.core.services import csv_import
+from app.core.services.csv_import import import_csv
+from app.core.services.jobs import JobContext, JobManager
+from app.core.services.uploads import UploadManager
+from app.database.cache import QueryCache
+from app.database.connection import Base
+from app.database.models.event import Event
+from app.database.models.job import Job, JobStatus
+from collections.abc import AsyncGenerator, AsyncIterator
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, MetaData, String, Table, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any
+
+METADATA = MetaData()
+MEASUREMENTS = Table(
+    "measurements",
+    METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("sensor", String(8), nullable=False),
+    Column("reading", Float, nullable=True),
+    Column("count", Integer, nullable=False, default=1),
+    Column("ok", Boolean, nullable=True),
+    Column("taken_at", DateTime, nullable=True),
+)
+EVENTS = Base.metadata.tables[Event.__tablename__]
+
+
+@pytest_asyncio.fixture
+async def sessionmaker(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Create a session factory over a temporary database with the tables the tests write to."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(METADATA.create_all)
+        await conn.run_sync(Base.metadata.create_all, tables=[EVENTS, Base.metadata.tables[Job.__tablename__]])
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _rows(sessionmaker: async_sessionmaker[AsyncSession], table: Table) -> list[tuple[Any, ...]]:
+    async with sessionmaker() as session:
+        return [tuple(row) for row in await session.execute(select(table).order_by(table.c.id))]
+
+
+async def test_import_coerces_types_and_rejects_bad_rows(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test per-column coercion, NULLs, defaults, rejected rows and chunking."""
+    path = tmp_path / "measurements.csv"
+    path.write_text(
+        "sensor,reading,ok,taken_at,extra\n"
+        "a,1.5,true,2024-01-01T10:00:00,x\n"
+        "b,,no,,x\n"
+        "c,oops,yes,2024-01-01,x\n"
+        ",2.0,1,2024-01-01,x\n"
+        "toolongname,2.0,1,2024-01-01,x\n"
+        "d,3,1,2024-01-02 12:30,x\n"
+        "e,4.25,0,not a date,x\n"
+        "f,1,maybe,,x\n"
+    )
+    progress: list[float] = []
+
+    stats = await import_csv(path, MEASUREMENTS, sessionmaker, chunk_rows=3, on_progress=progress.append)
+
+    assert (stats.rows_read, stats.rows_written, stats.rows_rejected, stats.chunks) == (8, 3, 5, 3)
+    assert await _rows(sessionmaker, MEASUREMENTS) == [
+        (1, "a", 1.5, 1, True, datetime(2024, 1, 1, 10)),
+        (2, "b", None, 1, False, None),
+        (3, "d", 3.0, 1, True, datetime(2024, 1, 2, 12, 30)),
+    ]
+    assert progress[-1] == 1.0
+    assert progress == sorted(progress)
+
+
+async def test_import_keeps_string_values_verbatim(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test that numeric-looking strings keep leading zeros and empty values become NULL."""
+    path = tmp_path / "events.csv"
+    path.write_text("ts,name,user_id,value\n1,view,00123,1\n2,view,,2.5\n3,007,456,3\n")
+
+    stats = await import_csv(path, EVENTS, sessionmaker)
+
+    assert stats.rows_written == 3
+    assert [row[1:] for row in await _rows(sessionmaker, EVENTS)] == [
+        (1, "view", "00123", 1.0),
+        (2, "view", None, 2.5),
+        (3, "007", "456", 3.0),
+    ]
+
+
+async def test_import_invalidates_query_cache(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test that cached results for the imported table are dropped after the import."""
+    cache = QueryCache()
+    count = select(func.count()).select_from(Event)
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, count, "scalar") == 0
+
+    path = tmp_path / "events.csv"
+    path.write_text("ts,name\n1,view\n2,view\n")
+    await import_csv(path, EVENTS, sessionmaker)
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, count, "scalar") == 2
+
+
+async def test_import_requires_table_columns(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test that missing required columns fail before anything is written."""
+    path = tmp_path / "bad.csv"
+    path.write_text("reading\n1.0\n")
+    with pytest.raises(ValueError, match="sensor"):
+        await import_csv(path, MEASUREMENTS, sessionmaker)
+
+    path.write_text("unrelated\n1\n")
+    with pytest.raises(ValueError):
+        await import_csv(path, EVENTS, sessionmaker)
+
+
+async def _upload(manager: UploadManager, data: bytes) -> str:
+    async def body() -> AsyncIterator[bytes]:
+        yield data
+
+    info = await manager.create("events.csv", len(data))
+    await manager.write(info.id, 0, body())
+    return info.id
+
+
+async def _wait_finished(manager: JobManager, job_id: str, timeout: float = 10.0) -> Job:
+    """Poll until a job reaches a final state."""
+    async with asyncio.timeout(timeout):
+        while True:
+            job = await manager.get(job_id)
+            if job is not None and JobStatus(job.status) in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+                return job
+            await asyncio.sleep(0.01)
+
+
+async def test_csv_import_job(
+    sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the background job importing an upload into the events table."""
+    monkeypatch.setattr(get_settings(), "upload_dir", str(tmp_path / "uploads"))
+    monkeypatch.setattr(csv_import, "AsyncSessionLocal", sessionmaker)
+    lines = "".join(f"{ts},view,user-{ts % 3}\n" for ts in range(1_000))
+    upload_id = await _upload(UploadManager(tmp_path / "uploads"), f"ts,name,user_id\n{lines}".encode())
+    manager = JobManager(sessionmaker, handlers={"csv_import": csv_import.csv_import_job})
+    await manager.start()
+    try:
+        imported = await manager.submit("csv_import", {"upload_id": upload_id, "table": "events", "chunk_rows": 300})
+        forbidden = await manager.submit("csv_import", {"upload_id": upload_id, "table": "jobs"})
+        job = await _wait_finished(manager, imported.id)
+        rejected = await _wait_finished(manager, forbidden.id)
+    finally:
+        await manager.stop()
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result is not None
+    assert job.result["rows_written"] == 1_000
+    assert job.result["chunks"] == 4
+    assert rejected.status == JobStatus.FAILED
+    assert "not allowed" in (rejected.error or "")
+    rows = await _rows(sessionmaker, EVENTS)
+    assert len(rows) == 1_000
+    assert rows[-1][1:] == (999, "view", "user-0", 0.0)
+
+
+async def test_csv_import_job_refuses_events_with_event_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that events are not imported while the columnar store, which would miss them, is enabled."""
+    monkeypatch.setattr(get_settings(), "event_store_enabled", True)
+    context = JobContext(job_id="job", kind="csv_import", payload={"upload_id": "x", "table": "events"}, attempt=1)
+    with pytest.raises(ValueError, match="event store"):
+        await csv_import.csv_import_job(context)
@@ -0,0 +1,141 @@
+"""Tests for micro-batched event ingestion."""
+
+import asyncio
+import json
+import pytest
+import pytest_asyncio
+from app.core.services.activity import ActivityFeed
+from app.core.services.ingest import EventIngestor, IngestBufferFullError, IngestDroppedError
+from app.database.connection import Base
+from app.database.models.event import Event
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest_asyncio.fixture
+async def sessionmaker(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Create a session factory over a temporary database with the events table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Base.metadata.tables[Event.__tablename__]])
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _events(count: int, start: int = 0) -> list[dict[str, object]]:
+    return [{"ts": start + i, "name": "view", "user_id": None, "value": 1.0} for i in range(count)]
+
+
+async def _count(sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    async with sessionmaker() as session:
+        return await session.scalar(select(func.count()).select_from(Event)) or 0
+
+
+async def test_offer_is_bounded(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that offers beyond the buffer size are rejected as a whole."""
+    ingestor = EventIngestor(sessionmaker, max_buffered=5)
+
+    assert ingestor.offer(_events(3)) == 3
+    with pytest.raises(IngestBufferFullError):
+        ingestor.offer(_events(3))
+    assert ingestor.buffered == 3
+
+
+async def test_flush_writes_batches(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that flushes commit at most one batch and notify listeners."""
+    notified = []
+    ingestor = EventIngestor(sessionmaker, batch_size=4, on_commit=lambda: notified.append(True))
+    ingestor.offer(_events(6))
+
+    assert await ingestor.flush() == 4
+    assert await _count(sessionmaker) == 4
+    assert ingestor.buffered == 2
+    assert await ingestor.flush() == 2
+    assert await ingestor.flush() == 0
+    assert ingestor.committed == 6
+    assert len(notified) == 2
+
+
+async def test_flush_publishes_committed_events(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that the activity feed sees events only once they are committed."""
+    feed = ActivityFeed(capacity=10)
+    ingestor = EventIngestor(sessionmaker, batch_size=2, activity_feed=feed)
+    ingestor.offer(_events(3))
+    assert feed.cursor == 0
+
+    await ingestor.flush()
+
+    assert [item["ts"] for item in feed.since(0).items] == [0, 1]
+
+
+async def test_flusher_commits_partial_batches_after_interval(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that the flusher writes partial batches and releases commit waiters."""
+    ingestor = EventIngestor(sessionmaker, batch_size=1000, flush_interval=0.05)
+    await ingestor.start()
+    try:
+        first = ingestor.offer(_events(10))
+        second = ingestor.offer(_events(5, start=100))
+        await ingestor.wait_committed(second, timeout=5)
+        await ingestor.wait_committed(first, timeout=0)
+        assert await _count(sessionmaker) == 15
+    finally:
+        await ingestor.stop()
+
+
+async def test_wait_committed_times_out(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that commit waiters time out when nothing is flushed."""
+    ingestor = EventIngestor(sessionmaker)
+    sequence = ingestor.offer(_events(1))
+
+    with pytest.raises(TimeoutError):
+        await ingestor.wait_committed(sequence, timeout=0.05)
+    assert ingestor._waiters == []
+
+
+async def test_stop_drains_buffer(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that stopping flushes buffered events."""
+    ingestor = EventIngestor(sessionmaker, batch_size=3, flush_interval=10)
+    await ingestor.start()
+    ingestor.offer(_events(7))
+    await asyncio.sleep(0)
+
+    await ingestor.stop(timeout=5)
+
+    assert await _count(sessionmaker) == 7
+
+
+async def test_failed_flush_keeps_events(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test that events stay buffered when a flush fails and are retried."""
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}")
+    ingestor = EventIngestor(async_sessionmaker(broken), batch_size=10)
+    ingestor.offer(_events(3))
+
+    with pytest.raises(OperationalError, match="no such table"):
+        await ingestor.flush()
+    assert ingestor.buffered == 3
+
+    ingestor.session_factory = sessionmaker
+    assert await ingestor.flush() == 3
+    await broken.dispose()
+
+
+async def test_batch_failing_repeatedly_is_dead_lettered(sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path) -> None:
+    """Test that a batch the database keeps rejecting is dropped to the dead-letter file and fails its waiters."""
+    dead_letter = tmp_path / "dead" / "events.ndjson"
+    ingestor = EventIngestor(sessionmaker, batch_size=2, flush_interval=0.01, max_attempts=2, dead_letter=dead_letter)
+    await ingestor.start()
+    try:
+        bad = ingestor.offer([{"ts": 1, "name": None, "user_id": None, "value": 1.0}, *_events(1, start=2)])
+        good = ingestor.offer(_events(2, start=10))
+        with pytest.raises(IngestDroppedError):
+            await ingestor.wait_committed(bad, timeout=5, first=bad - 1)
+        await ingestor.wait_committed(good, timeout=5, first=good - 1)
+    finally:
+        await ingestor.stop()
+
+    assert (ingestor.dropped, ingestor.committed) == (2, 2)
+    assert [json.loads(line)["ts"] for line in dead_letter.read_text().splitlines()] == [1, 2]
+    assert await _count(sessionmaker) == 2
@@ -0,0 +1,215 @@
+"""Tests for the background job manager."""
+
+import asyncio
+import pytest
+import pytest_asyncio
+import threading
+from app.core.services.jobs import JobContext, JobManager, JobQueueFullError, UnknownJobKindError
+from app.database.connection import Base
+from app.database.models.job import Job, JobStatus
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+
+@pytest_asyncio.fixture
+async def sessionmaker(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Create a session factory over a temporary database with the jobs table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.tables[Job.__tablename__].create)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _wait_finished(manager: JobManager, job_id: str, timeout: float = 5.0) -> Job:
+    """Poll until a job reaches a final state."""
+    async with asyncio.timeout(timeout):
+        while True:
+            job = await manager.get(job_id)
+            if job is not None and job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+                return job
+            await asyncio.sleep(0.01)
+
+
+async def test_runs_async_and_sync_handlers(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that coroutine handlers run on the loop and plain functions in a thread."""
+    loop_thread = threading.get_ident()
+
+    async def add(context: JobContext) -> int:
+        return int(context.payload["a"] + context.payload["b"])
+
+    def where(context: JobContext) -> dict[str, bool]:
+        context.report_progress(0.5)
+        return {"in_thread": threading.get_ident() != loop_thread}
+
+    manager = JobManager(sessionmaker, workers=2, handlers={"add": add, "where": where})
+    await manager.start()
+    try:
+        added = await manager.submit("add", {"a": 1, "b": 2})
+        located = await manager.submit("where")
+
+        added_job = await _wait_finished(manager, added.id)
+        located_job = await _wait_finished(manager, located.id)
+    finally:
+        await manager.stop()
+
+    assert added_job.status == JobStatus.SUCCEEDED
+    assert added_job.result == 3
+    assert added_job.attempts == 1
+    assert added_job.finished_at is not None
+    assert located_job.result == {"in_thread": True}
+    assert located_job.progress == 1.0
+
+
+async def test_failures_are_recorded(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that handler exceptions mark the job failed without stopping workers."""
+
+    async def boom(_context: JobContext) -> None:
+        raise ValueError("bad input")
+
+    manager = JobManager(sessionmaker, workers=1, handlers={"boom": boom})
+    await manager.start()
+    try:
+        first = await _wait_finished(manager, (await manager.submit("boom")).id)
+        second = await _wait_finished(manager, (await manager.submit("boom")).id)
+    finally:
+        await manager.stop()
+
+    assert first.status == JobStatus.FAILED
+    assert first.error == "ValueError: bad input"
+    assert second.status == JobStatus.FAILED
+
+
+async def test_higher_priority_runs_first(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that queued jobs are taken in priority order."""
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def record(context: JobContext) -> None:
+        if context.payload["name"] == "blocker":
+            await release.wait()
+        order.append(context.payload["name"])
+
+    manager = JobManager(sessionmaker, workers=1, handlers={"record": record})
+    await manager.start()
+    try:
+        blocker = await manager.submit("record", {"name": "blocker"})
+        while manager.running == 0:
+            await asyncio.sleep(0.01)
+        low = await manager.submit("record", {"name": "low"}, priority=1)
+        high = await manager.submit("record", {"name": "high"}, priority=9)
+        release.set()
+        for job in (blocker, low, high):
+            await _wait_finished(manager, job.id)
+    finally:
+        await manager.stop()
+
+    assert order == ["blocker", "high", "low"]
+
+
+async def test_submit_rejects_unknown_kind_and_full_queue(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test submission errors."""
+
+    async def noop(_context: JobContext) -> None:
+        return None
+
+    manager = JobManager(sessionmaker, workers=1, queue_size=1, handlers={"noop": noop})
+
+    with pytest.raises(UnknownJobKindError):
+        await manager.submit("missing")
+
+    await manager.submit("noop")
+    with pytest.raises(JobQueueFullError):
+        await manager.submit("noop")
+
+
+async def test_start_recovers_persisted_jobs(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that queued and abandoned jobs are re-run, but live leases are respected."""
+    now = datetime.utcnow()
+    async with sessionmaker() as session:
+        session.add_all(
+            [
+                Job(id="queued", kind="noop", status=JobStatus.QUEUED, payload={}, created_at=now),
+                Job(
+                    id="abandoned",
+                    kind="noop",
+                    status=JobStatus.RUNNING,
+                    payload={},
+                    attempts=1,
+                    created_at=now,
+                    heartbeat_at=now - timedelta(minutes=5),
+                ),
+                Job(
+                    id="alive",
+                    kind="noop",
+                    status=JobStatus.RUNNING,
+                    payload={},
+                    attempts=1,
+                    created_at=now,
+                    heartbeat_at=now,
+                ),
+            ]
+        )
+        await session.commit()
+
+    async def noop(_context: JobContext) -> str:
+        return "done"
+
+    manager = JobManager(sessionmaker, workers=2, lease_seconds=60, handlers={"noop": noop})
+    await manager.start()
+    try:
+        queued = await _wait_finished(manager, "queued")
+        abandoned = await _wait_finished(manager, "abandoned")
+        alive = await manager.get("alive")
+    finally:
+        await manager.stop()
+
+    assert queued.result == "done"
+    assert abandoned.result == "done"
+    assert abandoned.attempts == 2
+    assert alive is not None and alive.status == JobStatus.RUNNING
+
+
+async def test_stop_requeues_unfinished_jobs(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that jobs cancelled at shutdown are persisted as queued."""
+
+    async def forever(context: JobContext) -> None:
+        context.report_progress(0.25)
+        await asyncio.Event().wait()
+
+    manager = JobManager(sessionmaker, workers=1, handlers={"forever": forever})
+    await manager.start()
+    job = await manager.submit("forever")
+    while manager.running == 0:
+        await asyncio.sleep(0.01)
+    await manager.stop(timeout=0.05)
+
+    stored = await manager.get(job.id)
+    assert stored is not None
+    assert stored.status == JobStatus.QUEUED
+    assert stored.progress == 0.25
+
+
+async def test_stop_fails_unfinished_thread_jobs(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that a plain-function job still running in its thread at shutdown is not re-queued."""
+    release = threading.Event()
+
+    def blocking(context: JobContext) -> None:
+        release.wait(5)
+
+    manager = JobManager(sessionmaker, workers=1, handlers={"blocking": blocking})
+    await manager.start()
+    job = await manager.submit("blocking")
+    while manager.running == 0:
+        await asyncio.sleep(0.01)
+    try:
+        await manager.stop(timeout=0.05)
+    finally:
+        release.set()
+
+    stored = await manager.get(job.id)
+    assert stored is not None
+    assert stored.status == JobStatus.FAILED
+    assert "Interrupted" in (stored.error or "")
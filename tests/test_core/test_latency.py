@@ -0,0 +1,47 @@
+"""Tests for windowed request latency percentiles."""
+
+import pytest
+from app.core.services.latency import LatencyRecorder
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_snapshot_reports_percentiles_per_route() -> None:
+    """Test counts and percentiles (in milliseconds) per route."""
+    recorder = LatencyRecorder(clock=FakeClock())
+    for index in range(1, 101):
+        recorder.record("GET /items", index / 1000)
+    recorder.record("POST /items", 0.5)
+
+    snapshot = recorder.snapshot()
+
+    assert list(snapshot) == ["GET /items", "POST /items"]
+    items = snapshot["GET /items"]
+    assert items["count"] == 100
+    assert items["p50"] == pytest.approx(50, abs=1)
+    assert items["p99"] == pytest.approx(99, abs=1)
+    assert items["max"] == pytest.approx(100)
+    assert snapshot["POST /items"]["p95"] == pytest.approx(500)
+
+
+def test_old_slots_leave_the_window() -> None:
+    """Test that latencies older than the window are dropped slot by slot."""
+    clock = FakeClock()
+    recorder = LatencyRecorder(window_seconds=60, slots=3, clock=clock)
+    recorder.record("GET /", 1.0)
+    clock.now = 30
+    recorder.record("GET /", 0.001)
+
+    assert recorder.snapshot()["GET /"]["count"] == 2
+    clock.now = 65
+    assert recorder.snapshot()["GET /"] == {"count": 1, "p50": 1.0, "p95": 1.0, "p99": 1.0, "max": 1.0}
+    clock.now = 100
+    assert recorder.snapshot() == {}
@@ -0,0 +1,65 @@
+"""Tests for the base API models and trusted construction helpers."""
+
+from app.core.models.base import BaseAPIModel, PaginatedResponse, get_type_adapter
+from datetime import datetime
+from pydantic import PrivateAttr
+
+
+class _Item(BaseAPIModel):
+    id: int
+    name: str
+    tags: list[str] = []
+
+
+class _PrivateItem(BaseAPIModel):
+    id: int
+    _cache: dict[str, int] = PrivateAttr(default_factory=dict)
+
+
+def test_from_rows_matches_validation() -> None:
+    """Test that trusted construction equals validated construction."""
+    rows = [{"id": 1, "name": "a", "tags": ["x"], "extra": True}, {"id": 2, "name": "b"}]
+
+    items = _Item.from_rows(rows)
+
+    assert items == [_Item.model_validate(row) for row in rows]
+    assert items[0].model_fields_set == {"id", "name", "tags"}
+    assert items[1].model_fields_set == {"id", "name"}
+    assert _Item.from_row(rows[0]).model_dump() == {"id": 1, "name": "a", "tags": ["x"]}
+
+
+def test_from_rows_keeps_assignment_validation() -> None:
+    """Test that trusted instances still validate later assignments."""
+    item = _Item.from_row({"id": 1, "name": "a", "tags": []})
+
+    item.id = "5"  # type: ignore[assignment]
+
+    assert item.id == 5
+    assert "id" in item.model_fields_set
+
+
+def test_from_rows_with_private_attributes() -> None:
+    """Test that private attributes are initialized."""
+    item = _PrivateItem.from_row({"id": 1})
+
+    assert item._cache == {}
+
+
+def test_create_trusted_matches_create() -> None:
+    """Test that trusted pages serialize exactly like validated pages."""
+    items = _Item.from_rows({"id": index, "name": str(index)} for index in range(3))
+
+    trusted = PaginatedResponse.create_trusted(items=items, total=25, page=1, size=10)
+    validated = PaginatedResponse.create(items=items, total=25, page=1, size=10)
+
+    assert trusted.pages == 3
+    assert trusted.model_dump_json() == validated.model_dump_json()
+    assert PaginatedResponse.create_trusted(items=[], total=0, page=1, size=10).pages == 0
+
+
+def test_get_type_adapter_is_cached() -> None:
+    """Test that adapters are built once per type."""
+    adapter = get_type_adapter(list[datetime])
+
+    assert get_type_adapter(list[datetime]) is adapter
+    assert adapter.validate_python(["2024-01-01T00:00:00"]) == [datetime(2024, 1, 1)]
@@ -0,0 +1,132 @@
+"""Tests for the generic async repository."""
+
+import pytest
+import pytest_asyncio
+from app.core.repositories.base import Repository
+from app.database.cache import QueryCache
+from collections.abc import AsyncGenerator
+from sqlalchemy import ForeignKey
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+
+class _Base(DeclarativeBase):
+    """Isolated declarative base so test models stay out of the app metadata."""
+
+
+class Owner(_Base):
+    __tablename__ = "owners"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+    email: Mapped[str]
+    items: Mapped[list["Item"]] = relationship(back_populates="owner")
+
+
+class Item(_Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str]
+    owner_id: Mapped[int] = mapped_column(ForeignKey("owners.id"))
+    owner: Mapped[Owner] = relationship(back_populates="items")
+
+
+class OwnerRepository(Repository[Owner]):
+    model = Owner
+    eager_loads = {"items": "selectin"}
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    """Create a populated in-memory database session."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        for index in range(5):
+            owner = Owner(name=f"owner-{index}", email=f"owner{index}@example.com")
+            owner.items = [Item(title=f"item-{index}-{n}") for n in range(index)]
+            db.add(owner)
+        await db.commit()
+        db.expunge_all()
+        yield db
+
+    await engine.dispose()
+
+
+async def test_get_eager_loads_declared_relationships(session: AsyncSession) -> None:
+    """Test that declared relationships are loaded with the entity."""
+    owner = await OwnerRepository(session).get(4)
+
+    assert owner is not None
+    assert len(owner.items) == 3
+
+
+async def test_undeclared_relationship_raises_instead_of_lazy_loading(session: AsyncSession) -> None:
+    """Test that strict loading turns accidental lazy loads into errors."""
+    items = await Repository(session, Item).list(limit=1)
+
+    with pytest.raises(InvalidRequestError):
+        _ = items[0].owner
+
+
+async def test_filter_order_and_paginate(session: AsyncSession) -> None:
+    """Test filtering by expressions and keywords with ordering and limits."""
+    repo = OwnerRepository(session)
+
+    owners = await repo.filter(Owner.id > 1, order_by=["-id"], limit=2)
+    assert [owner.id for owner in owners] == [5, 4]
+
+    owners = await repo.filter(name=["owner-0", "owner-2"], order_by=["name"])
+    assert [owner.name for owner in owners] == ["owner-0", "owner-2"]
+
+
+async def test_rows_project_requested_columns(session: AsyncSession) -> None:
+    """Test that row queries return mappings with only the requested columns."""
+    repo = OwnerRepository(session)
+
+    rows = await repo.rows(columns=["id", "name"], order_by=["id"], limit=2)
+    assert [dict(row) for row in rows] == [{"id": 1, "name": "owner-0"}, {"id": 2, "name": "owner-1"}]
+    assert not session.identity_map
+
+    row = await repo.get_row(3, columns=["email"])
+    assert row is not None
+    assert dict(row) == {"email": "owner2@example.com"}
+    assert await repo.get_row(99) is None
+
+
+async def test_count_and_exists(session: AsyncSession) -> None:
+    """Test count and exists queries."""
+    repo = Repository(session, Item)
+
+    assert await repo.count() == 10
+    assert await repo.count(owner_id=4) == 3
+    assert await repo.exists(title="item-4-0")
+    assert not await repo.exists(Item.owner_id == 1)
+
+
+async def test_unknown_attribute_is_rejected(session: AsyncSession) -> None:
+    """Test that unknown column and relationship names raise ValueError."""
+    repo = OwnerRepository(session)
+
+    with pytest.raises(ValueError):
+        await repo.rows(columns=["missing"])
+
+    with pytest.raises(ValueError):
+        await repo.get(1, load={"missing": "joined"})
+
+
+async def test_row_queries_use_cache(session: AsyncSession) -> None:
+    """Test that row, count and exists queries go through a configured cache."""
+    cache = QueryCache()
+    repo = OwnerRepository(session, cache=cache)
+
+    for _ in range(2):
+        assert await repo.count() == 5
+        assert await repo.exists(name="owner-1")
+        assert [row["id"] for row in await repo.rows(columns=["id"], limit=2)] == [1, 2]
+
+    assert cache.stats().hits == 3
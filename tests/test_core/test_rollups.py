@@ -0,0 +1,256 @@
+"""Tests for incrementally maintained event rollups."""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from app.core.services.rollups import (
+    ALL_EVENTS,
+    DAY_MS,
+    GRANULARITIES,
+    HOUR_MS,
+    MINUTE_MS,
+    Aggregate,
+    RollupService,
+    granularity_for_step,
+    now_ms,
+    plan_range,
+)
+from app.database.connection import Base
+from app.database.models.event import Event
+from app.database.models.rollup import DayRollup, HourRollup, MinuteRollup, RollupWatermark
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, cast
+
+# 2024-01-01T00:00:00Z
+T0 = 1_704_067_200_000
+TABLES = [
+    Base.metadata.tables[cast(type[Base], model).__tablename__]
+    for model in (Event, RollupWatermark, *(model for g in GRANULARITIES for model in (g.model, *g.sketch_models)))
+]
+
+
+@pytest_asyncio.fixture
+async def sessionmaker(tmp_path: Path) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Create a session factory over a temporary database with event and rollup tables."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _insert(sessionmaker: async_sessionmaker[AsyncSession], events: list[tuple[int, str, float]]) -> None:
+    """Insert (ts, name, value) events."""
+    async with sessionmaker() as session:
+        await session.execute(insert(Event), [{"ts": ts, "name": name, "value": value} for ts, name, value in events])
+        await session.commit()
+
+
+def _brute_force(events: list[tuple[int, str, float]], start: int, end: int) -> dict[str, Aggregate]:
+    """Aggregate events directly for comparison."""
+    totals: dict[str, Aggregate] = {}
+    for ts, name, value in events:
+        if start <= ts < end:
+            totals.setdefault(name, Aggregate()).add(value)
+    return totals
+
+
+async def test_catch_up_builds_all_granularities(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that events are folded into minute, hour and day rollups once."""
+    await _insert(
+        sessionmaker,
+        [(T0 + 5_000, "purchase", 10.0), (T0 + 30_000, "purchase", 30.0), (T0 + HOUR_MS + 1, "purchase", 5.0)],
+    )
+    service = RollupService(sessionmaker)
+
+    assert await service.catch_up() == 3
+    assert await service.catch_up() == 0
+
+    async with sessionmaker() as session:
+        minute = await session.get(MinuteRollup, ("purchase", T0))
+        hours = (await session.scalars(select(HourRollup).order_by(HourRollup.bucket))).all()
+        day = await session.get(DayRollup, ("purchase", T0))
+
+    assert minute is not None and day is not None
+    assert (minute.count, minute.sum, minute.min, minute.max) == (2, 40.0, 10.0, 30.0)
+    assert [(row.bucket, row.count) for row in hours] == [(T0, 2), (T0 + HOUR_MS, 1)]
+    assert (day.count, day.sum, day.min, day.max) == (3, 45.0, 5.0, 30.0)
+
+
+async def test_incremental_and_late_events_merge(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that later batches, including late events, merge into existing buckets."""
+    service = RollupService(sessionmaker, batch_size=2)
+    await _insert(sessionmaker, [(T0 + HOUR_MS, "purchase", 3.0)])
+    await service.catch_up_all()
+
+    await _insert(sessionmaker, [(T0 + HOUR_MS + 10, "purchase", 1.0), (T0, "purchase", 100.0), (T0 + 1, "signup", 0.0)])
+    assert await service.catch_up_all() == 3
+
+    async with sessionmaker() as session:
+        day = await session.get(DayRollup, ("purchase", T0))
+        hour = await session.get(HourRollup, ("purchase", T0 + HOUR_MS))
+    assert day is not None and hour is not None
+    assert (day.count, day.sum, day.min, day.max) == (3, 104.0, 1.0, 100.0)
+    assert (hour.count, hour.min) == (2, 1.0)
+
+
+async def test_concurrent_catch_up_does_not_double_count(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that two services racing on one database fold each event once."""
+    await _insert(sessionmaker, [(T0 + index * MINUTE_MS, "view", 1.0) for index in range(50)])
+    first, second = RollupService(sessionmaker, batch_size=7), RollupService(sessionmaker, batch_size=7)
+
+    for _ in range(20):
+        await asyncio.gather(first.catch_up(), second.catch_up(), return_exceptions=True)
+
+    async with sessionmaker() as session:
+        total = await session.scalar(select(func.sum(DayRollup.count)))
+    assert total == 50
+
+
+def test_plan_range_uses_coarsest_aligned_buckets() -> None:
+    """Test the decomposition of a range into day, hour and minute segments."""
+    start = T0 + 10 * HOUR_MS + 30 * MINUTE_MS + 15_000
+    end = T0 + 2 * DAY_MS + 2 * HOUR_MS + 15 * MINUTE_MS
+
+    plan = [(granularity.name, low - T0, high - T0) for granularity, low, high in plan_range(start, end)]
+
+    assert plan == [
+        ("minute", 10 * HOUR_MS + 30 * MINUTE_MS, 11 * HOUR_MS),
+        ("hour", 11 * HOUR_MS, DAY_MS),
+        ("day", DAY_MS, 2 * DAY_MS),
+        ("hour", 2 * DAY_MS, 2 * DAY_MS + 2 * HOUR_MS),
+        ("minute", 2 * DAY_MS + 2 * HOUR_MS, 2 * DAY_MS + 2 * HOUR_MS + 15 * MINUTE_MS),
+    ]
+    assert [g.name for g, _, _ in plan_range(T0, T0 + 3 * DAY_MS)] == ["day"]
+
+
+def test_granularity_for_step() -> None:
+    """Test that series read the coarsest table dividing the step."""
+    assert granularity_for_step(DAY_MS).name == "day"
+    assert granularity_for_step(6 * HOUR_MS).name == "hour"
+    assert granularity_for_step(15 * MINUTE_MS).name == "minute"
+    with pytest.raises(ValueError):
+        granularity_for_step(30_000)
+
+
+async def test_totals_and_series_match_raw_events(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that rollup queries equal direct aggregation of the events."""
+    events = [(T0 + index * 7 * MINUTE_MS, "purchase" if index % 3 else "session", float(index)) for index in range(1000)]
+    await _insert(sessionmaker, events)
+    service = RollupService(sessionmaker)
+    await service.catch_up_all()
+
+    start, end = T0 + 5 * HOUR_MS + 17 * MINUTE_MS, T0 + 3 * DAY_MS + 7 * MINUTE_MS
+    totals = await service.totals(start, end)
+    assert totals == _brute_force(events, start, end)
+
+    series = await service.series(T0, T0 + 2 * DAY_MS, 6 * HOUR_MS, names=["session"])
+    assert set(series) == {"session"}
+    assert sorted(series["session"]) == [T0 + index * 6 * HOUR_MS for index in range(8)]
+    assert series["session"][T0] == _brute_force(events, T0, T0 + 6 * HOUR_MS)["session"]
+
+
+async def test_distinct_users_are_unions_over_the_range(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that distinct counts union the bucket sketches instead of summing buckets."""
+    # 2000 users visit on each of 5 days, with 500 new users per day.
+    rows: list[dict[str, Any]] = [
+        {"ts": T0 + day * DAY_MS + user * 17_000, "name": "visit", "user_id": f"user-{day * 500 + user}", "value": 0.0}
+        for day in range(5)
+        for user in range(2_000)
+    ]
+    rows.append({"ts": T0 + 90 * MINUTE_MS, "name": "purchase", "user_id": "buyer", "value": 1.0})
+    async with sessionmaker() as session:
+        await session.execute(insert(Event), rows)
+        await session.commit()
+    service = RollupService(sessionmaker, batch_size=3_000)
+    await service.catch_up_all()
+
+    start, end = T0 + 5 * HOUR_MS + 3 * MINUTE_MS, T0 + 4 * DAY_MS
+    exact = {row["user_id"] for row in rows if row["name"] == "visit" and start <= row["ts"] < end}
+    distinct = await service.distinct(start, end, names=["visit"])
+    assert set(distinct) == {"visit"}
+    assert distinct["visit"].estimate() == pytest.approx(len(exact), rel=4 * distinct["visit"].relative_error)
+
+    everyone = await service.distinct(T0, T0 + 5 * DAY_MS, names=[ALL_EVENTS])
+    assert everyone[ALL_EVENTS].estimate() == pytest.approx(4_001, rel=0.04)
+
+    by_day = await service.distinct_series(T0, T0 + 5 * DAY_MS, DAY_MS, names=["visit"])
+    assert sorted(by_day["visit"]) == [T0 + day * DAY_MS for day in range(5)]
+    assert by_day["visit"][T0].estimate() == pytest.approx(2_000, rel=0.04)
+
+
+async def test_value_percentiles_merge_bucket_digests(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that percentiles over a range come from merged per-bucket digests."""
+    values = [float(value) for value in range(1, 3_001)]
+    # Spread over 2.5 days so the range mixes day, hour and minute buckets.
+    events = [(T0 + index * 72_000, "session_end", value) for index, value in enumerate(values)]
+    await _insert(sessionmaker, events)
+    service = RollupService(sessionmaker, batch_size=700)
+    await service.catch_up_all()
+
+    start, end = T0 + 7 * MINUTE_MS, T0 + 2 * DAY_MS + 5 * HOUR_MS
+    digests = await service.digests(start, end, names=["session_end"])
+    expected = sorted(value for ts, _, value in events if start <= ts < end)
+    digest = digests["session_end"]
+
+    assert len(digest) == len(expected)
+    for q in (0.5, 0.95, 0.99):
+        assert digest.quantile(q) == pytest.approx(expected[int(q * len(expected))], rel=0.01)
+
+    by_day = await service.digest_series(T0, T0 + 3 * DAY_MS, DAY_MS, names=["session_end"])
+    assert sorted(by_day["session_end"]) == [T0, T0 + DAY_MS, T0 + 2 * DAY_MS]
+    assert by_day["session_end"][T0].max == 1200.0
+
+
+async def test_retention(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that old rollups and rolled-up raw events are deleted."""
+    now = T0 + 10 * DAY_MS
+    await _insert(sessionmaker, [(T0, "view", 1.0), (now - MINUTE_MS, "view", 1.0)])
+    service = RollupService(sessionmaker, retention_days={"minute": 1, "hour": 5}, event_retention_days=2)
+    await service.catch_up_all()
+    await _insert(sessionmaker, [(T0, "view", 1.0)])  # not yet rolled up: must be kept
+
+    deleted = await service.apply_retention(now=now)
+
+    assert deleted == {"minute": 1, "hour": 1, "events": 1}
+    async with sessionmaker() as session:
+        assert await session.scalar(select(func.count()).select_from(Event)) == 2
+        assert await session.scalar(select(func.count()).select_from(DayRollup)) == 2
+
+
+async def test_scheduler_catches_up_on_notify(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that notify triggers a background catch-up."""
+    service = RollupService(sessionmaker, interval=60)
+    await service.start()
+    try:
+        await _insert(sessionmaker, [(T0, "view", 1.0)])
+        service.notify()
+        async with asyncio.timeout(5):
+            while not await service.totals(T0, T0 + MINUTE_MS):
+                await asyncio.sleep(0.01)
+    finally:
+        await service.stop()
+
+
+def test_plan_range_refuses_pruned_rollups() -> None:
+    """Test that ranges needing rollups past their retention fail instead of undercounting."""
+    retained_from = {"minute": T0 + DAY_MS}
+
+    with pytest.raises(ValueError, match="minute rollups"):
+        plan_range(T0 + 30 * MINUTE_MS, T0 + 2 * DAY_MS, retained_from)
+    assert [g.name for g, _, _ in plan_range(T0, T0 + DAY_MS + 30 * MINUTE_MS, retained_from)] == ["day", "minute"]
+
+
+async def test_queries_refuse_pruned_rollups(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that series and totals over pruned minute rollups fail while coarser reads succeed."""
+    service = RollupService(sessionmaker, retention_days={"minute": 1})
+    old = now_ms() - 2 * DAY_MS
+
+    with pytest.raises(ValueError, match="pruned"):
+        await service.series(old, old + HOUR_MS, MINUTE_MS)
+    with pytest.raises(ValueError, match="pruned"):
+        await service.distinct(old + MINUTE_MS, old + HOUR_MS)
+    assert await service.series(old, old + DAY_MS, HOUR_MS) == {}
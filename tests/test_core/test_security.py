@@ -0,0 +1,126 @@
+"""Tests for password hashing and cached token verification."""
+
+import asyncio
+import pytest
+import time
+from app.core.security import AuthenticationError, PasswordHasher, TokenVerifier
+from datetime import timedelta
+from jose import jwt
+
+
+class FakeClock:
+    """Settable wall clock."""
+
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_hash_and_verify_password() -> None:
+    """Test round trip, wrong passwords, malformed hashes and over-long passwords."""
+    hasher = PasswordHasher(rounds=4)
+    try:
+        hashed = await hasher.hash("correct horse")
+
+        assert hashed.startswith("$2b$04$")
+        assert await hasher.verify("correct horse", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert not await hasher.verify("correct horse", "not-a-hash")
+        assert not await hasher.verify("x" * 73, hashed)
+        with pytest.raises(ValueError):
+            await hasher.hash("x" * 73)
+    finally:
+        hasher.close()
+
+
+async def test_hashing_does_not_block_event_loop() -> None:
+    """Test that the loop keeps running while more hashes than workers are in flight."""
+    hasher = PasswordHasher(rounds=10, max_workers=1, max_concurrency=2)
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        hashes = await asyncio.gather(*(hasher.hash(f"password-{i}") for i in range(4)))
+    finally:
+        ticker.cancel()
+        hasher.close()
+
+    assert len(set(hashes)) == 4
+    assert ticks > 10
+
+
+def test_verify_caches_claims_until_expiry() -> None:
+    """Test that tokens are decoded once and never accepted past ``exp``."""
+    clock = FakeClock()
+    verifier = TokenVerifier("secret", ttl=600, clock=clock)
+    token = verifier.create_token("user-1", timedelta(minutes=5), {"scope": "read"})
+
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(token)["scope"] == "read"
+    assert (verifier.stats.hits, verifier.stats.misses) == (1, 1)
+
+    clock.now += 300
+    with pytest.raises(AuthenticationError, match="expired"):
+        verifier.verify(token)
+    assert verifier.stats.size == 0
+
+
+def test_verify_rechecks_after_ttl() -> None:
+    """Test that cached entries expire after the TTL even for long-lived tokens."""
+    clock = FakeClock()
+    verifier = TokenVerifier("secret", ttl=10, clock=clock)
+    token = verifier.create_token("user-1", timedelta(hours=1))
+    verifier.verify(token)
+
+    clock.now += 11
+    verifier.verify(token)
+
+    assert verifier.stats.misses == 2
+
+
+def test_verify_rejects_bad_tokens_without_caching() -> None:
+    """Test bad signatures, garbage and non-numeric expiry."""
+    verifier = TokenVerifier("secret", clock=FakeClock())
+    forged = TokenVerifier("other", clock=FakeClock()).create_token("user-1", timedelta(minutes=5))
+
+    for token in (forged, "garbage", jwt.encode({"sub": "x", "exp": "soon"}, "secret")):
+        with pytest.raises(AuthenticationError):
+            verifier.verify(token)
+    assert verifier.stats.size == 0
+
+
+def test_cache_is_lru_bounded() -> None:
+    """Test that the least recently used token is evicted first."""
+    verifier = TokenVerifier("secret", max_entries=2, clock=FakeClock())
+    first, second, third = (verifier.create_token(f"user-{i}", timedelta(minutes=5)) for i in range(3))
+    verifier.verify(first)
+    verifier.verify(second)
+    verifier.verify(first)
+    verifier.verify(third)
+
+    verifier.verify(first)
+    verifier.verify(second)
+
+    assert verifier.stats.size == 2
+    assert (verifier.stats.hits, verifier.stats.misses) == (2, 4)
+
+
+def test_cached_verify_is_fast() -> None:
+    """Test that a cache hit costs well under 50 microseconds."""
+    verifier = TokenVerifier("secret")
+    token = verifier.create_token("user-1", timedelta(minutes=5))
+    verifier.verify(token)
+
+    started = time.perf_counter()
+    for _ in range(10_000):
+        verifier.verify(token)
+
+    assert (time.perf_counter() - started) / 10_000 < 50e-6
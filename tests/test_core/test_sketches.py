@@ -0,0 +1,157 @@
+"""Tests for the HyperLogLog and t-digest sketches."""
+
+import numpy as np
+import pytest
+from app.core.sketches import HyperLogLog, TDigest, hash64, precision_for_error
+
+
+def _hashes(start: int, count: int) -> np.ndarray:
+    """Hash the user ids ``user-<start>`` to ``user-<start + count - 1>``."""
+    return np.array([hash64(f"user-{index}") for index in range(start, start + count)], dtype=np.uint64)
+
+
+def test_precision_for_error() -> None:
+    """Test that the precision meets the requested error within the supported range."""
+    assert precision_for_error(0.01) == 14
+    assert HyperLogLog(precision_for_error(0.02)).relative_error <= 0.02
+    assert precision_for_error(0.5) == 4
+    assert precision_for_error(0) == 16
+    with pytest.raises(ValueError):
+        HyperLogLog(17)
+
+
+@pytest.mark.parametrize("count", [10, 1_000, 50_000])
+def test_estimate_accuracy(count: int) -> None:
+    """Test estimates for small (linear counting) and large cardinalities."""
+    sketch = HyperLogLog(14)
+    sketch.add_hashes(_hashes(0, count))
+    sketch.add_hashes(_hashes(0, count))
+
+    assert sketch.estimate() == pytest.approx(count, rel=4 * sketch.relative_error)
+
+
+def test_add_and_add_hashes_agree() -> None:
+    """Test that scalar and vectorized inserts set the same registers."""
+    scalar, vector = HyperLogLog(10), HyperLogLog(10)
+    for index in range(2_000):
+        scalar.add(f"user-{index}")
+    vector.add_hashes(_hashes(0, 2_000))
+
+    assert np.array_equal(scalar.registers, vector.registers)
+
+
+def test_merge_is_union() -> None:
+    """Test that merging overlapping sketches counts the union once."""
+    first, second = HyperLogLog(12), HyperLogLog(12)
+    first.add_hashes(_hashes(0, 20_000))
+    second.add_hashes(_hashes(10_000, 20_000))
+
+    union = HyperLogLog.union([first, second], precision=12)
+
+    assert union.estimate() == pytest.approx(30_000, rel=4 * union.relative_error)
+    assert first.estimate() == pytest.approx(20_000, rel=4 * first.relative_error)
+
+
+def test_merge_folds_to_lower_precision() -> None:
+    """Test that a sketch folded to a lower precision equals one built at it."""
+    hashes = _hashes(0, 5_000)
+    high, low = HyperLogLog(14), HyperLogLog(10)
+    high.add_hashes(hashes)
+    low.add_hashes(hashes)
+
+    merged = HyperLogLog(10)
+    merged.merge(high)
+    assert np.array_equal(merged.registers, low.registers)
+
+    high.merge(HyperLogLog(10))
+    assert high.precision == 10
+    assert np.array_equal(high.registers, low.registers)
+
+
+@pytest.mark.parametrize("count", [0, 50, 100_000])
+def test_serialization_round_trip(count: int) -> None:
+    """Test sparse and dense encodings."""
+    sketch = HyperLogLog(14)
+    sketch.add_hashes(_hashes(0, count))
+
+    data = sketch.to_bytes()
+    restored = HyperLogLog.from_bytes(data)
+
+    assert restored.precision == 14
+    assert np.array_equal(restored.registers, sketch.registers)
+    assert len(data) <= 2 + (1 << 14) * 6 // 8
+    if count <= 50:
+        assert len(data) == 2 + 3 * np.count_nonzero(sketch.registers)
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"\x01", b"\x01\x0e\x00", b"\x02\x0e\x00\x00", b"\x09\x0e", b"\x01\x30", b"\x02\x04\xff\x00\x01"]
+)
+def test_from_bytes_rejects_malformed_data(data: bytes) -> None:
+    """Test that truncated or unknown encodings raise ValueError."""
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(data)
+
+
+def _rank_errors(digest: TDigest, values: np.ndarray, quantiles: list[float]) -> np.ndarray:
+    """Differences between requested quantiles and the true ranks of the estimates."""
+    ordered = np.sort(values)
+    estimates = np.array(digest.quantiles(quantiles))
+    errors: np.ndarray = np.searchsorted(ordered, estimates) / len(ordered) - np.array(quantiles)
+    return errors
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal", "exponential"])
+def test_tdigest_quantile_accuracy(distribution: str) -> None:
+    """Test rank error of quantiles, tails included, with bounded centroids."""
+    values = getattr(np.random.default_rng(1), distribution)(size=200_000)
+    digest = TDigest(100)
+    digest.add_many(values)
+
+    errors = _rank_errors(digest, values, [0.001, 0.01, 0.5, 0.9, 0.95, 0.99, 0.999])
+
+    assert np.abs(errors).max() < 0.005
+    assert len(digest.means) <= 100
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+
+def test_tdigest_merge_matches_single_digest() -> None:
+    """Test that merging per-chunk digests keeps quantiles accurate."""
+    values = np.random.default_rng(2).lognormal(size=100_000)
+    merged = TDigest()
+    for chunk in np.array_split(values, 500):
+        part = TDigest()
+        part.add_many(chunk)
+        merged.merge(TDigest.from_bytes(part.to_bytes()))
+
+    assert len(merged) == len(values)
+    assert np.abs(_rank_errors(merged, values, [0.5, 0.95, 0.99])).max() < 0.005
+    assert TDigest.union([merged, TDigest()]).quantiles([0.5]) == merged.quantiles([0.5])
+
+
+def test_tdigest_add_buffers_values() -> None:
+    """Test single adds, NaN handling and small exact digests."""
+    digest = TDigest()
+    for value in [3.0, 1.0, float("nan"), 2.0]:
+        digest.add(value)
+
+    assert len(digest) == 3
+    assert digest.quantile(0.5) == 2.0
+    assert TDigest().quantile(0.5) is None
+    with pytest.raises(ValueError):
+        digest.quantile(1.5)
+
+
+def test_tdigest_serialization() -> None:
+    """Test round trip and rejection of malformed digests."""
+    digest = TDigest(50)
+    digest.add_many(np.arange(10_000, dtype=float))
+
+    restored = TDigest.from_bytes(digest.to_bytes())
+
+    assert restored.compression == 50
+    assert restored.quantiles([0.1, 0.9]) == digest.quantiles([0.1, 0.9])
+    for data in (b"", digest.to_bytes()[:-1], b"\x07" + digest.to_bytes()[1:]):
+        with pytest.raises(ValueError):
+            TDigest.from_bytes(data)
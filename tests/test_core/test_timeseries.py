@@ -0,0 +1,182 @@
+"""Tests for dense, server-side bucketed time series."""
+
+import math
+import pytest
+import pytest_asyncio
+from app.core.services.rollups import DAY_MS, GRANULARITIES, HOUR_MS, RollupService
+from app.core.services.timeseries import (
+    WEEK_MS,
+    MetricSpec,
+    bucket_range,
+    parse_metric,
+    query_series,
+)
+from app.database.columnar import EventStore
+from app.database.connection import Base
+from app.database.models.event import Event
+from app.database.models.rollup import RollupWatermark
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from pathlib import Path
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import cast
+
+# 2024-01-01T00:00:00Z, a Monday
+T0 = 1_704_067_200_000
+EVENTS = [
+    (T0 + 1_000, "purchase", 10.0),
+    (T0 + 2 * HOUR_MS, "purchase", 30.0),
+    (T0 + 2 * DAY_MS + 5, "purchase", 5.0),
+    (T0 + 2 * DAY_MS + 6, "signup", 0.0),
+]
+TABLES = [
+    Base.metadata.tables[cast(type[Base], model).__tablename__]
+    for model in (Event, RollupWatermark, *(model for g in GRANULARITIES for model in (g.model, *g.sketch_models)))
+]
+METRICS = [MetricSpec("purchase", "sum"), MetricSpec("purchase", "max"), MetricSpec("signup")]
+
+
+@pytest_asyncio.fixture
+async def rollups(tmp_path: Path) -> AsyncGenerator[RollupService, None]:
+    """Create a rollup service over a temporary database holding ``EVENTS``."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'series.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessionmaker() as session:
+        await session.execute(insert(Event), [{"ts": ts, "name": name, "value": value} for ts, name, value in EVENTS])
+        await session.commit()
+    service = RollupService(sessionmaker)
+    await service.catch_up_all()
+    yield service
+    await engine.dispose()
+
+
+def test_parse_metric() -> None:
+    """Test metric specifications with and without aggregate."""
+    assert parse_metric("purchase") == MetricSpec("purchase", "count")
+    assert parse_metric("purchase:sum").key == "purchase:sum"
+    assert parse_metric("ns:event:max") == MetricSpec("ns:event", "max")
+    assert parse_metric("session_end:p99.9").quantile == pytest.approx(0.999)
+    assert parse_metric("purchase:sum").quantile is None
+    with pytest.raises(ValueError):
+        parse_metric("purchase:median")
+    with pytest.raises(ValueError):
+        parse_metric(":sum")
+    with pytest.raises(ValueError):
+        parse_metric("purchase:p100")
+
+
+def test_bucket_range_aligns_weeks_to_monday() -> None:
+    """Test that week buckets start on Mondays and cover the whole range."""
+    wednesday = T0 + 2 * DAY_MS + HOUR_MS
+    step, _, low, count = bucket_range(wednesday, wednesday + WEEK_MS, "week")
+
+    assert step == WEEK_MS
+    assert low == T0
+    assert datetime.fromtimestamp(low / 1000, UTC).weekday() == 0
+    assert count == 2
+    with pytest.raises(ValueError):
+        bucket_range(T0, T0, "day")
+    with pytest.raises(ValueError):
+        bucket_range(T0, T0 + DAY_MS, "month")
+
+
+async def test_query_series_is_dense_and_gap_filled(rollups: RollupService) -> None:
+    """Test that every bucket has a value, with zeros and NaN for gaps."""
+    series = await query_series(rollups, T0, T0 + 4 * DAY_MS, "day", METRICS)
+
+    assert series.timestamps.tolist() == [T0 + index * DAY_MS for index in range(4)]
+    assert series.values["purchase:sum"].tolist() == [40.0, 0.0, 5.0, 0.0]
+    assert series.values["signup:count"].tolist() == [0.0, 0.0, 1.0, 0.0]
+    data = series.to_dict()
+    assert data["series"]["purchase:max"] == [30.0, None, 5.0, None]
+
+
+async def test_query_series_weeks_and_limits(rollups: RollupService) -> None:
+    """Test week bucketing and the bucket limit."""
+    series = await query_series(rollups, T0 + DAY_MS, T0 + 3 * DAY_MS, "week", METRICS)
+    assert series.timestamps.tolist() == [T0]
+    assert series.values["purchase:sum"].tolist() == [45.0]
+
+    with pytest.raises(ValueError):
+        await query_series(rollups, T0, T0 + DAY_MS, "minute", METRICS, max_buckets=100)
+
+
+async def test_event_store_and_rollups_agree(
+    rollups: RollupService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the columnar store yields the same series as the rollups."""
+    store = EventStore(tmp_path / "events")
+    store.append([ts for ts, _, _ in EVENTS], [name for _, name, _ in EVENTS], values=[v for _, _, v in EVENTS])
+    monkeypatch.setattr(EventStore, "covered_from", T0 - WEEK_MS)
+
+    for granularity in ("hour", "day", "week"):
+        expected = await query_series(rollups, T0, T0 + 3 * DAY_MS, granularity, METRICS)
+        actual = await query_series(rollups, T0, T0 + 3 * DAY_MS, granularity, METRICS, event_store=store)
+        assert (expected.source, actual.source) == ("rollups", "event_store")
+        assert actual.timestamps.tolist() == expected.timestamps.tolist()
+        for key, values in expected.values.items():
+            assert all(
+                (math.isnan(a) and math.isnan(b)) or a == b for a, b in zip(actual.values[key], values, strict=True)
+            )
+
+
+async def test_request_uses_rollups_unless_event_store_covers_it(
+    rollups: RollupService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that ranges the store does not cover, and sketch metrics, are answered from the rollups alone."""
+    store = EventStore(tmp_path / "events")
+    # The store only saw the last event, as if it was enabled after the others were ingested.
+    store.append([EVENTS[-1][0]], [EVENTS[-1][1]], values=[EVENTS[-1][2]])
+    monkeypatch.setattr(EventStore, "covered_from", T0 + 2 * DAY_MS)
+    metrics = [MetricSpec("signup"), MetricSpec("purchase", "sum")]
+
+    before = await query_series(rollups, T0, T0 + 3 * DAY_MS, "day", metrics, event_store=store)
+    assert before.source == "rollups"
+    assert before.totals == {"signup:count": 1, "purchase:sum": 45.0}
+
+    covered = await query_series(rollups, T0 + 2 * DAY_MS, T0 + 3 * DAY_MS, "day", metrics, event_store=store)
+    assert covered.source == "event_store"
+    assert covered.totals["signup:count"] == 1
+
+    mixed = await query_series(
+        rollups, T0 + 2 * DAY_MS, T0 + 3 * DAY_MS, "day", [*metrics, MetricSpec("purchase", "p50")], event_store=store
+    )
+    assert mixed.source == "rollups"
+    assert mixed.totals["purchase:sum"] == 5.0
+
+async def test_distinct_metrics_report_totals_and_errors(rollups: RollupService) -> None:
+    """Test distinct counts per bucket, as a range union and with their error."""
+    async with rollups.session_factory() as session:
+        await session.execute(
+            insert(Event),
+            [
+                {"ts": T0 + day * DAY_MS + index, "name": "visit", "user_id": f"user-{index}", "value": 0.0}
+                for day in range(3)
+                for index in range(100)
+            ],
+        )
+        await session.commit()
+    await rollups.catch_up_all()
+
+    metrics = [MetricSpec("visit", "distinct"), MetricSpec("visit"), MetricSpec("purchase", "sum")]
+    series = await query_series(rollups, T0, T0 + 4 * DAY_MS, "day", metrics)
+
+    assert series.values["visit:distinct"].tolist() == [100.0, 100.0, 100.0, 0.0]
+    assert series.totals == {"visit:distinct": 100, "visit:count": 300, "purchase:sum": 45.0}
+    assert series.errors == {"visit:distinct": pytest.approx(1.04 / 128)}
+
+
+async def test_percentile_metrics(rollups: RollupService) -> None:
+    """Test percentiles per bucket and over the range, with gaps as NaN."""
+    metrics = [MetricSpec("purchase", "p50"), MetricSpec("purchase", "p99")]
+    series = await query_series(rollups, T0, T0 + 4 * DAY_MS, "day", metrics)
+
+    assert series.values["purchase:p99"][0] == pytest.approx(30.0, rel=0.05)
+    assert series.values["purchase:p50"][2] == 5.0
+    assert math.isnan(series.values["purchase:p50"][1])
+    assert series.totals["purchase:p50"] == 10.0
+    assert series.to_dict()["series"]["purchase:p50"][3] is None
+    assert "purchase:p50" not in series.errors
@@ -0,0 +1,129 @@
+"""Tests for resumable streamed uploads."""
+
+import hashlib
+import os
+import pytest
+import time
+from app.core.services.uploads import (
+    UploadChecksumError,
+    UploadConflictError,
+    UploadManager,
+    UploadNotFoundError,
+    UploadTooLargeError,
+)
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+
+async def _stream(data: bytes, piece: int = 7, fail_after: int | None = None) -> AsyncIterator[bytes]:
+    """Yield data in small pieces, optionally failing like a dropped connection."""
+    for start in range(0, len(data), piece):
+        if fail_after is not None and start >= fail_after:
+            raise ConnectionError("client disconnected")
+        yield data[start : start + piece]
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> UploadManager:
+    """Create a manager with tiny chunks so writes span many chunks."""
+    return UploadManager(tmp_path / "uploads", max_bytes=1_000, chunk_size=16)
+
+
+async def test_upload_in_parts_with_checksum(manager: UploadManager) -> None:
+    """Test a two-request upload verified against the expected SHA-256."""
+    data = bytes(range(256)) * 2
+    info = await manager.create("data.bin", len(data), hashlib.sha256(data).hexdigest().upper())
+
+    info = await manager.write(info.id, 0, _stream(data[:100]), length=100)
+    assert (info.offset, info.complete) == (100, False)
+    info = await manager.write(info.id, 100, _stream(data[100:]))
+
+    assert info.complete
+    assert info.sha256 == hashlib.sha256(data).hexdigest()
+    assert (await manager.path(info.id)).read_bytes() == data
+    assert (await manager.get(info.id)).sha256 == info.sha256
+
+
+async def test_resume_after_interrupted_stream(manager: UploadManager, tmp_path: Path) -> None:
+    """Test that written bytes count after a failure and the hash survives a restart."""
+    data = b"0123456789" * 50
+    info = await manager.create("data.bin", len(data))
+
+    with pytest.raises(ConnectionError):
+        await manager.write(info.id, 0, _stream(data, fail_after=200))
+    offset = (await manager.get(info.id)).offset
+    assert 0 < offset <= 200
+
+    restarted = UploadManager(tmp_path / "uploads", chunk_size=16)
+    info = await restarted.write(info.id, offset, _stream(data[offset:]))
+
+    assert info.sha256 == hashlib.sha256(data).hexdigest()
+
+
+async def test_write_conflicts_and_limits(manager: UploadManager) -> None:
+    """Test offset checks, early size enforcement and unknown ids."""
+    info = await manager.create("data.bin", 20)
+
+    with pytest.raises(UploadConflictError) as conflict:
+        await manager.write(info.id, 5, _stream(b"x"))
+    assert conflict.value.offset == 0
+    with pytest.raises(UploadTooLargeError):
+        await manager.write(info.id, 0, _stream(b"x" * 21), length=21)
+    with pytest.raises(UploadTooLargeError):
+        await manager.write(info.id, 0, _stream(b"x" * 40, piece=16))
+    # The first full chunk was written before the overflow arrived.
+    assert (await manager.get(info.id)).offset == 16
+    with pytest.raises(UploadTooLargeError):
+        await manager.create("big.bin", 1_001)
+    for upload_id in ("0" * 32, "../etc/passwd"):
+        with pytest.raises(UploadNotFoundError):
+            await manager.get(upload_id)
+
+    await manager.write(info.id, 16, _stream(b"y" * 4))
+    with pytest.raises(UploadConflictError, match="complete"):
+        await manager.write(info.id, 20, _stream(b""))
+
+
+async def test_checksum_mismatch_deletes_upload(manager: UploadManager) -> None:
+    """Test that a corrupted upload is rejected and removed."""
+    info = await manager.create("data.bin", 3, "0" * 64)
+
+    with pytest.raises(UploadChecksumError):
+        await manager.write(info.id, 0, _stream(b"abc"))
+    with pytest.raises(UploadNotFoundError):
+        await manager.get(info.id)
+    assert list(manager.directory.iterdir()) == []
+
+
+async def test_lock_excludes_concurrent_writes_and_deletes(manager: UploadManager) -> None:
+    """Test that a write holding the upload's file lock blocks other writers and deletion."""
+    info = await manager.create("data.bin", 4)
+
+    with manager._lock(info.id) as acquired:
+        assert acquired
+        with pytest.raises(UploadConflictError, match="another request"):
+            await manager.write(info.id, 0, _stream(b"abcd"))
+        with pytest.raises(UploadConflictError):
+            await manager.delete(info.id)
+
+    assert (await manager.write(info.id, 0, _stream(b"abcd"))).complete
+    await manager.delete(info.id)
+    assert list(manager.directory.iterdir()) == []
+
+
+async def test_sweep_deletes_uploads_not_written_recently(manager: UploadManager) -> None:
+    """Test that expired uploads are deleted unless they are being written."""
+    old, busy, recent = [await manager.create("data.bin", 10) for _ in range(3)]
+    hour_ago = time.time() - 3600
+    for upload in (old, busy):
+        for path in (manager._meta_path(upload.id), manager._data_path(upload.id)):
+            os.utime(path, (hour_ago, hour_ago))
+
+    with manager._lock(busy.id):
+        assert await manager.sweep(60) == 1
+
+    with pytest.raises(UploadNotFoundError):
+        await manager.get(old.id)
+    assert (await manager.get(busy.id)).offset == 0
+    assert (await manager.get(recent.id)).offset == 0
+    assert await manager.sweep(60) == 1
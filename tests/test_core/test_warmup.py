@@ -0,0 +1,92 @@
+"""Tests for the startup warm-up and its readiness gate."""
+
+import asyncio
+import time
+from app.core.services.warmup import Warmup, prime_pool
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import QueuePool
+from typing import cast
+
+
+async def test_steps_run_concurrently_and_report_timings() -> None:
+    """Test that steps overlap, and that ready flips once all are done."""
+    started: list[float] = []
+
+    async def step() -> None:
+        started.append(time.monotonic())
+        await asyncio.sleep(0.05)
+
+    warmup = Warmup({"a": step, "b": step, "c": step}, deadline=10)
+    assert warmup.snapshot()["ready"] is False
+
+    began = time.monotonic()
+    await warmup.run()
+
+    assert time.monotonic() - began < 0.12
+    assert warmup.ready
+    snapshot = warmup.snapshot()
+    assert snapshot["ready"]
+    assert {step["status"] for step in snapshot["steps"].values()} == {"done"}
+    assert all(step["seconds"] >= 0.04 for step in snapshot["steps"].values())
+
+
+async def test_failed_step_is_recorded_without_blocking_readiness() -> None:
+    """Test that a failing step is reported and the others still complete."""
+
+    async def ok() -> None:
+        pass
+
+    async def broken() -> None:
+        raise RuntimeError("no connection")
+
+    warmup = Warmup({"ok": ok, "broken": broken}, deadline=10)
+    await warmup.run()
+
+    assert warmup.ready
+    assert warmup.results["ok"].status == "done"
+    assert warmup.results["broken"].status == "failed"
+    assert warmup.results["broken"].error == "RuntimeError: no connection"
+
+
+async def test_deadline_cancels_slow_steps() -> None:
+    """Test that the worker becomes ready at the deadline and slow steps are cancelled."""
+    cancelled = asyncio.Event()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    warmup = Warmup({"slow": slow}, deadline=0.05)
+    await warmup.run()
+
+    assert warmup.ready
+    assert cancelled.is_set()
+    assert warmup.results["slow"].status == "timed_out"
+
+
+def test_ready_after_deadline_even_if_not_run() -> None:
+    """Test that readiness does not depend on the warm-up task running at all."""
+    now = [0.0]
+
+    async def step() -> None:
+        pass
+
+    warmup = Warmup({"step": step}, deadline=30, clock=lambda: now[0])
+    assert not warmup.ready
+    now[0] = 30.0
+    assert warmup.ready
+
+
+async def test_prime_pool_opens_connections(tmp_path: Path) -> None:
+    """Test that the pool keeps the connections opened by the warm-up."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    try:
+        await prime_pool(engine, 3)
+
+        assert cast(QueuePool, engine.pool).checkedin() == 3
+    finally:
+        await engine.dispose()
@@ -0,0 +1,144 @@
+"""Tests for the query result cache."""
+
+import pytest_asyncio
+from app.database.cache import QueryCache
+from app.database.connection import AppSession
+from collections.abc import AsyncGenerator
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from typing import Any
+
+
+class _Base(DeclarativeBase):
+    """Isolated declarative base so test models stay out of the app metadata."""
+
+
+class Metric(_Base):
+    __tablename__ = "cache_metrics"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    value: Mapped[int]
+
+
+class Other(_Base):
+    __tablename__ = "cache_other"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+@pytest_asyncio.fixture
+async def sessionmaker() -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    """Create a session factory backed by AppSession over an in-memory database."""
+    engine: AsyncEngine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(_Base.metadata.create_all)
+    yield async_sessionmaker(engine, sync_session_class=AppSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def test_repeated_query_is_served_from_cache(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that identical statements and parameters hit the cache."""
+    cache = QueryCache()
+    stmt = select(Metric.id, Metric.value).where(Metric.value > 1)
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, stmt) == []
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, select(Metric.id, Metric.value).where(Metric.value > 1)) == []
+        assert await cache.fetch(session, select(Metric.id).where(Metric.value > 2)) == []
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+
+async def test_commit_invalidates_tagged_entries(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that ORM and bulk writes invalidate entries for the written tables only."""
+    cache = QueryCache()
+    count_metrics = select(func.count()).select_from(Metric)
+    count_other = select(func.count()).select_from(Other)
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, count_metrics, "scalar") == 0
+        assert await cache.fetch(session, count_other, "scalar") == 0
+
+        session.add(Metric(value=5))
+        await session.commit()
+        assert await cache.fetch(session, count_metrics, "scalar") == 1
+        assert await cache.fetch(session, count_other, "scalar") == 0
+
+        await session.execute(insert(Metric), [{"value": 1}, {"value": 2}])
+        await session.commit()
+        assert await cache.fetch(session, count_metrics, "scalar") == 3
+
+    assert cache.stats().invalidations == 2
+
+
+async def test_uncommitted_writes_bypass_cache(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that reads of uncommitted writes are not cached and rollback invalidates."""
+    cache = QueryCache()
+    stmt = select(func.count()).select_from(Metric)
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, stmt, "scalar") == 0
+        await session.execute(insert(Metric), [{"value": 1}])
+        assert await cache.fetch(session, stmt, "scalar") == 1
+        await session.rollback()
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, stmt, "scalar") == 0
+        session.add(Metric(value=1))
+        assert await cache.fetch(session, stmt, "scalar") == 1
+        await session.rollback()
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, stmt, "scalar") == 0
+
+
+async def test_result_invalidated_during_miss_is_not_stored(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that a result fetched while its table is invalidated is not cached."""
+    cache = QueryCache()
+    stmt = select(func.count()).select_from(Metric)
+
+    async with sessionmaker() as session:
+        execute = session.execute
+
+        async def execute_then_invalidate(*args: Any, **kwargs: Any) -> Any:
+            result = await execute(*args, **kwargs)
+            cache.invalidate_tables({Metric.__tablename__})
+            return result
+
+        session.execute = execute_then_invalidate  # type: ignore[method-assign]
+        assert await cache.fetch(session, stmt, "scalar") == 0
+
+    assert cache.stats().size == 0
+
+
+async def test_result_mode_is_part_of_the_key(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that one statement fetched in different modes is cached once per mode."""
+    cache = QueryCache()
+    stmt = select(func.count()).select_from(Metric)
+
+    async with sessionmaker() as session:
+        assert await cache.fetch(session, stmt, "scalar") == 0
+        assert await cache.fetch(session, stmt, "all") == [(0,)]
+        assert await cache.fetch(session, stmt, "scalar") == 0
+
+    assert (cache.stats().hits, cache.stats().size) == (1, 2)
+
+
+async def test_ttl_and_lru_bounds(sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+    """Test that expired entries are refetched and the LRU entry is evicted."""
+    cache = QueryCache(max_entries=2)
+
+    async with sessionmaker() as session:
+        for value in range(3):
+            await cache.fetch(session, select(Metric.id).where(Metric.value == value), "scalars")
+        assert cache.stats().evictions == 1
+
+        stmt = select(Metric.id).where(Metric.value == 99)
+        await cache.fetch(session, stmt, "scalars", ttl=0)
+        await cache.fetch(session, stmt, "scalars")
+
+    assert cache.stats().hits == 0
+    assert cache.stats().size == 2
@@ -0,0 +1,160 @@
+"""Tests for the memory-mapped columnar event store."""
+
+import numpy as np
+import pytest
+import time
+from app.database import columnar
+from app.database.columnar import EventStore, user_hash
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> EventStore:
+    """Create a store with small segments."""
+    return EventStore(tmp_path / "events", segment_rows=4, compact_rows=100, gc_grace_seconds=0)
+
+
+def _rows(store: EventStore, start: int = 0, end: int = 10**12, names: Iterable[str] | None = None) -> list[int]:
+    ts: list[int] = []
+    for part in store.scan(start, end, names):
+        ts.extend(int(t) for t in part.ts)
+    return sorted(ts)
+
+
+def test_append_rotates_full_segments_into_sorted_parts(store: EventStore) -> None:
+    """Full active segments are sealed into parts sorted by time."""
+    store.append([5, 3, 4, 1, 2, 9], ["a", "b", "a", "b", "a", "a"], values=[1, 2, 3, 4, 5, 6])
+
+    segments = store.segments()
+    assert sorted(segment.sealed for segment in segments) == [False, True]
+    part = next(segment for segment in segments if segment.sealed)
+    assert part.meta["min_ts"] == 1 and part.meta["max_ts"] == 5
+    assert list(store._columns(part)["ts"]) == [1, 3, 4, 5]
+    assert _rows(store) == [1, 2, 3, 4, 5, 9]
+
+
+def test_scan_filters_time_range_and_names(store: EventStore) -> None:
+    """Scans return rows in [start, end) for the requested names."""
+    store.append(range(10), ["a", "b"] * 5, users=["u1", None] * 5)
+
+    assert _rows(store, 2, 7) == [2, 3, 4, 5, 6]
+    assert _rows(store, 0, 10, names=["b"]) == [1, 3, 5, 7, 9]
+    assert _rows(store, 0, 10, names=["missing"]) == []
+
+    users = np.concatenate([part.user for part in store.scan(0, 10, ["a"])])
+    assert set(users.tolist()) == {user_hash("u1")}
+
+
+def test_aggregate_groups_by_name_and_bucket(store: EventStore) -> None:
+    """Aggregates match a straightforward computation."""
+    ts = [0, 10, 20, 30, 40, 50, 60, 70]
+    values = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    store.append(ts, ["a", "b", "a", "a", "b", "a", "a", "b"], values=values)
+
+    result = store.aggregate(0, 80, step_ms=40)
+    records = {(record["name"], record["bucket"]): record for record in result.to_records()}
+
+    assert records[("a", 0)] == {"name": "a", "bucket": 0, "count": 3, "sum": 8.0, "min": 1.0, "max": 4.0}
+    assert records[("b", 0)]["count"] == 1
+    assert records[("a", 40)] == {"name": "a", "bucket": 40, "count": 2, "sum": 13.0, "min": 6.0, "max": 7.0}
+    assert records[("b", 40)]["sum"] == 13.0
+
+    totals = store.aggregate(10, 60, names=["a"]).to_records()
+    assert totals == [{"name": "a", "bucket": 10, "count": 3, "sum": 13.0, "min": 3.0, "max": 6.0}]
+
+
+def test_aggregate_of_empty_range(store: EventStore) -> None:
+    """An empty range yields no groups."""
+    assert store.aggregate(0, 100, step_ms=10).to_records() == []
+
+
+def test_compaction_merges_parts_and_keeps_results(store: EventStore) -> None:
+    """Compaction replaces small parts without changing query results."""
+    for offset in range(0, 40, 4):
+        store.append([offset + 3, offset + 2, offset + 1, offset], ["x", "y", "x", "z"], values=[1, 2, 3, 4])
+    before = store.aggregate(0, 40, step_ms=8).to_records()
+    assert len(store.segments()) == 10
+
+    assert store.compact() == 10
+    segments = store.segments()
+    assert len(segments) == 1
+    assert list(store._columns(segments[0])["ts"]) == list(range(40))
+    assert store.aggregate(0, 40, step_ms=8).to_records() == before
+
+    # The ten parts and the active segments they were sealed from.
+    assert store.collect_garbage() == 20
+    assert [path.name for path in store.root.iterdir() if not path.name.startswith(".")] == [segments[0].name]
+
+
+def test_compaction_merges_in_bounded_windows(store: EventStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parts merged a few rows at a time still come out sorted, with ties and names intact."""
+    monkeypatch.setattr(columnar, "_MERGE_ROWS", 2)
+    store.append([1, 4, 4, 9], ["a", "b", "a", "b"], values=[1, 2, 3, 4])
+    store.append([0, 4, 5, 6], ["c", "a", "c", "c"], values=[5, 6, 7, 8])
+    store.append([2, 3, 4, 10], ["b", "b", "d", "a"], values=[9, 10, 11, 12])
+    def records() -> list[dict[str, Any]]:
+        return sorted(store.aggregate(0, 20, step_ms=3).to_records(), key=lambda record: (record["name"], record["bucket"]))
+
+    before = records()
+
+    assert store.compact() == 3
+    (part,) = store.segments()
+    columns = store._columns(part)
+    names = [part.meta["names"][code] for code in columns["name"]]
+    assert list(columns["ts"]) == [0, 1, 2, 3, 4, 4, 4, 4, 5, 6, 9, 10]
+    # Ties keep the order of the parts, which are merged by their first timestamp.
+    ties = list(zip(names, columns["value"].tolist(), strict=True))[4:8]
+    assert ties == [("a", 6.0), ("b", 2.0), ("a", 3.0), ("d", 11.0)]
+    assert records() == before
+
+
+def test_readers_see_writes_of_other_instances(store: EventStore) -> None:
+    """A second store instance reads rows appended by the first."""
+    store.append([1, 2], ["a", "a"])
+    reader = EventStore(store.root)
+
+    assert _rows(reader) == [1, 2]
+    store.append([3], ["a"])
+    assert _rows(reader) == [1, 2, 3]
+
+
+def test_rotation_by_age_and_retention(store: EventStore) -> None:
+    """Old active segments are sealed and expired parts dropped."""
+    store.rotate_seconds = 0
+    store.append([1, 2], ["a", "a"])
+    assert store.rotate()
+    store.append([100], ["a"])
+    assert store.rotate()
+
+    assert store.drop_before(50) == 1
+    assert _rows(store) == [100]
+
+
+def test_coverage_starts_at_creation_and_follows_retention(store: EventStore) -> None:
+    """The store covers events from its creation until retention drops older parts."""
+    created = store.covered_from
+    assert abs(created - time.time() * 1000) < 60_000
+    assert EventStore(store.root).covered_from == created
+
+    store.append([created + 1], ["a"])
+    store.rotate(force=True)
+    assert store.drop_before(created) == 0
+    assert store.covered_from == created
+    assert store.drop_before(created + 10) == 1
+    assert EventStore(store.root).covered_from == created + 10
+
+
+def test_retention_and_cleanup_skip_while_another_maintainer_runs(store: EventStore) -> None:
+    """Dropping and garbage collection, like compaction, only run under the maintenance lock."""
+    store.rotate_seconds = 0
+    store.append([1, 2], ["a", "a"])
+    assert store.rotate()
+
+    with store._maintenance_lock() as acquired:
+        assert acquired
+        assert store.drop_before(50) == 0
+        assert store.collect_garbage() == 0
+        assert store.compact() == 0
+    assert store.drop_before(50) == 1
@@ -0,0 +1,66 @@
+"""Tests for fingerprint-gated schema initialization."""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from app.database.schema import SchemaMismatchError, ensure_schema, schema_fingerprint, stored_fingerprint
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+
+def _metadata(*extra_columns: str) -> MetaData:
+    """Build a small metadata with optional extra string columns."""
+    metadata = MetaData()
+    Table(
+        "widgets",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        *(Column(name, String(32)) for name in extra_columns),
+    )
+    return metadata
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """Create an engine over a temporary SQLite file."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    await engine.dispose()
+
+
+def test_fingerprint_is_stable_and_tracks_changes() -> None:
+    """Test that equal schemas share a fingerprint and changes alter it."""
+    assert schema_fingerprint(_metadata()) == schema_fingerprint(_metadata())
+    assert schema_fingerprint(_metadata()) != schema_fingerprint(_metadata("name"))
+
+
+async def test_ddl_runs_only_when_fingerprint_changes(engine: AsyncEngine) -> None:
+    """Test that DDL is skipped while the stored fingerprint matches."""
+    assert await stored_fingerprint(engine) is None
+
+    assert await ensure_schema(engine, _metadata())
+    assert not await ensure_schema(engine, _metadata())
+    assert await stored_fingerprint(engine) == schema_fingerprint(_metadata())
+
+    with_gadgets = _metadata()
+    Table("gadgets", with_gadgets, Column("id", Integer, primary_key=True))
+    assert await ensure_schema(engine, with_gadgets)
+    assert await stored_fingerprint(engine) == schema_fingerprint(with_gadgets)
+
+
+async def test_changed_existing_table_fails_without_recording(engine: AsyncEngine) -> None:
+    """Test that a column create_all cannot add raises instead of being recorded as applied."""
+    assert await ensure_schema(engine, _metadata())
+
+    with pytest.raises(SchemaMismatchError, match="widgets lacks name.*alembic upgrade head"):
+        await ensure_schema(engine, _metadata("name"))
+    assert await stored_fingerprint(engine) == schema_fingerprint(_metadata())
+
+
+async def test_concurrent_initialization_runs_ddl_once(engine: AsyncEngine) -> None:
+    """Test that concurrent starters serialize on the lock and only one runs DDL."""
+    results = await asyncio.gather(*(ensure_schema(engine, _metadata()) for _ in range(4)))
+
+    assert sorted(results) == [False, False, False, True]
@@ -0,0 +1 @@
+"""Frontend tests package initialization."""
@@ -0,0 +1,85 @@
+"""Tests for the in-process ASGI transport of the API client."""
+
+import httpx
+import pytest
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from frontend.config import get_frontend_settings
+from frontend.services import api_client as api_client_module
+from frontend.services.asgi_transport import InProcessTransport
+from typing import Any
+
+
+@pytest.fixture
+def lifecycle() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def transport(lifecycle: list[str]) -> Iterator[InProcessTransport]:
+    """Serve a small app with a lifespan and a middleware in process."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        lifecycle.append("startup")
+        app.state.greeting = "hello"
+        yield
+        lifecycle.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.middleware("http")
+    async def tag(request: Request, call_next: Any) -> Any:
+        response = await call_next(request)
+        response.headers["X-Tagged"] = "1"
+        return response
+
+    @app.get("/api/v1/greeting")
+    async def greeting(request: Request, name: str = "world") -> dict[str, str]:
+        return {"message": f"{request.app.state.greeting} {name}"}
+
+    @app.post("/api/v1/echo")
+    async def echo(payload: dict[str, Any]) -> dict[str, Any]:
+        return payload
+
+    transport = InProcessTransport(app, timeout=5)
+    yield transport
+    transport.shutdown()
+
+
+def test_requests_run_through_app_and_middleware(transport: InProcessTransport, lifecycle: list[str]) -> None:
+    """Test that requests reach routes through middleware, with the lifespan started once."""
+    with httpx.Client(transport=transport, base_url="http://localhost") as client:
+        response = client.get("/api/v1/greeting", params={"name": "streamlit"})
+        echoed = client.post("/api/v1/echo", json={"rows": [1, 2]})
+
+    # Closing the client must not stop the shared transport.
+    with httpx.Client(transport=transport, base_url="http://localhost") as client:
+        assert client.get("/api/v1/missing").status_code == 404
+
+    assert response.json() == {"message": "hello streamlit"}
+    assert response.headers["X-Tagged"] == "1"
+    assert echoed.json() == {"rows": [1, 2]}
+    assert lifecycle == ["startup"]
+
+
+def test_shutdown_runs_lifespan_exit(transport: InProcessTransport, lifecycle: list[str]) -> None:
+    """Test that shutdown runs the app's shutdown once."""
+    transport.shutdown()
+    transport.shutdown()
+
+    assert lifecycle == ["startup", "shutdown"]
+
+
+def test_api_client_uses_in_process_transport(
+    transport: InProcessTransport, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the client switches to the in-process transport when enabled."""
+    monkeypatch.setattr(get_frontend_settings(), "api_in_process", True)
+    monkeypatch.setattr(api_client_module, "get_in_process_transport", lambda: transport)
+
+    client = api_client_module.APIClient()
+
+    assert client.base_url == "http://localhost/api/v1"
+    assert client.get("/greeting", params={"name": "api"}) == {"message": "hello api"}
@@ -0,0 +1,134 @@
+"""Tests for the single-flight request cache."""
+
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from frontend.services.request_cache import RequestCache
+
+
+class FakeClock:
+    """Settable monotonic clock."""
+
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_calls_share_one_load() -> None:
+    """Test that callers arriving during a load wait for it instead of loading again."""
+    cache = RequestCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load() -> dict[str, str]:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"status": "healthy"}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(cache.get, "health", load)
+        started.wait(5)
+        followers = [pool.submit(cache.get, "health", load) for _ in range(7)]
+        while cache.stats.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result(5), *(future.result(5) for future in followers)]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats.coalesced == 7
+    assert cache.stats.size == 0
+
+
+def test_errors_are_shared_and_not_cached() -> None:
+    """Test that a failed load raises for its waiters and the next call loads again."""
+    cache = RequestCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing() -> None:
+        started.set()
+        release.wait(5)
+        raise RuntimeError("API down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.get, "health", failing, 30)
+        started.wait(5)
+        follower = pool.submit(cache.get, "health", failing, 30)
+        while cache.stats.coalesced < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="API down"):
+                future.result(5)
+
+    assert cache.get("health", lambda: "up", ttl=30) == "up"
+
+
+def test_ttl_caches_until_expiry() -> None:
+    """Test that values are reused within the TTL and reloaded after it."""
+    clock = FakeClock()
+    cache = RequestCache(clock=clock, rand=lambda: 0.0)
+    values = iter(["first", "second"])
+
+    assert cache.get("key", lambda: next(values), ttl=30) == "first"
+    clock.now += 29
+    assert cache.get("key", lambda: next(values), ttl=30) == "first"
+    clock.now += 1
+    assert cache.get("key", lambda: next(values), ttl=30) == "second"
+    assert cache.stats.loads == 2
+
+
+def test_early_refresh_before_expiry() -> None:
+    """Test that a draw close to expiry refreshes, weighted by the load time."""
+    clock = FakeClock()
+    draw = [0.0]
+    cache = RequestCache(clock=clock, rand=lambda: draw[0])
+
+    def slow_load() -> str:
+        clock.now += 2  # the load takes two seconds
+        return f"loaded at {clock.now:g}"
+
+    cache.get("key", slow_load, ttl=30)
+    clock.now += 25
+    assert cache.get("key", slow_load, ttl=30) == "loaded at 1002"
+
+    # ln(1 - 0.99) * 2 s ≈ -9.2 s: refresh 5 s before expiry.
+    draw[0] = 0.99
+    assert cache.get("key", slow_load, ttl=30) == "loaded at 1029"
+    assert cache.stats.early_refreshes == 1
+
+
+def test_failed_early_refresh_keeps_value() -> None:
+    """Test that an early refresh that fails returns and keeps the valid value."""
+    clock = FakeClock()
+    cache = RequestCache(clock=clock, rand=lambda: 0.99)
+
+    def load() -> str:
+        clock.now += 2
+        return "cached"
+
+    def failing() -> str:
+        clock.now += 1
+        raise RuntimeError("API down")
+
+    cache.get("key", load, ttl=30)
+    clock.now += 27
+    assert cache.get("key", failing, ttl=30) == "cached"
+    assert cache.stats.early_refreshes == 1
+    assert cache.get("key", failing, ttl=30) == "cached"
+
+
+def test_clear_during_load_does_not_store() -> None:
+    """Test that a value loaded across a clear() is returned but not cached."""
+    cache = RequestCache()
+
+    def load() -> str:
+        cache.clear()
+        return "stale"
+
+    assert cache.get("key", load, ttl=30) == "stale"
+    assert cache.stats.size == 0
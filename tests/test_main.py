@@ -0,0 +1,47 @@
+"""Tests for the application lifespan."""
+
+import pytest
+from app import main
+from app.core.services.ingest import EventIngestor
+from fastapi import FastAPI
+
+
+@pytest.fixture(autouse=True)
+def small_compute_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start a single compute process to keep the lifespan fast."""
+    monkeypatch.setattr(main.settings, "compute_workers", 1)
+
+
+def _assert_stopped(application: FastAPI) -> None:
+    """Check that the services started before the ingestor were stopped."""
+    assert application.state.compute_pool._executor is None
+    assert application.state.job_manager._tasks == []
+    assert application.state.rollups._task is None
+
+
+async def test_failed_startup_stops_started_services(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that services started before a failing one are stopped."""
+
+    async def fail(self: EventIngestor) -> None:
+        raise RuntimeError("ingestor failed to start")
+
+    monkeypatch.setattr(EventIngestor, "start", fail)
+    application = FastAPI()
+
+    with pytest.raises(RuntimeError, match="ingestor failed"):
+        async with main.lifespan(application):
+            pass
+
+    _assert_stopped(application)
+
+
+async def test_error_while_serving_stops_services() -> None:
+    """Test that an exception raised at the yield still runs the shutdown."""
+    application = FastAPI()
+
+    with pytest.raises(ValueError, match="boom"):
+        async with main.lifespan(application):
+            raise ValueError("boom")
+
+    _assert_stopped(application)
+    assert application.state.ingestor._task is None
@@ -0,0 +1,52 @@
+"""Tests for the production server launcher."""
+
+import os
+from app.server import ServerOptions, available_cpus, build_gunicorn_command, default_compute_workers
+from pathlib import Path
+
+
+def _affinity() -> int:
+    """Get the number of CPUs in the scheduler affinity mask."""
+    return len(os.sched_getaffinity(0))
+
+
+def test_cgroup_v2_quota_limits_cpus(tmp_path: Path) -> None:
+    """Test that a cgroup v2 CPU quota caps the usable CPU count."""
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+
+    assert available_cpus(tmp_path) == 1
+
+
+def test_cgroup_v1_quota_limits_cpus(tmp_path: Path) -> None:
+    """Test that a cgroup v1 CFS quota is honoured and rounded up."""
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("150000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+    assert available_cpus(tmp_path) == min(2, _affinity())
+
+
+def test_unlimited_cgroup_uses_affinity(tmp_path: Path) -> None:
+    """Test that an unlimited or missing quota falls back to the affinity mask."""
+    assert available_cpus(tmp_path) == _affinity()
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert available_cpus(tmp_path) == _affinity()
+
+
+def test_compute_workers_are_shared_by_server_workers(tmp_path: Path) -> None:
+    """Test that the default compute pools of all API workers fit in the usable CPUs."""
+    (tmp_path / "cpu.max").write_text("800000 100000\n")
+    cpus = available_cpus(tmp_path)
+
+    assert default_compute_workers(1, tmp_path) == max(1, cpus - 1)
+    assert default_compute_workers(cpus, tmp_path) == 1
+    assert default_compute_workers(2, tmp_path) * 2 <= max(2, cpus - 1)
+    """Test that gunicorn is configured with uvicorn workers and tuning flags."""
+    command = build_gunicorn_command(ServerOptions(host="0.0.0.0", port=8000, workers=16, max_requests=500))
+
+    assert command[command.index("--workers") + 1] == "16"
+    assert command[command.index("--bind") + 1] == "0.0.0.0:8000"
+    assert command[command.index("--max-requests") + 1] == "500"
+    assert "--preload" in command
+    assert command[command.index("--worker-class") + 1].endswith("UvicornWorker")